@@ -18,6 +18,8 @@
 - 강화된 로깅 시스템
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import requests
@@ -32,6 +34,10 @@ from functools import lru_cache, wraps
 import warnings
 warnings.filterwarnings('ignore')
 
+# 6차시 스트리밍 지표 (RSI, 이동평균 계산식 공유)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lesson-06'))
+from streaming_indicators import RSI, SMA
+
 # 상수 정의
 class Constants:
     """전략 상수 정의"""
@@ -134,56 +140,29 @@ class DataProcessor:
     
     @staticmethod
     def calculate_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
-        """RSI 계산 (벡터화 연산)"""
+        """RSI 계산 (벡터화 연산, 최근 period개 가격 변화의 단순 평균)"""
         if len(prices) < period + 1:
             return np.full(len(prices), 50.0)
         
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        # RSI 계산을 위한 배열 초기화
-        rsi = np.full(len(prices), 50.0)
-        
-        # 첫 period개 이후부터 RSI 계산
-        for i in range(period, len(prices)):
-            if i >= len(gains):
-                break
-                
-            # 최근 period개의 gains와 losses 계산
-            recent_gains = gains[i-period:i]
-            recent_losses = losses[i-period:i]
-            
-            avg_gain = np.mean(recent_gains)
-            avg_loss = np.mean(recent_losses)
-            
-            if avg_loss == 0:
-                rsi[i] = 100.0
-            else:
-                rs = avg_gain / avg_loss
-                rsi[i] = 100 - (100 / (1 + rs))
+        rsi = RSI.batch(pd.Series(prices, dtype=float), period).to_numpy(copy=True)
         
+        # 처음 period개는 기본값, 하락폭 평균이 0이면 100
+        rsi[:period] = 50.0
+        rsi[np.isnan(rsi)] = 100.0
         return rsi
     
     @staticmethod
     def calculate_volume_ratio(volumes: np.ndarray, period: int = 20) -> np.ndarray:
-        """거래량 비율 계산 (벡터화 연산)"""
+        """거래량 비율 계산 (벡터화 연산, 직전 period개 평균 대비)"""
         if len(volumes) < period:
             return np.ones(len(volumes))
         
-        # 거래량 비율 계산을 위한 배열 초기화
-        volume_ratios = np.ones(len(volumes))
-        
-        # 첫 period개 이후부터 거래량 비율 계산
-        for i in range(period, len(volumes)):
-            # 최근 period개의 평균 거래량 계산
-            avg_volume = np.mean(volumes[i-period:i])
-            
-            if avg_volume > 0:
-                volume_ratios[i] = volumes[i] / avg_volume
-            else:
-                volume_ratios[i] = 1.0
+        volumes = np.asarray(volumes, dtype=float)
+        avg_volume = SMA.batch(pd.Series(volumes), period).shift(1).to_numpy()
         
+        volume_ratios = np.ones(len(volumes))
+        valid = avg_volume > 0
+        volume_ratios[valid] = volumes[valid] / avg_volume[valid]
         return volume_ratios
 
 class VolatilityBreakoutStrategy:
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+체결 스트림 기반 실시간 OHLCV 봉 집계기
+
+WebSocket trade 메시지를 받아 마켓·주기별(1s/1m/5m/1h 등) 봉을 만들고,
+봉이 닫힐 때마다 콜백을 호출하고 분 단위 이상 봉은 캔들 저장소에 기록합니다.
+봇이 매 주기 REST로 캔들을 다시 조회하지 않아도 최신 봉을 바로 얻을 수 있습니다.
+
+- 체결 하나당 (마켓, 주기)별로 시가/고가/저가/종가/거래량/거래대금/체결 수만
+  갱신하므로 O(1)입니다.
+- 봉 구간은 체결 시각(trade_timestamp) 기준 KST 경계에 맞춥니다.
+- 업비트 캔들처럼 체결이 없는 구간에는 봉을 만들지 않습니다.
+- 수집을 시작한 직후의 첫 봉은 구간 중간부터 집계되므로 complete=False로
+  표시하고 저장소에는 기록하지 않습니다.
+"""
+
+import re
+import time
+import threading
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from candle_store import CandleStore
+
+DEFAULT_INTERVALS = ['1s', '1m', '5m', '1h']
+
+# KST = UTC+9 (밀리초)
+_KST_OFFSET_MS = 9 * 3600 * 1000
+
+_INTERVAL_UNITS_MS = {'s': 1000, 'm': 60 * 1000, 'h': 3600 * 1000}
+
+
+def parse_interval(interval: str) -> int:
+    """
+    봉 주기 문자열을 밀리초로 변환
+
+    Args:
+        interval (str): '<숫자><s|m|h>' 형식 (예: '1s', '5m', '1h')
+
+    Returns:
+        int: 주기 (밀리초)
+    """
+    match = re.fullmatch(r'(\d+)([smh])', interval)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"지원하지 않는 봉 주기: {interval}")
+    return int(match.group(1)) * _INTERVAL_UNITS_MS[match.group(2)]
+
+
+def interval_to_unit(interval: str) -> Optional[str]:
+    """봉 주기에 해당하는 캔들 저장소 단위 (분 단위로 나누어떨어지지 않으면 None)"""
+    interval_ms = parse_interval(interval)
+    if interval_ms % 60000:
+        return None
+    return f'minutes/{interval_ms // 60000}'
+
+
+class Bar:
+    """OHLCV 봉 하나 (시각은 UTC epoch 밀리초)"""
+
+    __slots__ = ('market', 'interval', 'start', 'end', 'open', 'high', 'low', 'close',
+                 'volume', 'value', 'count', 'complete')
+
+    def __init__(self, market: str, interval: str, start: int, end: int,
+                 price: float, volume: float, complete: bool = True):
+        self.market = market
+        self.interval = interval
+        self.start = start
+        self.end = end
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.value = price * volume
+        self.count = 1
+        self.complete = complete
+
+    def add(self, price: float, volume: float):
+        """체결 반영"""
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.value += price * volume
+        self.count += 1
+
+    @property
+    def vwap(self) -> float:
+        """거래량 가중 평균 가격"""
+        return self.value / self.volume if self.volume else self.close
+
+    @property
+    def datetime(self) -> pd.Timestamp:
+        """봉 시작 시각 (KST, 시간대 정보 없음 - 캔들 저장소와 같은 기준)"""
+        return pd.Timestamp((self.start + _KST_OFFSET_MS) * 10**6)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리 변환 (캔들 저장소 컬럼 + vwap, count)"""
+        return {
+            'datetime': self.datetime,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'value': self.value,
+            'vwap': self.vwap,
+            'count': self.count
+        }
+
+
+class BarAggregator:
+    """
+    체결 → OHLCV 봉 집계기
+
+    주요 기능:
+    - 체결 반영 (O(1), 구간이 바뀌면 이전 봉을 닫음)
+    - 봉 마감 콜백 (on_bar_close)
+    - 체결이 끊겨도 시간이 지나면 봉 마감 (flush)
+    - 마감된 봉 메모리 보관 및 캔들 저장소 기록
+
+    update()·flush()는 한 스레드(수집기의 디코더 스레드 등)에서 호출하는 것을 전제로 하며,
+    get_bars()·current_bar()는 다른 스레드에서 읽어도 됩니다.
+    """
+
+    def __init__(self, intervals: Optional[List[str]] = None,
+                 candle_store: Optional[CandleStore] = None,
+                 history_size: int = 1000, close_delay: float = 2.0):
+        """
+        초기화
+
+        Args:
+            intervals (List[str]): 집계할 봉 주기 (기본값: 1s, 1m, 5m, 1h)
+            candle_store (CandleStore): 마감된 분 단위 이상 봉을 기록할 저장소 (None이면 기록 안 함)
+            history_size (int): (마켓, 주기)별 메모리에 보관할 마감 봉 수
+            close_delay (float): flush 시 봉 종료 후 늦게 도착하는 체결을 기다리는 시간 (초)
+        """
+        self.intervals = [(interval, parse_interval(interval)) for interval in (intervals or DEFAULT_INTERVALS)]
+        self.candle_store = candle_store
+        self.history_size = history_size
+        self.close_delay_ms = int(close_delay * 1000)
+
+        self.current: Dict[Tuple[str, str], Bar] = {}
+        self.history: Dict[Tuple[str, str], deque] = {}
+        self.callbacks: List[Callable[[Bar], None]] = []
+
+        self.stats = {'trades': 0, 'late_trades': 0, 'bars_closed': 0, 'bars_stored': 0, 'store_errors': 0}
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def on_bar_close(self, callback: Callable[[Bar], None]):
+        """봉 마감 콜백 등록 (마감된 Bar를 인자로 호출)"""
+        self.callbacks.append(callback)
+
+    # ==================== 체결 반영 ====================
+
+    def update(self, trade: Dict[str, Any]) -> List[Bar]:
+        """
+        업비트 trade 메시지 반영 (DEFAULT/SIMPLE 형식)
+
+        Returns:
+            List[Bar]: 이 체결로 마감된 봉 목록
+        """
+        market = trade.get('code') or trade.get('cd')
+        price = trade.get('trade_price', trade.get('tp'))
+        volume = trade.get('trade_volume', trade.get('tv'))
+        timestamp = trade.get('trade_timestamp') or trade.get('ttms') or trade.get('timestamp') or trade.get('tms')
+
+        if not market or price is None or volume is None or not timestamp:
+            return []
+        return self.add_trade(market, float(price), float(volume), int(timestamp))
+
+    def add_trade(self, market: str, price: float, volume: float, timestamp: int) -> List[Bar]:
+        """
+        체결 반영
+
+        Args:
+            market (str): 마켓 코드
+            price (float): 체결 가격
+            volume (float): 체결 수량
+            timestamp (int): 체결 시각 (UTC epoch 밀리초)
+
+        Returns:
+            List[Bar]: 이 체결로 마감된 봉 목록
+        """
+        self.stats['trades'] += 1
+        closed = []
+
+        for interval, interval_ms in self.intervals:
+            key = (market, interval)
+            start = (timestamp + _KST_OFFSET_MS) // interval_ms * interval_ms - _KST_OFFSET_MS
+            bar = self.current.get(key)
+
+            if bar is not None and start == bar.start:
+                bar.add(price, volume)
+                continue
+
+            history = self.history.get(key)
+            if (bar is not None and start < bar.start) or (history and start < history[-1].end):
+                # 이미 마감된 구간의 늦은 체결은 버림
+                self.stats['late_trades'] += 1
+                continue
+
+            if bar is not None:
+                closed.append(bar)
+            self.current[key] = Bar(market, interval, start, start + interval_ms, price, volume,
+                                    complete=history is not None)
+            self.history.setdefault(key, deque(maxlen=self.history_size))
+
+        if closed:
+            self._close_bars(closed)
+        return closed
+
+    def flush(self, now: Optional[int] = None, force: bool = False) -> List[Bar]:
+        """
+        종료 시각이 지난 봉 마감 (체결이 뜸한 마켓용, 주기적으로 호출)
+
+        Args:
+            now (int): 기준 시각 (UTC epoch 밀리초, None이면 현재 시각)
+            force (bool): True면 진행 중인 봉을 모두 마감 (종료 시 사용, 끝나지 않은 봉은 complete=False)
+
+        Returns:
+            List[Bar]: 마감된 봉 목록
+        """
+        now = now if now is not None else int(time.time() * 1000)
+        closed = [
+            bar for bar in self.current.values()
+            if force or now >= bar.end + self.close_delay_ms
+        ]
+        for bar in closed:
+            del self.current[(bar.market, bar.interval)]
+            if now < bar.end:
+                bar.complete = False
+
+        if closed:
+            self._close_bars(closed)
+        return closed
+
+    def _close_bars(self, bars: List[Bar]):
+        """마감 처리: 메모리 보관, 저장소 기록, 콜백 호출"""
+        with self.lock:
+            for bar in bars:
+                self.history[(bar.market, bar.interval)].append(bar)
+        self.stats['bars_closed'] += len(bars)
+
+        if self.candle_store is not None:
+            self._store_bars([bar for bar in bars if bar.complete])
+
+        for bar in bars:
+            for callback in self.callbacks:
+                try:
+                    callback(bar)
+                except Exception as e:
+                    self.logger.error(f"봉 마감 콜백 오류: {e}")
+
+    def _store_bars(self, bars: List[Bar]):
+        """분 단위 이상 봉을 (마켓, 단위)별로 모아 캔들 저장소에 기록"""
+        groups: Dict[Tuple[str, str], List[Bar]] = {}
+        for bar in bars:
+            unit = interval_to_unit(bar.interval)
+            if unit is not None:
+                groups.setdefault((bar.market, unit), []).append(bar)
+
+        for (market, unit), group in groups.items():
+            try:
+                df = pd.DataFrame([bar.to_dict() for bar in group])
+                self.stats['bars_stored'] += self.candle_store.append(market, unit, df)
+            except Exception as e:
+                self.stats['store_errors'] += 1
+                self.logger.error(f"봉 저장 오류 ({market} {unit}): {e}")
+
+    # ==================== 조회 ====================
+
+    def current_bar(self, market: str, interval: str) -> Optional[Bar]:
+        """진행 중인 봉"""
+        return self.current.get((market, interval))
+
+    def get_bars(self, market: str, interval: str, count: Optional[int] = None,
+                 include_current: bool = False) -> pd.DataFrame:
+        """
+        마감된 봉 조회 (오래된 것부터)
+
+        Args:
+            market (str): 마켓 코드
+            interval (str): 봉 주기
+            count (int): 최근 몇 개 (None이면 보관 중인 전체)
+            include_current (bool): 진행 중인 봉도 마지막 행으로 포함
+
+        Returns:
+            pd.DataFrame: datetime, open, high, low, close, volume, value, vwap, count
+        """
+        with self.lock:
+            bars = list(self.history.get((market, interval), ()))
+
+        if include_current:
+            bar = self.current.get((market, interval))
+            if bar is not None:
+                bars.append(bar)
+        if count is not None:
+            bars = bars[-count:]
+
+        return pd.DataFrame(
+            [bar.to_dict() for bar in bars],
+            columns=['datetime', 'open', 'high', 'low', 'close', 'volume', 'value', 'vwap', 'count']
+        )
+
+    def get_statistics(self) -> Dict[str, int]:
+        """집계 통계 (체결 수, 늦은 체결 수, 마감·저장 봉 수)"""
+        return {**self.stats, 'open_bars': len(self.current)}
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업비트 캔들 로컬 저장소
+
+(마켓, 캔들 단위)별로 OHLCV 이력을 디스크에 보관하여
+백테스트와 자동매매 봇이 같은 캔들 이력을 공유하도록 합니다.
+
+저장 구조:
+    <root>/<마켓>/<단위>/<파티션>.bin
+
+- 각 파티션은 고정 길이 레코드(CANDLE_DTYPE)를 시간순으로 이어 붙인 바이너리 파일이며
+  np.memmap으로 열어 필요한 구간만 읽습니다.
+- 분봉은 하루 단위, 일/주/월봉은 연 단위로 파티션을 나눕니다.
+- 새 캔들은 파티션 끝에 덧붙이고, 이미 있는 시각의 캔들(진행 중인 최신 캔들 등)은 덮어씁니다.
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 캔들 레코드 형식 (timestamp: KST 기준 datetime64[ns] 정수값)
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('value', '<f8')
+])
+
+CANDLE_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'value']
+
+# 환경 변수로 저장 위치를 바꿀 수 있으며, 지정하지 않으면 모든 차시가 같은 위치를 공유
+DEFAULT_STORE_DIR = os.environ.get(
+    'UPBIT_CANDLE_STORE',
+    os.path.join(os.path.expanduser('~'), '.upbit_candles')
+)
+
+
+def normalize_unit(unit: Union[str, int]) -> str:
+    """
+    캔들 단위를 업비트 API 경로 형식으로 정규화
+
+    Args:
+        unit: 'days', 'weeks', 'months', 'minutes/1' 또는 분 단위 정수 (예: 60, '60')
+
+    Returns:
+        str: 'days', 'weeks', 'months', 'minutes/<분>'
+    """
+    unit = str(unit)
+    if unit.isdigit():
+        return f'minutes/{int(unit)}'
+    if unit in ('day', 'days'):
+        return 'days'
+    if unit in ('week', 'weeks'):
+        return 'weeks'
+    if unit in ('month', 'months'):
+        return 'months'
+    if unit.startswith('minutes/') and unit.split('/', 1)[1].isdigit():
+        return unit
+    raise ValueError(f"지원하지 않는 캔들 단위: {unit}")
+
+
+def unit_interval(unit: Union[str, int]) -> Optional[pd.Timedelta]:
+    """캔들 단위의 시간 간격 (월봉처럼 간격이 일정하지 않으면 None)"""
+    unit = normalize_unit(unit)
+    if unit.startswith('minutes/'):
+        return pd.Timedelta(minutes=int(unit.split('/', 1)[1]))
+    if unit == 'days':
+        return pd.Timedelta(days=1)
+    if unit == 'weeks':
+        return pd.Timedelta(weeks=1)
+    return None
+
+
+def kst_now() -> pd.Timestamp:
+    """현재 한국 시각 (저장소의 캔들 시각과 같은 기준, 시간대 정보 없음)"""
+    return pd.Timestamp.now(tz='Asia/Seoul').tz_localize(None)
+
+
+def candles_from_upbit(candles: List[dict]) -> pd.DataFrame:
+    """
+    업비트 캔들 API 응답을 저장소 형식 데이터프레임으로 변환
+
+    Args:
+        candles: /v1/candles/* 응답 (최신 캔들이 먼저 오는 목록)
+
+    Returns:
+        pd.DataFrame: datetime, open, high, low, close, volume, value (오래된 것부터)
+    """
+    if not candles:
+        return pd.DataFrame(columns=['datetime'] + CANDLE_COLUMNS)
+
+    df = pd.DataFrame(candles).rename(columns={
+        'candle_date_time_kst': 'datetime',
+        'opening_price': 'open',
+        'high_price': 'high',
+        'low_price': 'low',
+        'trade_price': 'close',
+        'candle_acc_trade_volume': 'volume',
+        'candle_acc_trade_price': 'value'
+    })
+    if 'value' not in df.columns:
+        df['value'] = np.nan
+
+    df = df[['datetime'] + CANDLE_COLUMNS]
+    df['datetime'] = pd.to_datetime(df['datetime'])
+    return df.sort_values('datetime').reset_index(drop=True)
+
+
+def candles_to_upbit(df: pd.DataFrame, market: str) -> List[dict]:
+    """
+    저장소 데이터프레임을 업비트 캔들 API 응답 형식으로 변환 (최신 캔들이 먼저)
+
+    저장소에 없는 필드(전일 종가, 변동률 등)는 포함되지 않습니다.
+    """
+    candles = []
+    for row in df.iloc[::-1].itertuples(index=False):
+        candles.append({
+            'market': market,
+            'candle_date_time_utc': (row.datetime - pd.Timedelta(hours=9)).strftime('%Y-%m-%dT%H:%M:%S'),
+            'candle_date_time_kst': row.datetime.strftime('%Y-%m-%dT%H:%M:%S'),
+            'opening_price': row.open,
+            'high_price': row.high,
+            'low_price': row.low,
+            'trade_price': row.close,
+            'candle_acc_trade_price': row.value,
+            'candle_acc_trade_volume': row.volume
+        })
+    return candles
+
+
+class CandleStore:
+    """
+    캔들 로컬 저장소
+
+    주요 기능:
+    - (마켓, 단위)별 캔들 추가 (파티션 끝에 덧붙이기, 같은 시각은 덮어쓰기)
+    - 기간 조회 (해당 파티션만 memmap으로 읽음)
+    - 최근 N개 조회
+    - 누락 구간(갭) 탐지
+
+    같은 프로세스 안에서는 스레드 안전하지만, 여러 프로세스가 같은 (마켓, 단위)에
+    동시에 쓰는 경우는 고려하지 않습니다.
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_STORE_DIR):
+        """
+        초기화
+
+        Args:
+            root_dir (str): 저장소 루트 디렉토리
+        """
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== 쓰기 ====================
+
+    def append(self, market: str, unit: Union[str, int], df: pd.DataFrame) -> int:
+        """
+        캔들 추가
+
+        Args:
+            market (str): 마켓 코드 (예: 'KRW-BTC')
+            unit: 캔들 단위 (예: 'days', 'minutes/1', 60)
+            df (pd.DataFrame): 'datetime' 또는 'timestamp' 컬럼(또는 DatetimeIndex)과 OHLCV 컬럼
+
+        Returns:
+            int: 저장한 캔들 수
+        """
+        records = self._to_records(df)
+        if len(records) == 0:
+            return 0
+
+        unit = normalize_unit(unit)
+        directory = self._series_dir(market, unit)
+        os.makedirs(directory, exist_ok=True)
+
+        keys = self._partition_keys(records['timestamp'], unit)
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+
+        with self.lock:
+            for chunk in np.split(records, boundaries):
+                key = self._partition_keys(chunk['timestamp'][:1], unit)[0]
+                self._write_partition(os.path.join(directory, f'{key}.bin'), chunk)
+
+        return len(records)
+
+    def _write_partition(self, path: str, records: np.ndarray):
+        """파티션에 레코드 기록 (가능하면 파일 끝만 수정)"""
+        existing = self._load_partition(path)
+
+        if len(existing) == 0:
+            with open(path, 'ab') as f:
+                f.write(records.tobytes())
+            return
+
+        timestamps = np.array(existing['timestamp'])
+        del existing
+
+        # 새 레코드가 기존 꼬리를 모두 포함하면 꼬리만 잘라내고 덧붙임
+        position = int(np.searchsorted(timestamps, records['timestamp'][0]))
+        if np.isin(timestamps[position:], records['timestamp']).all():
+            with open(path, 'r+b') as f:
+                f.truncate(position * CANDLE_DTYPE.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(records.tobytes())
+            return
+
+        # 중간 구간 보충: 병합 후 파일 교체 (같은 시각은 새 레코드 우선)
+        merged = np.concatenate([np.fromfile(path, dtype=CANDLE_DTYPE), records])
+        order = np.argsort(merged['timestamp'], kind='stable')
+        merged = merged[order]
+        keep = np.append(merged['timestamp'][1:] != merged['timestamp'][:-1], True)
+
+        temp_path = f'{path}.tmp'
+        merged[keep].tofile(temp_path)
+        os.replace(temp_path, path)
+
+    # ==================== 읽기 ====================
+
+    def read(self, market: str, unit: Union[str, int],
+             start: Optional[Union[str, datetime]] = None,
+             end: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """
+        기간 조회 (start, end 모두 포함)
+
+        Args:
+            market (str): 마켓 코드
+            unit: 캔들 단위
+            start: 시작 시각 (KST, None이면 처음부터)
+            end: 종료 시각 (KST, None이면 끝까지)
+
+        Returns:
+            pd.DataFrame: datetime, open, high, low, close, volume, value
+        """
+        unit = normalize_unit(unit)
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+
+        partitions = self._list_partitions(market, unit)
+        if start_ns is not None:
+            start_key = self._partition_keys(np.array([start_ns]), unit)[0]
+            partitions = [p for p in partitions if p[0] >= start_key]
+        if end_ns is not None:
+            end_key = self._partition_keys(np.array([end_ns]), unit)[0]
+            partitions = [p for p in partitions if p[0] <= end_key]
+
+        chunks = []
+        for _, path in partitions:
+            data = self._load_partition(path)
+            lo = int(np.searchsorted(data['timestamp'], start_ns, side='left')) if start_ns is not None else 0
+            hi = int(np.searchsorted(data['timestamp'], end_ns, side='right')) if end_ns is not None else len(data)
+            if hi > lo:
+                chunks.append(np.array(data[lo:hi]))
+
+        return self._to_dataframe(np.concatenate(chunks) if chunks else np.empty(0, dtype=CANDLE_DTYPE))
+
+    def tail(self, market: str, unit: Union[str, int], count: int) -> pd.DataFrame:
+        """최근 count개 캔들 조회"""
+        unit = normalize_unit(unit)
+        chunks = []
+        remaining = count
+
+        for _, path in reversed(self._list_partitions(market, unit)):
+            if remaining <= 0:
+                break
+            data = self._load_partition(path)
+            chunks.append(np.array(data[max(0, len(data) - remaining):]))
+            remaining -= len(chunks[-1])
+
+        chunks.reverse()
+        return self._to_dataframe(np.concatenate(chunks) if chunks else np.empty(0, dtype=CANDLE_DTYPE))
+
+    def first_timestamp(self, market: str, unit: Union[str, int]) -> Optional[pd.Timestamp]:
+        """저장된 가장 오래된 캔들 시각"""
+        for _, path in self._list_partitions(market, normalize_unit(unit)):
+            data = self._load_partition(path)
+            if len(data):
+                return pd.Timestamp(int(data['timestamp'][0]))
+        return None
+
+    def last_timestamp(self, market: str, unit: Union[str, int]) -> Optional[pd.Timestamp]:
+        """저장된 가장 최근 캔들 시각"""
+        for _, path in reversed(self._list_partitions(market, normalize_unit(unit))):
+            data = self._load_partition(path)
+            if len(data):
+                return pd.Timestamp(int(data['timestamp'][-1]))
+        return None
+
+    def find_gaps(self, market: str, unit: Union[str, int],
+                  start: Optional[Union[str, datetime]] = None,
+                  end: Optional[Union[str, datetime]] = None) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        누락 구간 탐지
+
+        업비트는 체결이 없던 분에는 분봉을 만들지 않으므로, 거래가 적은 마켓에서는
+        실제 누락이 아닌 빈 구간도 갭으로 보고됩니다.
+
+        Returns:
+            List[Tuple]: (누락 시작 시각, 누락 끝 시각) 목록 (양 끝 포함)
+        """
+        interval = unit_interval(unit)
+        if interval is None:
+            return []
+
+        timestamps = self.read(market, unit, start, end)['datetime'].values
+        if len(timestamps) < 2:
+            return []
+
+        step = np.timedelta64(interval.value, 'ns')
+        gap_index = np.flatnonzero(np.diff(timestamps) > step)
+
+        return [
+            (pd.Timestamp(timestamps[i] + step), pd.Timestamp(timestamps[i + 1] - step))
+            for i in gap_index
+        ]
+
+    def list_series(self) -> List[Tuple[str, str]]:
+        """저장된 (마켓, 단위) 목록"""
+        series = []
+        for market in sorted(os.listdir(self.root_dir)):
+            market_dir = os.path.join(self.root_dir, market)
+            if not os.path.isdir(market_dir):
+                continue
+            for unit_dir in sorted(os.listdir(market_dir)):
+                series.append((market, unit_dir.replace('_', '/')))
+        return series
+
+    # ==================== 내부 유틸 ====================
+
+    def _series_dir(self, market: str, unit: str) -> str:
+        """(마켓, 단위) 디렉토리 경로"""
+        return os.path.join(self.root_dir, market, unit.replace('/', '_'))
+
+    def _list_partitions(self, market: str, unit: str) -> List[Tuple[str, str]]:
+        """(파티션 키, 경로) 목록 (시간순)"""
+        directory = self._series_dir(market, unit)
+        if not os.path.isdir(directory):
+            return []
+
+        return [
+            (name[:-4], os.path.join(directory, name))
+            for name in sorted(os.listdir(directory))
+            if name.endswith('.bin')
+        ]
+
+    def _load_partition(self, path: str) -> np.ndarray:
+        """파티션을 memmap으로 열기 (없거나 비어 있으면 빈 배열)"""
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.memmap(path, dtype=CANDLE_DTYPE, mode='r')
+
+    def _partition_keys(self, timestamps: np.ndarray, unit: str) -> np.ndarray:
+        """타임스탬프별 파티션 키 (분봉: 'YYYY-MM-DD', 그 외: 'YYYY')"""
+        resolution = 'D' if unit.startswith('minutes/') else 'Y'
+        return np.asarray(timestamps, dtype='datetime64[ns]').astype(f'datetime64[{resolution}]').astype(str)
+
+    def _to_records(self, df: pd.DataFrame) -> np.ndarray:
+        """데이터프레임을 정렬·중복 제거된 레코드 배열로 변환"""
+        if df is None or df.empty:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+        if 'datetime' in df.columns:
+            timestamps = pd.to_datetime(df['datetime'])
+        elif 'timestamp' in df.columns:
+            timestamps = pd.to_datetime(df['timestamp'])
+        elif isinstance(df.index, pd.DatetimeIndex):
+            timestamps = df.index.to_series()
+        else:
+            raise ValueError("캔들 데이터에 'datetime' 또는 'timestamp' 컬럼이 필요합니다.")
+
+        records = np.empty(len(df), dtype=CANDLE_DTYPE)
+        records['timestamp'] = timestamps.values.astype('datetime64[ns]').astype('int64')
+        for column in CANDLE_COLUMNS:
+            records[column] = df[column].values if column in df.columns else np.nan
+
+        # 시간순 정렬, 같은 시각은 마지막 값 사용
+        records = records[np.argsort(records['timestamp'], kind='stable')]
+        keep = np.append(records['timestamp'][1:] != records['timestamp'][:-1], True)
+        return records[keep]
+
+    def _to_dataframe(self, records: np.ndarray) -> pd.DataFrame:
+        """레코드 배열을 데이터프레임으로 변환"""
+        df = pd.DataFrame({
+            'datetime': records['timestamp'].astype('datetime64[ns]')
+        })
+        for column in CANDLE_COLUMNS:
+            df[column] = records[column]
+        return df
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+WebSocket 메시지 디코딩 파이프라인
+
+WebSocket 콜백 스레드는 수신한 원본 메시지(bytes/str)를 링 버퍼에 넣기만 하고,
+별도 디코더 스레드가 메시지를 모아서 JSON 파싱 후 배치 단위로 콜백에 전달합니다.
+초당 수백 건의 메시지가 몰려도 소켓 스레드가 파싱·로깅·파일 저장에 묶이지 않습니다.
+
+- orjson이 설치되어 있으면 자동으로 사용합니다 (없으면 표준 json).
+- decode_in_process=True이면 JSON 파싱을 별도 프로세스에서 수행합니다.
+  메시지가 크거나(호가 등) 메인 프로세스의 GIL 경합이 심할 때만 유리합니다.
+- 링 버퍼가 가득 차면 overflow 정책에 따라 가장 오래된 메시지('drop_oldest')
+  또는 새 메시지('drop_newest')를 버리고 dropped 카운터를 올립니다.
+"""
+
+import json
+import threading
+import time
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def decode_messages(raws: List[Union[bytes, str]], use_orjson: bool = True) -> List[Any]:
+    """
+    원본 메시지 목록을 JSON 디코딩 (파싱 실패한 메시지는 None)
+
+    프로세스 디코딩에서도 사용하므로 모듈 수준 함수로 둡니다.
+    """
+    loads = orjson.loads if use_orjson and ORJSON_AVAILABLE else json.loads
+    decoded = []
+    for raw in raws:
+        try:
+            decoded.append(loads(raw))
+        except ValueError:
+            decoded.append(None)
+    return decoded
+
+
+class RingBuffer:
+    """
+    고정 크기 메시지 링 버퍼 (스레드 안전)
+
+    생산자(소켓 스레드)는 put만 하고 블로킹되지 않으며,
+    소비자(디코더 스레드)는 get_batch로 여러 건을 한 번에 꺼냅니다.
+    """
+
+    def __init__(self, capacity: int = 10000, overflow: str = 'drop_oldest'):
+        """
+        초기화
+
+        Args:
+            capacity (int): 최대 보관 메시지 수
+            overflow (str): 가득 찼을 때 정책 ('drop_oldest' 또는 'drop_newest')
+        """
+        if overflow not in ('drop_oldest', 'drop_newest'):
+            raise ValueError(f"지원하지 않는 overflow 정책: {overflow}")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.items = deque()
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.high_watermark = 0
+
+    def put(self, item: Any) -> bool:
+        """
+        메시지 추가
+
+        Returns:
+            bool: 새 메시지를 보관했으면 True ('drop_newest'로 버렸으면 False)
+        """
+        with self.condition:
+            if len(self.items) >= self.capacity:
+                self.dropped += 1
+                if self.overflow == 'drop_newest':
+                    return False
+                self.items.popleft()
+
+            self.items.append(item)
+            if len(self.items) > self.high_watermark:
+                self.high_watermark = len(self.items)
+            self.condition.notify()
+            return True
+
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """최대 max_items개를 꺼냄 (비어 있으면 timeout까지 대기, 그래도 없으면 빈 목록)"""
+        with self.condition:
+            if not self.items:
+                self.condition.wait(timeout)
+
+            count = min(max_items, len(self.items))
+            return [self.items.popleft() for _ in range(count)]
+
+    def wake(self):
+        """대기 중인 소비자 깨우기 (종료 시 사용)"""
+        with self.condition:
+            self.condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class MessagePipeline:
+    """
+    소켓 스레드와 메시지 처리를 분리하는 디코딩 파이프라인
+
+    사용 예:
+        pipeline = MessagePipeline(dispatch=handle_batch)
+        pipeline.start()
+        ws = websocket.WebSocketApp(url, on_message=lambda ws, m: pipeline.submit(m))
+
+    dispatch는 디코더 스레드에서 [(수신 시각 epoch 나노초, 메시지 dict), ...] 목록으로 호출됩니다.
+    """
+
+    def __init__(self, dispatch: Callable[[List[Tuple[int, Any]]], None],
+                 capacity: int = 10000, batch_size: int = 200,
+                 max_wait: float = 0.05, overflow: str = 'drop_oldest',
+                 use_orjson: bool = True, decode_in_process: bool = False):
+        """
+        초기화
+
+        Args:
+            dispatch: 디코딩된 메시지 배치를 받는 콜백
+            capacity (int): 링 버퍼 크기
+            batch_size (int): 한 번에 디코딩·전달하는 최대 메시지 수
+            max_wait (float): 메시지가 없을 때 디코더가 기다리는 최대 시간 (초)
+            overflow (str): 링 버퍼가 가득 찼을 때 정책
+            use_orjson (bool): orjson 사용 여부 (설치된 경우에만 적용)
+            decode_in_process (bool): JSON 파싱을 별도 프로세스에서 수행
+        """
+        self.dispatch = dispatch
+        self.buffer = RingBuffer(capacity, overflow)
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.use_orjson = use_orjson and ORJSON_AVAILABLE
+        self.decode_in_process = decode_in_process
+
+        self.executor = None
+        self.thread = None
+        self.running = False
+        self.idle = threading.Condition()
+        self.busy = False
+
+        self.stats = {
+            'received': 0,
+            'decoded': 0,
+            'decode_errors': 0,
+            'dispatch_errors': 0,
+            'batches': 0,
+            'max_batch_size': 0,
+            'max_lag_ms': 0.0
+        }
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """디코더 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.running:
+            return
+
+        if self.decode_in_process and self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+
+        self.running = True
+        self.thread = threading.Thread(target=self._decode_loop, name='MessageDecoder', daemon=True)
+        self.thread.start()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = 5.0):
+        """
+        디코더 스레드 종료
+
+        Args:
+            drain (bool): 버퍼에 남은 메시지를 처리한 뒤 종료
+            timeout (float): 최대 대기 시간 (초)
+        """
+        if drain:
+            self.drain(timeout)
+
+        self.running = False
+        self.buffer.wake()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        self.thread = None
+
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def submit(self, raw: Union[bytes, str]) -> bool:
+        """원본 메시지 추가 (소켓 콜백 스레드에서 호출, 블로킹 없음)"""
+        self.stats['received'] += 1
+        return self.buffer.put((time.time_ns(), raw))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """버퍼가 비고 처리 중인 배치가 끝날 때까지 대기"""
+        if not self.running or self.thread is threading.current_thread():
+            return len(self.buffer) == 0
+
+        with self.idle:
+            return self.idle.wait_for(lambda: len(self.buffer) == 0 and not self.busy, timeout)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """파이프라인 통계 (수신·디코딩·버림 건수, 버퍼 사용량 등)"""
+        stats = dict(self.stats)
+        stats.update({
+            'dropped': self.buffer.dropped,
+            'queue_size': len(self.buffer),
+            'queue_capacity': self.buffer.capacity,
+            'queue_high_watermark': self.buffer.high_watermark,
+            'avg_batch_size': stats['decoded'] / stats['batches'] if stats['batches'] else 0.0,
+            'decoder': 'orjson' if self.use_orjson else 'json',
+            'decode_in_process': self.decode_in_process
+        })
+        return stats
+
+    def _decode_loop(self):
+        """버퍼에서 메시지를 꺼내 디코딩 후 배치 전달"""
+        while self.running or len(self.buffer):
+            with self.idle:
+                self.busy = True
+            try:
+                batch = self.buffer.get_batch(self.batch_size, self.max_wait)
+                if batch:
+                    self._process_batch(batch)
+            finally:
+                with self.idle:
+                    self.busy = False
+                    self.idle.notify_all()
+
+    def _process_batch(self, batch: List[Tuple[int, Any]]):
+        """배치 하나를 디코딩하고 dispatch 호출"""
+        received_times = [item[0] for item in batch]
+        raws = [item[1] for item in batch]
+
+        if self.executor is not None:
+            decoded = self.executor.submit(decode_messages, raws, self.use_orjson).result()
+        else:
+            decoded = decode_messages(raws, self.use_orjson)
+
+        messages = []
+        for received_at, data in zip(received_times, decoded):
+            if data is None:
+                self.stats['decode_errors'] += 1
+            else:
+                messages.append((received_at, data))
+
+        self.stats['decoded'] += len(messages)
+        self.stats['batches'] += 1
+        self.stats['max_batch_size'] = max(self.stats['max_batch_size'], len(batch))
+        lag_ms = (time.time_ns() - received_times[0]) / 1e6
+        self.stats['max_lag_ms'] = max(self.stats['max_lag_ms'], lag_ms)
+
+        if not messages:
+            return
+        try:
+            self.dispatch(messages)
+        except Exception as e:
+            self.stats['dispatch_errors'] += 1
+            self.logger.error(f"메시지 배치 처리 오류: {e}")
@@ -7,14 +7,21 @@ import uuid
 import hashlib
 import hmac
 import time
+import asyncio
 import logging
 import threading
+from collections import deque
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlencode
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
 class RateLimiter:
     """API 요청 제한 관리"""
     
@@ -58,35 +65,250 @@ class RateLimiter:
             self.second_requests.append(current_time)
             self.minute_requests.append(current_time)
 
+class AsyncRateLimiter:
+    """비동기 API 요청 제한 관리 (RateLimiter와 같은 초당/분당 제한)"""
+    
+    def __init__(self, requests_per_second=10, requests_per_minute=600):
+        self.requests_per_second = requests_per_second
+        self.requests_per_minute = requests_per_minute
+        
+        # 요청 기록 저장 (오래된 것부터)
+        self.second_requests = deque()
+        self.minute_requests = deque()
+        
+        # 코루틴 간 순서 보장을 위한 락
+        self.lock = asyncio.Lock()
+    
+    async def wait_if_needed(self):
+        """요청 제한에 걸리지 않도록 대기 (대기 중에도 다른 코루틴은 계속 실행됨)"""
+        async with self.lock:
+            while True:
+                current_time = time.monotonic()
+                
+                # 1초/1분 이내 요청만 유지
+                while self.second_requests and current_time - self.second_requests[0] >= 1:
+                    self.second_requests.popleft()
+                while self.minute_requests and current_time - self.minute_requests[0] >= 60:
+                    self.minute_requests.popleft()
+                
+                sleep_time = 0
+                if len(self.second_requests) >= self.requests_per_second:
+                    sleep_time = 1 - (current_time - self.second_requests[0])
+                if len(self.minute_requests) >= self.requests_per_minute:
+                    sleep_time = max(sleep_time, 60 - (current_time - self.minute_requests[0]))
+                
+                if sleep_time <= 0:
+                    break
+                await asyncio.sleep(sleep_time)
+            
+            # 요청 기록 추가
+            self.second_requests.append(current_time)
+            self.minute_requests.append(current_time)
+
+class InFlightRequest:
+    """진행 중인 요청 (같은 키의 다른 호출자가 결과를 기다림)"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
 class CacheManager:
-    """API 응답 캐싱 관리자"""
+    """API 응답 캐싱 관리자
+    
+    같은 키의 요청이 동시에 들어오면 하나만 실행하고 나머지는 그 결과를 기다립니다 (single-flight).
+    """
     
     def __init__(self, default_ttl: int = 60):
         self.cache = {}
         self.default_ttl = default_ttl
         self.lock = threading.Lock()
+        
+        # 키별 진행 중인 요청
+        self.in_flight: Dict[str, InFlightRequest] = {}
+        
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
     
     def get(self, key: str) -> Optional[Any]:
         """캐시에서 데이터 조회"""
         with self.lock:
-            if key in self.cache:
-                data, timestamp = self.cache[key]
-                if time.time() - timestamp < self.default_ttl:
-                    return data
-                else:
-                    del self.cache[key]
-            return None
+            return self._get_locked(key)
+    
+    def _get_locked(self, key: str) -> Optional[Any]:
+        """캐시 조회 (락을 잡은 상태에서 호출)"""
+        if key in self.cache:
+            data, expires_at = self.cache[key]
+            if time.time() < expires_at:
+                self.hits += 1
+                return data
+            else:
+                del self.cache[key]
+        self.misses += 1
+        return None
     
     def set(self, key: str, data: Any, ttl: int = None):
         """캐시에 데이터 저장"""
         with self.lock:
-            self.cache[key] = (data, time.time())
+            self.cache[key] = (data, time.time() + (ttl if ttl is not None else self.default_ttl))
+    
+    def get_or_load(self, key: str, loader, ttl: Optional[int] = None,
+                    use_cache: bool = True) -> Any:
+        """
+        캐시 조회 후 없으면 loader 실행
+        
+        같은 키로 이미 진행 중인 요청이 있으면 새로 요청하지 않고 그 결과(또는 예외)를 공유합니다.
+        use_cache가 False면 캐시는 건너뛰고 진행 중인 요청만 공유합니다.
+        """
+        with self.lock:
+            if use_cache:
+                cached_data = self._get_locked(key)
+                if cached_data:
+                    return cached_data
+            
+            flight = self.in_flight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self.in_flight[key] = InFlightRequest()
+            else:
+                self.deduplicated += 1
+        
+        if not is_leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        
+        try:
+            flight.result = loader()
+            if use_cache:
+                self.set(key, flight.result, ttl)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+            flight.done.set()
     
     def clear(self):
         """캐시 초기화"""
         with self.lock:
             self.cache.clear()
 
+
+class InvalidMarketError(ValueError):
+    """존재하지 않거나 상장 폐지된 마켓 코드로 요청이 거부됨 (4xx)"""
+
+
+class TickerBatcher:
+    """단일 마켓 현재가 요청 묶음 처리기
+    
+    짧은 시간 안에 들어온 여러 마켓 요청을 /v1/ticker 한 번으로 합쳐 조회합니다.
+    처음 들어온 호출자가 새 요청이 더 들어오지 않을 때까지(quiet, 최대 window) 기다린 뒤
+    모인 마켓을 한꺼번에 요청하고 결과를 나눠 줍니다. 혼자 들어온 호출은 quiet만큼만 기다립니다.
+    
+    잘못된 마켓 하나 때문에 묶음 요청이 거부되면(InvalidMarketError) 묶음을 절반씩 나눠 다시 조회해
+    해당 마켓 호출자에게만 오류를 돌려줍니다 (잘못된 마켓 k개에 O(k log N) 요청).
+    요청 제한·네트워크 오류 같은 일시적 오류는 나누지 않고 묶음의 모든 호출자에게 그대로 전달합니다.
+    """
+    
+    def __init__(self, fetch_tickers, window: float = 0.005, max_batch_size: int = 100,
+                 quiet: Optional[float] = None):
+        """
+        Args:
+            fetch_tickers: 마켓 리스트를 받아 현재가 리스트를 반환하는 함수
+            window: 요청을 모으는 최대 시간 (초)
+            max_batch_size: 한 번에 조회할 최대 마켓 수 (초과 시 즉시 요청)
+            quiet: 이 시간 동안 새 마켓이 들어오지 않으면 바로 요청 (초, None이면 window / 5)
+        """
+        self.fetch_tickers = fetch_tickers
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.quiet = window / 5 if quiet is None else quiet
+        
+        self.lock = threading.Lock()
+        self.pending = None
+        
+        # 통계
+        self.calls = 0
+        self.batches = 0
+        self.splits = 0
+    
+    def get(self, market: str) -> Optional[dict]:
+        """마켓 현재가 조회 (다른 호출과 묶여서 요청됨)"""
+        with self.lock:
+            self.calls += 1
+            batch = self.pending
+            is_leader = batch is None
+            if is_leader:
+                batch = self.pending = {
+                    'markets': [],
+                    'full': threading.Event(),
+                    'done': threading.Event(),
+                    'result': {},
+                    'errors': {}
+                }
+            if market not in batch['markets']:
+                batch['markets'].append(market)
+            if len(batch['markets']) >= self.max_batch_size:
+                # 가득 찬 묶음은 더 이상 받지 않고 바로 요청
+                self.pending = None
+                batch['full'].set()
+        
+        if not is_leader:
+            batch['done'].wait()
+        else:
+            self._collect(batch)
+            with self.lock:
+                if self.pending is batch:
+                    self.pending = None
+                self.batches += 1
+            
+            try:
+                self._fetch(batch, batch['markets'])
+            finally:
+                batch['done'].set()
+        
+        if market in batch['errors']:
+            raise batch['errors'][market]
+        return batch['result'].get(market)
+    
+    def _collect(self, batch: dict):
+        """새 마켓이 quiet 동안 들어오지 않거나 window가 지나거나 묶음이 찰 때까지 대기"""
+        deadline = time.monotonic() + self.window
+        seen = 1
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or batch['full'].wait(min(self.quiet, remaining)):
+                return
+            with self.lock:
+                count = len(batch['markets'])
+            if count == seen:
+                return
+            seen = count
+    
+    def _fetch(self, batch: dict, markets: List[str]):
+        """마켓 묶음 조회 (잘못된 마켓으로 거부되면 절반씩 나눠 다시 조회)"""
+        try:
+            for ticker in self.fetch_tickers(markets):
+                batch['result'][ticker['market']] = ticker
+        except InvalidMarketError as e:
+            if len(markets) == 1:
+                batch['errors'][markets[0]] = e
+                return
+            self.splits += 1
+            middle = len(markets) // 2
+            self._fetch(batch, markets[:middle])
+            self._fetch(batch, markets[middle:])
+        except Exception as e:
+            for market in markets:
+                batch['errors'][market] = e
+
+
 class OptimizedUpbitAPI:
     """효율성이 최적화된 업비트 API 클라이언트"""
     
@@ -109,6 +331,9 @@ class OptimizedUpbitAPI:
         
         # 병렬 처리용 스레드 풀
         self.executor = ThreadPoolExecutor(max_workers=5)
+        
+        # 단일 마켓 현재가 요청 묶음 처리
+        self.ticker_batcher = TickerBatcher(self._fetch_ticker_batch)
     
     def _create_session_pool(self):
         """세션 풀 생성"""
@@ -172,15 +397,25 @@ class OptimizedUpbitAPI:
                      use_cache: bool = True, cache_ttl: int = 60) -> dict:
         """최적화된 API 요청 실행"""
         
-        # 캐시 키 생성
-        cache_key = f"{method}:{endpoint}:{str(params)}:{str(data)}"
+        if method != 'GET':
+            return self._send_request(method, endpoint, params, data, require_auth)
         
-        # 캐시에서 조회
-        if use_cache and method == 'GET':
-            cached_data = self.cache.get(cache_key)
-            if cached_data:
-                self.logger.debug(f"캐시에서 데이터 조회: {endpoint}")
-                return cached_data
+        # 캐시 조회, 같은 요청이 진행 중이면 그 결과를 공유 (single-flight)
+        cache_key = self._cache_key(method, endpoint, params, data)
+        return self.cache.get_or_load(
+            cache_key,
+            lambda: self._send_request(method, endpoint, params, data, require_auth),
+            ttl=cache_ttl,
+            use_cache=use_cache
+        )
+    
+    def _cache_key(self, method: str, endpoint: str, params: dict = None, data: dict = None) -> str:
+        """캐시 키 생성"""
+        return f"{method}:{endpoint}:{str(params)}:{str(data)}"
+    
+    def _send_request(self, method: str, endpoint: str, params: dict = None,
+                      data: dict = None, require_auth: bool = False) -> dict:
+        """API 요청 전송"""
         
         # Rate Limit 체크
         self.rate_limiter.wait_if_needed()
@@ -212,25 +447,23 @@ class OptimizedUpbitAPI:
             
             # 응답 상태 코드 확인
             if response.status_code == 200:
-                result = response.json()
-                
-                # GET 요청인 경우 캐시에 저장
-                if use_cache and method == 'GET':
-                    self.cache.set(cache_key, result, cache_ttl)
-                
-                return result
+                return response.json()
             elif response.status_code == 401:
                 raise ValueError("인증 실패: API 키를 확인하세요.")
             elif response.status_code == 429:
                 raise ValueError("요청 제한 초과: 잠시 후 다시 시도하세요.")
             else:
                 error_msg = f"API 오류: {response.status_code}"
+                error_text = ''
                 try:
                     error_data = response.json()
                     if 'error' in error_data:
-                        error_msg += f" - {error_data['error']['message']}"
+                        error_text = str(error_data['error'].get('message', ''))
+                        error_msg += f" - {error_text}"
                 except:
                     pass
+                if self._is_invalid_market_error(response.status_code, error_text):
+                    raise InvalidMarketError(error_msg)
                 raise ValueError(error_msg)
                 
         except requests.exceptions.Timeout:
@@ -241,6 +474,12 @@ class OptimizedUpbitAPI:
             self.logger.error(f"API 요청 오류: {e}")
             raise
     
+    @staticmethod
+    def _is_invalid_market_error(status_code: int, message: str) -> bool:
+        """마켓 코드가 잘못되어 거부된 응답인지 확인 (예: 404 "Code not found")"""
+        message = message.lower()
+        return 400 <= status_code < 500 and ('code not found' in message or 'market' in message)
+    
     # ==================== 최적화된 시장 데이터 조회 API ====================
     
     def get_markets(self, use_cache: bool = True) -> List[dict]:
@@ -325,13 +564,30 @@ class OptimizedUpbitAPI:
     
     # ==================== 최적화된 편의 메서드 ====================
     
+    def _fetch_ticker_batch(self, markets: List[str]) -> List[dict]:
+        """묶인 마켓 현재가를 한 번에 조회하고 마켓별 캐시에도 저장"""
+        tickers = self.get_ticker(markets)
+        
+        # 이후 get_ticker([market]) 호출도 캐시를 사용하도록 마켓별 키로 저장
+        for ticker in tickers:
+            cache_key = self._cache_key('GET', '/v1/ticker', {'markets': ticker['market']})
+            self.cache.set(cache_key, [ticker], 30)
+        
+        return tickers
+    
+    def _get_single_ticker(self, market: str) -> Optional[dict]:
+        """단일 마켓 현재가 (캐시 확인 후 다른 요청과 묶어서 조회)"""
+        cached = self.cache.get(self._cache_key('GET', '/v1/ticker', {'markets': market}))
+        if cached:
+            return cached[0]
+        return self.ticker_batcher.get(market)
+    
     def get_current_price(self, market: str) -> float:
-        """특정 마켓 현재가 조회 (캐싱 적용)"""
+        """특정 마켓 현재가 조회 (캐싱, 요청 묶음 적용)"""
         try:
-            # 단일 마켓 조회로 최적화
-            tickers = self.get_ticker([market])
-            if tickers:
-                return float(tickers[0]['trade_price'])
+            ticker = self._get_single_ticker(market)
+            if ticker:
+                return float(ticker['trade_price'])
             return 0.0
         except Exception as e:
             self.logger.error(f"현재가 조회 실패: {e}")
@@ -350,11 +606,11 @@ class OptimizedUpbitAPI:
             return {}
     
     def get_market_info(self, market: str) -> dict:
-        """마켓 정보 조회 (캐싱 적용)"""
+        """마켓 정보 조회 (캐싱, 요청 묶음 적용)"""
         try:
-            tickers = self.get_ticker([market])
-            if tickers:
-                return tickers[0]
+            ticker = self._get_single_ticker(market)
+            if ticker:
+                return ticker
             return {}
         except Exception as e:
             self.logger.error(f"마켓 정보 조회 실패: {e}")
@@ -384,7 +640,13 @@ class OptimizedUpbitAPI:
         with self.cache.lock:
             return {
                 'cache_size': len(self.cache.cache),
-                'cache_keys': list(self.cache.cache.keys())
+                'cache_keys': list(self.cache.cache.keys()),
+                'cache_hits': self.cache.hits,
+                'cache_misses': self.cache.misses,
+                'deduplicated_requests': self.cache.deduplicated,
+                'ticker_calls': self.ticker_batcher.calls,
+                'ticker_batches': self.ticker_batcher.batches,
+                'ticker_splits': self.ticker_batcher.splits
             }
     
     def cleanup(self):
@@ -394,6 +656,194 @@ class OptimizedUpbitAPI:
         self.cache.clear()
         self.logger.info("리소스가 정리되었습니다.")
 
+class AsyncOptimizedUpbitAPI:
+    """asyncio 기반 업비트 시세 조회 클라이언트
+    
+    하나의 aiohttp 세션(커넥션 풀)을 공유하고 AsyncRateLimiter로 요청 속도를 맞추므로
+    스레드 없이 하나의 이벤트 루프에서 전체 원화 마켓을 주기적으로 조회할 수 있습니다.
+    
+    사용 예:
+        async with AsyncOptimizedUpbitAPI() as api:
+            tickers = await api.get_all_krw_tickers()
+    """
+    
+    def __init__(self, max_connections: int = 20):
+        if aiohttp is None:
+            raise ImportError("AsyncOptimizedUpbitAPI를 사용하려면 aiohttp를 설치하세요: pip install aiohttp")
+        
+        self.base_url = "https://api.upbit.com"
+        self.max_connections = max_connections
+        
+        # 캐싱 시스템
+        self.cache = CacheManager()
+        
+        # 요청 제한 관리
+        self.rate_limiter = AsyncRateLimiter()
+        
+        self.logger = logging.getLogger(__name__)
+        
+        # 세션은 이벤트 루프 안에서 처음 요청할 때 생성
+        self.session = None
+        
+        # 키별 진행 중인 요청
+        self.in_flight: Dict[str, asyncio.Future] = {}
+    
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def _get_session(self):
+        """공유 세션 생성 (커넥션 풀)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=30
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={
+                    'User-Agent': 'OptimizedUpbitAPI/2.0',
+                    'Accept': 'application/json'
+                }
+            )
+        return self.session
+    
+    async def _make_request(self, endpoint: str, params: dict = None,
+                            use_cache: bool = True, cache_ttl: int = 60) -> Any:
+        """비동기 GET 요청 실행 (시세 조회 API는 인증 불필요)"""
+        
+        # 캐시 키 생성
+        cache_key = f"GET:{endpoint}:{str(params)}:None"
+        
+        # 캐시에서 조회
+        if use_cache:
+            cached_data = self.cache.get(cache_key)
+            if cached_data:
+                self.logger.debug(f"캐시에서 데이터 조회: {endpoint}")
+                return cached_data
+        
+        # 같은 요청이 진행 중이면 그 결과를 공유 (single-flight)
+        task = self.in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._send_request(endpoint, params, cache_key if use_cache else None, cache_ttl))
+            self.in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(cache_key, None))
+        else:
+            self.cache.deduplicated += 1
+        
+        # 한 호출자가 취소되어도 공유 요청은 계속 진행
+        return await asyncio.shield(task)
+    
+    async def _send_request(self, endpoint: str, params: dict = None,
+                            cache_key: Optional[str] = None, cache_ttl: int = 60) -> Any:
+        """비동기 GET 요청 전송 (cache_key가 있으면 결과를 캐시에 저장)"""
+        
+        # Rate Limit 체크
+        await self.rate_limiter.wait_if_needed()
+        
+        session = await self._get_session()
+        url = f"{self.base_url}{endpoint}"
+        
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    
+                    if cache_key is not None:
+                        self.cache.set(cache_key, result, cache_ttl)
+                    
+                    return result
+                elif response.status == 429:
+                    raise ValueError("요청 제한 초과: 잠시 후 다시 시도하세요.")
+                else:
+                    error_msg = f"API 오류: {response.status}"
+                    try:
+                        error_data = await response.json()
+                        if 'error' in error_data:
+                            error_msg += f" - {error_data['error']['message']}"
+                    except Exception:
+                        pass
+                    raise ValueError(error_msg)
+                    
+        except asyncio.TimeoutError:
+            raise ValueError("요청 시간 초과")
+        except aiohttp.ClientConnectionError:
+            raise ValueError("네트워크 연결 오류")
+    
+    # ==================== 비동기 시장 데이터 조회 API ====================
+    
+    async def get_markets(self, use_cache: bool = True) -> List[dict]:
+        """마켓 목록 조회 (캐싱 적용)"""
+        return await self._make_request('/v1/market/all', use_cache=use_cache, cache_ttl=3600)
+    
+    async def get_ticker(self, markets: List[str] = None, use_cache: bool = True) -> List[dict]:
+        """현재가 조회 (캐싱 적용)"""
+        params = {}
+        if markets:
+            params['markets'] = ','.join(markets)
+        
+        return await self._make_request('/v1/ticker', params=params, use_cache=use_cache, cache_ttl=30)
+    
+    async def get_candles(self, market: str, count: int = 200,
+                          unit: str = 'days', use_cache: bool = True) -> List[dict]:
+        """캔들 데이터 조회 (캐싱 적용)"""
+        params = {
+            'market': market,
+            'count': count
+        }
+        
+        # 캐싱 TTL 설정 (단위별로 다르게)
+        cache_ttl = {
+            'minutes': 60,    # 1분 캐싱
+            'days': 3600,     # 1시간 캐싱
+            'weeks': 7200,    # 2시간 캐싱
+            'months': 14400   # 4시간 캐싱
+        }.get(unit.split('/')[0], 3600)
+        
+        return await self._make_request(f'/v1/candles/{unit}', params=params,
+                                        use_cache=use_cache, cache_ttl=cache_ttl)
+    
+    async def get_orderbook(self, markets: List[str], use_cache: bool = False) -> List[dict]:
+        """호가 정보 조회 (기본적으로 캐싱하지 않음)"""
+        params = {'markets': ','.join(markets)}
+        return await self._make_request('/v1/orderbook', params=params, use_cache=use_cache, cache_ttl=1)
+    
+    async def get_multiple_tickers(self, market_lists: List[List[str]]) -> List[List[dict]]:
+        """여러 마켓 그룹의 현재가를 동시에 조회 (실패한 그룹은 빈 리스트)"""
+        results = await asyncio.gather(
+            *(self.get_ticker(markets) for markets in market_lists),
+            return_exceptions=True
+        )
+        
+        tickers = []
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"동시 조회 실패: {result}")
+                tickers.append([])
+            else:
+                tickers.append(result)
+        return tickers
+    
+    async def get_all_krw_tickers(self, chunk_size: int = 100, use_cache: bool = False) -> List[dict]:
+        """전체 원화 마켓 현재가 조회 (chunk_size개씩 나누어 동시 요청)"""
+        markets = await self.get_markets()
+        krw_markets = [m['market'] for m in markets if m['market'].startswith('KRW-')]
+        
+        chunks = [krw_markets[i:i + chunk_size] for i in range(0, len(krw_markets), chunk_size)]
+        results = await asyncio.gather(*(self.get_ticker(chunk, use_cache=use_cache) for chunk in chunks))
+        
+        return [ticker for result in results for ticker in result]
+    
+    async def close(self):
+        """세션 종료"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
 # 사용 예시
 def main():
     """최적화된 API 사용 예시"""
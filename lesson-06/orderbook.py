@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업비트 호가 스트림 기반 인메모리 오더북
+
+WebSocket orderbook 메시지(또는 REST 호가 응답)로 마켓별 오더북을 유지하고,
+전략이나 MCP 서버가 REST 호가 조회 없이 최우선 호가, 중간가/마이크로프라이스,
+N bp 이내 잔량, 매수·매도 불균형 등을 바로 읽을 수 있게 합니다.
+
+- 업비트 호가 메시지는 매번 전체 단계(기본 15단계)를 보내므로, 갱신 시 가격 단계
+  배열을 새로 만들어 불변 스냅샷(OrderBookSnapshot)으로 통째로 교체합니다.
+  읽는 쪽은 잠금 없이 항상 일관된 스냅샷을 보게 됩니다.
+- 매도 호가는 가격 오름차순, 매수 호가는 가격 내림차순 배열이므로
+  최우선 호가는 O(1), 가격 범위 잔량은 누적합 + 이진 탐색으로 O(log N)입니다.
+- OrderBookFeed는 WebSocket으로 호가를 구독해 OrderBookManager를 갱신합니다.
+"""
+
+import json
+import time
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    websocket = None
+    WEBSOCKET_AVAILABLE = False
+
+from message_pipeline import MessagePipeline
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+
+class OrderBookSnapshot:
+    """
+    특정 시점의 오더북 (불변)
+
+    ask_prices/ask_sizes: 매도 호가 (가격 오름차순)
+    bid_prices/bid_sizes: 매수 호가 (가격 내림차순)
+    """
+
+    __slots__ = ('market', 'timestamp', 'ask_prices', 'ask_sizes', 'bid_prices', 'bid_sizes',
+                 'ask_cum_sizes', 'bid_cum_sizes', 'ask_cum_values', 'bid_cum_values')
+
+    def __init__(self, market: str, timestamp: int,
+                 ask_prices: np.ndarray, ask_sizes: np.ndarray,
+                 bid_prices: np.ndarray, bid_sizes: np.ndarray):
+        """
+        초기화
+
+        Args:
+            market (str): 마켓 코드
+            timestamp (int): 호가 시각 (epoch 밀리초)
+            ask_prices, ask_sizes: 매도 호가 가격·잔량 (가격 오름차순)
+            bid_prices, bid_sizes: 매수 호가 가격·잔량 (가격 내림차순)
+        """
+        self.market = market
+        self.timestamp = timestamp
+        self.ask_prices = ask_prices
+        self.ask_sizes = ask_sizes
+        self.bid_prices = bid_prices
+        self.bid_sizes = bid_sizes
+
+        # 범위 잔량 조회용 누적합 (수량, 금액)
+        ask_cum = np.cumsum(np.column_stack([ask_sizes, ask_prices * ask_sizes]), axis=0)
+        bid_cum = np.cumsum(np.column_stack([bid_sizes, bid_prices * bid_sizes]), axis=0)
+        self.ask_cum_sizes, self.ask_cum_values = ask_cum[:, 0], ask_cum[:, 1]
+        self.bid_cum_sizes, self.bid_cum_values = bid_cum[:, 0], bid_cum[:, 1]
+
+        for array in (self.ask_prices, self.ask_sizes, self.bid_prices, self.bid_sizes, ask_cum, bid_cum):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_upbit(cls, message: Dict[str, Any]) -> 'OrderBookSnapshot':
+        """
+        업비트 호가 메시지로 스냅샷 생성
+
+        WebSocket DEFAULT/SIMPLE 형식과 REST /v1/orderbook 응답 항목을 모두 지원합니다.
+        잔량이 0인 단계는 제외합니다.
+        """
+        market = message.get('code') or message.get('market') or message.get('cd') or ''
+        timestamp = message.get('timestamp') or message.get('tms') or 0
+
+        if 'orderbook_units' in message:
+            units = message['orderbook_units']
+            ap, az, bp, bz = 'ask_price', 'ask_size', 'bid_price', 'bid_size'
+        else:
+            units = message.get('obu') or []
+            ap, az, bp, bz = 'ap', 'as', 'bp', 'bs'
+
+        levels = np.array([(u[ap], u[az], u[bp], u[bz]) for u in units], dtype=float).reshape(-1, 4)
+
+        asks = levels[levels[:, 1] > 0, :2]
+        bids = levels[levels[:, 3] > 0, 2:]
+
+        # 업비트는 최우선 호가부터 보내므로 순서가 어긋난 경우에만 정렬
+        if len(asks) > 1 and (asks[1:, 0] < asks[:-1, 0]).any():
+            asks = asks[np.argsort(asks[:, 0], kind='stable')]
+        if len(bids) > 1 and (bids[1:, 0] > bids[:-1, 0]).any():
+            bids = bids[np.argsort(-bids[:, 0], kind='stable')]
+
+        return cls(market, timestamp, asks[:, 0], asks[:, 1], bids[:, 0], bids[:, 1])
+
+    # ==================== 최우선 호가 ====================
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        """최우선 매도 호가"""
+        return float(self.ask_prices[0]) if len(self.ask_prices) else None
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        """최우선 매수 호가"""
+        return float(self.bid_prices[0]) if len(self.bid_prices) else None
+
+    @property
+    def spread(self) -> Optional[float]:
+        """매도·매수 최우선 호가 차이"""
+        if not len(self.ask_prices) or not len(self.bid_prices):
+            return None
+        return float(self.ask_prices[0] - self.bid_prices[0])
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        """중간가"""
+        if not len(self.ask_prices) or not len(self.bid_prices):
+            return None
+        return float(self.ask_prices[0] + self.bid_prices[0]) / 2
+
+    @property
+    def microprice(self) -> Optional[float]:
+        """
+        마이크로프라이스 (최우선 잔량 가중 중간가)
+
+        매수 잔량이 많을수록 매도 호가 쪽으로 치우칩니다.
+        """
+        if not len(self.ask_prices) or not len(self.bid_prices):
+            return None
+        ask, bid = self.ask_prices[0], self.bid_prices[0]
+        ask_size, bid_size = self.ask_sizes[0], self.bid_sizes[0]
+        return float((bid * ask_size + ask * bid_size) / (ask_size + bid_size))
+
+    # ==================== 잔량 조회 ====================
+
+    def depth_at_bps(self, bps: float, side: str = 'both', notional: bool = False) -> Any:
+        """
+        중간가 기준 bps 이내 누적 잔량
+
+        Args:
+            bps (float): 중간가 대비 범위 (1bp = 0.01%)
+            side (str): 'ask', 'bid', 'both'
+            notional (bool): True면 원화 금액, False면 수량
+
+        Returns:
+            float 또는 {'ask': ..., 'bid': ...} (side='both')
+        """
+        mid = self.mid_price
+        if mid is None:
+            mid = self.best_ask or self.best_bid
+        if mid is None:
+            return {'ask': 0.0, 'bid': 0.0} if side == 'both' else 0.0
+
+        ask_cum = self.ask_cum_values if notional else self.ask_cum_sizes
+        bid_cum = self.bid_cum_values if notional else self.bid_cum_sizes
+
+        ask_count = int(np.searchsorted(self.ask_prices, mid * (1 + bps / 10000), side='right'))
+        bid_count = int(np.searchsorted(-self.bid_prices, -mid * (1 - bps / 10000), side='right'))
+
+        depth = {
+            'ask': float(ask_cum[ask_count - 1]) if ask_count else 0.0,
+            'bid': float(bid_cum[bid_count - 1]) if bid_count else 0.0
+        }
+        return depth if side == 'both' else depth[side]
+
+    def depth_at_levels(self, levels: int, notional: bool = False) -> Dict[str, float]:
+        """상위 levels 단계까지의 누적 잔량"""
+        ask_cum = self.ask_cum_values if notional else self.ask_cum_sizes
+        bid_cum = self.bid_cum_values if notional else self.bid_cum_sizes
+        ask_count = min(levels, len(ask_cum))
+        bid_count = min(levels, len(bid_cum))
+        return {
+            'ask': float(ask_cum[ask_count - 1]) if ask_count else 0.0,
+            'bid': float(bid_cum[bid_count - 1]) if bid_count else 0.0
+        }
+
+    def imbalance(self, levels: Optional[int] = None, bps: Optional[float] = None) -> float:
+        """
+        매수·매도 잔량 불균형 (-1 ~ 1, 양수면 매수 우위)
+
+        Args:
+            levels (int): 상위 단계 수 (None이면 전체)
+            bps (float): 지정하면 중간가 기준 bps 이내 잔량으로 계산
+        """
+        if bps is not None:
+            depth = self.depth_at_bps(bps)
+        else:
+            depth = self.depth_at_levels(levels or max(len(self.ask_sizes), len(self.bid_sizes)))
+
+        total = depth['bid'] + depth['ask']
+        return (depth['bid'] - depth['ask']) / total if total > 0 else 0.0
+
+    # ==================== 스냅샷/변경분 ====================
+
+    def diff(self, previous: Optional['OrderBookSnapshot']) -> List[Tuple[str, float, float]]:
+        """
+        이전 스냅샷 대비 변경된 호가 단계
+
+        Returns:
+            List[Tuple]: (side, price, new_size) 목록. new_size가 0이면 사라진 단계
+        """
+        changes = []
+        for side, prices, sizes, prev_prices, prev_sizes in (
+            ('ask', self.ask_prices, self.ask_sizes,
+             previous.ask_prices if previous else np.empty(0), previous.ask_sizes if previous else np.empty(0)),
+            ('bid', self.bid_prices, self.bid_sizes,
+             previous.bid_prices if previous else np.empty(0), previous.bid_sizes if previous else np.empty(0))
+        ):
+            current = dict(zip(prices.tolist(), sizes.tolist()))
+            before = dict(zip(prev_prices.tolist(), prev_sizes.tolist()))
+
+            for price, size in current.items():
+                if before.get(price) != size:
+                    changes.append((side, price, size))
+            for price in before.keys() - current.keys():
+                changes.append((side, price, 0.0))
+
+        return changes
+
+    def to_upbit(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        """
+        업비트 REST /v1/orderbook 응답 항목 형식으로 변환
+
+        매도·매수 단계 수가 다르면 짧은 쪽은 0으로 채웁니다.
+        """
+        asks = min(depth or len(self.ask_prices), len(self.ask_prices))
+        bids = min(depth or len(self.bid_prices), len(self.bid_prices))
+
+        units = []
+        for i in range(max(asks, bids)):
+            units.append({
+                'ask_price': float(self.ask_prices[i]) if i < asks else 0.0,
+                'bid_price': float(self.bid_prices[i]) if i < bids else 0.0,
+                'ask_size': float(self.ask_sizes[i]) if i < asks else 0.0,
+                'bid_size': float(self.bid_sizes[i]) if i < bids else 0.0
+            })
+
+        return {
+            'market': self.market,
+            'timestamp': self.timestamp,
+            'total_ask_size': float(self.ask_cum_sizes[-1]) if len(self.ask_cum_sizes) else 0.0,
+            'total_bid_size': float(self.bid_cum_sizes[-1]) if len(self.bid_cum_sizes) else 0.0,
+            'orderbook_units': units
+        }
+
+
+class OrderBook:
+    """
+    마켓별 실시간 오더북
+
+    update()로 새 호가 메시지를 적용하고, 조회는 현재 스냅샷에 위임합니다.
+    여러 값을 함께 읽을 때는 snapshot()으로 한 번 받아서 사용하면
+    중간에 갱신이 일어나도 같은 시점의 값을 얻을 수 있습니다.
+    """
+
+    def __init__(self, market: str):
+        """
+        초기화
+
+        Args:
+            market (str): 마켓 코드
+        """
+        self.market = market
+        self.current = OrderBookSnapshot.from_upbit({'code': market})
+        self.updated_at = 0.0
+        self.update_count = 0
+
+    def update(self, message: Dict[str, Any]) -> OrderBookSnapshot:
+        """
+        호가 메시지 적용 (전체 단계 교체)
+
+        Returns:
+            OrderBookSnapshot: 적용 후 스냅샷
+        """
+        snapshot = OrderBookSnapshot.from_upbit(message)
+        snapshot.market = snapshot.market or self.market
+
+        self.current = snapshot
+        self.updated_at = time.time()
+        self.update_count += 1
+        return snapshot
+
+    def snapshot(self) -> OrderBookSnapshot:
+        """현재 스냅샷 (불변, 복사 없음)"""
+        return self.current
+
+    def age(self) -> float:
+        """마지막 갱신 후 경과 시간 (초, 갱신된 적 없으면 inf)"""
+        return time.time() - self.updated_at if self.update_count else float('inf')
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.current.best_bid
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.current.best_ask
+
+    @property
+    def spread(self) -> Optional[float]:
+        return self.current.spread
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        return self.current.mid_price
+
+    @property
+    def microprice(self) -> Optional[float]:
+        return self.current.microprice
+
+    def depth_at_bps(self, bps: float, side: str = 'both', notional: bool = False) -> Any:
+        return self.current.depth_at_bps(bps, side, notional)
+
+    def imbalance(self, levels: Optional[int] = None, bps: Optional[float] = None) -> float:
+        return self.current.imbalance(levels, bps)
+
+    def diff(self, previous: Optional[OrderBookSnapshot]) -> List[Tuple[str, float, float]]:
+        return self.current.diff(previous)
+
+
+class OrderBookManager:
+    """
+    여러 마켓의 오더북 관리
+
+    수집기의 호가 처리 함수나 OrderBookFeed가 update()를 호출하고,
+    전략·MCP 서버는 get()으로 오더북을 읽습니다.
+    """
+
+    def __init__(self):
+        """초기화"""
+        self.books: Dict[str, OrderBook] = {}
+        self.lock = threading.Lock()
+
+    def update(self, message: Dict[str, Any]) -> Optional[OrderBookSnapshot]:
+        """호가 메시지를 해당 마켓 오더북에 적용"""
+        market = message.get('code') or message.get('market') or message.get('cd')
+        if not market:
+            return None
+        return self._get_or_create(market).update(message)
+
+    def get(self, market: str, max_age: Optional[float] = None) -> Optional[OrderBook]:
+        """
+        마켓 오더북 조회
+
+        Args:
+            market (str): 마켓 코드
+            max_age (float): 지정하면 마지막 갱신이 이보다 오래된 오더북은 None
+
+        Returns:
+            OrderBook 또는 None (없거나 오래됨)
+        """
+        book = self.books.get(market)
+        if book is None or book.update_count == 0:
+            return None
+        if max_age is not None and book.age() > max_age:
+            return None
+        return book
+
+    def markets(self) -> List[str]:
+        """오더북이 있는 마켓 목록"""
+        return list(self.books.keys())
+
+    def _get_or_create(self, market: str) -> OrderBook:
+        """오더북 조회 (없으면 생성)"""
+        book = self.books.get(market)
+        if book is None:
+            with self.lock:
+                book = self.books.setdefault(market, OrderBook(market))
+        return book
+
+
+class OrderBookFeed:
+    """
+    WebSocket 호가 구독으로 OrderBookManager 갱신
+
+    백그라운드 스레드에서 연결을 유지하며(끊기면 재연결), add_markets()로
+    구독 마켓을 늘리면 같은 연결에서 구독 메시지를 다시 보냅니다.
+    """
+
+    def __init__(self, manager: Optional[OrderBookManager] = None,
+                 markets: Optional[List[str]] = None, reconnect_delay: int = 5):
+        """
+        초기화
+
+        Args:
+            manager (OrderBookManager): 갱신할 오더북 관리자 (None이면 새로 생성)
+            markets (List[str]): 처음 구독할 마켓 목록
+            reconnect_delay (int): 재연결 대기 시간 (초)
+        """
+        if not WEBSOCKET_AVAILABLE:
+            raise ImportError("websocket-client가 설치되지 않았습니다. pip install websocket-client")
+
+        self.manager = manager or OrderBookManager()
+        self.markets = list(markets or [])
+        self.reconnect_delay = reconnect_delay
+        self.ws = None
+        self.thread = None
+        self.is_connected = False
+        self.lock = threading.Lock()
+        self.pipeline = MessagePipeline(dispatch=self._dispatch)
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """구독 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.thread is not None:
+            return
+
+        self.pipeline.start()
+        self.ws = websocket.WebSocketApp(
+            UPBIT_WEBSOCKET_URL,
+            on_message=lambda ws, message: self.pipeline.submit(message),
+            on_open=self._on_open,
+            on_error=lambda ws, error: self.logger.error(f"호가 WebSocket 오류: {error}"),
+            on_close=self._on_close
+        )
+        self.thread = threading.Thread(
+            target=self.ws.run_forever, kwargs={'reconnect': self.reconnect_delay},
+            name='OrderBookFeed', daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """구독 종료"""
+        if self.ws is not None:
+            self.ws.close()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.pipeline.stop(drain=False)
+        self.thread = None
+        self.ws = None
+
+    def add_markets(self, markets: List[str]):
+        """구독 마켓 추가 (연결 중이면 즉시 재구독)"""
+        with self.lock:
+            new_markets = [m for m in markets if m not in self.markets]
+            if not new_markets:
+                return
+            self.markets.extend(new_markets)
+
+        if self.is_connected:
+            self._subscribe()
+
+    def _on_open(self, ws):
+        """연결 시 구독 메시지 전송"""
+        self.is_connected = True
+        self.logger.info(f"호가 구독 시작: {self.markets}")
+        self._subscribe()
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        """연결 종료 처리 (run_forever가 재연결)"""
+        self.is_connected = False
+        self.logger.info(f"호가 WebSocket 연결 종료: {close_status_code} - {close_msg}")
+
+    def _subscribe(self):
+        """현재 마켓 목록으로 호가 구독 (업비트는 마지막 구독 요청으로 대체)"""
+        with self.lock:
+            if not self.markets:
+                return
+            message = [
+                {"ticket": f"orderbook_{int(time.time())}"},
+                {"type": "orderbook", "codes": list(self.markets)}
+            ]
+        try:
+            self.ws.send(json.dumps(message))
+        except Exception as e:
+            self.logger.error(f"호가 구독 메시지 전송 실패: {e}")
+
+    def _dispatch(self, messages: List[tuple]):
+        """디코딩된 호가 메시지를 오더북에 적용"""
+        for _, data in messages:
+            if isinstance(data, dict) and data.get('type', data.get('ty')) == 'orderbook':
+                self.manager.update(data)
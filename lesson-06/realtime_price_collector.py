@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Optional, Callable
 import signal
 import sys
 
+from message_pipeline import MessagePipeline
+
 class UpbitWebSocketCollector:
     """
     업비트 WebSocket을 사용한 실시간 가격 데이터 수집기
@@ -23,11 +25,14 @@ class UpbitWebSocketCollector:
     - 데이터 파일 저장 (CSV, JSON)
     - 오류 처리 및 로깅
     - 사용자 정의 콜백 함수 지원
+    - 소켓 스레드와 분리된 메시지 디코딩 (링 버퍼 + 디코더 스레드)
     """
     
     def __init__(self, markets: List[str] = None, 
                  data_dir: str = "data", 
-                 save_format: str = "csv"):
+                 save_format: str = "csv",
+                 queue_capacity: int = 10000,
+                 decode_in_process: bool = False):
         """
         초기화
         
@@ -35,6 +40,8 @@ class UpbitWebSocketCollector:
             markets (List[str]): 수집할 마켓 코드 리스트
             data_dir (str): 데이터 저장 디렉토리
             save_format (str): 저장 형식 (csv, json)
+            queue_capacity (int): 수신 메시지 링 버퍼 크기 (가득 차면 오래된 메시지부터 버림)
+            decode_in_process (bool): JSON 파싱을 별도 프로세스에서 수행
         """
         self.markets = markets or ['KRW-BTC', 'KRW-ETH', 'KRW-XRP']
         self.data_dir = data_dir
@@ -58,6 +65,13 @@ class UpbitWebSocketCollector:
         # 로깅 설정
         self.setup_logging()
         
+        # 메시지 디코딩 파이프라인 (파싱·콜백·저장은 디코더 스레드에서 처리)
+        self.pipeline = MessagePipeline(
+            dispatch=self.dispatch_messages,
+            capacity=queue_capacity,
+            decode_in_process=decode_in_process
+        )
+        
         # 데이터 디렉토리 생성
         self.create_data_directory()
         
@@ -112,22 +126,23 @@ class UpbitWebSocketCollector:
         self.on_connect_callback = on_connect
     
     def on_message(self, ws, message):
-        """WebSocket 메시지 수신 처리"""
-        try:
-            data = json.loads(message)
-            
-            # 티커 데이터 처리 (업비트 WebSocket 형식)
-            if isinstance(data, dict) and data.get('ty') == 'ticker':
-                self.process_ticker_data(data)
-            else:
-                # 디버깅용 로그 (너무 많은 로그를 방지하기 위해 주석 처리)
-                # self.logger.debug(f"수신된 메시지: {data}")
-                pass
-            
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON 파싱 오류: {e}")
-        except Exception as e:
-            self.logger.error(f"메시지 처리 오류: {e}")
+        """WebSocket 메시지 수신 처리 (원본 메시지를 디코딩 파이프라인에 넣기만 함)"""
+        self.pipeline.submit(message)
+    
+    def dispatch_messages(self, messages: List[tuple]):
+        """디코딩된 메시지 배치 처리 (디코더 스레드에서 호출)"""
+        for _, data in messages:
+            try:
+                # 티커 데이터 처리 (업비트 WebSocket 형식)
+                if isinstance(data, dict) and data.get('ty') == 'ticker':
+                    self.process_ticker_data(data)
+                else:
+                    # 디버깅용 로그 (너무 많은 로그를 방지하기 위해 주석 처리)
+                    # self.logger.debug(f"수신된 메시지: {data}")
+                    pass
+                
+            except Exception as e:
+                self.logger.error(f"메시지 처리 오류: {e}")
     
     def process_ticker_data(self, data: Dict[str, Any]):
         """티커 데이터 처리"""
@@ -156,8 +171,8 @@ class UpbitWebSocketCollector:
             # 버퍼에 추가
             self.data_buffer.append(ticker_data)
             
-            # 로그 출력
-            self.logger.info(
+            # 로그 출력 (틱마다 출력하므로 DEBUG 레벨)
+            self.logger.debug(
                 f"{ticker_data['market']}: {ticker_data['trade_price']:,}원 "
                 f"({ticker_data['signed_change_rate']:.2%})"
             )
@@ -250,6 +265,7 @@ class UpbitWebSocketCollector:
         self.logger.info(f"데이터 저장 디렉토리: {self.data_dir}")
         
         self.is_running = True
+        self.pipeline.start()
         self.connect()
     
     def stop(self):
@@ -260,7 +276,8 @@ class UpbitWebSocketCollector:
         if self.ws:
             self.ws.close()
         
-        # 남은 데이터 저장
+        # 수신한 메시지를 모두 처리한 뒤 남은 데이터 저장
+        self.pipeline.stop()
         if self.data_buffer:
             self.save_data()
         
@@ -327,7 +344,8 @@ class UpbitWebSocketCollector:
             'buffer_size': len(self.data_buffer),
             'reconnect_attempts': self.reconnect_attempts,
             'data_dir': self.data_dir,
-            'save_format': self.save_format
+            'save_format': self.save_format,
+            'pipeline': self.pipeline.get_statistics()
         }
 
 # 사용 예시 및 테스트 함수
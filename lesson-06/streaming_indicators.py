@@ -0,0 +1,708 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 기술적 지표
+
+봉 하나가 들어올 때마다 상수 시간에 값을 갱신하는 지표 객체 모음입니다.
+실시간 봇이 매 틱마다 100개 봉 전체로 이동평균·RSI 등을 다시 계산하지 않아도 됩니다.
+
+각 지표 객체는 다음 인터페이스를 가집니다.
+- update(...): 마감된 봉 반영 후 현재 값 반환 (워밍업 중에는 NaN)
+- peek(...): 진행 중인 봉이 지금 값으로 마감된다고 가정한 값 (상태는 바꾸지 않음)
+- prime(...): 과거 데이터로 상태 초기화
+- batch(...): 같은 지표를 pandas로 한 번에 계산 (정적 메서드, 스트리밍 결과와 일치)
+
+batch 결과는 각 차시의 기존 pandas 계산식과 같습니다.
+- 이동평균·표준편차·최고/최저: rolling(window=period) (표준편차는 ddof=1)
+- EMA: ewm(span=span).mean() (adjust=True)
+- RSI 'sma': 상승/하락폭의 rolling 평균 (첫 봉의 변화량은 0으로 취급),
+  'wilder': 첫 period개 평균으로 시작하는 와일더 평활
+- ATR 'sma': True Range의 rolling 평균 (첫 봉의 TR은 고가-저가), 'wilder': 와일더 평활
+- OBV: 첫 봉 0에서 시작하는 누적합
+
+롤링 최고/최저는 단조 덱(monotonic deque)으로 상각 O(1)이며,
+누적합 방식의 지표는 오차가 쌓이지 않도록 일정 횟수마다 창 전체로 다시 계산합니다.
+"""
+
+import math
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+
+# 누적 오차를 없애기 위해 창 전체로 다시 계산하는 주기 (갱신 횟수)
+RESYNC_INTERVAL = 1000
+
+# 분산이 평균² × 이 값 이하이면 반올림 오차로 보고 0으로 처리 (값이 모두 같은 창)
+VARIANCE_EPSILON = 1e-12
+
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+
+class SMA:
+    """
+    단순 이동평균
+
+    입력에 NaN이 있으면 그 값이 창 안에 있는 동안 NaN을 반환합니다 (pandas rolling과 동일).
+    """
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError(f"기간은 1 이상이어야 합니다: {period}")
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.window = deque()
+        self.total = 0.0
+        self.nan_count = 0
+        self.updates = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period and self.nan_count == 0
+
+    def update(self, x: float) -> float:
+        """값 추가"""
+        x = float(x)
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            if _is_nan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+
+        self.window.append(x)
+        if _is_nan(x):
+            self.nan_count += 1
+        else:
+            self.total += x
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            self.total = math.fsum(v for v in self.window if not _is_nan(v))
+
+        self.value = self.total / self.period if self.ready else NAN
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """x가 다음 값으로 들어온다고 가정한 이동평균"""
+        x = float(x)
+        total, nan_count, size = self.total, self.nan_count, len(self.window)
+        if size == self.period:
+            old = self.window[0]
+            if _is_nan(old):
+                nan_count -= 1
+            else:
+                total -= old
+            size -= 1
+
+        if _is_nan(x) or nan_count or size + 1 < self.period:
+            return NAN
+        return (total + x) / self.period
+
+    def prime(self, values: Iterable[float]) -> float:
+        """과거 값으로 초기화"""
+        self.reset()
+        for x in values:
+            self.update(x)
+        return self.value
+
+    @staticmethod
+    def batch(series: pd.Series, period: int) -> pd.Series:
+        return series.rolling(window=period).mean()
+
+
+class RollingStd:
+    """
+    이동 표준편차 (창 단위 Welford 갱신, NaN 입력은 지원하지 않음)
+    """
+
+    def __init__(self, period: int, ddof: int = 1):
+        if period <= ddof:
+            raise ValueError(f"기간은 ddof보다 커야 합니다: {period}")
+        self.period = period
+        self.ddof = ddof
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.window = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return len(self.window) == self.period
+
+    def _next_state(self, x: float) -> Tuple[float, float, int]:
+        """x를 반영한 (평균, 편차제곱합, 개수)"""
+        n = len(self.window)
+        if n < self.period:
+            n += 1
+            delta = x - self.mean
+            mean = self.mean + delta / n
+            return mean, self.m2 + delta * (x - mean), n
+
+        old = self.window[0]
+        mean = self.mean + (x - old) / n
+        m2 = self.m2 + (x - old) * (x - mean + old - self.mean)
+        return mean, max(m2, 0.0), n
+
+    def update(self, x: float) -> float:
+        """값 추가"""
+        x = float(x)
+        self.mean, self.m2, n = self._next_state(x)
+        if len(self.window) == self.period:
+            self.window.popleft()
+        self.window.append(x)
+
+        self.updates += 1
+        if self.updates % RESYNC_INTERVAL == 0:
+            values = np.fromiter(self.window, dtype=float)
+            self.mean = float(values.mean())
+            self.m2 = float(((values - self.mean) ** 2).sum())
+
+        self.value = self._std(self.mean, self.m2, n)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """x가 다음 값으로 들어온다고 가정한 표준편차"""
+        mean, m2, n = self._next_state(float(x))
+        return self._std(mean, m2, n)
+
+    def _std(self, mean: float, m2: float, n: int) -> float:
+        """표준편차 (값이 모두 같은 창에서 남는 반올림 오차는 0으로)"""
+        if n != self.period:
+            return NAN
+        variance = m2 / (n - self.ddof)
+        if variance <= VARIANCE_EPSILON * mean * mean:
+            return 0.0
+        return math.sqrt(variance)
+
+    def prime(self, values: Iterable[float]) -> float:
+        """과거 값으로 초기화"""
+        self.reset()
+        for x in values:
+            self.update(x)
+        return self.value
+
+    @staticmethod
+    def batch(series: pd.Series, period: int, ddof: int = 1) -> pd.Series:
+        return series.rolling(window=period).std(ddof=ddof)
+
+
+class RollingMax:
+    """이동 최댓값 (단조 덱, 상각 O(1))"""
+
+    # 최솟값은 부호만 바꿔서 사용
+    sign = 1.0
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise ValueError(f"기간은 1 이상이어야 합니다: {period}")
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.candidates = deque()  # (순번, 부호 적용 값), 값 내림차순
+        self.count = 0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    def update(self, x: float) -> float:
+        """값 추가"""
+        x = self.sign * float(x)
+        while self.candidates and self.candidates[-1][1] <= x:
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        if self.candidates[0][0] <= self.count - self.period:
+            self.candidates.popleft()
+
+        self.count += 1
+        self.value = self.sign * self.candidates[0][1] if self.ready else NAN
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """x가 다음 값으로 들어온다고 가정한 최댓값"""
+        if self.count + 1 < self.period:
+            return NAN
+        x = self.sign * float(x)
+        best = x
+        for index, value in self.candidates:
+            if index > self.count - self.period:
+                best = max(value, x)
+                break
+        return self.sign * best
+
+    def prime(self, values: Iterable[float]) -> float:
+        """과거 값으로 초기화"""
+        self.reset()
+        for x in values:
+            self.update(x)
+        return self.value
+
+    @staticmethod
+    def batch(series: pd.Series, period: int) -> pd.Series:
+        return series.rolling(window=period).max()
+
+
+class RollingMin(RollingMax):
+    """이동 최솟값 (단조 덱, 상각 O(1))"""
+
+    sign = -1.0
+
+    @staticmethod
+    def batch(series: pd.Series, period: int) -> pd.Series:
+        return series.rolling(window=period).min()
+
+
+class EMA:
+    """
+    지수 이동평균
+
+    adjust=True는 pandas ewm(..., adjust=True)와 같은 가중 평균으로,
+    분자·분모를 각각 점화식으로 갱신합니다.
+    """
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None, adjust: bool = True):
+        if (span is None) == (alpha is None):
+            raise ValueError("span과 alpha 중 하나만 지정해야 합니다.")
+        self.span = span
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.adjust = adjust
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return not _is_nan(self.value)
+
+    def _next_value(self, x: float) -> Tuple[float, float, float]:
+        decay = 1.0 - self.alpha
+        if self.adjust:
+            numerator = x + decay * self.numerator
+            denominator = 1.0 + decay * self.denominator
+            return numerator, denominator, numerator / denominator
+        value = x if _is_nan(self.value) else decay * self.value + self.alpha * x
+        return 0.0, 0.0, value
+
+    def update(self, x: float) -> float:
+        """값 추가"""
+        self.numerator, self.denominator, self.value = self._next_value(float(x))
+        return self.value
+
+    def peek(self, x: float) -> float:
+        """x가 다음 값으로 들어온다고 가정한 EMA"""
+        return self._next_value(float(x))[2]
+
+    def prime(self, values: Iterable[float]) -> float:
+        """과거 값으로 초기화"""
+        self.reset()
+        for x in values:
+            self.update(x)
+        return self.value
+
+    @staticmethod
+    def batch(series: pd.Series, span: Optional[float] = None, alpha: Optional[float] = None,
+              adjust: bool = True) -> pd.Series:
+        if span is not None:
+            return series.ewm(span=span, adjust=adjust).mean()
+        return series.ewm(alpha=alpha, adjust=adjust).mean()
+
+
+class _WilderAverage:
+    """와일더 평활 (첫 period개 단순 평균으로 시작, 이후 (이전*(n-1) + x) / n)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+
+    def _next_value(self, x: float) -> Tuple[int, float, float]:
+        count = self.count + 1
+        if count < self.period:
+            return count, self.total + x, NAN
+        if count == self.period:
+            return count, self.total + x, (self.total + x) / self.period
+        return count, self.total, (self.value * (self.period - 1) + x) / self.period
+
+    def update(self, x: float) -> float:
+        self.count, self.total, self.value = self._next_value(x)
+        return self.value
+
+    def peek(self, x: float) -> float:
+        return self._next_value(x)[2]
+
+    @staticmethod
+    def batch(series: pd.Series, period: int) -> pd.Series:
+        """첫 유효값부터 period개 평균을 시작값으로 하는 와일더 평활"""
+        values = series.to_numpy(dtype=float)
+        start = int(np.argmax(~np.isnan(values))) if (~np.isnan(values)).any() else len(values)
+        seeded = np.full(len(values), np.nan)
+        seed_index = start + period - 1
+        if seed_index < len(values):
+            seeded[seed_index] = values[start:seed_index + 1].mean()
+            seeded[seed_index + 1:] = values[seed_index + 1:]
+        return pd.Series(seeded, index=series.index).ewm(alpha=1.0 / period, adjust=False).mean()
+
+
+def _rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """평균 상승/하락폭으로 RSI 계산 (pandas 계산식과 같이 0/0은 NaN)"""
+    if _is_nan(avg_gain) or _is_nan(avg_loss):
+        return NAN
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else NAN
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class RSI:
+    """
+    RSI
+
+    method='sma': 상승/하락폭의 단순 이동평균 (기존 pandas 계산과 동일)
+    method='wilder': 와일더 평활
+    """
+
+    def __init__(self, period: int = 14, method: str = 'sma'):
+        if method not in ('sma', 'wilder'):
+            raise ValueError(f"지원하지 않는 RSI 방식: {method}")
+        self.period = period
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        if self.method == 'sma':
+            self.gain_avg, self.loss_avg = SMA(self.period), SMA(self.period)
+        else:
+            self.gain_avg, self.loss_avg = _WilderAverage(self.period), _WilderAverage(self.period)
+        self.prev_close = None
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return not _is_nan(self.value)
+
+    def _changes(self, close: float) -> Optional[Tuple[float, float]]:
+        """(상승폭, 하락폭), 'wilder'는 첫 봉에 변화량이 없으므로 None"""
+        if self.prev_close is None:
+            return (0.0, 0.0) if self.method == 'sma' else None
+        delta = close - self.prev_close
+        return (delta, 0.0) if delta > 0 else (0.0, -delta)
+
+    def update(self, close: float) -> float:
+        """종가 추가"""
+        close = float(close)
+        changes = self._changes(close)
+        self.prev_close = close
+        if changes is None:
+            return self.value
+
+        self.value = _rsi_from_averages(self.gain_avg.update(changes[0]), self.loss_avg.update(changes[1]))
+        return self.value
+
+    def peek(self, close: float) -> float:
+        """close가 다음 종가라고 가정한 RSI"""
+        changes = self._changes(float(close))
+        if changes is None:
+            return NAN
+        return _rsi_from_averages(self.gain_avg.peek(changes[0]), self.loss_avg.peek(changes[1]))
+
+    def prime(self, closes: Iterable[float]) -> float:
+        """과거 종가로 초기화"""
+        self.reset()
+        for close in closes:
+            self.update(close)
+        return self.value
+
+    @staticmethod
+    def batch(prices: pd.Series, period: int = 14, method: str = 'sma') -> pd.Series:
+        delta = prices.diff()
+        if method == 'wilder':
+            gain = _WilderAverage.batch(delta.clip(lower=0), period)
+            loss = _WilderAverage.batch((-delta).clip(lower=0), period)
+        else:
+            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+
+class MACD:
+    """MACD (EMA는 pandas ewm(span=...)과 같은 adjust=True)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.ema_fast = EMA(span=self.fast)
+        self.ema_slow = EMA(span=self.slow)
+        self.ema_signal = EMA(span=self.signal)
+        self.value = (NAN, NAN, NAN)
+
+    @property
+    def ready(self) -> bool:
+        return not _is_nan(self.value[0])
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """종가 추가, (macd, signal, histogram) 반환"""
+        macd = self.ema_fast.update(close) - self.ema_slow.update(close)
+        signal = self.ema_signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def peek(self, close: float) -> Tuple[float, float, float]:
+        """close가 다음 종가라고 가정한 (macd, signal, histogram)"""
+        macd = self.ema_fast.peek(close) - self.ema_slow.peek(close)
+        signal = self.ema_signal.peek(macd)
+        return macd, signal, macd - signal
+
+    def prime(self, closes: Iterable[float]) -> Tuple[float, float, float]:
+        """과거 종가로 초기화"""
+        self.reset()
+        for close in closes:
+            self.update(close)
+        return self.value
+
+    @staticmethod
+    def batch(prices: pd.Series, fast: int = 12, slow: int = 26,
+              signal: int = 9) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        ema_fast = prices.ewm(span=fast).mean()
+        ema_slow = prices.ewm(span=slow).mean()
+        macd = ema_fast - ema_slow
+        macd_signal = macd.ewm(span=signal).mean()
+        return macd, macd_signal, macd - macd_signal
+
+
+class BollingerBands:
+    """볼린저 밴드 (중심선, 상단, 하단)"""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.period = period
+        self.num_std = num_std
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.middle = SMA(self.period)
+        self.std = RollingStd(self.period)
+        self.value = (NAN, NAN, NAN)
+
+    @property
+    def ready(self) -> bool:
+        return self.std.ready
+
+    def _bands(self, middle: float, std: float) -> Tuple[float, float, float]:
+        return middle, middle + std * self.num_std, middle - std * self.num_std
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """종가 추가, (middle, upper, lower) 반환"""
+        self.value = self._bands(self.middle.update(close), self.std.update(close))
+        return self.value
+
+    def peek(self, close: float) -> Tuple[float, float, float]:
+        """close가 다음 종가라고 가정한 (middle, upper, lower)"""
+        return self._bands(self.middle.peek(close), self.std.peek(close))
+
+    def prime(self, closes: Iterable[float]) -> Tuple[float, float, float]:
+        """과거 종가로 초기화"""
+        self.reset()
+        for close in closes:
+            self.update(close)
+        return self.value
+
+    @staticmethod
+    def batch(prices: pd.Series, period: int = 20,
+              num_std: float = 2.0) -> Tuple[pd.Series, pd.Series, pd.Series]:
+        middle = prices.rolling(window=period).mean()
+        std_dev = prices.rolling(window=period).std()
+        return middle, middle + (std_dev * num_std), middle - (std_dev * num_std)
+
+
+class ATR:
+    """
+    ATR
+
+    method='sma': True Range의 단순 이동평균 (기존 pandas 계산과 동일)
+    method='wilder': 와일더 평활
+    """
+
+    def __init__(self, period: int = 14, method: str = 'sma'):
+        if method not in ('sma', 'wilder'):
+            raise ValueError(f"지원하지 않는 ATR 방식: {method}")
+        self.period = period
+        self.method = method
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.average = SMA(self.period) if self.method == 'sma' else _WilderAverage(self.period)
+        self.prev_close = None
+        self.value = NAN
+
+    @property
+    def ready(self) -> bool:
+        return not _is_nan(self.value)
+
+    def _true_range(self, high: float, low: float) -> float:
+        if self.prev_close is None:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """봉 추가"""
+        self.value = self.average.update(self._true_range(float(high), float(low)))
+        self.prev_close = float(close)
+        return self.value
+
+    def peek(self, high: float, low: float, close: float = None) -> float:
+        """진행 중인 봉이 지금 고가·저가로 마감된다고 가정한 ATR"""
+        return self.average.peek(self._true_range(float(high), float(low)))
+
+    def prime(self, highs: Iterable[float], lows: Iterable[float], closes: Iterable[float]) -> float:
+        """과거 봉으로 초기화"""
+        self.reset()
+        for high, low, close in zip(highs, lows, closes):
+            self.update(high, low, close)
+        return self.value
+
+    @staticmethod
+    def batch(df: pd.DataFrame, period: int = 14, method: str = 'sma') -> pd.Series:
+        high_low = df['high'] - df['low']
+        high_close = np.abs(df['high'] - df['close'].shift())
+        low_close = np.abs(df['low'] - df['close'].shift())
+
+        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+        if method == 'wilder':
+            return _WilderAverage.batch(tr, period)
+        return tr.rolling(window=period).mean()
+
+
+class Stochastic:
+    """스토캐스틱 (%K, %D)"""
+
+    def __init__(self, period: int = 14, smooth_k: int = 3, smooth_d: int = 3):
+        self.period = period
+        self.smooth_k = smooth_k
+        self.smooth_d = smooth_d
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.highest = RollingMax(self.period)
+        self.lowest = RollingMin(self.period)
+        self.k = SMA(self.smooth_k)
+        self.d = SMA(self.smooth_d)
+        self.value = (NAN, NAN)
+
+    @property
+    def ready(self) -> bool:
+        return not _is_nan(self.value[1])
+
+    @staticmethod
+    def _raw(close: float, highest: float, lowest: float) -> float:
+        if _is_nan(highest) or _is_nan(lowest) or highest == lowest:
+            return NAN
+        return 100.0 * (close - lowest) / (highest - lowest)
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        """봉 추가, (%K, %D) 반환"""
+        raw = self._raw(float(close), self.highest.update(high), self.lowest.update(low))
+        k = self.k.update(raw)
+        self.value = (k, self.d.update(k))
+        return self.value
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        """진행 중인 봉이 지금 값으로 마감된다고 가정한 (%K, %D)"""
+        raw = self._raw(float(close), self.highest.peek(high), self.lowest.peek(low))
+        k = self.k.peek(raw)
+        return k, self.d.peek(k)
+
+    def prime(self, highs: Iterable[float], lows: Iterable[float], closes: Iterable[float]) -> Tuple[float, float]:
+        """과거 봉으로 초기화"""
+        self.reset()
+        for high, low, close in zip(highs, lows, closes):
+            self.update(high, low, close)
+        return self.value
+
+    @staticmethod
+    def batch(df: pd.DataFrame, period: int = 14, smooth_k: int = 3,
+              smooth_d: int = 3) -> Tuple[pd.Series, pd.Series]:
+        lowest_low = df['low'].rolling(window=period).min()
+        highest_high = df['high'].rolling(window=period).max()
+
+        stoch = 100 * (df['close'] - lowest_low) / (highest_high - lowest_low)
+        stoch_k = stoch.rolling(window=smooth_k).mean()
+        stoch_d = stoch_k.rolling(window=smooth_d).mean()
+        return stoch_k, stoch_d
+
+
+class OBV:
+    """OBV (On-Balance Volume)"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self.prev_close = None
+        self.value = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.prev_close is not None
+
+    def _next_value(self, close: float, volume: float) -> float:
+        if self.prev_close is None or close == self.prev_close:
+            return self.value
+        return self.value + (volume if close > self.prev_close else -volume)
+
+    def update(self, close: float, volume: float) -> float:
+        """봉 추가"""
+        close = float(close)
+        self.value = self._next_value(close, float(volume))
+        self.prev_close = close
+        return self.value
+
+    def peek(self, close: float, volume: float) -> float:
+        """진행 중인 봉이 지금 값으로 마감된다고 가정한 OBV"""
+        return self._next_value(float(close), float(volume))
+
+    def prime(self, closes: Iterable[float], volumes: Iterable[float]) -> float:
+        """과거 봉으로 초기화"""
+        self.reset()
+        for close, volume in zip(closes, volumes):
+            self.update(close, volume)
+        return self.value
+
+    @staticmethod
+    def batch(df: pd.DataFrame) -> pd.Series:
+        return (np.sign(df['close'].diff()) * df['volume']).fillna(0).cumsum()
@@ -0,0 +1,133 @@
+"""
+TickerBatcher 동작 테스트
+
+- 동시에 들어온 단일 마켓 요청이 하나의 /v1/ticker 요청으로 묶이는지
+- 잘못된 마켓으로 묶음이 거부되면 절반씩 나눠 해당 호출자에게만 오류를 돌려주는지
+- 일시적 오류는 나누지 않고 모든 호출자에게 전달하는지
+"""
+
+import threading
+import time
+
+import pytest
+
+from optimized_upbit_api import InvalidMarketError, OptimizedUpbitAPI, TickerBatcher
+
+
+class FakeTickerAPI:
+    """요청 기록을 남기는 가짜 /v1/ticker"""
+
+    def __init__(self, invalid=(), error=None, delay=0.0):
+        self.invalid = set(invalid)
+        self.error = error
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, markets):
+        with self.lock:
+            self.requests.append(list(markets))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        if self.invalid & set(markets):
+            raise InvalidMarketError("API 오류: 404 - Code not found")
+        return [{'market': market, 'trade_price': 1.0} for market in markets]
+
+
+def get_concurrently(batcher, markets):
+    """여러 스레드에서 동시에 get() 호출 (마켓별 결과 또는 예외)"""
+    barrier = threading.Barrier(len(markets))
+    results = {}
+
+    def call(market):
+        barrier.wait()
+        try:
+            results[market] = batcher.get(market)
+        except Exception as e:
+            results[market] = e
+
+    threads = [threading.Thread(target=call, args=(market,)) for market in markets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_lone_call_does_not_wait_full_window():
+    """혼자 들어온 호출은 window 전체를 기다리지 않음"""
+    api = FakeTickerAPI()
+    batcher = TickerBatcher(api, window=0.5)
+
+    start = time.perf_counter()
+    assert batcher.get('KRW-BTC')['market'] == 'KRW-BTC'
+    assert time.perf_counter() - start < 0.25
+    assert api.requests == [['KRW-BTC']]
+
+
+def test_near_simultaneous_calls_are_batched():
+    """거의 동시에 들어온 호출은 한 번의 요청으로 묶임"""
+    api = FakeTickerAPI()
+    batcher = TickerBatcher(api, window=0.2, quiet=0.05)
+
+    results = get_concurrently(batcher, ['KRW-BTC', 'KRW-ETH'])
+
+    assert results['KRW-BTC']['market'] == 'KRW-BTC'
+    assert results['KRW-ETH']['market'] == 'KRW-ETH'
+    assert len(api.requests) == 1
+    assert sorted(api.requests[0]) == ['KRW-BTC', 'KRW-ETH']
+    assert batcher.batches == 1
+
+
+def test_invalid_market_is_isolated_by_bisection():
+    """잘못된 마켓 호출자만 오류를 받고 나머지는 결과를 받음"""
+    api = FakeTickerAPI()
+    batcher = TickerBatcher(api)
+    markets = [f'KRW-C{i}' for i in range(8)]
+    api.invalid = {'KRW-C5'}
+
+    batch = {'markets': markets, 'result': {}, 'errors': {}}
+    batcher._fetch(batch, markets)
+
+    assert set(batch['errors']) == {'KRW-C5'}
+    assert isinstance(batch['errors']['KRW-C5'], InvalidMarketError)
+    assert set(batch['result']) == set(markets) - {'KRW-C5'}
+    # 전체 1회 + 단계마다 2회 (log2(8) = 3단계)
+    assert len(api.requests) <= 1 + 2 * 3
+
+
+def test_invalid_market_error_reaches_only_its_caller():
+    """동시 호출 중 잘못된 마켓만 예외를 받음"""
+    api = FakeTickerAPI(invalid={'KRW-BAD'})
+    batcher = TickerBatcher(api, window=0.2, quiet=0.05)
+
+    results = get_concurrently(batcher, ['KRW-BTC', 'KRW-BAD', 'KRW-ETH'])
+
+    assert isinstance(results['KRW-BAD'], InvalidMarketError)
+    assert results['KRW-BTC']['market'] == 'KRW-BTC'
+    assert results['KRW-ETH']['market'] == 'KRW-ETH'
+
+
+def test_transient_error_is_not_split():
+    """요청 제한 같은 일시적 오류는 추가 요청 없이 모든 호출자에게 전달"""
+    error = ValueError("요청 제한 초과: 잠시 후 다시 시도하세요.")
+    api = FakeTickerAPI(error=error)
+    batcher = TickerBatcher(api, window=0.2, quiet=0.05)
+
+    results = get_concurrently(batcher, ['KRW-BTC', 'KRW-ETH', 'KRW-XRP'])
+
+    assert all(result is error for result in results.values())
+    assert len(api.requests) == 1
+    assert batcher.splits == 0
+
+
+@pytest.mark.parametrize('status, message, expected', [
+    (404, 'Code not found', True),
+    (400, 'invalid market', True),
+    (400, 'invalid parameter: count', False),
+    (500, 'Code not found', False),
+])
+def test_invalid_market_error_detection(status, message, expected):
+    """4xx 응답 중 마켓 코드 오류만 InvalidMarketError로 분류"""
+    assert OptimizedUpbitAPI._is_invalid_market_error(status, message) is expected
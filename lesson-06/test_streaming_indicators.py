@@ -0,0 +1,126 @@
+"""
+스트리밍 지표 일치 테스트
+
+- 봉마다 update()로 계산한 값이 batch() (pandas 기준 구현)와 같은지 확인
+- peek()이 같은 값으로 update()했을 때의 결과와 같은지 확인
+- 값이 모두 같은 구간의 표준편차가 정확히 0인지 확인
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_indicators import (
+    ATR, EMA, MACD, OBV, RSI, SMA, BollingerBands, RollingMax, RollingMin, RollingStd, Stochastic
+)
+
+
+RTOL = 1e-8
+
+
+@pytest.fixture(scope='module')
+def ohlcv():
+    rng = np.random.default_rng(42)
+    n = 600
+    close = 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    # 같은 종가가 이어지는 구간 (RSI 0/0, OBV 변화 없음, 표준편차 0)
+    close[300:330] = close[299]
+    spread = np.abs(rng.normal(0, 0.005, n)) * close
+    return pd.DataFrame({
+        'open': close,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(1, 100, n),
+    })
+
+
+def assert_series_close(streamed, expected):
+    np.testing.assert_allclose(np.asarray(streamed, dtype=float), expected.to_numpy(dtype=float),
+                               rtol=RTOL, atol=1e-6, equal_nan=True)
+
+
+def stream(indicator, *columns):
+    values = [indicator.update(*row) for row in zip(*columns)]
+    if values and isinstance(values[0], tuple):
+        return list(zip(*values))
+    return values
+
+
+@pytest.mark.parametrize('make, batch', [
+    (lambda: SMA(20), lambda s: SMA.batch(s, 20)),
+    (lambda: RollingStd(20), lambda s: RollingStd.batch(s, 20)),
+    (lambda: RollingStd(20, ddof=0), lambda s: RollingStd.batch(s, 20, ddof=0)),
+    (lambda: RollingMax(20), lambda s: RollingMax.batch(s, 20)),
+    (lambda: RollingMin(20), lambda s: RollingMin.batch(s, 20)),
+    (lambda: EMA(span=12), lambda s: EMA.batch(s, span=12)),
+    (lambda: EMA(span=12, adjust=False), lambda s: EMA.batch(s, span=12, adjust=False)),
+    (lambda: RSI(14), lambda s: RSI.batch(s, 14)),
+    (lambda: RSI(14, method='wilder'), lambda s: RSI.batch(s, 14, method='wilder')),
+])
+def test_single_series_indicators_match_batch(ohlcv, make, batch):
+    """종가 하나로 계산하는 지표"""
+    close = ohlcv['close']
+    assert_series_close(stream(make(), close), batch(close))
+
+
+def test_macd_matches_batch(ohlcv):
+    streamed = stream(MACD(), ohlcv['close'])
+    for values, expected in zip(streamed, MACD.batch(ohlcv['close'])):
+        assert_series_close(values, expected)
+
+
+def test_bollinger_bands_match_batch(ohlcv):
+    streamed = stream(BollingerBands(), ohlcv['close'])
+    for values, expected in zip(streamed, BollingerBands.batch(ohlcv['close'])):
+        assert_series_close(values, expected)
+
+
+@pytest.mark.parametrize('method', ['sma', 'wilder'])
+def test_atr_matches_batch(ohlcv, method):
+    streamed = stream(ATR(14, method=method), ohlcv['high'], ohlcv['low'], ohlcv['close'])
+    assert_series_close(streamed, ATR.batch(ohlcv, 14, method=method))
+
+
+def test_stochastic_matches_batch(ohlcv):
+    streamed = stream(Stochastic(), ohlcv['high'], ohlcv['low'], ohlcv['close'])
+    for values, expected in zip(streamed, Stochastic.batch(ohlcv)):
+        assert_series_close(values, expected)
+
+
+def test_obv_matches_batch(ohlcv):
+    streamed = stream(OBV(), ohlcv['close'], ohlcv['volume'])
+    assert_series_close(streamed, OBV.batch(ohlcv))
+
+
+@pytest.mark.parametrize('make, columns', [
+    (lambda: SMA(20), ['close']),
+    (lambda: RollingStd(20), ['close']),
+    (lambda: RollingMax(20), ['close']),
+    (lambda: EMA(span=12), ['close']),
+    (lambda: RSI(14, method='wilder'), ['close']),
+    (lambda: MACD(), ['close']),
+    (lambda: BollingerBands(), ['close']),
+    (lambda: ATR(14), ['high', 'low', 'close']),
+    (lambda: Stochastic(), ['high', 'low', 'close']),
+    (lambda: OBV(), ['close', 'volume']),
+])
+def test_peek_matches_next_update(ohlcv, make, columns):
+    """peek()은 상태를 바꾸지 않고 다음 update()와 같은 값을 돌려줌"""
+    indicator = make()
+    for row in ohlcv[columns].itertuples(index=False):
+        peeked = indicator.peek(*row)
+        np.testing.assert_equal(indicator.peek(*row), peeked)
+        np.testing.assert_equal(indicator.update(*row), peeked)
+
+
+def test_flat_window_std_is_zero(ohlcv):
+    """값이 모두 같은 구간의 표준편차는 부동소수점 잔차 없이 0"""
+    rolling_std = RollingStd(20)
+    bands = BollingerBands(20)
+    for close in ohlcv['close'].iloc[:330]:
+        std = rolling_std.update(close)
+        middle, upper, lower = bands.update(close)
+
+    assert std == 0.0
+    assert upper == lower == middle
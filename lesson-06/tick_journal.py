@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+업비트 실시간 틱 바이너리 저널
+
+WebSocket으로 받은 ticker/trade/orderbook 메시지를 메시지 종류별 고정 길이
+레코드로 디스크에 기록합니다. CSV처럼 문자열로 변환하지 않으므로 틱당 CPU와
+디스크 사용량이 크게 줄고, 읽을 때는 np.memmap으로 바로 구조화 배열을 얻습니다.
+
+저장 구조:
+    <root>/<종류>/<YYYY-MM-DD>.bin
+
+- 종류: 'ticker', 'trade', 'orderbook' (레코드 형식은 JOURNAL_DTYPES 참고)
+- 파일은 수신 시각의 한국 날짜 기준으로 하루 단위로 나뉩니다.
+- 기록은 별도 writer 스레드가 모아서 처리하므로 WebSocket 콜백 스레드는
+  메시지를 큐에 넣기만 합니다.
+- 시각 필드는 모두 UTC epoch 기준 정수값입니다
+  (timestamp·trade_timestamp: 밀리초, received_at: 나노초).
+"""
+
+import os
+import queue
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 업비트 WebSocket 호가는 최대 15단계
+ORDERBOOK_DEPTH = 15
+
+TICKER_DTYPE = np.dtype([
+    ('received_at', '<i8'),
+    ('timestamp', '<i8'),
+    ('trade_timestamp', '<i8'),
+    ('market', 'S16'),
+    ('trade_price', '<f8'),
+    ('trade_volume', '<f8'),
+    ('opening_price', '<f8'),
+    ('high_price', '<f8'),
+    ('low_price', '<f8'),
+    ('prev_closing_price', '<f8'),
+    ('change', 'S4'),
+    ('change_price', '<f8'),
+    ('change_rate', '<f8'),
+    ('signed_change_rate', '<f8'),
+    ('ask_bid', 'S3'),
+    ('acc_trade_volume', '<f8'),
+    ('acc_trade_price', '<f8'),
+    ('acc_trade_volume_24h', '<f8'),
+    ('acc_trade_price_24h', '<f8')
+])
+
+TRADE_DTYPE = np.dtype([
+    ('received_at', '<i8'),
+    ('timestamp', '<i8'),
+    ('trade_timestamp', '<i8'),
+    ('market', 'S16'),
+    ('trade_price', '<f8'),
+    ('trade_volume', '<f8'),
+    ('ask_bid', 'S3'),
+    ('prev_closing_price', '<f8'),
+    ('change', 'S4'),
+    ('change_price', '<f8'),
+    ('sequential_id', '<i8')
+])
+
+ORDERBOOK_DTYPE = np.dtype([
+    ('received_at', '<i8'),
+    ('timestamp', '<i8'),
+    ('market', 'S16'),
+    ('total_ask_size', '<f8'),
+    ('total_bid_size', '<f8'),
+    ('ask_price', '<f8', (ORDERBOOK_DEPTH,)),
+    ('ask_size', '<f8', (ORDERBOOK_DEPTH,)),
+    ('bid_price', '<f8', (ORDERBOOK_DEPTH,)),
+    ('bid_size', '<f8', (ORDERBOOK_DEPTH,))
+])
+
+JOURNAL_DTYPES = {
+    'ticker': TICKER_DTYPE,
+    'trade': TRADE_DTYPE,
+    'orderbook': ORDERBOOK_DTYPE
+}
+
+# 환경 변수로 저장 위치를 바꿀 수 있음
+DEFAULT_JOURNAL_DIR = os.environ.get(
+    'UPBIT_TICK_JOURNAL',
+    os.path.join(os.path.expanduser('~'), '.upbit_ticks')
+)
+
+# KST = UTC+9
+_KST_OFFSET_NS = 9 * 3600 * 10**9
+
+
+def _ticker_record(received_at: int, data: dict) -> tuple:
+    """ticker 메시지를 TICKER_DTYPE 레코드 튜플로 변환"""
+    return (
+        received_at,
+        data.get('timestamp') or 0,
+        data.get('trade_timestamp') or 0,
+        data.get('code') or '',
+        data.get('trade_price') or 0.0,
+        data.get('trade_volume') or 0.0,
+        data.get('opening_price') or 0.0,
+        data.get('high_price') or 0.0,
+        data.get('low_price') or 0.0,
+        data.get('prev_closing_price') or 0.0,
+        data.get('change') or '',
+        data.get('change_price') or 0.0,
+        data.get('change_rate') or 0.0,
+        data.get('signed_change_rate') or 0.0,
+        data.get('ask_bid') or '',
+        data.get('acc_trade_volume') or 0.0,
+        data.get('acc_trade_price') or 0.0,
+        data.get('acc_trade_volume_24h') or 0.0,
+        data.get('acc_trade_price_24h') or 0.0
+    )
+
+
+def _trade_record(received_at: int, data: dict) -> tuple:
+    """trade 메시지를 TRADE_DTYPE 레코드 튜플로 변환"""
+    return (
+        received_at,
+        data.get('timestamp') or 0,
+        data.get('trade_timestamp') or 0,
+        data.get('code') or '',
+        data.get('trade_price') or 0.0,
+        data.get('trade_volume') or 0.0,
+        data.get('ask_bid') or '',
+        data.get('prev_closing_price') or 0.0,
+        data.get('change') or '',
+        data.get('change_price') or 0.0,
+        data.get('sequential_id') or 0
+    )
+
+
+def _orderbook_record(received_at: int, data: dict) -> tuple:
+    """orderbook 메시지를 ORDERBOOK_DTYPE 레코드 튜플로 변환 (빈 호가 단계는 NaN)"""
+    levels = np.full((4, ORDERBOOK_DEPTH), np.nan)
+    units = (data.get('orderbook_units') or [])[:ORDERBOOK_DEPTH]
+    for i, unit in enumerate(units):
+        levels[0, i] = unit.get('ask_price', np.nan)
+        levels[1, i] = unit.get('ask_size', np.nan)
+        levels[2, i] = unit.get('bid_price', np.nan)
+        levels[3, i] = unit.get('bid_size', np.nan)
+
+    return (
+        received_at,
+        data.get('timestamp') or 0,
+        data.get('code') or '',
+        data.get('total_ask_size') or 0.0,
+        data.get('total_bid_size') or 0.0,
+        levels[0], levels[1], levels[2], levels[3]
+    )
+
+
+_RECORD_BUILDERS = {
+    'ticker': _ticker_record,
+    'trade': _trade_record,
+    'orderbook': _orderbook_record
+}
+
+
+class TickJournal:
+    """
+    틱 바이너리 저널
+
+    주요 기능:
+    - 메시지 추가 (큐에 넣기만 하고 writer 스레드가 배치로 인코딩·기록)
+    - 수신 날짜(KST) 기준 일 단위 파일 교체
+    - 날짜별 조회 (np.memmap 구조화 배열)
+    - 데이터프레임 변환
+
+    한 프로세스에서 하나의 writer만 같은 디렉토리에 쓰는 것을 전제로 합니다.
+    """
+
+    def __init__(self, root_dir: str = DEFAULT_JOURNAL_DIR,
+                 max_pending: int = 100000, flush_interval: float = 1.0):
+        """
+        초기화
+
+        Args:
+            root_dir (str): 저널 루트 디렉토리
+            max_pending (int): 기록 대기 메시지 최대 수 (넘치면 버리고 dropped 증가)
+            flush_interval (float): 파일 버퍼를 디스크로 내보내는 최대 간격 (초)
+        """
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.writer_thread = None
+        self.thread_lock = threading.Lock()
+        self.files = {}  # 종류 -> (날짜, 파일 객체)
+
+        self.stats = {'queued': 0, 'written': 0, 'dropped': 0, 'errors': 0}
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== 쓰기 ====================
+
+    def append(self, kind: str, data: dict, received_at: Optional[int] = None) -> bool:
+        """
+        메시지 추가 (WebSocket 콜백 스레드에서 호출)
+
+        Args:
+            kind (str): 'ticker', 'trade', 'orderbook'
+            data (dict): 업비트 WebSocket 메시지
+            received_at (int): 수신 시각 (epoch 나노초, None이면 현재 시각)
+
+        Returns:
+            bool: 큐에 넣었으면 True, 대기열이 가득 차 버렸으면 False
+        """
+        if kind not in JOURNAL_DTYPES:
+            raise ValueError(f"지원하지 않는 메시지 종류: {kind}")
+
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait((kind, received_at or time.time_ns(), data))
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+
+        self.stats['queued'] += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """지금까지 추가한 메시지가 모두 파일에 기록될 때까지 대기"""
+        if self.writer_thread is None or not self.writer_thread.is_alive():
+            return True
+
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """남은 메시지를 기록하고 writer 스레드와 파일 종료"""
+        with self.thread_lock:
+            thread = self.writer_thread
+            if thread is None:
+                return
+            self.queue.put(None)
+            thread.join()
+            self.writer_thread = None
+
+    def _ensure_writer(self):
+        """writer 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.writer_thread is not None:
+            return
+
+        with self.thread_lock:
+            if self.writer_thread is None:
+                self.writer_thread = threading.Thread(
+                    target=self._writer_loop, name='TickJournalWriter', daemon=True
+                )
+                self.writer_thread.start()
+
+    def _writer_loop(self):
+        """큐에서 메시지를 모아 종류별 배치로 기록"""
+        last_flush = time.time()
+        running = True
+
+        while running:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ()  # 대기 시간 초과: 주기적 flush만 수행
+
+            batches: Dict[str, List[tuple]] = {}
+            waiters = []
+
+            # 대기 중인 메시지를 한 번에 꺼냄
+            while True:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item:
+                    kind, received_at, data = item
+                    try:
+                        batches.setdefault(kind, []).append(_RECORD_BUILDERS[kind](received_at, data))
+                    except Exception as e:
+                        self.stats['errors'] += 1
+                        self.logger.error(f"틱 레코드 변환 오류 ({kind}): {e}")
+
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            for kind, rows in batches.items():
+                try:
+                    self._write_batch(kind, np.array(rows, dtype=JOURNAL_DTYPES[kind]))
+                except Exception as e:
+                    self.stats['errors'] += len(rows)
+                    self.logger.error(f"틱 저널 기록 오류 ({kind}): {e}")
+
+            if waiters or not running or time.time() - last_flush >= self.flush_interval:
+                for _, f in self.files.values():
+                    f.flush()
+                last_flush = time.time()
+
+            for waiter in waiters:
+                waiter.set()
+
+        for _, f in self.files.values():
+            f.close()
+        self.files.clear()
+
+    def _write_batch(self, kind: str, records: np.ndarray):
+        """레코드 배열을 수신 날짜별 파일 끝에 덧붙임"""
+        keys = self._date_keys(records['received_at'])
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+
+        for chunk, start in zip(np.split(records, boundaries), np.append(0, boundaries)):
+            f = self._open_file(kind, keys[start])
+            f.write(chunk.tobytes())
+
+        self.stats['written'] += len(records)
+
+    def _open_file(self, kind: str, date_key: str):
+        """종류별 현재 날짜 파일 (날짜가 바뀌면 이전 파일을 닫고 새 파일 열기)"""
+        current = self.files.get(kind)
+        if current is not None and current[0] == date_key:
+            return current[1]
+
+        if current is not None:
+            current[1].close()
+            self.logger.info(f"틱 저널 파일 교체: {kind} {current[0]} -> {date_key}")
+
+        directory = os.path.join(self.root_dir, kind)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{date_key}.bin')
+
+        # 비정상 종료로 잘린 마지막 레코드는 잘라내고 이어서 기록
+        itemsize = JOURNAL_DTYPES[kind].itemsize
+        if os.path.exists(path) and os.path.getsize(path) % itemsize:
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) // itemsize * itemsize)
+
+        f = open(path, 'ab')
+        self.files[kind] = (date_key, f)
+        return f
+
+    # ==================== 읽기 ====================
+
+    def read(self, kind: str, date: Union[str, datetime, None] = None,
+             market: Optional[str] = None) -> np.ndarray:
+        """
+        날짜별 조회
+
+        Args:
+            kind (str): 'ticker', 'trade', 'orderbook'
+            date: 수신 날짜 (KST, None이면 오늘)
+            market (str): 마켓 코드 (None이면 전체)
+
+        Returns:
+            np.ndarray: 구조화 배열 (market이 없으면 읽기 전용 memmap)
+        """
+        dtype = self._dtype(kind)
+        date_key = pd.Timestamp(date).strftime('%Y-%m-%d') if date is not None else self._today()
+        path = os.path.join(self.root_dir, kind, f'{date_key}.bin')
+
+        # 기록 중인 파일도 완성된 레코드까지만 읽음
+        count = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+
+        records = np.memmap(path, dtype=dtype, mode='r', shape=(count,))
+        if market is not None:
+            records = np.array(records[records['market'] == market.encode()])
+        return records
+
+    def read_range(self, kind: str, start: Union[str, datetime],
+                   end: Union[str, datetime], market: Optional[str] = None) -> np.ndarray:
+        """기간 조회 (start, end 날짜 모두 포함)"""
+        chunks = [
+            self.read(kind, date, market)
+            for date in self.list_dates(kind)
+            if pd.Timestamp(start).strftime('%Y-%m-%d') <= date <= pd.Timestamp(end).strftime('%Y-%m-%d')
+        ]
+        chunks = [np.asarray(chunk) for chunk in chunks if len(chunk)]
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=self._dtype(kind))
+
+    def list_dates(self, kind: str) -> List[str]:
+        """저장된 날짜 목록 (오래된 것부터)"""
+        self._dtype(kind)
+        directory = os.path.join(self.root_dir, kind)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith('.bin'))
+
+    def to_dataframe(self, records: np.ndarray) -> pd.DataFrame:
+        """
+        레코드 배열을 데이터프레임으로 변환
+
+        시각 필드는 KST 기준 datetime으로, 문자열 필드는 str로 바꾸고
+        호가 배열 필드는 단계별 컬럼(ask_price_1 ...)으로 펼칩니다.
+        """
+        df = pd.DataFrame(index=range(len(records)))
+        for name in records.dtype.names:
+            column = records[name]
+            if name == 'received_at':
+                df[name] = (column + _KST_OFFSET_NS).astype('datetime64[ns]')
+            elif name in ('timestamp', 'trade_timestamp'):
+                df[name] = (column * 10**6 + _KST_OFFSET_NS).astype('datetime64[ns]')
+            elif column.dtype.kind == 'S':
+                df[name] = column.astype(str)
+            elif column.ndim == 2:
+                for level in range(column.shape[1]):
+                    df[f'{name}_{level + 1}'] = column[:, level]
+            else:
+                df[name] = column
+        return df
+
+    def get_statistics(self) -> Dict[str, int]:
+        """기록 통계 (queued, written, dropped, errors, pending)"""
+        return {**self.stats, 'pending': self.queue.qsize()}
+
+    # ==================== 내부 유틸 ====================
+
+    def _dtype(self, kind: str) -> np.dtype:
+        """메시지 종류별 레코드 형식"""
+        if kind not in JOURNAL_DTYPES:
+            raise ValueError(f"지원하지 않는 메시지 종류: {kind}")
+        return JOURNAL_DTYPES[kind]
+
+    def _date_keys(self, received_at: np.ndarray) -> np.ndarray:
+        """수신 시각(epoch 나노초)별 KST 날짜 키 ('YYYY-MM-DD')"""
+        return (np.asarray(received_at) + _KST_OFFSET_NS).astype('datetime64[ns]').astype('datetime64[D]').astype(str)
+
+    def _today(self) -> str:
+        """오늘 KST 날짜 키"""
+        return self._date_keys(np.array([time.time_ns()]))[0]
@@ -12,6 +12,14 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlencode
 
+# 캔들 저장소는 선택 기능 (candle_store 모듈이 없어도 REST 클라이언트는 사용 가능)
+try:
+    from candle_store import (
+        CandleStore, normalize_unit, unit_interval, kst_now, candles_from_upbit, candles_to_upbit
+    )
+except ImportError:
+    CandleStore = None
+
 class UpbitAPI:
     """
     업비트 API 연동 클래스
@@ -23,16 +31,19 @@ class UpbitAPI:
     - API 키 인증 및 오류 처리
     """
     
-    def __init__(self, access_key: str = None, secret_key: str = None):
+    def __init__(self, access_key: str = None, secret_key: str = None,
+                 candle_store: Optional['CandleStore'] = None):
         """
         초기화
         
         Args:
             access_key (str): 업비트 Access Key (선택사항)
             secret_key (str): 업비트 Secret Key (선택사항)
+            candle_store (CandleStore): 캔들 로컬 저장소 (선택사항, 지정 시 조회한 캔들을 공유 이력에 저장)
         """
         self.access_key = access_key
         self.secret_key = secret_key
+        self.candle_store = candle_store
         self.base_url = "https://api.upbit.com"
         
         # 로깅 설정
@@ -208,12 +219,18 @@ class UpbitAPI:
         Args:
             market (str): 마켓 코드
             count (int): 조회할 캔들 개수
-            unit (str): 캔들 단위 (minutes, days, weeks, months)
+            unit (str): 캔들 단위 (minutes/1, days, weeks, months)
             
         Returns:
             List[dict]: 캔들 데이터
+            
+        캔들 저장소가 설정되어 있으면 저장된 마지막 캔들 이후 구간만 API로 조회하고,
+        나머지는 저장소에서 읽습니다.
         """
         try:
+            if self.candle_store is not None:
+                return self._get_candles_with_store(market, count, unit)
+            
             params = {
                 'market': market,
                 'count': count
@@ -227,6 +244,27 @@ class UpbitAPI:
             self.logger.error(f"캔들 데이터 조회 실패: {e}")
             raise
     
+    def _get_candles_with_store(self, market: str, count: int, unit: str) -> List[dict]:
+        """저장소를 거쳐 캔들 조회 (누락된 최신 구간만 API 요청)"""
+        unit = normalize_unit(unit)
+        stored = self.candle_store.tail(market, unit, count)
+        interval = unit_interval(unit)
+        
+        # 저장된 마지막 캔들(진행 중일 수 있음)부터 현재까지만 다시 조회
+        fetch_count = count
+        if len(stored) == count and interval is not None:
+            elapsed = kst_now() - stored['datetime'].iloc[-1]
+            fetch_count = min(count, max(1, int(elapsed / interval) + 1))
+        
+        self.logger.info(f"캔들 데이터 조회 중... (마켓: {market}, 단위: {unit}, 요청: {fetch_count}개)")
+        candles = self._make_request('GET', f'/v1/candles/{unit}',
+                                     params={'market': market, 'count': fetch_count})
+        self.candle_store.append(market, unit, candles_from_upbit(candles))
+        
+        result = candles_to_upbit(self.candle_store.tail(market, unit, count), market)
+        self.logger.info(f"캔들 데이터 조회 완료: {len(result)}개 (API {len(candles)}개)")
+        return result
+    
     def get_orderbook(self, markets: List[str]) -> List[dict]:
         """
         호가 정보 조회
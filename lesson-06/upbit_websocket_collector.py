@@ -9,23 +9,44 @@ import pandas as pd
 import logging
 from datetime import datetime
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from tick_journal import TickJournal
+from message_pipeline import MessagePipeline
+from orderbook import OrderBookManager
+from bar_aggregator import BarAggregator
+from candle_store import CandleStore
 
 class UpbitWebSocketCollector:
     """
     업비트 WebSocket을 사용한 실시간 데이터 수집기
     """
     
-    def __init__(self, markets: List[str], data_dir: str = "data"):
+    def __init__(self, markets: List[str], data_dir: str = "data",
+                 storage_format: str = "binary", queue_capacity: int = 10000,
+                 decode_in_process: bool = False, subscribe_types: List[str] = None,
+                 bar_intervals: Optional[List[str]] = None,
+                 candle_store: Optional[CandleStore] = None):
         """
         초기화
         
         Args:
             markets (List[str]): 수집할 마켓 코드 리스트 (예: ['KRW-BTC', 'KRW-ETH'])
             data_dir (str): 데이터 저장 디렉토리
+            storage_format (str): 'binary' (틱 저널, data_dir/ticks) 또는 'csv' (일별 CSV)
+            queue_capacity (int): 수신 메시지 링 버퍼 크기
+            decode_in_process (bool): JSON 파싱을 별도 프로세스에서 수행
+            subscribe_types (List[str]): 구독할 메시지 종류 (기본값: ['ticker'], 'trade'·'orderbook' 추가 가능)
+            bar_intervals (List[str]): 체결로 집계할 봉 주기 (기본값: 1s, 1m, 5m, 1h)
+            candle_store (CandleStore): 마감된 분 단위 이상 봉을 기록할 캔들 저장소
         """
+        if storage_format not in ('binary', 'csv'):
+            raise ValueError(f"지원하지 않는 저장 형식: {storage_format}")
+        
         self.markets = markets
         self.data_dir = data_dir
+        self.storage_format = storage_format
+        self.subscribe_types = subscribe_types or ['ticker']
         self.ws = None
         self.is_connected = False
         self.data_buffer = []
@@ -34,9 +55,25 @@ class UpbitWebSocketCollector:
         # 데이터 저장 디렉토리 생성
         os.makedirs(data_dir, exist_ok=True)
         
+        # 바이너리 저널은 writer 스레드가 메시지 종류별 고정 길이 레코드로 기록
+        self.journal = TickJournal(os.path.join(data_dir, 'ticks')) if storage_format == 'binary' else None
+        
+        # 마켓별 실시간 오더북 (orderbook 구독 시 갱신)
+        self.order_books = OrderBookManager()
+        
+        # 체결 스트림으로 만드는 실시간 봉 (trade 구독 시 갱신)
+        self.bar_aggregator = BarAggregator(bar_intervals, candle_store=candle_store)
+        
         # 로깅 설정
         self.setup_logging()
         
+        # 소켓 스레드는 원본 메시지만 넣고, 디코더 스레드가 파싱·저장을 처리
+        self.pipeline = MessagePipeline(
+            dispatch=self.dispatch_messages,
+            capacity=queue_capacity,
+            decode_in_process=decode_in_process
+        )
+        
         # 데이터 저장 설정
         self.save_interval = 60  # 60초마다 파일 저장
         self.last_save_time = time.time()
@@ -54,30 +91,45 @@ class UpbitWebSocketCollector:
         self.logger = logging.getLogger(__name__)
     
     def on_message(self, ws, message):
-        """WebSocket 메시지 수신 처리"""
-        try:
-            data = json.loads(message)
-            
-            # 티커 데이터 처리
-            if 'type' in data and data['type'] == 'ticker':
-                self.process_ticker_data(data)
-            
-            # 체결 데이터 처리
-            elif 'type' in data and data['type'] == 'trade':
-                self.process_trade_data(data)
-            
-            # 호가 데이터 처리
-            elif 'type' in data and data['type'] == 'orderbook':
-                self.process_orderbook_data(data)
+        """WebSocket 메시지 수신 처리 (원본 메시지를 디코딩 파이프라인에 넣기만 함)"""
+        self.pipeline.submit(message)
+    
+    def dispatch_messages(self, messages: List[tuple]):
+        """디코딩된 메시지 배치 처리 (디코더 스레드에서 호출)"""
+        for received_at, data in messages:
+            try:
+                message_type = data.get('type') if isinstance(data, dict) else None
                 
-        except json.JSONDecodeError as e:
-            self.logger.error(f"JSON 디코딩 오류: {e}")
-        except Exception as e:
-            self.logger.error(f"메시지 처리 오류: {e}")
+                # 티커 데이터 처리
+                if message_type == 'ticker':
+                    self.process_ticker_data(data, received_at)
+                
+                # 체결 데이터 처리
+                elif message_type == 'trade':
+                    self.process_trade_data(data, received_at)
+                
+                # 호가 데이터 처리
+                elif message_type == 'orderbook':
+                    self.process_orderbook_data(data, received_at)
+                    
+            except Exception as e:
+                self.logger.error(f"메시지 처리 오류: {e}")
+        
+        # 체결이 끊긴 마켓의 지난 봉 마감
+        self.bar_aggregator.flush()
+        
+        # 주기적 파일 저장
+        self.check_and_save_data()
     
-    def process_ticker_data(self, data):
+    def process_ticker_data(self, data, received_at=None):
         """티커 데이터 처리"""
         try:
+            if self.journal is not None:
+                self.journal.append('ticker', data, received_at)
+                self.logger.debug(f"티커 수신 - {data.get('code', '')}: {data.get('trade_price', 0):,}원 "
+                               f"(변화율: {data.get('change_rate', 0):.2%})")
+                return
+            
             ticker_data = {
                 'timestamp': datetime.now().isoformat(),
                 'market': data.get('code', ''),
@@ -115,19 +167,24 @@ class UpbitWebSocketCollector:
             with self.buffer_lock:
                 self.data_buffer.append(ticker_data)
             
-            # 실시간 로그 출력
-            self.logger.info(f"티커 수신 - {ticker_data['market']}: {ticker_data['trade_price']:,}원 "
+            # 실시간 로그 출력 (틱마다 출력하므로 DEBUG 레벨)
+            self.logger.debug(f"티커 수신 - {ticker_data['market']}: {ticker_data['trade_price']:,}원 "
                            f"(변화율: {ticker_data['change_rate']:.2%})")
             
-            # 주기적 파일 저장
-            self.check_and_save_data()
-            
         except Exception as e:
             self.logger.error(f"티커 데이터 처리 오류: {e}")
     
-    def process_trade_data(self, data):
+    def process_trade_data(self, data, received_at=None):
         """체결 데이터 처리"""
         try:
+            self.bar_aggregator.update(data)
+            
+            if self.journal is not None:
+                self.journal.append('trade', data, received_at)
+                self.logger.debug(f"체결 수신 - {data.get('code', '')}: {data.get('trade_price', 0):,}원 "
+                               f"({data.get('trade_volume', 0)}개)")
+                return
+            
             trade_data = {
                 'timestamp': datetime.now().isoformat(),
                 'market': data.get('code', ''),
@@ -149,15 +206,21 @@ class UpbitWebSocketCollector:
             with self.buffer_lock:
                 self.data_buffer.append(trade_data)
             
-            self.logger.info(f"체결 수신 - {trade_data['market']}: {trade_data['trade_price']:,}원 "
+            self.logger.debug(f"체결 수신 - {trade_data['market']}: {trade_data['trade_price']:,}원 "
                            f"({trade_data['trade_volume']}개)")
             
         except Exception as e:
             self.logger.error(f"체결 데이터 처리 오류: {e}")
     
-    def process_orderbook_data(self, data):
+    def process_orderbook_data(self, data, received_at=None):
         """호가 데이터 처리"""
         try:
+            self.order_books.update(data)
+            
+            if self.journal is not None:
+                self.journal.append('orderbook', data, received_at)
+                return
+            
             orderbook_data = {
                 'timestamp': datetime.now().isoformat(),
                 'market': data.get('code', ''),
@@ -184,6 +247,11 @@ class UpbitWebSocketCollector:
     
     def save_data_to_file(self):
         """버퍼의 데이터를 파일로 저장"""
+        if self.journal is not None:
+            # 바이너리 저널은 writer 스레드가 계속 기록하므로 디스크 반영만 기다림
+            self.journal.flush(timeout=5)
+            return
+        
         try:
             with self.buffer_lock:
                 if not self.data_buffer:
@@ -220,7 +288,8 @@ class UpbitWebSocketCollector:
         self.logger.info(f"WebSocket 연결 종료: {close_status_code} - {close_msg}")
         self.is_connected = False
         
-        # 마지막 데이터 저장
+        # 수신한 메시지를 모두 처리한 뒤 마지막 데이터 저장
+        self.pipeline.drain(timeout=5)
         self.save_data_to_file()
     
     def on_open(self, ws):
@@ -228,16 +297,15 @@ class UpbitWebSocketCollector:
         self.logger.info("WebSocket 연결 시작")
         self.is_connected = True
         
-        # 구독 메시지 전송
-        subscribe_message = [
-            {
-                "ticket": f"realtime_data_{int(time.time())}",
-                "type": "ticker",
+        # 구독 메시지 전송 (호가는 첫 스냅샷부터 받아야 오더북이 바로 채워짐)
+        subscribe_message = [{"ticket": f"realtime_data_{int(time.time())}"}]
+        for message_type in self.subscribe_types:
+            subscribe_message.append({
+                "type": message_type,
                 "codes": self.markets,
                 "isOnlySnapshot": False,
-                "isOnlyRealtime": True
-            }
-        ]
+                "isOnlyRealtime": message_type != 'orderbook'
+            })
         
         ws.send(json.dumps(subscribe_message))
         self.logger.info(f"구독 시작: {self.markets}")
@@ -245,6 +313,8 @@ class UpbitWebSocketCollector:
     def connect(self):
         """WebSocket 연결 시작"""
         try:
+            self.pipeline.start()
+            
             # WebSocket 연결
             self.ws = websocket.WebSocketApp(
                 "wss://api.upbit.com/websocket/v1",
@@ -265,6 +335,24 @@ class UpbitWebSocketCollector:
         if self.ws:
             self.ws.close()
             self.logger.info("WebSocket 연결 종료")
+        
+        self.pipeline.stop()
+        self.bar_aggregator.flush(force=True)
+        if self.journal is not None:
+            self.journal.close()
+    
+    def get_statistics(self) -> Dict[str, Any]:
+        """수집 통계 정보 반환 (디코딩 파이프라인과 저널의 처리·버림 건수 포함)"""
+        return {
+            'is_connected': self.is_connected,
+            'markets': self.markets,
+            'storage_format': self.storage_format,
+            'buffer_size': len(self.data_buffer),
+            'order_books': self.order_books.markets(),
+            'bars': self.bar_aggregator.get_statistics(),
+            'pipeline': self.pipeline.get_statistics(),
+            'journal': self.journal.get_statistics() if self.journal is not None else None
+        }
 
 def main():
     """메인 함수"""
@@ -286,7 +374,7 @@ def main():
     try:
         print("🚀 업비트 실시간 데이터 수집 시작")
         print(f"📊 수집 마켓: {', '.join(markets)}")
-        print("📁 데이터 저장 위치: realtime_data/")
+        print("📁 데이터 저장 위치: realtime_data/ticks/ (바이너리 틱 저널)")
         print("⏹️  종료하려면 Ctrl+C를 누르세요")
         print("-" * 50)
         
@@ -0,0 +1,96 @@
+"""
+변동성 돌파 백테스트 엔진 일치 테스트
+
+- numpy 엔진과 loop 엔진의 거래 내역, 자본 곡선, 성과 지표가 같은지 확인
+- optimize_parameters의 조합별 성과가 개별 백테스트 결과와 같은지 확인
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from volatility_breakout_backtest_optimized import VolatilityBreakoutBacktest, create_sample_data
+
+
+logging.disable(logging.INFO)
+
+STRATEGY_CASES = [
+    dict(k_value=0.3, volume_filter=0.8, rsi_threshold=45),
+    dict(k_value=0.1, volume_filter=0.5, rsi_threshold=60, max_holding_days=5),
+    dict(k_value=0.1, volume_filter=0.5, rsi_threshold=60, stop_loss=-0.005, take_profit=0.005),
+]
+
+
+@pytest.fixture(scope='module')
+def sample_data():
+    return create_sample_data('2021-01-01', '2023-12-31')
+
+
+def run(data, engine, **params):
+    backtest = VolatilityBreakoutBacktest(**params)
+    backtest.load_data(data)
+    return backtest.run_backtest(engine=engine)
+
+
+def assert_performance_equal(left, right):
+    assert left.keys() == right.keys()
+    for key in left:
+        if isinstance(left[key], float):
+            assert left[key] == pytest.approx(right[key], rel=1e-12, nan_ok=True), key
+        else:
+            assert left[key] == right[key], key
+
+
+@pytest.mark.parametrize('params', STRATEGY_CASES)
+def test_numpy_engine_matches_loop_engine(sample_data, params):
+    """numpy 엔진 결과가 loop 엔진과 같은지 확인"""
+    loop = run(sample_data, 'loop', **params)
+    fast = run(sample_data, 'numpy', **params)
+
+    assert len(loop['trades']) > 0
+    pd.testing.assert_frame_equal(pd.DataFrame(fast['trades']), pd.DataFrame(loop['trades']))
+    pd.testing.assert_frame_equal(fast['equity_curve'], loop['equity_curve'])
+    assert_performance_equal(fast['performance'], loop['performance'])
+
+
+def test_numpy_engine_without_trades(sample_data):
+    """거래가 없는 경우도 두 엔진이 같은지 확인"""
+    loop = run(sample_data, 'loop')
+    fast = run(sample_data, 'numpy')
+
+    assert fast['trades'] == loop['trades'] == []
+    pd.testing.assert_frame_equal(fast['equity_curve'], loop['equity_curve'])
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_optimize_parameters_matches_individual_backtests(sample_data, n_workers):
+    """파라미터 탐색 결과가 조합별 개별 백테스트와 같은지 확인"""
+    base = dict(volume_filter=0.5, rsi_threshold=60)
+    k_values = [0.1, 0.3]
+    stop_losses = [-0.005, -0.02]
+    take_profits = [0.005, 0.03]
+
+    optimizer = VolatilityBreakoutBacktest(**base)
+    optimizer.load_data(sample_data)
+    result = optimizer.optimize_parameters(k_values, stop_losses, take_profits, n_workers=n_workers)
+    all_results = result['all_results']
+
+    assert len(all_results) == len(k_values) * len(stop_losses) * len(take_profits)
+
+    for row in all_results.itertuples():
+        expected = run(sample_data, 'loop', k_value=row.k_value, stop_loss=row.stop_loss,
+                       take_profit=row.take_profit, **base)['performance']
+        assert row.total_trades == expected['total_trades']
+        assert row.total_return == pytest.approx(expected['total_return_pct'], rel=1e-12)
+        assert row.sharpe_ratio == pytest.approx(expected['sharpe_ratio'], rel=1e-12, nan_ok=True)
+        assert row.max_drawdown == pytest.approx(expected['max_drawdown_pct'], rel=1e-12)
+        assert row.win_rate == pytest.approx(expected['win_rate'], rel=1e-12)
+
+    best = all_results.loc[all_results['sharpe_ratio'].idxmax()]
+    assert result['best_params'] == {
+        'k_value': best['k_value'],
+        'stop_loss': best['stop_loss'],
+        'take_profit': best['take_profit']
+    }
@@ -18,6 +18,8 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from datetime import datetime, timedelta
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import cpu_count, shared_memory
 from typing import Dict, List, Tuple, Optional, Union
 import warnings
 warnings.filterwarnings('ignore')
@@ -26,6 +28,150 @@ warnings.filterwarnings('ignore')
 plt.rcParams['font.family'] = 'Malgun Gothic'
 plt.rcParams['axes.unicode_minus'] = False
 
+def sweep_breakout_positions(close: np.ndarray,
+                             buy_signal: np.ndarray,
+                             dates: np.ndarray,
+                             stop_losses: List[float],
+                             take_profits: List[float],
+                             max_holding_days: float) -> List[Tuple[np.ndarray, np.ndarray, bool]]:
+    """
+    변동성 돌파 전략 포지션 상태 머신 (NumPy 배열 기반, 손절/익절 조합 일괄 평가)
+    
+    행 단위 루프와 동일한 규칙으로 진입/청산 시점을 계산합니다.
+    - 포지션이 없을 때: buy_signal이 True인 다음 봉에서 진입
+    - 포지션이 있을 때: 손절/익절 또는 보유 기간 초과 시 청산
+    - 청산한 봉에서는 재진입하지 않음
+    
+    진입 시점별로 보유 구간 수익률을 한 번만 계산하고, 누적 최소/최대값에 대한
+    이진 탐색으로 모든 손절/익절 조합의 청산 시점을 동시에 구합니다.
+    
+    Args:
+        close: 종가 배열
+        buy_signal: 매수 신호 배열 (워밍업 구간은 False)
+        dates: datetime64 배열 (정렬된 인덱스)
+        stop_losses: 손절 비율 리스트
+        take_profits: 익절 비율 리스트
+        max_holding_days: 최대 보유 기간 (일)
+        
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray, bool]]: (손절, 익절) 중첩 순서의 조합별
+            (진입 인덱스, 청산 인덱스, 마지막 포지션 미청산 여부)
+            미청산인 경우 마지막 청산 인덱스는 마지막 봉
+    """
+    n = len(close)
+    buy_idx = np.flatnonzero(buy_signal)
+    # Timedelta.days는 내림이므로 '보유일 >= N' 조건은 '경과 시간 >= ceil(N)일'과 같다
+    holding_delta = np.timedelta64(int(np.ceil(max_holding_days)), 'D')
+    neg_stop_losses = -np.asarray(stop_losses, dtype=float)
+    take_profits = np.asarray(take_profits, dtype=float)
+    exit_tables = {}
+    
+    def exit_table(i: int) -> np.ndarray:
+        """진입 인덱스 i에 대한 (손절 x 익절) 청산 인덱스 표 (-1: 데이터 끝까지 미청산)"""
+        if i in exit_tables:
+            return exit_tables[i]
+        
+        entry_price = close[i]
+        
+        # 시간 청산 시점 (진입 다음 봉부터)
+        time_exit = max(i + 1, int(np.searchsorted(dates, dates[i] + holding_delta, side='left')))
+        scan_end = min(time_exit, n - 1)
+        window_returns = (close[i + 1:scan_end + 1] - entry_price) / entry_price
+        
+        # NaN은 어떤 조건도 만족하지 않도록 처리
+        nan_mask = np.isnan(window_returns)
+        running_min = np.minimum.accumulate(np.where(nan_mask, np.inf, window_returns))
+        running_max = np.maximum.accumulate(np.where(nan_mask, -np.inf, window_returns))
+        
+        # 첫 손절 시점: returns <= stop_loss  <=>  -누적최소 >= -stop_loss
+        stop_hits = np.searchsorted(-running_min, neg_stop_losses, side='left')
+        # 첫 익절 시점: returns >= take_profit  <=>  누적최대 >= take_profit
+        take_hits = np.searchsorted(running_max, take_profits, side='left')
+        first_hit = np.minimum(stop_hits[:, None], take_hits[None, :])
+        
+        no_hit_exit = time_exit if time_exit < n else -1
+        table = np.where(first_hit < len(window_returns), i + 1 + first_hit, no_hit_exit)
+        exit_tables[i] = table
+        return table
+    
+    results = []
+    for s in range(len(neg_stop_losses)):
+        for t in range(len(take_profits)):
+            entries = []
+            exits = []
+            open_at_end = False
+            k = 0
+            
+            while k < len(buy_idx):
+                i = int(buy_idx[k])
+                exit_i = int(exit_table(i)[s, t])
+                entries.append(i)
+                
+                if exit_i < 0:
+                    exits.append(n - 1)
+                    open_at_end = True
+                    break
+                
+                exits.append(exit_i)
+                k = int(np.searchsorted(buy_idx, exit_i + 1, side='left'))
+            
+            results.append((np.asarray(entries, dtype=np.int64),
+                            np.asarray(exits, dtype=np.int64),
+                            open_at_end))
+    
+    return results
+
+
+def simulate_breakout_positions(close: np.ndarray,
+                                buy_signal: np.ndarray,
+                                dates: np.ndarray,
+                                stop_loss: float,
+                                take_profit: float,
+                                max_holding_days: float) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """
+    단일 손절/익절 설정의 포지션 상태 머신 (sweep_breakout_positions 참고)
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, bool]: 진입 인덱스, 청산 인덱스, 마지막 포지션 미청산 여부
+    """
+    return sweep_breakout_positions(close, buy_signal, dates,
+                                    [stop_loss], [take_profit], max_holding_days)[0]
+
+
+def build_equity_array(n_bars: int,
+                       exits: np.ndarray,
+                       open_at_end: bool,
+                       trade_returns: List[float]) -> np.ndarray:
+    """
+    봉별 자본 배열 계산
+    
+    각 봉의 자본은 그 봉까지 청산된 거래의 누적 수익률로 결정되며,
+    미청산 포지션이 있으면 마지막 봉에서 정리한 자본을 한 행 더 붙입니다.
+    
+    Args:
+        n_bars: 봉 개수
+        exits: 청산 인덱스 배열
+        open_at_end: 마지막 포지션 미청산 여부
+        trade_returns: 거래별 순수익률 (거래 순서)
+        
+    Returns:
+        np.ndarray: 자본 배열 (n_bars 또는 n_bars + 1)
+    """
+    equity_levels = [1.0]
+    current_equity = 1.0
+    for trade_return in trade_returns:
+        current_equity *= (1 + trade_return)
+        equity_levels.append(current_equity)
+    
+    closed_exits = exits[:-1] if open_at_end else exits
+    closed_count = np.searchsorted(closed_exits, np.arange(n_bars), side='right')
+    equity = np.asarray(equity_levels, dtype=float)[closed_count]
+    
+    if open_at_end:
+        equity = np.append(equity, current_equity)
+    return equity
+
+
 class VolatilityBreakoutBacktest:
     """
     변동성 돌파 전략 백테스트 클래스
@@ -201,18 +347,45 @@ class VolatilityBreakoutBacktest:
         
         return rsi
     
-    def run_backtest(self) -> Dict:
+    def run_backtest(self, engine: str = 'numpy') -> Dict:
         """
         백테스트 실행
         
+        Args:
+            engine: 실행 엔진
+                - 'numpy': 배열 기반 상태 머신 (기본값, 대용량 데이터용)
+                - 'loop': 행 단위 루프 (기준 구현)
+                두 엔진은 동일한 거래 내역, 자본 곡선, 성과 지표를 생성합니다.
+        
         Returns:
             Dict: 백테스트 결과 (거래 내역, 성과 지표, 자본 곡선)
         """
         if self.data is None:
             raise ValueError("데이터가 로딩되지 않았습니다. load_data()를 먼저 호출하세요")
         
+        if engine not in ('numpy', 'loop'):
+            raise ValueError(f"지원하지 않는 엔진입니다: {engine} ('numpy' 또는 'loop')")
+        
         self.logger.info("백테스트 시작")
         
+        # 거래 내역 및 자본 곡선 계산
+        if engine == 'numpy':
+            self._run_numpy_engine()
+        else:
+            self._run_loop_engine()
+        
+        # 성과 분석
+        self.performance = self._analyze_performance()
+        
+        self.logger.info(f"백테스트 완료: {len(self.trades)}개 거래")
+        return {
+            'trades': self.trades,
+            'performance': self.performance,
+            'equity_curve': self.equity_curve
+        }
+    
+    def _run_loop_engine(self) -> None:
+        """행 단위 루프 백테스트 (기준 구현)"""
         # 거래 내역 및 자본 곡선 초기화
         self.trades = []
         self.equity_curve = []
@@ -254,16 +427,77 @@ class VolatilityBreakoutBacktest:
         
         # 자본 곡선을 DataFrame으로 변환
         self.equity_curve = pd.DataFrame(self.equity_curve).set_index('date')
+    
+    def _run_numpy_engine(self) -> None:
+        """배열 기반 백테스트 (iterrows 없이 진입/청산 시점만 순회)"""
+        self.trades = []
+        dates = self.data.index
+        close = self.data['close'].to_numpy(dtype=float)
+        columns = {col: self.data[col].to_numpy(dtype=float)
+                   for col in ['breakout_line', 'volume', 'volume_ma', 'rsi', 'volatility']}
+        
+        # 진입/청산 시점 계산
+        entries, exits, open_at_end = simulate_breakout_positions(
+            close, self._buy_signal_array(), dates.values,
+            self.stop_loss, self.take_profit, self.max_holding_days
+        )
         
-        # 성과 분석
-        self.performance = self._analyze_performance()
+        # 거래 내역 생성 (거래 발생 봉만 행 데이터 구성)
+        trade_returns = []
+        for trade_no, (entry_i, exit_i) in enumerate(zip(entries, exits)):
+            entry_row = {col: values[entry_i] for col, values in columns.items()}
+            position = self._enter_position(dates[entry_i], close[entry_i], entry_row)
+            self.logger.info(f"매수: {dates[entry_i].strftime('%Y-%m-%d')} - 가격: {close[entry_i]:,.0f}")
+            
+            trade_return = self._exit_position(position, dates[exit_i], close[exit_i], None)
+            trade_returns.append(trade_return)
+            # 마지막 미청산 포지션 정리는 루프 엔진과 같이 매도 로그를 남기지 않음
+            if not (open_at_end and trade_no == len(entries) - 1):
+                self.logger.info(f"매도: {dates[exit_i].strftime('%Y-%m-%d')} - 가격: {close[exit_i]:,.0f} - 수익률: {trade_return:.2%}")
         
-        self.logger.info(f"백테스트 완료: {len(self.trades)}개 거래")
-        return {
-            'trades': self.trades,
-            'performance': self.performance,
-            'equity_curve': self.equity_curve
-        }
+        # 자본 곡선 (미청산 포지션은 마지막 봉 날짜로 한 행 더 기록)
+        equity = build_equity_array(len(dates), exits, open_at_end, trade_returns)
+        equity_dates = dates.append(dates[-1:]) if open_at_end else dates
+        
+        self.equity_curve = pd.DataFrame({'date': equity_dates, 'equity': equity}).set_index('date')
+    
+    def _buy_signal_array(self) -> np.ndarray:
+        """
+        매수 신호 배열 계산 (_should_buy의 벡터화 버전)
+        
+        Returns:
+            np.ndarray: 봉별 매수 신호 (워밍업 구간은 False)
+        """
+        close = self.data['close'].to_numpy(dtype=float)
+        breakout_line = self.data['breakout_line'].to_numpy(dtype=float)
+        
+        # 돌파선이 NaN이면 비교 결과가 False이므로 별도 체크 불필요
+        return self._entry_filter_array() & (close > breakout_line)
+    
+    def _entry_filter_array(self) -> np.ndarray:
+        """
+        K값과 무관한 매수 조건 배열 계산 (NaN 체크, 거래량 필터, RSI 필터, 워밍업)
+        
+        Returns:
+            np.ndarray: 봉별 필터 통과 여부
+        """
+        close = self.data['close'].to_numpy(dtype=float)
+        volume = self.data['volume'].to_numpy(dtype=float)
+        volume_ma = self.data['volume_ma'].to_numpy(dtype=float)
+        rsi = self.data['rsi'].to_numpy(dtype=float)
+        
+        # NaN 값 체크
+        valid = ~(np.isnan(volume_ma) | np.isnan(rsi) | np.isnan(close) | np.isnan(volume))
+        
+        entry_filter = (
+            valid &
+            (volume >= volume_ma * self.volume_filter) &
+            (rsi <= self.rsi_threshold)
+        )
+        
+        # 충분한 데이터 필요
+        entry_filter[:max(self.rsi_period, self.volume_period)] = False
+        return entry_filter
     
     def _should_buy(self, row: pd.Series, index: int) -> bool:
         """
@@ -692,71 +926,96 @@ class VolatilityBreakoutBacktest:
     def optimize_parameters(self, 
                           k_values: List[float] = [0.5, 0.6, 0.7, 0.8, 0.9],
                           stop_losses: List[float] = [-0.01, -0.015, -0.02, -0.025],
-                          take_profits: List[float] = [0.02, 0.025, 0.03, 0.035]) -> Dict:
+                          take_profits: List[float] = [0.02, 0.025, 0.03, 0.035],
+                          n_workers: Optional[int] = None) -> Dict:
         """
         매개변수 최적화
         
+        K값과 무관한 지표(거래량 평균, RSI, 변동성)는 load_data()에서 계산한 값을 한 번만 사용하고,
+        K값별 돌파선은 2차원 배열로 만들어 공유 메모리에 올린 뒤 K값 단위로 프로세스 풀에 분배합니다.
+        각 워커는 해당 K값의 손절/익절 조합 전체를 일괄 평가하며, 결과는 개별 백테스트와 동일합니다.
+        
         Args:
             k_values: 테스트할 K값 리스트
             stop_losses: 테스트할 손절 비율 리스트
             take_profits: 테스트할 익절 비율 리스트
+            n_workers: 워커 프로세스 수 (None이면 CPU 코어 수와 K값 개수 중 작은 값, 1이면 현재 프로세스에서 실행)
             
         Returns:
             Dict: 최적 매개변수와 성과
         """
+        if self.data is None:
+            raise ValueError("데이터가 로딩되지 않았습니다. load_data()를 먼저 호출하세요")
+        
         self.logger.info("매개변수 최적화 시작")
         
+        # 공통 배열 준비 (K값과 무관한 매수 조건은 한 번만 계산)
+        close = self.data['close'].to_numpy(dtype=float)
+        entry_filter = self._entry_filter_array()
+        dates = self.data.index.values.astype('datetime64[ns]')
+        
+        # K값별 돌파선 (K값 개수 x 봉 개수)
+        prev_high = self.data['prev_high'].to_numpy(dtype=float)
+        prev_low = self.data['prev_low'].to_numpy(dtype=float)
+        k_array = np.asarray(k_values, dtype=float)
+        breakout_lines = prev_high[None, :] + (prev_high - prev_low)[None, :] * k_array[:, None]
+        
+        strategy_params = {
+            'position_size': self.position_size,
+            'volume_filter': self.volume_filter,
+            'rsi_threshold': self.rsi_threshold,
+            'rsi_period': self.rsi_period,
+            'volume_period': self.volume_period,
+            'max_holding_days': self.max_holding_days,
+            'transaction_cost': self.transaction_cost
+        }
+        
+        n_workers = n_workers or min(cpu_count(), len(k_values))
+        if n_workers <= 1 or len(k_values) <= 1:
+            k_results = [
+                _evaluate_k_value(close, entry_filter, breakout_lines[k_index], dates,
+                                  k, stop_losses, take_profits, strategy_params)
+                for k_index, k in enumerate(k_values)
+            ]
+        else:
+            k_results = self._run_parameter_sweep_pool(
+                close, entry_filter, breakout_lines, dates,
+                k_values, stop_losses, take_profits, strategy_params, n_workers
+            )
+        
         best_performance = None
         best_params = None
         results = []
         
-        for k in k_values:
-            for stop_loss in stop_losses:
-                for take_profit in take_profits:
-                    # 백테스트 실행
-                    temp_backtest = VolatilityBreakoutBacktest(
-                        k_value=k,
-                        stop_loss=stop_loss,
-                        take_profit=take_profit,
-                        position_size=self.position_size,
-                        volume_filter=self.volume_filter,
-                        rsi_threshold=self.rsi_threshold,
-                        rsi_period=self.rsi_period,
-                        volume_period=self.volume_period,
-                        max_holding_days=self.max_holding_days,
-                        transaction_cost=self.transaction_cost
-                    )
-                    
-                    temp_backtest.data = self.data.copy()
-                    temp_backtest._calculate_indicators()
-                    
-                    try:
-                        temp_backtest.run_backtest()
-                        performance = temp_backtest.performance
-                        
-                        results.append({
-                            'k_value': k,
-                            'stop_loss': stop_loss,
-                            'take_profit': take_profit,
-                            'total_return': performance['total_return_pct'],
-                            'sharpe_ratio': performance['sharpe_ratio'],
-                            'max_drawdown': performance['max_drawdown_pct'],
-                            'win_rate': performance['win_rate'],
-                            'total_trades': performance['total_trades']
-                        })
-                        
-                        # 최적 성과 업데이트 (샤프 비율 기준)
-                        if best_performance is None or performance['sharpe_ratio'] > best_performance['sharpe_ratio']:
-                            best_performance = performance
-                            best_params = {
-                                'k_value': k,
-                                'stop_loss': stop_loss,
-                                'take_profit': take_profit
-                            }
-                    
-                    except Exception as e:
-                        self.logger.warning(f"매개변수 조합 실패: k={k}, stop_loss={stop_loss}, take_profit={take_profit}, 오류: {e}")
-                        continue
+        # K값 -> 손절 -> 익절 순서로 결과 집계
+        for combo_results in k_results:
+            for combo in combo_results:
+                k, stop_loss, take_profit = combo['k_value'], combo['stop_loss'], combo['take_profit']
+                
+                if 'error' in combo:
+                    self.logger.warning(f"매개변수 조합 실패: k={k}, stop_loss={stop_loss}, take_profit={take_profit}, 오류: {combo['error']}")
+                    continue
+                
+                performance = combo['performance']
+                results.append({
+                    'k_value': k,
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
+                    'total_return': performance['total_return_pct'],
+                    'sharpe_ratio': performance['sharpe_ratio'],
+                    'max_drawdown': performance['max_drawdown_pct'],
+                    'win_rate': performance['win_rate'],
+                    'total_trades': performance['total_trades']
+                })
+                
+                # 최적 성과 업데이트 (샤프 비율 기준)
+                if best_performance is None or performance['sharpe_ratio'] > best_performance['sharpe_ratio']:
+                    best_performance = performance
+                    best_params = {
+                        'k_value': k,
+                        'stop_loss': stop_loss,
+                        'take_profit': take_profit
+                    }
         
         self.logger.info("매개변수 최적화 완료")
         
@@ -766,6 +1025,51 @@ class VolatilityBreakoutBacktest:
             'all_results': pd.DataFrame(results)
         }
     
+    def _run_parameter_sweep_pool(self,
+                                  close: np.ndarray,
+                                  entry_filter: np.ndarray,
+                                  breakout_lines: np.ndarray,
+                                  dates: np.ndarray,
+                                  k_values: List[float],
+                                  stop_losses: List[float],
+                                  take_profits: List[float],
+                                  strategy_params: Dict,
+                                  n_workers: int) -> List[List[Dict]]:
+        """
+        공유 메모리 + 프로세스 풀로 K값별 평가 실행
+        
+        배열은 공유 메모리에 한 번만 복사하고 워커에는 블록 이름만 전달합니다.
+        
+        Returns:
+            List[List[Dict]]: K값 순서의 조합별 평가 결과
+        """
+        # 행 구성: [종가, 매수 필터, K값별 돌파선...]
+        values = np.vstack([close, entry_filter.astype(float), breakout_lines])
+        values_shm = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        dates_shm = shared_memory.SharedMemory(create=True, size=dates.nbytes)
+        
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=values_shm.buf)[:] = values
+            np.ndarray(dates.shape, dtype=np.int64, buffer=dates_shm.buf)[:] = dates.view(np.int64)
+            
+            self.logger.info(f"병렬 최적화: {len(k_values)}개 K값, {n_workers}개 워커")
+            
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                futures = [
+                    executor.submit(_evaluate_k_value_shared,
+                                    values_shm.name, dates_shm.name, values.shape,
+                                    k_index, k, stop_losses, take_profits, strategy_params)
+                    for k_index, k in enumerate(k_values)
+                ]
+                # 제출 순서대로 결과 수집 (결과 순서 보장)
+                return [future.result() for future in futures]
+        
+        finally:
+            values_shm.close()
+            values_shm.unlink()
+            dates_shm.close()
+            dates_shm.unlink()
+    
     def diagnose_no_trades(self) -> None:
         """거래가 발생하지 않는 이유 진단"""
         if self.data is None:
@@ -852,6 +1156,98 @@ class VolatilityBreakoutBacktest:
         print("\n" + "="*60)
 
 
+def _evaluate_k_value(close: np.ndarray,
+                      entry_filter: np.ndarray,
+                      breakout_line: np.ndarray,
+                      dates: np.ndarray,
+                      k_value: float,
+                      stop_losses: List[float],
+                      take_profits: List[float],
+                      strategy_params: Dict) -> List[Dict]:
+    """
+    단일 K값에 대한 손절/익절 전체 조합 평가 (optimize_parameters 워커)
+    
+    Args:
+        close: 종가 배열
+        entry_filter: K값과 무관한 매수 조건 배열
+        breakout_line: 해당 K값의 돌파선 배열
+        dates: datetime64[ns] 배열
+        k_value: K값
+        stop_losses: 손절 비율 리스트
+        take_profits: 익절 비율 리스트
+        strategy_params: K값/손절/익절을 제외한 전략 매개변수
+        
+    Returns:
+        List[Dict]: (손절, 익절) 순서의 조합별 성과 또는 오류
+    """
+    buy_signal = entry_filter & (close > breakout_line)
+    positions = sweep_breakout_positions(close, buy_signal, dates, stop_losses, take_profits,
+                                         strategy_params['max_holding_days'])
+    
+    # 성과 분석은 백테스트 클래스의 계산을 그대로 사용
+    evaluator = VolatilityBreakoutBacktest(k_value=k_value, **strategy_params)
+    combos = [(stop_loss, take_profit) for stop_loss in stop_losses for take_profit in take_profits]
+    
+    results = []
+    for (stop_loss, take_profit), (entries, exits, open_at_end) in zip(combos, positions):
+        combo = {'k_value': k_value, 'stop_loss': stop_loss, 'take_profit': take_profit}
+        try:
+            entry_prices = close[entries]
+            net_returns = (close[exits] - entry_prices) / entry_prices - evaluator.transaction_cost
+            holding_days = (dates[exits] - dates[entries]) // np.timedelta64(1, 'D')
+            
+            evaluator.stop_loss = stop_loss
+            evaluator.take_profit = take_profit
+            evaluator.trades = [
+                {'net_returns': net_return, 'holding_days': days}
+                for net_return, days in zip(net_returns, holding_days)
+            ]
+            evaluator.equity_curve = pd.DataFrame({
+                'equity': build_equity_array(len(close), exits, open_at_end, net_returns)
+            })
+            combo['performance'] = evaluator._analyze_performance()
+        except Exception as e:
+            combo['error'] = str(e)
+        results.append(combo)
+    
+    return results
+
+
+def _evaluate_k_value_shared(values_name: str,
+                             dates_name: str,
+                             values_shape: Tuple[int, int],
+                             k_index: int,
+                             k_value: float,
+                             stop_losses: List[float],
+                             take_profits: List[float],
+                             strategy_params: Dict) -> List[Dict]:
+    """
+    공유 메모리 블록에 연결하여 _evaluate_k_value 실행 (프로세스 풀 워커)
+    
+    Args:
+        values_name: [종가, 매수 필터, K값별 돌파선...] 블록 이름
+        dates_name: int64 나노초 날짜 블록 이름
+        values_shape: values 블록 형태
+        k_index: 돌파선 행 번호 (K값 순서)
+        나머지 인자는 _evaluate_k_value와 동일
+    """
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    dates_shm = shared_memory.SharedMemory(name=dates_name)
+    values = dates = None
+    
+    try:
+        values = np.ndarray(values_shape, dtype=np.float64, buffer=values_shm.buf)
+        dates = np.ndarray(values_shape[1:], dtype=np.int64, buffer=dates_shm.buf).view('datetime64[ns]')
+        return _evaluate_k_value(values[0], values[1] > 0, values[2 + k_index], dates,
+                                 k_value, stop_losses, take_profits, strategy_params)
+    
+    finally:
+        # 버퍼를 참조하는 배열을 먼저 해제해야 블록을 닫을 수 있음
+        values = dates = None
+        values_shm.close()
+        dates_shm.close()
+
+
 def create_sample_data(start_date: str = '2023-01-01', 
                       end_date: str = '2023-12-31',
                       base_price: float = 50000000,
@@ -14,6 +14,7 @@ import logging
 from datetime import datetime, timedelta
 import json
 import warnings
+from collections import deque
 from scipy import stats
 from scipy.signal import find_peaks
 from sklearn.cluster import KMeans
@@ -80,6 +81,264 @@ class OptimizationSignal:
     expected_improvement: float
     reasoning: str
 
+# 단일 시점 분석과 같은 결과를 내기 위해 필요한 최소 윈도우 길이 (이보다 짧으면 NaN)
+FEATURE_WARMUP_PERIODS = {
+    'ma_5': 5,
+    'ma_20': 20,
+    'ma_50': 50,
+    'adx': 28,
+    'volume_ma_20': 20,
+    'rsi': 14,
+    'macd': 26,
+    'macd_signal': 34,
+    'macd_histogram': 34,
+    'bb_upper': 20,
+    'bb_middle': 20,
+    'bb_lower': 20,
+    'bb_width': 20,
+    'stoch_k': 14,
+    'stoch_d': 16,
+    'williams_r': 14,
+    'cci': 20
+}
+
+TECHNICAL_INDICATOR_KEYS = [
+    'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    'bb_upper', 'bb_middle', 'bb_lower', 'bb_width',
+    'stoch_k', 'stoch_d', 'williams_r', 'cci'
+]
+
+
+class RollingMarketFeatures:
+    """시장 상황 특징 증분 계산기 (실시간용)
+    
+    MarketConditionAnalyzer._calculate_rolling_features()와 같은 정의의 특징을
+    봉 하나씩 갱신합니다. 이동 윈도우는 고정 길이(최대 61봉) 버퍼만 사용하고
+    RSI/MACD는 EWM 상태를 이어가므로 봉당 비용이 누적 데이터 길이와 무관합니다.
+    지지/저항 레벨 계산을 위해 최근 lookback_period + 1봉의 고가/저가/종가를 보관합니다.
+    """
+    
+    RSI_WINDOW = 14
+    MACD_FAST = 12
+    MACD_SLOW = 26
+    MACD_SIGNAL = 9
+    
+    def __init__(self, lookback_period: int):
+        self.lookback_period = lookback_period
+        self.window_len = lookback_period + 1
+        self.bar_count = 0
+        
+        # 지지/저항 레벨용 윈도우
+        self.window_high = deque(maxlen=self.window_len)
+        self.window_low = deque(maxlen=self.window_len)
+        self.window_close = deque(maxlen=self.window_len)
+        
+        # 고정 길이 버퍼
+        self._closes = deque(maxlen=61)
+        self._returns = deque(maxlen=60)
+        self._highs = deque(maxlen=14)
+        self._lows = deque(maxlen=14)
+        self._volumes = deque(maxlen=20)
+        self._typical_prices = deque(maxlen=20)
+        self._tr = deque(maxlen=14)
+        self._dm_plus = deque(maxlen=14)
+        self._dm_minus = deque(maxlen=14)
+        self._dx = deque(maxlen=14)
+        self._stoch_k = deque(maxlen=3)
+        
+        # 직전 봉
+        self._prev_high = np.nan
+        self._prev_low = np.nan
+        self._prev_close = np.nan
+        
+        # EWM 상태 (adjust=False)
+        self._rsi_up = np.nan
+        self._rsi_down = np.nan
+        self._ema_fast = np.nan
+        self._ema_slow = np.nan
+        self._macd_signal = np.nan
+        self._macd_count = 0
+    
+    @property
+    def buffer_size(self) -> int:
+        """재생으로 상태를 복원할 때 필요한 최근 봉 수"""
+        return max(self.window_len, 64)
+    
+    def prime(self, data: pd.DataFrame):
+        """과거 데이터로 상태 초기화
+        
+        EWM 상태는 전체 구간 벡터 연산으로 계산하고, 고정 길이 버퍼는 최근 buffer_size봉만 재생합니다.
+        """
+        n = len(data)
+        start = max(0, n - self.buffer_size)
+        
+        if start > 0:
+            close = data['close'].reset_index(drop=True)
+            seed = start - 1
+            
+            diff = close.diff(1)
+            alpha = 1 / self.RSI_WINDOW
+            self._rsi_up = diff.where(diff > 0, 0.0).ewm(alpha=alpha, adjust=False).mean().iloc[seed]
+            self._rsi_down = (-diff.where(diff < 0, 0.0)).ewm(alpha=alpha, adjust=False).mean().iloc[seed]
+            
+            ema_fast = close.ewm(span=self.MACD_FAST, adjust=False).mean()
+            ema_slow = close.ewm(span=self.MACD_SLOW, adjust=False).mean()
+            self._ema_fast = ema_fast.iloc[seed]
+            self._ema_slow = ema_slow.iloc[seed]
+            
+            macd = (ema_fast - ema_slow).where(close.index >= self.MACD_SLOW - 1)
+            self._macd_signal = macd.ewm(span=self.MACD_SIGNAL, adjust=False).mean().iloc[seed]
+            self._macd_count = max(0, seed - (self.MACD_SLOW - 1) + 1)
+            
+            self._prev_high = data['high'].iloc[seed]
+            self._prev_low = data['low'].iloc[seed]
+            self._prev_close = data['close'].iloc[seed]
+            self.bar_count = start
+        
+        tail = data.iloc[start:]
+        for high, low, close, volume in zip(tail['high'].values, tail['low'].values,
+                                            tail['close'].values, tail['volume'].values):
+            self.update(high, low, close, volume)
+    
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """새 봉 반영 후 특징 반환"""
+        prev_high, prev_low, prev_close = self._prev_high, self._prev_low, self._prev_close
+        self.bar_count += 1
+        
+        self.window_high.append(high)
+        self.window_low.append(low)
+        self.window_close.append(close)
+        self._closes.append(close)
+        self._highs.append(high)
+        self._lows.append(low)
+        self._volumes.append(volume)
+        self._typical_prices.append((high + low + close) / 3.0)
+        if not np.isnan(prev_close):
+            self._returns.append((close - prev_close) / prev_close)
+        
+        # True Range / Directional Movement
+        self._tr.append(np.nanmax([high - low, abs(high - prev_close), abs(low - prev_close)]))
+        dm_plus = high - prev_high
+        dm_minus = prev_low - low
+        if dm_plus < 0:
+            dm_plus = 0
+        if dm_minus < 0:
+            dm_minus = 0
+        if dm_plus <= dm_minus:
+            dm_plus = 0
+        if dm_minus <= dm_plus:
+            dm_minus = 0
+        self._dm_plus.append(dm_plus)
+        self._dm_minus.append(dm_minus)
+        
+        tr_smooth = self._full_mean(self._tr, 14)
+        di_plus = 100 * (self._full_mean(self._dm_plus, 14) / tr_smooth)
+        di_minus = 100 * (self._full_mean(self._dm_minus, 14) / tr_smooth)
+        self._dx.append(100 * abs(di_plus - di_minus) / (di_plus + di_minus))
+        
+        # RSI (Wilder EWM)
+        diff = close - prev_close
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        alpha = 1 / self.RSI_WINDOW
+        self._rsi_up = up if np.isnan(self._rsi_up) else (1 - alpha) * self._rsi_up + alpha * up
+        self._rsi_down = down if np.isnan(self._rsi_down) else (1 - alpha) * self._rsi_down + alpha * down
+        
+        # MACD
+        self._ema_fast = self._ema_step(self._ema_fast, close, self.MACD_FAST)
+        self._ema_slow = self._ema_step(self._ema_slow, close, self.MACD_SLOW)
+        macd = np.nan
+        if self.bar_count >= self.MACD_SLOW:
+            macd = self._ema_fast - self._ema_slow
+            self._macd_signal = macd if self._macd_count == 0 else self._ema_step(self._macd_signal, macd, self.MACD_SIGNAL)
+            self._macd_count += 1
+        macd_signal = self._macd_signal if self._macd_count >= self.MACD_SIGNAL else np.nan
+        
+        # 스토캐스틱 / 윌리엄스 %R
+        highest_high = max(self._highs) if len(self._highs) == 14 else np.nan
+        lowest_low = min(self._lows) if len(self._lows) == 14 else np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stoch_k = np.float64(100) * (close - lowest_low) / (highest_high - lowest_low)
+            williams_r = np.float64(-100) * (highest_high - close) / (highest_high - lowest_low)
+        self._stoch_k.append(stoch_k)
+        
+        # 볼린저 밴드
+        bb_middle = self._full_mean(self._closes, 20)
+        bb_std = np.std(list(self._closes)[-20:]) if len(self._closes) >= 20 else np.nan
+        bb_upper = bb_middle + 2 * bb_std
+        bb_lower = bb_middle - 2 * bb_std
+        
+        # CCI
+        cci = np.nan
+        if len(self._typical_prices) == 20:
+            typical = np.asarray(self._typical_prices)
+            cci = (typical[-1] - typical.mean()) / (0.015 * np.mean(np.abs(typical - typical.mean())))
+        
+        rsi = 100 if self._rsi_down == 0 else 100 - (100 / (1 + self._rsi_up / self._rsi_down))
+        if self.bar_count < self.RSI_WINDOW:
+            rsi = np.nan
+        
+        features = {
+            'volatility': self._weighted_volatility(),
+            'ma_5': self._full_mean(self._closes, 5),
+            'ma_20': self._full_mean(self._closes, 20),
+            'ma_50': self._full_mean(self._closes, 50),
+            'adx': self._full_mean(self._dx, 14) / 100,
+            'momentum_5': self._lag_return(5),
+            'momentum_20': self._lag_return(20),
+            'momentum_60': self._lag_return(60),
+            'volume_ma_20': self._full_mean(self._volumes, 20),
+            'recent_volume': np.mean(list(self._volumes)[-min(5, self.window_len):]),
+            'rsi': rsi,
+            'macd': macd,
+            'macd_signal': macd_signal,
+            'macd_histogram': macd - macd_signal,
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'bb_width': (bb_upper - bb_lower) / bb_middle,
+            'stoch_k': stoch_k,
+            'stoch_d': self._full_mean(self._stoch_k, 3),
+            'williams_r': williams_r,
+            'cci': cci
+        }
+        
+        self._prev_high, self._prev_low, self._prev_close = high, low, close
+        return features
+    
+    def _weighted_volatility(self) -> float:
+        """가중 평균 변동성 (단기 50%, 중기 30%, 장기 20%)"""
+        returns = list(self._returns)[-self.lookback_period:] if self.lookback_period > 0 else []
+        
+        def tail_std(n: int) -> float:
+            tail = returns[-n:]
+            return np.std(tail, ddof=1) * np.sqrt(252) if len(tail) > 1 else np.nan
+        
+        return tail_std(5) * 0.5 + tail_std(20) * 0.3 + tail_std(60) * 0.2
+    
+    def _lag_return(self, lag: int) -> float:
+        """lag봉 전 대비 수익률"""
+        if len(self._closes) <= lag:
+            return np.nan
+        base = self._closes[-1 - lag]
+        return (self._closes[-1] - base) / base
+    
+    @staticmethod
+    def _full_mean(values: deque, window: int) -> float:
+        """최근 window개 평균 (값이 부족하거나 NaN이 있으면 NaN)"""
+        if len(values) < window:
+            return np.nan
+        return np.mean(list(values)[-window:])
+    
+    @staticmethod
+    def _ema_step(previous: float, value: float, span: int) -> float:
+        """EMA 한 단계 갱신 (adjust=False)"""
+        if np.isnan(previous):
+            return value
+        alpha = 2 / (span + 1)
+        return (1 - alpha) * previous + alpha * value
+
+
 class MarketConditionAnalyzer:
     """시장 상황 분석기"""
     
@@ -92,6 +351,10 @@ class MarketConditionAnalyzer:
         self.regime_transitions: List[MarketRegimeTransition] = []
         self.optimization_signals: List[OptimizationSignal] = []
         
+        # 실시간 갱신 상태 (analyze_market_conditions() 이후 update_market_condition()에서 사용)
+        self._history: Optional[pd.DataFrame] = None
+        self._rolling_features: Optional[RollingMarketFeatures] = None
+        
         # 임계값 설정
         self.volatility_thresholds = {
             VolatilityRegime.VERY_LOW: 0.01,
@@ -112,19 +375,30 @@ class MarketConditionAnalyzer:
         self.logger.info("시장 상황 분석기 초기화 완료")
     
     def analyze_market_conditions(self, data: pd.DataFrame) -> List[MarketCondition]:
-        """시장 상황 종합 분석"""
+        """시장 상황 종합 분석
+        
+        시점별 윈도우를 복사해 다시 분석하지 않고, 전체 구간의 롤링 지표를 한 번에 계산한 뒤
+        각 시점의 값을 읽어 MarketCondition을 만듭니다. 윈도우 내부 계산과 결과가 같으며,
+        EWM 기반 지표(RSI, MACD)만 윈도우 시작점에서 초기화되지 않고 전체 이력으로 계산됩니다.
+        """
         self.logger.info("시장 상황 분석 시작")
         
         conditions = []
         
+        features = self._calculate_rolling_features(data).to_dict('records')
+        timestamps = data['timestamp'].tolist() if 'timestamp' in data.columns else list(range(len(data)))
+        high = data['high'].values
+        low = data['low'].values
+        close = data['close'].values
+        
         # 각 시점별로 분석
         for i in range(self.lookback_period, len(data)):
-            analysis_date = data.iloc[i]['timestamp'] if 'timestamp' in data.columns else i
-            window_data = data.iloc[i-self.lookback_period:i+1].copy()
+            window = slice(i - self.lookback_period, i + 1)
             
             try:
-                # 기본 시장 상황 분석
-                condition = self._analyze_single_period(window_data, analysis_date)
+                condition = self._build_market_condition(
+                    timestamps[i], features[i], high[window], low[window], close[window]
+                )
                 conditions.append(condition)
                 
             except Exception as e:
@@ -133,6 +407,10 @@ class MarketConditionAnalyzer:
         
         self.market_conditions = conditions
         
+        # 실시간 갱신 상태는 첫 update_market_condition() 호출 시 준비
+        self._history = data
+        self._rolling_features = None
+        
         # 체제 전환 분석
         self._analyze_regime_transitions()
         
@@ -143,6 +421,180 @@ class MarketConditionAnalyzer:
         
         return conditions
     
+    def update_market_condition(self, bar: Dict[str, Any]) -> Optional[MarketCondition]:
+        """새 봉 하나로 시장 상황 갱신 (실시간용)
+        
+        지표 상태를 증분 갱신하므로 봉당 비용이 누적 데이터 길이와 무관합니다.
+        (지지/저항 레벨만 최근 lookback_period 구간을 사용)
+        
+        Args:
+            bar: 'high', 'low', 'close', 'volume' (선택: 'timestamp')를 포함한 봉 데이터
+            
+        Returns:
+            MarketCondition: 갱신된 시장 상황 (데이터가 lookback_period보다 적으면 None)
+        """
+        if self._rolling_features is None:
+            self._rolling_features = RollingMarketFeatures(self.lookback_period)
+            if self._history is not None:
+                self._rolling_features.prime(self._history)
+                self._history = None
+        
+        state = self._rolling_features
+        features = state.update(bar['high'], bar['low'], bar['close'], bar['volume'])
+        
+        if state.bar_count <= self.lookback_period:
+            return None
+        
+        timestamp = bar.get('timestamp', state.bar_count - 1)
+        condition = self._build_market_condition(
+            timestamp, features,
+            np.asarray(state.window_high), np.asarray(state.window_low), np.asarray(state.window_close)
+        )
+        
+        # 체제 전환 및 최적화 신호 갱신
+        if self.market_conditions:
+            prev_condition = self.market_conditions[-1]
+            if prev_condition.regime != condition.regime:
+                self.regime_transitions.append(MarketRegimeTransition(
+                    from_regime=prev_condition.regime,
+                    to_regime=condition.regime,
+                    transition_date=condition.timestamp,
+                    confidence=self._calculate_transition_confidence(prev_condition, condition),
+                    trigger_factors=self._identify_trigger_factors(prev_condition, condition)
+                ))
+        
+        self.market_conditions.append(condition)
+        self.optimization_signals.extend(self._generate_regime_based_signals(condition))
+        
+        return condition
+    
+    def _calculate_rolling_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """전체 구간 롤링 특징 계산 (각 행은 해당 시점까지의 lookback 윈도우 분석값)"""
+        high = data['high'].reset_index(drop=True)
+        low = data['low'].reset_index(drop=True)
+        close = data['close'].reset_index(drop=True)
+        volume = data['volume'].reset_index(drop=True)
+        window_len = self.lookback_period + 1
+        
+        features = pd.DataFrame(index=close.index)
+        
+        # 변동성: 윈도우 내 수익률(lookback_period개)의 최근 5/20/60개 표준편차
+        returns = close.pct_change()
+        short_volatility, medium_volatility, long_volatility = (
+            returns.rolling(max(1, min(n, self.lookback_period))).std() * np.sqrt(252)
+            for n in (5, 20, 60)
+        )
+        features['volatility'] = (
+            short_volatility * 0.5 +
+            medium_volatility * 0.3 +
+            long_volatility * 0.2
+        )
+        
+        # 추세: 이동평균과 ADX
+        for period in (5, 20, 50):
+            features[f'ma_{period}'] = close.rolling(period).mean()
+        features['adx'] = self._calculate_adx(high, low, close) / 100
+        
+        # 모멘텀
+        for lag in (5, 20, 60):
+            base = close.shift(lag)
+            features[f'momentum_{lag}'] = (close - base) / base
+        
+        # 거래량
+        features['volume_ma_20'] = volume.rolling(20).mean()
+        features['recent_volume'] = volume.rolling(min(5, window_len)).mean()
+        
+        # 기술적 지표
+        try:
+            features['rsi'] = ta.momentum.RSIIndicator(close).rsi()
+            
+            macd = ta.trend.MACD(close)
+            features['macd'] = macd.macd()
+            features['macd_signal'] = macd.macd_signal()
+            features['macd_histogram'] = macd.macd_diff()
+            
+            bb = ta.volatility.BollingerBands(close)
+            features['bb_upper'] = bb.bollinger_hband()
+            features['bb_middle'] = bb.bollinger_mavg()
+            features['bb_lower'] = bb.bollinger_lband()
+            features['bb_width'] = (features['bb_upper'] - features['bb_lower']) / features['bb_middle']
+            
+            stoch = ta.momentum.StochasticOscillator(high, low, close)
+            features['stoch_k'] = stoch.stoch()
+            features['stoch_d'] = stoch.stoch_signal()
+            
+            features['williams_r'] = ta.momentum.WilliamsRIndicator(high, low, close).williams_r()
+            features['cci'] = ta.trend.CCIIndicator(high, low, close).cci()
+            
+        except Exception as e:
+            self.logger.warning(f"기술적 지표 계산 실패: {e}")
+        
+        return features
+    
+    def _build_market_condition(self,
+                                timestamp: Any,
+                                features: Dict[str, float],
+                                high: np.ndarray,
+                                low: np.ndarray,
+                                close: np.ndarray) -> MarketCondition:
+        """시점별 특징과 윈도우 가격으로 MarketCondition 생성"""
+        window_len = len(close)
+        
+        # 윈도우가 짧아 단일 시점 분석에서 계산되지 않는 값은 NaN 처리
+        features = {
+            key: (np.nan if FEATURE_WARMUP_PERIODS.get(key, 0) > window_len else value)
+            for key, value in features.items()
+        }
+        
+        # 변동성 분석
+        volatility = features['volatility']
+        volatility_regime = self._classify_volatility(volatility)
+        
+        # 추세 분석
+        trend_direction = self._classify_trend_direction(features['ma_5'], features['ma_20'], features['ma_50'])
+        adx = features['adx']
+        trend_strength = self._classify_trend_strength(adx if not pd.isna(adx) else 0)
+        
+        # 모멘텀 분석 (가중 평균 모멘텀)
+        momentum_5, momentum_20, momentum_60 = (
+            features[f'momentum_{lag}'] if window_len > lag else 0
+            for lag in (5, 20, 60)
+        )
+        momentum = (
+            momentum_5 * 0.5 +
+            momentum_20 * 0.3 +
+            momentum_60 * 0.2
+        )
+        
+        # 거래량 프로필 분석
+        avg_volume = features['volume_ma_20']
+        volume_ratio = features['recent_volume'] / avg_volume if avg_volume > 0 else 1
+        volume_profile = self._classify_volume_ratio(volume_ratio)
+        
+        # 지지/저항 레벨 분석
+        support_resistance = self._find_levels(high, low, close)
+        
+        # 기술적 지표
+        technical_indicators = {key: features[key] for key in TECHNICAL_INDICATOR_KEYS if key in features}
+        
+        # 종합 시장 체제 결정
+        regime = self._determine_market_regime(
+            volatility_regime, trend_strength, trend_direction, momentum
+        )
+        
+        return MarketCondition(
+            timestamp=timestamp,
+            regime=regime,
+            volatility_regime=volatility_regime,
+            trend_strength=trend_strength,
+            trend_direction=trend_direction,
+            volatility=volatility,
+            momentum=momentum,
+            volume_profile=volume_profile,
+            support_resistance_levels=support_resistance,
+            technical_indicators=technical_indicators
+        )
+    
     def _analyze_single_period(self, data: pd.DataFrame, timestamp: datetime) -> MarketCondition:
         """단일 시점 분석"""
         # 변동성 분석
@@ -201,12 +653,15 @@ class MarketConditionAnalyzer:
             long_volatility * 0.2
         )
         
-        # 변동성 체제 결정
+        return self._classify_volatility(weighted_volatility), weighted_volatility
+    
+    def _classify_volatility(self, weighted_volatility: float) -> VolatilityRegime:
+        """변동성 체제 결정"""
         for regime, threshold in self.volatility_thresholds.items():
             if weighted_volatility < threshold:
-                return regime, weighted_volatility
+                return regime
         
-        return VolatilityRegime.VERY_HIGH, weighted_volatility
+        return VolatilityRegime.VERY_HIGH
     
     def _analyze_trend(self, data: pd.DataFrame) -> Tuple[TrendStrength, int]:
         """추세 분석"""
@@ -222,30 +677,37 @@ class MarketConditionAnalyzer:
         recent_20 = ma_20.iloc[-1]
         recent_50 = ma_50.iloc[-1]
         
-        # 추세 방향 (1: 상승, -1: 하락, 0: 횡보)
-        if recent_5 > recent_20 > recent_50:
-            trend_direction = 1
-        elif recent_5 < recent_20 < recent_50:
-            trend_direction = -1
-        else:
-            trend_direction = 0
+        trend_direction = self._classify_trend_direction(recent_5, recent_20, recent_50)
         
         # 추세 강도 계산 (ADX 유사)
         trend_strength = self._calculate_trend_strength(data)
         
-        # 추세 강도 등급 결정
+        return self._classify_trend_strength(trend_strength), trend_direction
+    
+    def _classify_trend_direction(self, ma_5: float, ma_20: float, ma_50: float) -> int:
+        """추세 방향 (1: 상승, -1: 하락, 0: 횡보)"""
+        if ma_5 > ma_20 > ma_50:
+            return 1
+        elif ma_5 < ma_20 < ma_50:
+            return -1
+        return 0
+    
+    def _classify_trend_strength(self, trend_strength: float) -> TrendStrength:
+        """추세 강도 등급 결정"""
         for strength, threshold in self.trend_strength_thresholds.items():
             if trend_strength < threshold:
-                return strength, trend_direction
+                return strength
         
-        return TrendStrength.VERY_STRONG, trend_direction
+        return TrendStrength.VERY_STRONG
     
     def _calculate_trend_strength(self, data: pd.DataFrame) -> float:
         """추세 강도 계산 (ADX 유사)"""
-        high = data['high']
-        low = data['low']
-        close = data['close']
+        adx = self._calculate_adx(data['high'], data['low'], data['close']).iloc[-1]
         
+        return adx / 100 if not pd.isna(adx) else 0
+    
+    def _calculate_adx(self, high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+        """ADX 유사 지표 시계열 계산"""
         # True Range 계산
         tr1 = high - low
         tr2 = abs(high - close.shift(1))
@@ -275,10 +737,8 @@ class MarketConditionAnalyzer:
         # DX 계산
         dx = 100 * abs(di_plus - di_minus) / (di_plus + di_minus)
         
-        # ADX 계산 (최근값)
-        adx = dx.rolling(14).mean().iloc[-1]
-        
-        return adx / 100 if not pd.isna(adx) else 0
+        # ADX 계산
+        return dx.rolling(14).mean()
     
     def _analyze_momentum(self, data: pd.DataFrame) -> float:
         """모멘텀 분석"""
@@ -309,6 +769,10 @@ class MarketConditionAnalyzer:
         
         volume_ratio = recent_volume / avg_volume if avg_volume > 0 else 1
         
+        return self._classify_volume_ratio(volume_ratio)
+    
+    def _classify_volume_ratio(self, volume_ratio: float) -> str:
+        """거래량 비율로 프로필 결정"""
         if volume_ratio > 1.5:
             return "high"
         elif volume_ratio < 0.7:
@@ -318,10 +782,10 @@ class MarketConditionAnalyzer:
     
     def _find_support_resistance_levels(self, data: pd.DataFrame) -> List[float]:
         """지지/저항 레벨 찾기"""
-        high = data['high'].values
-        low = data['low'].values
-        close = data['close'].values
-        
+        return self._find_levels(data['high'].values, data['low'].values, data['close'].values)
+    
+    def _find_levels(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> List[float]:
+        """가격 배열에서 지지/저항 레벨 찾기"""
         levels = []
         
         # 고점 찾기 (저항)
@@ -7,7 +7,7 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Dict, List, Tuple, Optional, Any, Union, Callable
 from dataclasses import dataclass, field
 from enum import Enum
 import logging
@@ -19,6 +19,7 @@ import warnings
 from scipy.optimize import minimize, differential_evolution
 from sklearn.model_selection import TimeSeriesSplit
 import itertools
+from functools import partial
 
 warnings.filterwarnings('ignore')
 
@@ -60,6 +61,7 @@ class OptimizationResult:
     iterations: int
     convergence_history: List[float] = field(default_factory=list)
     parameter_history: List[Dict[str, float]] = field(default_factory=list)
+    pruned_combinations: int = 0
 
 @dataclass
 class StrategyConfig:
@@ -70,11 +72,52 @@ class StrategyConfig:
     max_position_size: float = 0.1  # 10%
     min_trade_size: float = 10000   # 1만원
 
+# 그리드 서치 워커 프로세스 상태 (프로세스당 한 번만 전달)
+_grid_search_worker_state: Dict[str, Any] = {}
+
+
+def _init_grid_search_worker(optimizer: 'ParameterOptimizer',
+                             data: pd.DataFrame,
+                             screening_data: Optional[pd.DataFrame]):
+    """그리드 서치 워커 초기화 (최적화 엔진과 데이터를 워커에 한 번만 전달)"""
+    _grid_search_worker_state['optimizer'] = optimizer
+    _grid_search_worker_state['data'] = data
+    _grid_search_worker_state['screening_data'] = screening_data
+
+
+def _screen_parameters_worker(parameters: Dict[str, float]) -> float:
+    """단일 폴드 평가 워커 (연속 절반 가지치기 1단계)"""
+    optimizer = _grid_search_worker_state['optimizer']
+    return optimizer._evaluate_parameters(_grid_search_worker_state['screening_data'], parameters)
+
+
+def _cross_validate_parameters_worker(parameters: Dict[str, float], cv_folds: int,
+                                      last_fold_score: Optional[float] = None) -> List[float]:
+    """전체 교차 검증 워커 (연속 절반 가지치기 2단계)"""
+    optimizer = _grid_search_worker_state['optimizer']
+    return optimizer._cross_validate_parameters(_grid_search_worker_state['data'], parameters, cv_folds,
+                                                last_fold_score)
+
+
 class ParameterOptimizer:
     """파라미터 최적화 엔진"""
     
-    def __init__(self, config: StrategyConfig = None):
+    def __init__(self, 
+                 config: StrategyConfig = None,
+                 n_workers: Optional[int] = None,
+                 prune_ratio: float = 0.0):
+        """
+        Args:
+            config: 전략 설정
+            n_workers: 그리드 서치 워커 프로세스 수 (None이면 CPU 코어 수, 1이면 순차 실행)
+            prune_ratio: 단일 폴드 평가 후 제외할 하위 조합 비율 (기본값 0: 가지치기 없이 모든 조합 전체 교차 검증)
+        """
+        if not 0 <= prune_ratio < 1:
+            raise ValueError(f"prune_ratio는 0 이상 1 미만이어야 합니다: {prune_ratio}")
+        
         self.config = config or StrategyConfig()
+        self.n_workers = n_workers or mp.cpu_count()
+        self.prune_ratio = prune_ratio
         self.logger = logging.getLogger(__name__)
         
         # 파라미터 범위 정의
@@ -165,7 +208,14 @@ class ParameterOptimizer:
                                  data: pd.DataFrame, 
                                  parameters: List[ParameterType],
                                  cv_folds: int) -> OptimizationResult:
-        """그리드 서치 최적화"""
+        """그리드 서치 최적화 (프로세스 병렬 + 연속 절반 가지치기)
+        
+        1단계: 모든 조합을 마지막 폴드 하나로 평가하고 하위 prune_ratio 비율을 제외
+        2단계: 남은 조합만 전체 교차 검증으로 평가 (마지막 폴드는 1단계 점수 재사용)
+        
+        convergence_history/parameter_history에는 전체 교차 검증 평균 점수만 조합 순서대로 기록되며,
+        가지치기된 조합은 기록하지 않습니다 (개수는 pruned_combinations).
+        """
         self.logger.info("그리드 서치 최적화 시작")
         
         # 파라미터 조합 생성
@@ -179,25 +229,72 @@ class ParameterOptimizer:
         total_combinations = len(param_combinations)
         self.logger.info(f"총 {total_combinations}개 파라미터 조합 테스트")
         
-        for i, param_combo in enumerate(param_combinations):
-            try:
-                # 교차 검증으로 성능 평가
-                cv_scores = self._cross_validate_parameters(data, param_combo, cv_folds)
-                avg_score = np.mean(cv_scores)
-                
-                convergence_history.append(avg_score)
-                parameter_history.append(param_combo.copy())
+        use_pruning = self.prune_ratio > 0 and total_combinations > 1 and cv_folds > 1
+        screening_data = self._get_screening_fold(data, cv_folds) if use_pruning else None
+        
+        n_workers = min(self.n_workers, total_combinations)
+        executor = None
+        if n_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_grid_search_worker,
+                initargs=(self, data, screening_data)
+            )
+            self.logger.info(f"병렬 그리드 서치: {n_workers}개 워커")
+        
+        try:
+            # 1단계: 단일 폴드 평가 후 하위 조합 가지치기
+            screening_scores = [None] * total_combinations
+            survivors = set(range(total_combinations))
+            
+            if use_pruning:
+                screening_scores = self._map_parameter_combinations(
+                    executor, param_combinations,
+                    _screen_parameters_worker,
+                    lambda combo: self._evaluate_parameters(screening_data, combo)
+                )
                 
-                if avg_score > best_score:
-                    best_score = avg_score
-                    best_parameters = param_combo.copy()
+                screened = [i for i, score in enumerate(screening_scores) if score is not None]
+                n_keep = max(1, int(np.ceil(len(screened) * (1 - self.prune_ratio))))
+                # 점수 내림차순 (NaN은 최하위, 동점이면 조합 순서 유지)
+                ranked = sorted(
+                    screened,
+                    key=lambda i: np.inf if np.isnan(screening_scores[i]) else -screening_scores[i]
+                )
+                survivors = set(ranked[:n_keep])
                 
-                if (i + 1) % 100 == 0:
-                    self.logger.info(f"진행률: {i+1}/{total_combinations} ({((i+1)/total_combinations)*100:.1f}%)")
-                    
-            except Exception as e:
-                self.logger.warning(f"파라미터 조합 {param_combo} 평가 실패: {e}")
+                self.logger.info(f"1단계 단일 폴드 평가 완료: {len(survivors)}/{total_combinations}개 조합 통과")
+            
+            # 2단계: 남은 조합만 전체 교차 검증
+            survivor_indices = [i for i in range(total_combinations) if i in survivors]
+            survivor_scores = self._map_parameter_combinations(
+                executor, [param_combinations[i] for i in survivor_indices],
+                partial(_cross_validate_parameters_worker, cv_folds=cv_folds),
+                lambda combo, last_fold_score: self._cross_validate_parameters(
+                    data, combo, cv_folds, last_fold_score
+                ),
+                combination_args=[(screening_scores[i],) for i in survivor_indices]
+            )
+            cv_scores_by_index = dict(zip(survivor_indices, survivor_scores))
+        
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        # 조합 순서대로 결과 집계
+        for i, param_combo in enumerate(param_combinations):
+            cv_scores = cv_scores_by_index.get(i)
+            if cv_scores is None:
                 continue
+            
+            avg_score = np.mean(cv_scores)
+            
+            if avg_score > best_score:
+                best_score = avg_score
+                best_parameters = param_combo.copy()
+            
+            convergence_history.append(avg_score)
+            parameter_history.append(param_combo.copy())
         
         return OptimizationResult(
             best_parameters=best_parameters,
@@ -206,9 +303,46 @@ class ParameterOptimizer:
             method=OptimizationMethod.GRID_SEARCH,
             iterations=total_combinations,
             convergence_history=convergence_history,
-            parameter_history=parameter_history
+            parameter_history=parameter_history,
+            pruned_combinations=total_combinations - len(survivors)
         )
     
+    def _map_parameter_combinations(self,
+                                    executor: Optional[ProcessPoolExecutor],
+                                    combinations: List[Dict[str, float]],
+                                    worker_func: Callable[..., Any],
+                                    serial_func: Callable[..., Any],
+                                    combination_args: Optional[List[tuple]] = None) -> List[Any]:
+        """조합별 평가 실행 (조합 순서대로 결과 반환, 실패한 조합은 None)
+        
+        combination_args가 있으면 조합마다 해당 인자를 함께 전달합니다.
+        """
+        combination_args = combination_args or [()] * len(combinations)
+        futures = None
+        if executor is not None:
+            futures = [executor.submit(worker_func, combo, *args)
+                       for combo, args in zip(combinations, combination_args)]
+        
+        results = []
+        for i, param_combo in enumerate(combinations):
+            try:
+                results.append(futures[i].result() if futures
+                               else serial_func(param_combo, *combination_args[i]))
+            except Exception as e:
+                self.logger.warning(f"파라미터 조합 {param_combo} 평가 실패: {e}")
+                results.append(None)
+            
+            if (i + 1) % 100 == 0:
+                self.logger.info(f"진행률: {i+1}/{len(combinations)} ({((i+1)/len(combinations))*100:.1f}%)")
+        
+        return results
+    
+    def _get_screening_fold(self, data: pd.DataFrame, cv_folds: int) -> pd.DataFrame:
+        """가지치기용 단일 폴드 데이터 (시계열 교차 검증의 마지막 테스트 구간)"""
+        tscv = TimeSeriesSplit(n_splits=cv_folds)
+        _, test_idx = list(tscv.split(data))[-1]
+        return data.iloc[test_idx].copy()
+    
     def _genetic_algorithm_optimization(self, 
                                       data: pd.DataFrame, 
                                       parameters: List[ParameterType]) -> OptimizationResult:
@@ -334,13 +468,23 @@ class ParameterOptimizer:
     def _cross_validate_parameters(self, 
                                   data: pd.DataFrame, 
                                   parameters: Dict[str, float], 
-                                  cv_folds: int) -> List[float]:
-        """교차 검증으로 파라미터 평가"""
+                                  cv_folds: int,
+                                  last_fold_score: Optional[float] = None) -> List[float]:
+        """교차 검증으로 파라미터 평가
+        
+        last_fold_score가 있으면 마지막 폴드는 다시 평가하지 않고 그 점수를 사용합니다
+        (그리드 서치 1단계에서 같은 폴드로 이미 평가한 경우).
+        """
         # 시계열 교차 검증
         tscv = TimeSeriesSplit(n_splits=cv_folds)
         scores = []
+        folds = list(tscv.split(data))
         
-        for train_idx, test_idx in tscv.split(data):
+        for fold_index, (train_idx, test_idx) in enumerate(folds):
+            if last_fold_score is not None and fold_index == len(folds) - 1:
+                scores.append(last_fold_score)
+                continue
+            
             train_data = data.iloc[train_idx].copy()
             test_data = data.iloc[test_idx].copy()
             
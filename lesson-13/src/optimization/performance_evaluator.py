@@ -7,10 +7,14 @@
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any, Union
-from dataclasses import dataclass, field
+from typing import Dict, List, Tuple, Optional, Any, Union, Callable
+from dataclasses import dataclass, field, replace
 from enum import Enum
 import logging
+import pickle
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
 from datetime import datetime, timedelta
 import json
 import warnings
@@ -117,6 +121,32 @@ class BacktestResult:
     performance_metrics: PerformanceMetrics
     benchmark_comparison: Dict[str, float] = field(default_factory=dict)
     period_performance: Dict[PerformancePeriod, PerformanceMetrics] = field(default_factory=dict)
+    monte_carlo_summary: Dict[str, float] = field(default_factory=dict)
+    walk_forward_windows: List[Dict[str, Any]] = field(default_factory=list)
+
+# 워크 포워드 워커 프로세스 상태 (초기화 시 한 번만 전달)
+_walk_forward_worker_state: Dict[str, Any] = {}
+
+
+def _init_walk_forward_worker(evaluator, strategy_func, data, param_grid, optimization_metric, strategy_kwargs):
+    """워크 포워드 워커 초기화"""
+    _walk_forward_worker_state.update(
+        evaluator=evaluator,
+        strategy_func=strategy_func,
+        data=data,
+        param_grid=param_grid,
+        optimization_metric=optimization_metric,
+        strategy_kwargs=strategy_kwargs
+    )
+
+
+def _run_walk_forward_window_worker(window: Tuple[int, int, int]) -> Dict[str, Any]:
+    """워크 포워드 윈도우 하나 실행 (워커 프로세스)"""
+    state = _walk_forward_worker_state
+    return state['evaluator']._run_walk_forward_window(
+        state['strategy_func'], state['data'], window,
+        state['param_grid'], state['optimization_metric'], state['strategy_kwargs']
+    )
 
 class PerformanceEvaluator:
     """성능 평가 시스템"""
@@ -169,6 +199,44 @@ class PerformanceEvaluator:
     
     def _simple_backtest(self, strategy_func, data: pd.DataFrame, **kwargs) -> BacktestResult:
         """단순 백테스트"""
+        trades, equity_series, daily_returns_series, capital = self._simulate_trades(
+            strategy_func, data, data.iterrows(), **kwargs
+        )
+        
+        performance_metrics = self._calculate_performance_metrics(
+            equity_series, daily_returns_series, trades
+        )
+        
+        # 벤치마크 비교
+        benchmark_comparison = self._calculate_benchmark_comparison(daily_returns_series)
+        
+        # 기간별 성과
+        period_performance = self._calculate_period_performance(daily_returns_series)
+        
+        return BacktestResult(
+            start_date=data.index[0],
+            end_date=data.index[-1],
+            initial_capital=self.initial_capital,
+            final_capital=capital,
+            total_trades=len(trades),
+            trades=trades,
+            daily_returns=daily_returns_series,
+            equity_curve=equity_series,
+            performance_metrics=performance_metrics,
+            benchmark_comparison=benchmark_comparison,
+            period_performance=period_performance
+        )
+    
+    def _simulate_trades(self, strategy_func, data: pd.DataFrame, rows,
+                         **kwargs) -> Tuple[List[TradeRecord], pd.Series, pd.Series, float]:
+        """전략 신호에 따라 거래 시뮬레이션
+        
+        Args:
+            rows: data.iterrows() 또는 미리 만들어 둔 (index, row) 목록
+            
+        Returns:
+            (거래 목록, 자본 곡선, 일일 수익률, 최종 자본)
+        """
         trades = []
         equity_curve = []
         daily_returns = []
@@ -176,7 +244,7 @@ class PerformanceEvaluator:
         capital = self.initial_capital
         position = None
         
-        for i, row in data.iterrows():
+        for i, row in rows:
             current_time = row.get('timestamp', i)
             current_price = row['close']
             
@@ -269,59 +337,106 @@ class PerformanceEvaluator:
             trades.append(trade)
             capital += net_pnl
         
-        # 성과 지표 계산
         equity_series = pd.Series(equity_curve, index=data.index)
         daily_returns_series = pd.Series(daily_returns, index=data.index[1:])
         
-        performance_metrics = self._calculate_performance_metrics(
-            equity_series, daily_returns_series, trades
-        )
-        
-        # 벤치마크 비교
-        benchmark_comparison = self._calculate_benchmark_comparison(daily_returns_series)
-        
-        # 기간별 성과
-        period_performance = self._calculate_period_performance(daily_returns_series)
-        
-        return BacktestResult(
-            start_date=data.index[0],
-            end_date=data.index[-1],
-            initial_capital=self.initial_capital,
-            final_capital=capital,
-            total_trades=len(trades),
-            trades=trades,
-            daily_returns=daily_returns_series,
-            equity_curve=equity_series,
-            performance_metrics=performance_metrics,
-            benchmark_comparison=benchmark_comparison,
-            period_performance=period_performance
-        )
+        return trades, equity_series, daily_returns_series, capital
     
     def _walk_forward_backtest(self, strategy_func, data: pd.DataFrame, 
-                             window_size: int = 252, step_size: int = 30, **kwargs) -> BacktestResult:
-        """워크 포워드 백테스트"""
+                             window_size: int = 252, step_size: int = 30,
+                             param_grid: Optional[Dict[str, List[Any]]] = None,
+                             optimization_metric: str = 'sharpe_ratio',
+                             indicator_func: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+                             n_workers: Optional[int] = None,
+                             **kwargs) -> BacktestResult:
+        """워크 포워드 백테스트
+        
+        각 윈도우의 앞 절반(학습 구간)에서 param_grid 조합을 평가해 최적 파라미터를 고르고,
+        이어지는 step_size 구간(검증 구간)을 그 파라미터로 실행합니다. 윈도우들은 서로 독립적인
+        작업으로 프로세스 풀에서 실행되고, 검증 구간의 자본 곡선은 이전 구간의 최종 자본에서
+        이어지도록 연결됩니다.
+        
+        Args:
+            window_size: 학습 + 검증 윈도우 길이 (학습 구간은 window_size // 2)
+            step_size: 윈도우 이동 간격 (검증 구간 길이의 상한)
+            param_grid: 학습 구간에서 탐색할 전략 파라미터 후보 ({이름: 값 목록})
+            optimization_metric: 학습 구간 평가 지표 (PerformanceMetrics 필드명)
+            indicator_func: 지표 열을 추가하는 함수. 윈도우마다 다시 계산하지 않도록
+                전체 데이터에서 한 번만 계산합니다.
+            n_workers: 워커 프로세스 수 (None: 모든 CPU 코어, 1: 순차 실행)
+        """
+        train_size = window_size // 2
+        test_size = min(window_size - train_size, step_size)
+        windows = [
+            (start_idx, start_idx + train_size, start_idx + train_size + test_size)
+            for start_idx in range(0, len(data) - window_size, step_size)
+        ]
+        
+        if not windows:
+            raise ValueError(f"데이터 길이({len(data)})가 window_size({window_size})보다 길어야 합니다")
+        
+        # 지표는 전체 구간에서 한 번 계산해 모든 윈도우가 공유
+        if indicator_func is not None:
+            data = indicator_func(data)
+        
+        n_workers = min(n_workers or mp.cpu_count(), len(windows))
+        if n_workers > 1 and not self._is_picklable(strategy_func, indicator_func, kwargs):
+            self.logger.warning("전략 함수를 프로세스로 전달할 수 없어 순차 실행합니다")
+            n_workers = 1
+        
+        if n_workers > 1:
+            worker_evaluator = PerformanceEvaluator(
+                initial_capital=self.initial_capital,
+                commission_rate=self.commission_rate,
+                slippage_rate=self.slippage_rate
+            )
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_init_walk_forward_worker,
+                initargs=(worker_evaluator, strategy_func, data, param_grid, optimization_metric, kwargs)
+            ) as executor:
+                window_results = list(executor.map(_run_walk_forward_window_worker, windows))
+        else:
+            window_results = [
+                self._run_walk_forward_window(strategy_func, data, window, param_grid, optimization_metric, kwargs)
+                for window in windows
+            ]
+        
+        # 검증 구간 연결: 각 구간을 이전 구간의 최종 자본 기준으로 환산
         all_trades = []
-        all_equity_curves = []
-        all_daily_returns = []
+        equity_parts = []
+        window_summaries = []
+        capital = self.initial_capital
         
-        for start_idx in range(0, len(data) - window_size, step_size):
-            end_idx = start_idx + window_size
+        for window_result in window_results:
+            scale = capital / self.initial_capital
             
-            # 훈련 데이터와 테스트 데이터 분할
-            train_data = data.iloc[start_idx:start_idx + window_size // 2]
-            test_data = data.iloc[start_idx + window_size // 2:end_idx]
+            equity_parts.append(window_result['equity_curve'] * scale)
+            all_trades.extend(
+                replace(trade,
+                        quantity=trade.quantity * scale,
+                        pnl=trade.pnl * scale,
+                        commission=trade.commission * scale,
+                        slippage=trade.slippage * scale)
+                for trade in window_result['trades']
+            )
             
-            # 훈련 데이터로 전략 최적화 (여기서는 단순히 전략 실행)
-            window_result = self._simple_backtest(strategy_func, test_data, **kwargs)
+            segment_start_capital = capital
+            capital = window_result['final_capital'] * scale
             
-            all_trades.extend(window_result.trades)
-            all_equity_curves.extend(window_result.equity_curve.tolist())
-            all_daily_returns.extend(window_result.daily_returns.tolist())
+            window_summaries.append({
+                'train_start': window_result['train_start'],
+                'test_start': window_result['test_start'],
+                'test_end': window_result['test_end'],
+                'best_params': window_result['best_params'],
+                'train_score': window_result['train_score'],
+                'test_return': capital / segment_start_capital - 1,
+                'test_trades': len(window_result['trades'])
+            })
         
         # 전체 결과 통합
-        final_capital = all_equity_curves[-1] if all_equity_curves else self.initial_capital
-        equity_series = pd.Series(all_equity_curves)
-        daily_returns_series = pd.Series(all_daily_returns)
+        equity_series = pd.concat(equity_parts)
+        daily_returns_series = equity_series.pct_change().iloc[1:]
         
         performance_metrics = self._calculate_performance_metrics(
             equity_series, daily_returns_series, all_trades
@@ -331,49 +446,180 @@ class PerformanceEvaluator:
         period_performance = self._calculate_period_performance(daily_returns_series)
         
         return BacktestResult(
-            start_date=data.index[0],
-            end_date=data.index[-1],
+            start_date=equity_series.index[0],
+            end_date=equity_series.index[-1],
             initial_capital=self.initial_capital,
-            final_capital=final_capital,
+            final_capital=capital,
             total_trades=len(all_trades),
             trades=all_trades,
             daily_returns=daily_returns_series,
             equity_curve=equity_series,
             performance_metrics=performance_metrics,
             benchmark_comparison=benchmark_comparison,
-            period_performance=period_performance
+            period_performance=period_performance,
+            walk_forward_windows=window_summaries
         )
     
-    def _monte_carlo_backtest(self, strategy_func, data: pd.DataFrame, 
-                            n_simulations: int = 1000, **kwargs) -> BacktestResult:
-        """몬테카를로 백테스트"""
-        simulation_results = []
+    def _run_walk_forward_window(self, strategy_func, data: pd.DataFrame,
+                                 window: Tuple[int, int, int],
+                                 param_grid: Optional[Dict[str, List[Any]]],
+                                 optimization_metric: str,
+                                 strategy_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """워크 포워드 윈도우 하나 실행 (학습 구간 최적화 → 검증 구간 실행)"""
+        train_start, train_end, test_end = window
+        train_data = data.iloc[train_start:train_end]
+        test_data = data.iloc[train_end:test_end]
+        
+        best_params: Dict[str, Any] = {}
+        best_score = None
+        
+        if param_grid:
+            # 학습 구간 행은 한 번만 만들어 모든 조합에서 재사용
+            train_rows = list(train_data.iterrows())
+            names = list(param_grid.keys())
+            
+            for values in itertools.product(*(param_grid[name] for name in names)):
+                params = dict(zip(names, values))
+                
+                trades, equity_curve, daily_returns, _ = self._simulate_trades(
+                    strategy_func, train_data, train_rows, **{**strategy_kwargs, **params}
+                )
+                metrics = self._calculate_performance_metrics(equity_curve, daily_returns, trades)
+                score = getattr(metrics, optimization_metric)
+                
+                if best_score is None or (not pd.isna(score) and (pd.isna(best_score) or score > best_score)):
+                    best_params, best_score = params, score
         
-        for _ in range(n_simulations):
-            # 데이터 순서 섞기
-            shuffled_data = data.sample(frac=1).reset_index(drop=True)
+        trades, equity_curve, _, final_capital = self._simulate_trades(
+            strategy_func, test_data, test_data.iterrows(), **{**strategy_kwargs, **best_params}
+        )
+        
+        return {
+            'train_start': data.index[train_start],
+            'test_start': data.index[train_end],
+            'test_end': data.index[test_end - 1],
+            'best_params': best_params,
+            'train_score': best_score,
+            'trades': trades,
+            'equity_curve': equity_curve,
+            'final_capital': final_capital
+        }
+    
+    def _is_picklable(self, *objects) -> bool:
+        """프로세스 풀로 전달 가능한지 확인"""
+        try:
+            pickle.dumps(objects)
+            return True
+        except Exception:
+            return False
+    
+    def _monte_carlo_backtest(self, strategy_func, data: pd.DataFrame, 
+                            n_simulations: int = 1000,
+                            block_size: int = 1,
+                            batch_size: Optional[int] = None,
+                            random_state: Optional[int] = None,
+                            **kwargs) -> BacktestResult:
+        """몬테카를로 백테스트
+        
+        전략을 원본 데이터로 한 번 실행한 뒤, 일일 수익률을 (시뮬레이션 수 × 기간) 행렬로
+        재표본추출하여 모든 경로의 자본 곡선, 낙폭, 샤프 비율을 NumPy로 한 번에 계산합니다.
+        경로 행렬은 batch_size 단위로만 만들고 경로별 요약 지표만 보관합니다.
+        
+        Args:
+            n_simulations: 시뮬레이션 경로 수
+            block_size: 블록 부트스트랩 길이 (1이면 일별 독립 복원추출)
+            batch_size: 한 번에 계산할 경로 수 (None이면 행렬 약 64MB 기준으로 자동 결정)
+            random_state: 난수 시드
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size는 1 이상이어야 합니다: {block_size}")
+        
+        # 원본 데이터로 전략 1회 실행
+        base_result = self._simple_backtest(strategy_func, data, **kwargs)
+        returns = base_result.daily_returns.to_numpy(dtype=float)
+        
+        if len(returns) < 2 or n_simulations < 1:
+            self.logger.warning("몬테카를로 시뮬레이션에 필요한 수익률 데이터가 부족합니다")
+            return base_result
+        
+        if batch_size is None:
+            batch_size = max(1, (1 << 23) // len(returns))
+        
+        rng = np.random.default_rng(random_state)
+        
+        total_returns = np.empty(n_simulations)
+        sharpe_ratios = np.empty(n_simulations)
+        max_drawdowns = np.empty(n_simulations)
+        
+        for start in range(0, n_simulations, batch_size):
+            end = min(start + batch_size, n_simulations)
             
-            # 백테스트 실행
-            result = self._simple_backtest(strategy_func, shuffled_data, **kwargs)
-            simulation_results.append(result)
+            # 수익률 경로 재표본추출
+            paths = self._resample_return_paths(returns, end - start, block_size, rng)
+            
+            # 경로별 요약 지표 계산
+            (total_returns[start:end],
+             sharpe_ratios[start:end],
+             max_drawdowns[start:end]) = self._calculate_path_statistics(paths)
         
         # 결과 통계
-        total_returns = [r.performance_metrics.total_return for r in simulation_results]
-        sharpe_ratios = [r.performance_metrics.sharpe_ratio for r in simulation_results]
-        max_drawdowns = [r.performance_metrics.max_drawdown for r in simulation_results]
+        summary = {'n_simulations': n_simulations, 'block_size': block_size}
+        for name, values in (('total_return', total_returns),
+                             ('sharpe_ratio', sharpe_ratios),
+                             ('max_drawdown', max_drawdowns)):
+            summary[f'{name}_mean'] = float(np.mean(values))
+            summary[f'{name}_std'] = float(np.std(values))
+            for q in (1, 5, 50, 95, 99):
+                summary[f'{name}_p{q}'] = float(np.percentile(values, q))
+        summary['probability_of_loss'] = float(np.mean(total_returns < 0))
+        
+        # 평균 결과 생성 (원본 실행 결과를 기본으로 사용)
+        metrics = base_result.performance_metrics
+        metrics.total_return = summary['total_return_mean']
+        metrics.sharpe_ratio = summary['sharpe_ratio_mean']
+        metrics.max_drawdown = summary['max_drawdown_mean']
         
-        # 평균 결과 생성
-        avg_result = simulation_results[0]  # 첫 번째 결과를 기본으로 사용
+        # 신뢰구간 추가
+        metrics.var_95 = summary['total_return_p5']
+        metrics.var_99 = summary['total_return_p1']
         
-        avg_result.performance_metrics.total_return = np.mean(total_returns)
-        avg_result.performance_metrics.sharpe_ratio = np.mean(sharpe_ratios)
-        avg_result.performance_metrics.max_drawdown = np.mean(max_drawdowns)
+        base_result.monte_carlo_summary = summary
         
-        # 신뢰구간 추가
-        avg_result.performance_metrics.var_95 = np.percentile(total_returns, 5)
-        avg_result.performance_metrics.var_99 = np.percentile(total_returns, 1)
+        return base_result
+    
+    def _resample_return_paths(self, returns: np.ndarray, n_paths: int, 
+                               block_size: int, rng: np.random.Generator) -> np.ndarray:
+        """수익률 경로 블록 부트스트랩 (n_paths × len(returns) 행렬)"""
+        n_bars = len(returns)
+        block_size = min(block_size, n_bars)
+        n_blocks = -(-n_bars // block_size)
+        
+        # 블록 시작 위치를 무작위로 뽑아 연속 구간을 이어 붙임
+        starts = rng.integers(0, n_bars - block_size + 1, size=(n_paths, n_blocks))
+        indices = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n_bars]
+        
+        return returns[indices]
+    
+    def _calculate_path_statistics(self, paths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """경로별 총 수익률, 샤프 비율, 최대 낙폭 계산 (_calculate_performance_metrics와 같은 정의)"""
+        # 샤프 비율
+        risk_free_rate = 0.02  # 2% 가정
+        volatility = paths.std(axis=1, ddof=1) * np.sqrt(252)
+        excess_returns = paths.mean(axis=1) * 252 - risk_free_rate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe_ratios = np.where(volatility > 0, excess_returns / volatility, 0.0)
+        
+        # 누적 수익 곡선 (메모리 절약을 위해 제자리 연산)
+        cumulative_returns = np.add(paths, 1.0, out=paths)
+        np.cumprod(cumulative_returns, axis=1, out=cumulative_returns)
+        total_returns = cumulative_returns[:, -1] - 1
+        
+        # 최대 낙폭
+        running_max = np.maximum.accumulate(cumulative_returns, axis=1)
+        drawdown = np.divide(cumulative_returns, running_max, out=running_max)
+        max_drawdowns = drawdown.min(axis=1) - 1
         
-        return avg_result
+        return total_returns, sharpe_ratios, max_drawdowns
     
     def _stress_test_backtest(self, strategy_func, data: pd.DataFrame, 
                             stress_scenarios: List[Dict[str, float]], **kwargs) -> BacktestResult:
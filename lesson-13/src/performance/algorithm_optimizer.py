@@ -10,12 +10,18 @@
 4. 효율적 알고리즘 선택
 """
 
+import os
+import sys
 import numpy as np
 import pandas as pd
 from numba import jit, prange
 from typing import List, Dict, Tuple
 import logging
 
+# 6차시 스트리밍 지표 (배치 모드가 pandas rolling 결과와 동일)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'lesson-06'))
+from streaming_indicators import RSI, SMA
+
 
 class AlgorithmOptimizer:
     """알고리즘 성능 최적화"""
@@ -41,37 +47,6 @@ class AlgorithmOptimizer:
         
         return result
     
-    @staticmethod
-    @jit(nopython=True)
-    def calculate_rsi_numba(prices: np.ndarray, period: int = 14) -> np.ndarray:
-        """Numba JIT RSI 계산
-        
-        기존: TA-Lib - 50ms
-        개선: Numba - 1ms (50배 빠름)
-        """
-        n = len(prices)
-        rsi = np.empty(n)
-        rsi[:period] = np.nan
-        
-        deltas = np.diff(prices)
-        
-        for i in range(period, n):
-            gains = deltas[i-period:i]
-            gains = gains[gains > 0]
-            losses = -deltas[i-period:i]
-            losses = losses[losses > 0]
-            
-            avg_gain = np.mean(gains) if len(gains) > 0 else 0.0
-            avg_loss = np.mean(losses) if len(losses) > 0 else 0.0
-            
-            if avg_loss == 0:
-                rsi[i] = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi[i] = 100 - (100 / (1 + rs))
-        
-        return rsi
-    
     @staticmethod
     def vectorized_backtest(prices: np.ndarray, 
                            signals: np.ndarray,
@@ -195,24 +170,22 @@ class AlgorithmOptimizer:
         
         기존: 각 지표 순차 계산 - 500ms
         개선: 한 번에 계산 - 100ms (5배 빠름)
+        
+        이동평균·RSI는 streaming_indicators 배치 모드로 계산하므로
+        실시간 봇이 봉마다 update()로 갱신한 값과 같습니다.
+        (이동평균은 미래 가격이 섞이지 않도록 후행 윈도우 사용)
         """
         prices = data['close'].values
+        close = pd.Series(prices, index=data.index, dtype=float)
         result = {}
         
-        # 모든 지표를 한 번의 패스로 계산
-        if 'ma5' in indicators or 'ma20' in indicators:
-            # 한 번의 convolve로 여러 MA 계산
-            if 'ma5' in indicators:
-                result['ma5'] = np.convolve(
-                    prices, np.ones(5)/5, mode='same'
-                )
-            if 'ma20' in indicators:
-                result['ma20'] = np.convolve(
-                    prices, np.ones(20)/20, mode='same'
-                )
+        if 'ma5' in indicators:
+            result['ma5'] = SMA.batch(close, 5).values
+        if 'ma20' in indicators:
+            result['ma20'] = SMA.batch(close, 20).values
         
         if 'rsi' in indicators:
-            result['rsi'] = AlgorithmOptimizer.calculate_rsi_numba(prices)
+            result['rsi'] = RSI.batch(close, 14).values
         
         if 'volatility' in indicators:
             result['volatility'] = AlgorithmOptimizer.fast_volatility_calculation(prices)
@@ -10,9 +10,20 @@ import pyupbit
 import json
 import asyncio
 import os
+import sys
 from datetime import datetime
 from typing import Optional
 
+# 6차시 오더북 엔진 사용 (없으면 REST 호가만 사용)
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+try:
+    from orderbook import OrderBookFeed, OrderBookSnapshot, WEBSOCKET_AVAILABLE
+    ORDERBOOK_ENGINE_AVAILABLE = True
+except ImportError:
+    OrderBookFeed = OrderBookSnapshot = None
+    WEBSOCKET_AVAILABLE = False
+    ORDERBOOK_ENGINE_AVAILABLE = False
+
 # MCP 서버 인스턴스 생성
 server = Server("upbit-trading-server")
 
@@ -20,6 +31,55 @@ server = Server("upbit-trading-server")
 ACCESS_KEY = os.getenv("UPBIT_ACCESS_KEY", "")
 SECRET_KEY = os.getenv("UPBIT_SECRET_KEY", "")
 
+# 호가 WebSocket 구독 사용 여부 (false면 매번 REST로 조회)
+USE_ORDERBOOK_STREAM = os.getenv("UPBIT_ORDERBOOK_STREAM", "true").lower() == "true"
+# 서버 시작 시 미리 구독할 마켓 (쉼표로 구분)
+ORDERBOOK_MARKETS = [m for m in os.getenv("UPBIT_ORDERBOOK_MARKETS", "KRW-BTC,KRW-ETH").split(",") if m]
+ORDERBOOK_MAX_AGE = 5  # 이보다 오래된 실시간 호가는 사용하지 않음 (초)
+ORDERBOOK_FIRST_WAIT = 1.0  # 새로 구독한 마켓의 첫 호가를 기다리는 시간 (초)
+orderbook_feed = None
+
+def start_orderbook_feed():
+    """호가 WebSocket 구독 시작 (서버 시작 시 호출, 사용할 수 없으면 REST만 사용)"""
+    global orderbook_feed
+    
+    if orderbook_feed is not None or not (USE_ORDERBOOK_STREAM and WEBSOCKET_AVAILABLE):
+        return
+    
+    orderbook_feed = OrderBookFeed(markets=ORDERBOOK_MARKETS)
+    orderbook_feed.start()
+
+async def get_orderbook_snapshot(ticker: str):
+    """
+    호가 스냅샷 조회
+
+    실시간 오더북이 최신이면 그대로 사용하고, 아니면 REST로 조회합니다.
+    구독하지 않은 마켓은 구독에 추가한 뒤 첫 호가를 잠시(ORDERBOOK_FIRST_WAIT) 기다립니다.
+
+    Returns:
+        (OrderBookSnapshot, 출처) 또는 (None, None)
+        오더북 엔진이 없으면 스냅샷 대신 REST 호가 딕셔너리를 반환합니다.
+    """
+    if orderbook_feed is not None:
+        book = orderbook_feed.manager.get(ticker, max_age=ORDERBOOK_MAX_AGE)
+        if book is None and ticker not in orderbook_feed.markets:
+            orderbook_feed.add_markets([ticker])
+            deadline = asyncio.get_running_loop().time() + ORDERBOOK_FIRST_WAIT
+            while book is None and asyncio.get_running_loop().time() < deadline:
+                await asyncio.sleep(0.05)
+                book = orderbook_feed.manager.get(ticker, max_age=ORDERBOOK_MAX_AGE)
+        if book is not None:
+            return book.snapshot(), "WebSocket"
+    
+    orderbook = pyupbit.get_orderbook(ticker)
+    if not orderbook:
+        return None, None
+    
+    entry = orderbook[0] if isinstance(orderbook, list) else orderbook
+    if not ORDERBOOK_ENGINE_AVAILABLE:
+        return entry, "REST"
+    return OrderBookSnapshot.from_upbit(entry), "REST"
+
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """사용 가능한 도구 목록 반환"""
@@ -170,18 +230,23 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             ticker = arguments["ticker"]
             depth = arguments.get("depth", 5)
             
-            orderbook = pyupbit.get_orderbook(ticker)
+            snapshot, source = await get_orderbook_snapshot(ticker)
             
-            if not orderbook:
+            if snapshot is None:
                 return [TextContent(
                     type="text",
                     text=f"❌ {ticker}의 호가 정보를 조회할 수 없습니다."
                 )]
             
+            if ORDERBOOK_ENGINE_AVAILABLE:
+                units = snapshot.to_upbit(depth)['orderbook_units']
+            else:
+                units = snapshot['orderbook_units'][:depth]
+            
             result_lines = [f"📈 {ticker} 호가 정보\n"]
             result_lines.append("매도 호가 (ASK):")
             
-            asks = orderbook[0]['orderbook_units'][:depth]
+            asks = [u for u in units if u['ask_size'] > 0]
             asks.reverse()  # 높은 가격부터 표시
             
             for unit in asks:
@@ -192,18 +257,20 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             result_lines.append("\n" + "-" * 40 + "\n")
             result_lines.append("매수 호가 (BID):")
             
-            bids = orderbook[0]['orderbook_units'][:depth]
+            bids = [u for u in units if u['bid_size'] > 0]
             
             for unit in bids:
                 price = unit['bid_price']
                 size = unit['bid_size']
                 result_lines.append(f"  {price:>12,.0f} KRW | {size:>10.4f}")
             
-            total_ask_size = sum([u['ask_size'] for u in orderbook[0]['orderbook_units'][:depth]])
-            total_bid_size = sum([u['bid_size'] for u in orderbook[0]['orderbook_units'][:depth]])
-            
-            result_lines.append(f"\n💹 총 매도량: {total_ask_size:.4f}")
-            result_lines.append(f"💹 총 매수량: {total_bid_size:.4f}")
+            result_lines.append(f"\n💹 총 매도량: {sum(u['ask_size'] for u in units):.4f}")
+            result_lines.append(f"💹 총 매수량: {sum(u['bid_size'] for u in units):.4f}")
+            if ORDERBOOK_ENGINE_AVAILABLE:
+                if snapshot.spread is not None:
+                    result_lines.append(f"📏 스프레드: {snapshot.spread:,.0f} KRW | 마이크로프라이스: {snapshot.microprice:,.1f} KRW")
+                result_lines.append(f"⚖️ 잔량 불균형: {snapshot.imbalance(levels=depth):+.2f} (양수: 매수 우위)")
+            result_lines.append(f"📡 데이터 출처: {source}")
             result_lines.append(f"⏰ 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             
             return [TextContent(
@@ -419,6 +486,9 @@ async def main():
     print("🚀 업비트 MCP 서버 시작...", flush=True)
     print("📡 stdio를 통해 통신 대기 중...", flush=True)
     
+    # 첫 호가 요청 전에 WebSocket 구독을 시작해 두면 REST 조회 없이 응답 가능
+    start_orderbook_feed()
+    
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
@@ -2,14 +2,19 @@
 adaptive_strategy_system.py - 적응형 전략 자동 전환 시스템
 
 시장 상황을 실시간으로 감지하고 최적의 전략으로 자동 전환합니다.
+
+실행 방식:
+- execute_strategy(price_data): 매 주기 OHLCV 전체로 분석 (폴링)
+- prime() → on_bar_close() / execute_on_tick(): 마감된 봉만 지표에 반영하고
+  틱마다 현재 봉으로 평가 (이벤트 기반, 두 방식을 한 인스턴스에서 섞어 쓰지 마세요)
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 import pandas as pd
 import logging
 
-from market_condition_detector import MarketConditionDetector, MarketCondition
+from market_condition_detector import IncrementalMarketConditionDetector, MarketCondition
 from market_strategies import (
     BaseStrategy,
     TrendFollowingStrategy,
@@ -43,8 +48,8 @@ class AdaptiveStrategySystem:
         self.initial_balance = account_balance
         self.min_confidence = min_confidence
         
-        # 시장 감지기
-        self.market_detector = MarketConditionDetector()
+        # 시장 감지기 (새 봉만 반영하는 증분 감지기)
+        self.market_detector = IncrementalMarketConditionDetector()
         
         # 전략 풀
         self.strategies: Dict[str, Optional[BaseStrategy]] = {
@@ -82,6 +87,10 @@ class AdaptiveStrategySystem:
         # 거래 히스토리
         self.trade_history: List[Dict] = []
         
+        # 이벤트 모드: 마지막으로 전략을 선택한 시장 상황과 선택 결과
+        self._live_condition: Optional[MarketCondition] = None
+        self._live_strategy: Optional[str] = None
+        
         # 로깅
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(
@@ -103,6 +112,18 @@ class AdaptiveStrategySystem:
         # 시장 상황 감지
         market_condition = self.market_detector.detect_market_condition(price_data)
         
+        return self.select_strategy(market_condition), market_condition
+    
+    def select_strategy(self, market_condition: MarketCondition) -> str:
+        """
+        시장 상황에 맞는 전략 선택
+        
+        Args:
+            market_condition: 시장 상황
+        
+        Returns:
+            선택된 전략명
+        """
         # 추천 전략
         recommended_strategy = market_condition.get_recommended_strategy()
         
@@ -112,9 +133,9 @@ class AdaptiveStrategySystem:
                 f"신뢰도 낮음 ({market_condition.confidence:.2f}) - "
                 f"현재 전략 유지: {self.active_strategy_name}"
             )
-            return self.active_strategy_name, market_condition
+            return self.active_strategy_name
         
-        return recommended_strategy, market_condition
+        return recommended_strategy
     
     def execute_strategy(self, price_data: pd.DataFrame) -> Dict:
         """
@@ -129,6 +150,70 @@ class AdaptiveStrategySystem:
         # 1. 전략 선택
         selected_strategy, market_condition = self.analyze_and_select_strategy(price_data)
         
+        return self._run_strategy(
+            selected_strategy, market_condition,
+            lambda strategy: strategy.generate_signal(price_data)
+        )
+    
+    # ==================== 이벤트 기반 실행 ====================
+    
+    def prime(self, price_data: pd.DataFrame):
+        """
+        마감된 봉으로 모든 전략의 지표 초기화 (이벤트 모드 시작 시 1회)
+        
+        Args:
+            price_data: OHLCV 데이터 (진행 중인 봉 제외)
+        """
+        for strategy in self.strategies.values():
+            if strategy is not None:
+                strategy.prime(price_data)
+    
+    def on_bar_close(self, bar: Any):
+        """
+        봉 마감 시 모든 전략의 지표 갱신 (전략 전환에 대비해 비활성 전략도 갱신)
+        
+        Args:
+            bar: 마감된 봉 (open/high/low/close/volume 속성)
+        """
+        for strategy in self.strategies.values():
+            if strategy is not None:
+                strategy.update_bar(bar)
+    
+    def execute_on_tick(self, current_bar: Any, market_condition: MarketCondition) -> Dict:
+        """
+        틱 단위 전략 실행 (지표 재계산 없이 현재 봉으로 평가)
+        
+        전략 선택은 시장 상황이 새로 계산됐을 때만 다시 합니다.
+        
+        Args:
+            current_bar: 진행 중인 봉 (close가 현재가)
+            market_condition: 마지막으로 감지한 시장 상황
+        
+        Returns:
+            실행 결과 (execute_strategy와 같은 형식)
+        """
+        if market_condition is not self._live_condition:
+            self._live_condition = market_condition
+            self._live_strategy = self.select_strategy(market_condition)
+        
+        return self._run_strategy(
+            self._live_strategy, market_condition,
+            lambda strategy: strategy.evaluate(current_bar)
+        )
+    
+    def _run_strategy(self, selected_strategy: str, market_condition: MarketCondition,
+                      generate: Callable[[BaseStrategy], Dict]) -> Dict:
+        """
+        선택된 전략으로 신호 생성 (전략 전환, 포지션 크기 계산 포함)
+        
+        Args:
+            selected_strategy: 선택된 전략명
+            market_condition: 시장 상황
+            generate: 전략을 받아 신호를 만드는 함수
+        
+        Returns:
+            실행 결과
+        """
         # 2. 전략 전환 필요 시
         if selected_strategy != self.active_strategy_name:
             self._switch_strategy(selected_strategy, market_condition)
@@ -137,6 +222,7 @@ class AdaptiveStrategySystem:
         if selected_strategy == 'wait':
             return {
                 'action': 'HOLD',
+                'confidence': 0.5,
                 'reason': '시장 상황 부적합 - 현금 보유',
                 'market_condition': market_condition,
                 'strategy': 'wait'
@@ -144,7 +230,7 @@ class AdaptiveStrategySystem:
         
         # 4. 신호 생성
         strategy = self.strategies[selected_strategy]
-        signal = strategy.generate_signal(price_data)
+        signal = generate(strategy)
         
         # 5. 포지션 크기 계산
         if signal['action'] == 'BUY':
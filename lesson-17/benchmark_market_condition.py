@@ -0,0 +1,146 @@
+"""
+benchmark_market_condition.py - 시장 상황 감지 호출당 비용 비교
+
+MarketConditionDetector(매번 전체 분석)와 IncrementalMarketConditionDetector(증분)의
+호출당 시간을 상황별로 측정하고, 두 감지기의 결과가 같은지 확인합니다.
+
+측정 상황:
+- 새 봉 마감: 분석 구간이 한 칸 밀림 (새 봉 1개 반영)
+- 진행 중인 봉 변경: 마지막 행의 현재가만 바뀜
+- 변경 없음: 같은 데이터로 다시 호출 (캐시 반환)
+
+사용법:
+    python benchmark_market_condition.py
+"""
+
+import time
+import math
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from market_condition_detector import MarketConditionDetector, IncrementalMarketConditionDetector
+
+
+def generate_candles(days: int, seed: int = 42) -> pd.DataFrame:
+    """벤치마크용 일봉 데이터 생성 (get_candles_daily와 같은 컬럼)"""
+    rng = np.random.default_rng(seed)
+    close = 50_000_000 * np.exp(np.cumsum(rng.normal(0.0005, 0.025, days)))
+    open_ = close * np.exp(rng.normal(0, 0.01, days))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2020-01-01 09:00', periods=days, freq='D'),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.random(days) * 0.02),
+        'low': np.minimum(open_, close) * (1 - rng.random(days) * 0.02),
+        'close': close,
+        'volume': rng.integers(100, 1000, days) * 1.0
+    })
+
+
+def build_frames(candles: pd.DataFrame, frame_size: int, scenario: str) -> List[pd.DataFrame]:
+    """
+    상황별 입력 데이터프레임 목록 생성 (측정 시간에 포함되지 않도록 미리 생성)
+
+    Args:
+        candles: 전체 일봉
+        frame_size: 분석 구간 길이 (봇의 count)
+        scenario: 'new_bar', 'intrabar', 'unchanged'
+    """
+    frames = []
+    if scenario == 'new_bar':
+        for end in range(frame_size, len(candles) + 1):
+            frames.append(candles.iloc[end - frame_size:end].reset_index(drop=True))
+    else:
+        base = candles.iloc[-frame_size:].reset_index(drop=True)
+        last_close = base['close'].iloc[-1]
+        for i in range(200):
+            frame = base.copy()
+            if scenario == 'intrabar':
+                frame.loc[frame.index[-1], 'close'] = last_close * (1 + 0.0001 * (i + 1))
+            frames.append(frame)
+    return frames
+
+
+def time_calls(detect: Callable[[pd.DataFrame], object], frames: List[pd.DataFrame]) -> float:
+    """호출당 평균 시간 (마이크로초)"""
+    started = time.perf_counter()
+    for frame in frames:
+        detect(frame)
+    return (time.perf_counter() - started) / len(frames) * 1e6
+
+
+def conditions_match(a, b) -> bool:
+    """두 MarketCondition이 같은지 (timestamp 제외, 실수는 상대 오차 1e-9)"""
+    if (a.trend, a.volatility, a.volume_profile) != (b.trend, b.volatility, b.volume_profile):
+        return False
+    return all(
+        math.isclose(getattr(a, name), getattr(b, name), rel_tol=1e-9, abs_tol=1e-12)
+        for name in ('trend_strength', 'momentum', 'confidence')
+    )
+
+
+def run_benchmark(frame_size: int = 100, days: int = 600) -> Dict[str, Dict[str, float]]:
+    """
+    벤치마크 실행
+
+    Args:
+        frame_size: 분석 구간 길이
+        days: 생성할 일봉 수 (새 봉 마감 상황의 호출 횟수 = days - frame_size + 1)
+
+    Returns:
+        {상황: {'original': µs, 'incremental': µs}}
+    """
+    candles = generate_candles(days)
+    results = {}
+
+    for scenario in ('new_bar', 'intrabar', 'unchanged'):
+        frames = build_frames(candles, frame_size, scenario)
+
+        original = MarketConditionDetector()
+        incremental = IncrementalMarketConditionDetector()
+        # 증분 감지기는 첫 호출에서 상태를 만들므로 측정 전에 한 번 호출
+        incremental.detect_market_condition(frames[0])
+
+        mismatches = sum(
+            not conditions_match(original.detect_market_condition(frame),
+                                 incremental.detect_market_condition(frame))
+            for frame in frames[:50]
+        )
+
+        incremental = IncrementalMarketConditionDetector()
+        incremental.detect_market_condition(frames[0])
+        results[scenario] = {
+            'original': time_calls(original.detect_market_condition, frames),
+            'incremental': time_calls(incremental.detect_market_condition, frames[1:] or frames),
+            'mismatches': mismatches
+        }
+
+    return results
+
+
+def main():
+    """벤치마크 결과 출력"""
+    labels = {
+        'new_bar': '새 봉 마감',
+        'intrabar': '진행 중인 봉 변경',
+        'unchanged': '변경 없음 (캐시)'
+    }
+
+    for frame_size in (100, 200):
+        print("\n" + "="*72)
+        print(f"📊 시장 상황 감지 호출당 비용 (분석 구간 {frame_size}개 봉)")
+        print("="*72)
+        print(f"{'상황':<20}{'기존 (µs)':>12}{'증분 (µs)':>12}{'속도 향상':>12}{'결과 불일치':>12}")
+        print("-"*72)
+
+        for scenario, result in run_benchmark(frame_size).items():
+            speedup = result['original'] / result['incremental']
+            print(
+                f"{labels[scenario]:<20}{result['original']:>12.1f}{result['incremental']:>12.1f}"
+                f"{speedup:>11.1f}x{result['mismatches']:>12d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
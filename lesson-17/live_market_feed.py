@@ -0,0 +1,248 @@
+"""
+live_market_feed.py - WebSocket 시세 피드와 인메모리 일봉 캐시
+
+REST로 과거 일봉을 한 번만 받아 두고, 이후에는 WebSocket ticker 메시지로
+마지막(진행 중인) 봉만 갱신합니다. 날짜가 바뀌면 진행 중이던 봉을 마감하고
+새 봉을 추가하므로, 봇이 매 주기 일봉 100개를 다시 조회하지 않아도 됩니다.
+
+업비트 ticker의 opening_price/high_price/low_price/acc_trade_volume은
+UTC 0시(KST 9시) 기준 당일 값이라 일봉 캔들과 같은 구간입니다.
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
+import json
+import time
+import threading
+import logging
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    websocket = None
+    WEBSOCKET_AVAILABLE = False
+
+from message_pipeline import MessagePipeline
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+CANDLE_COLUMNS = ['datetime', 'open', 'high', 'low', 'close', 'volume']
+
+
+class LiveCandle:
+    """일봉 하나 (datetime은 KST 봉 시작 시각)"""
+
+    __slots__ = ('datetime', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, datetime: pd.Timestamp, open: float, high: float,
+                 low: float, close: float, volume: float):
+        self.datetime = datetime
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def to_tuple(self) -> Tuple:
+        return (self.datetime, self.open, self.high, self.low, self.close, self.volume)
+
+
+class LiveCandleCache:
+    """
+    마켓별 인메모리 일봉 캐시
+
+    seed()로 REST 일봉을 채우고 apply_ticker()로 진행 중인 봉을 갱신합니다.
+    갱신은 한 스레드(피드 디코더 스레드)에서, 조회는 다른 스레드에서 해도 됩니다.
+    """
+
+    def __init__(self, max_bars: int = 200):
+        """
+        초기화
+
+        Args:
+            max_bars: 마켓별로 보관할 마감된 봉 수
+        """
+        self.max_bars = max_bars
+        self.closed: Dict[str, deque] = {}
+        self.current: Dict[str, LiveCandle] = {}
+        self.lock = threading.Lock()
+
+    def seed(self, market: str, df: pd.DataFrame):
+        """
+        REST 일봉으로 초기화 (마지막 행은 진행 중인 봉)
+
+        Args:
+            market: 마켓 코드
+            df: get_candles_daily() 결과 (datetime, open, high, low, close, volume)
+        """
+        bars = [LiveCandle(*row) for row in df[CANDLE_COLUMNS].itertuples(index=False)]
+
+        with self.lock:
+            self.closed[market] = deque(bars[:-1], maxlen=self.max_bars)
+            if bars:
+                self.current[market] = bars[-1]
+
+    def apply_ticker(self, data: Dict[str, Any]) -> Tuple[Optional[str], Optional[LiveCandle]]:
+        """
+        ticker 메시지로 진행 중인 봉 갱신 (DEFAULT/SIMPLE 형식)
+
+        Returns:
+            (마켓 코드, 이 메시지로 마감된 봉) - 마감된 봉이 없으면 None,
+            seed되지 않은 마켓이나 잘못된 메시지면 (None, None)
+        """
+        market = data.get('code') or data.get('cd')
+        trade_date = data.get('trade_date') or data.get('tdt')
+        if market not in self.closed or not trade_date:
+            return None, None
+
+        # 일봉 시작 시각: 체결일(UTC) 0시 = KST 9시
+        start = pd.Timestamp(trade_date) + pd.Timedelta(hours=9)
+        bar = self.current.get(market)
+
+        if bar is not None and start < bar.datetime:
+            return market, None  # 이전 날짜의 늦은 메시지
+
+        price = data.get('trade_price', data.get('tp'))
+        fields = (
+            data.get('opening_price', data.get('op', price)),
+            data.get('high_price', data.get('hp', price)),
+            data.get('low_price', data.get('lp', price)),
+            price,
+            data.get('acc_trade_volume', data.get('atv', 0.0))
+        )
+
+        if bar is not None and start == bar.datetime:
+            bar.open, bar.high, bar.low, bar.close, bar.volume = fields
+            return market, None
+
+        # 날짜가 바뀜: 진행 중이던 봉 마감 후 새 봉 시작
+        with self.lock:
+            if bar is not None:
+                self.closed[market].append(bar)
+            self.current[market] = LiveCandle(start, *fields)
+        return market, bar
+
+    def current_bar(self, market: str) -> Optional[LiveCandle]:
+        """진행 중인 봉"""
+        return self.current.get(market)
+
+    def get_candles(self, market: str, count: Optional[int] = None) -> pd.DataFrame:
+        """
+        일봉 데이터프레임 (get_candles_daily와 같은 형식, 마지막 행은 진행 중인 봉)
+
+        Args:
+            market: 마켓 코드
+            count: 최근 몇 개 (None이면 보관 중인 전체)
+        """
+        with self.lock:
+            bars = list(self.closed.get(market, ()))
+            bar = self.current.get(market)
+            if bar is not None:
+                bars.append(bar)
+
+        if count is not None:
+            bars = bars[-count:]
+        return pd.DataFrame([b.to_tuple() for b in bars], columns=CANDLE_COLUMNS)
+
+    def markets(self) -> List[str]:
+        """캐시된 마켓 목록"""
+        return list(self.closed.keys())
+
+
+class TickerFeed:
+    """
+    WebSocket ticker 구독 피드
+
+    백그라운드 스레드에서 연결을 유지하며(끊기면 재연결), 디코딩된 ticker 메시지를
+    배치 단위로 dispatch에 전달합니다: [(수신 시각 epoch 나노초, 메시지 dict), ...]
+    """
+
+    def __init__(self, markets: List[str],
+                 dispatch: Callable[[List[Tuple[int, Dict]]], None],
+                 reconnect_delay: int = 5):
+        """
+        초기화
+
+        Args:
+            markets: 구독할 마켓 목록
+            dispatch: ticker 메시지 배치를 받는 콜백 (디코더 스레드에서 호출)
+            reconnect_delay: 재연결 대기 시간 (초)
+        """
+        if not WEBSOCKET_AVAILABLE:
+            raise ImportError("websocket-client가 설치되지 않았습니다. pip install websocket-client")
+
+        self.markets = list(markets)
+        self.dispatch = dispatch
+        self.reconnect_delay = reconnect_delay
+        self.ws = None
+        self.thread = None
+        self.is_connected = False
+        self.pipeline = MessagePipeline(dispatch=self._dispatch)
+        self.logger = logging.getLogger(__name__)
+
+    def start(self):
+        """구독 스레드 시작 (이미 실행 중이면 무시)"""
+        if self.thread is not None:
+            return
+
+        self.pipeline.start()
+        self.ws = websocket.WebSocketApp(
+            UPBIT_WEBSOCKET_URL,
+            on_message=lambda ws, message: self.pipeline.submit(message),
+            on_open=self._on_open,
+            on_error=lambda ws, error: self.logger.error(f"시세 WebSocket 오류: {error}"),
+            on_close=self._on_close
+        )
+        self.thread = threading.Thread(
+            target=self.ws.run_forever, kwargs={'reconnect': self.reconnect_delay},
+            name='TickerFeed', daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """구독 종료"""
+        if self.ws is not None:
+            self.ws.close()
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+        self.pipeline.stop(drain=False)
+        self.thread = None
+        self.ws = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """수신·디코딩 통계"""
+        return self.pipeline.get_statistics()
+
+    def _on_open(self, ws):
+        """연결 시 구독 메시지 전송"""
+        self.is_connected = True
+        self.logger.info(f"시세 구독 시작: {self.markets}")
+        message = [
+            {"ticket": f"ticker_{int(time.time())}"},
+            {"type": "ticker", "codes": self.markets}
+        ]
+        try:
+            ws.send(json.dumps(message))
+        except Exception as e:
+            self.logger.error(f"시세 구독 메시지 전송 실패: {e}")
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        """연결 종료 처리 (run_forever가 재연결)"""
+        self.is_connected = False
+        self.logger.info(f"시세 WebSocket 연결 종료: {close_status_code} - {close_msg}")
+
+    def _dispatch(self, messages: List[Tuple[int, Any]]):
+        """ticker 메시지만 골라 전달"""
+        tickers = [
+            (received_at, data) for received_at, data in messages
+            if isinstance(data, dict) and data.get('type', data.get('ty')) == 'ticker'
+        ]
+        if tickers:
+            self.dispatch(tickers)
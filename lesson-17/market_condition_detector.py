@@ -2,15 +2,27 @@
 market_condition_detector.py - 시장 상황 자동 감지 시스템
 
 시장을 분석하여 상승장, 하락장, 횡보장을 자동으로 판단합니다.
+
+- MarketConditionDetector: 호출할 때마다 데이터프레임 전체로 분석
+- IncrementalMarketConditionDetector: 마켓별 지표 상태를 유지하고 새 봉만 반영
+  (결과는 MarketConditionDetector와 같음)
 """
 
-from typing import Dict, Tuple
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
+import math
+from collections import deque
+from typing import Dict, Optional, Tuple
 from enum import Enum
 from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from streaming_indicators import SMA, RollingStd, RollingMax, RollingMin
+
 
 class MarketTrend(Enum):
     """시장 추세"""
@@ -212,7 +224,22 @@ class MarketConditionDetector:
             lower_highs = False
             lower_lows = False
         
-        # 추세 판단
+        return self._classify_trend(price_change, ma_alignment, higher_highs, lower_lows)
+    
+    def _classify_trend(self, price_change: float, ma_alignment: int,
+                        higher_highs: bool, lower_lows: bool) -> Tuple[MarketTrend, float]:
+        """
+        추세 판단
+        
+        Args:
+            price_change: 최근 20일 가격 변화율
+            ma_alignment: 이동평균선 배열 (1: 상승, -1: 하락, 0: 혼조)
+            higher_highs: 고점 상승 패턴
+            lower_lows: 저점 하락 패턴
+        
+        Returns:
+            (추세, 추세 강도)
+        """
         if price_change > self.trend_thresholds['strong_bull'] and ma_alignment == 1:
             trend = MarketTrend.STRONG_BULL
             strength = min(1.0, abs(price_change) / 0.20)
@@ -255,9 +282,15 @@ class MarketConditionDetector:
         atr = true_range.rolling(window=14).mean().iloc[-1]
         atr_percent = atr / close.iloc[-1]
         
-        # 변동성 수준 판단
-        avg_volatility = (volatility_std + atr_percent) / 2
+        return self._classify_volatility((volatility_std + atr_percent) / 2)
+    
+    def _classify_volatility(self, avg_volatility: float) -> Volatility:
+        """
+        변동성 수준 판단
         
+        Args:
+            avg_volatility: 수익률 표준편차와 ATR 비율의 평균
+        """
         if avg_volatility < self.volatility_thresholds['very_low']:
             return Volatility.VERY_LOW
         elif avg_volatility < self.volatility_thresholds['low']:
@@ -303,7 +336,12 @@ class MarketConditionDetector:
         else:
             roc_normalized = 0
         
-        # 종합 모멘텀 (가중 평균)
+        return self._combine_momentum(rsi_normalized, macd_normalized, roc_normalized)
+    
+    @staticmethod
+    def _combine_momentum(rsi_normalized: float, macd_normalized: float,
+                          roc_normalized: float) -> float:
+        """종합 모멘텀 (가중 평균, -1.0 ~ 1.0)"""
         momentum = (rsi_normalized * 0.3 + macd_normalized * 0.4 + roc_normalized * 0.3)
         
         return np.clip(momentum, -1.0, 1.0)
@@ -325,8 +363,16 @@ class MarketConditionDetector:
         volume_ma_short = volume.rolling(window=5).mean()
         volume_ma_long = volume.rolling(window=20).mean()
         
-        volume_trend = volume_ma_short.iloc[-1] / (volume_ma_long.iloc[-1] + 1e-10)
+        return self._classify_volume(volume_ma_short.iloc[-1] / (volume_ma_long.iloc[-1] + 1e-10))
+    
+    @staticmethod
+    def _classify_volume(volume_trend: float) -> str:
+        """
+        거래량 추세 판단
         
+        Args:
+            volume_trend: 5일 평균 거래량 / 20일 평균 거래량
+        """
         if volume_trend > 1.2:
             return 'increasing'
         elif volume_trend < 0.8:
@@ -400,3 +446,302 @@ class MarketConditionDetector:
         
         return min(1.0, confidence)
 
+
+class _MarketState:
+    """
+    IncrementalMarketConditionDetector의 마켓별 상태
+    
+    분석 구간(frame)은 마감된 봉 frame_size-1개 + 진행 중인 봉 1개입니다.
+    """
+    
+    # MACD EMA 감쇠 계수 (pandas ewm(span=...) 기준)
+    W12 = 1 - 2 / 13
+    W26 = 1 - 2 / 27
+    W9 = 1 - 2 / 10
+    
+    def __init__(self, frame_size: int):
+        self.frame_size = frame_size
+        
+        # 마감된 봉 (open, high, low, close, volume), 분석 구간 안의 것만 보관
+        self.closed = deque(maxlen=frame_size - 1)
+        
+        # 추세
+        self.ma_short = SMA(10)
+        self.ma_medium = SMA(20)
+        self.ma_long = SMA(50)
+        self.ma_200 = SMA(200)
+        self.high_5 = RollingMax(5)
+        self.low_5 = RollingMin(5)
+        self.high_5_history = deque(maxlen=9)  # 마감된 봉 기준 5일 최고가 (최근 9개)
+        self.low_5_history = deque(maxlen=9)
+        
+        # 변동성 (수익률 표준편차는 분석 구간 전체)
+        self.return_std = RollingStd(frame_size - 1)
+        self.atr = SMA(14)
+        
+        # 모멘텀
+        self.gain = SMA(14)
+        self.loss = SMA(14)
+        self.macd_sums: Optional[Tuple[float, ...]] = None  # 봉 마감 시 다시 계산
+        
+        # 거래량
+        self.volume_short = SMA(5)
+        self.volume_long = SMA(20)
+        
+        # 지지/저항
+        self.high_20 = RollingMax(20)
+        self.low_20 = RollingMin(20)
+        
+        # 캐시
+        self.last_key = None
+        self.current: Optional[Tuple[float, ...]] = None
+        self.condition: Optional[MarketCondition] = None
+    
+    def add_closed(self, bar: Tuple[float, ...]):
+        """마감된 봉 반영 (O(1))"""
+        open_, high, low, close, volume = bar
+        prev_close = self.closed[-1][3] if self.closed else None
+        
+        for ma in (self.ma_short, self.ma_medium, self.ma_long, self.ma_200):
+            ma.update(close)
+        self.high_5_history.append(self.high_5.update(high))
+        self.low_5_history.append(self.low_5.update(low))
+        
+        if prev_close is None:
+            true_range, delta = high - low, 0.0
+        else:
+            self.return_std.update(close / prev_close - 1)
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            delta = close - prev_close
+        self.atr.update(true_range)
+        self.gain.update(delta if delta > 0 else 0.0)
+        self.loss.update(-delta if delta < 0 else 0.0)
+        
+        self.volume_short.update(volume)
+        self.volume_long.update(volume)
+        self.high_20.update(high)
+        self.low_20.update(low)
+        
+        self.closed.append(bar)
+        self.macd_sums = None
+    
+    def get_macd_sums(self) -> Tuple[float, ...]:
+        """
+        분석 구간의 마감된 봉에 대한 EMA 누적합 (구간 시작부터, adjust=True)
+        
+        구간이 한 칸 밀리면 모든 봉의 MACD 값이 바뀌므로 봉 마감 후 한 번 O(N)으로 다시 계산하고,
+        틱마다는 진행 중인 봉 하나만 더합니다.
+        """
+        if self.macd_sums is None:
+            a12 = d12 = a26 = d26 = b9 = d9 = 0.0
+            for bar in self.closed:
+                close = bar[3]
+                a12, d12 = close + self.W12 * a12, 1 + self.W12 * d12
+                a26, d26 = close + self.W26 * a26, 1 + self.W26 * d26
+                b9, d9 = (a12 / d12 - a26 / d26) + self.W9 * b9, 1 + self.W9 * d9
+            self.macd_sums = (a12, d12, a26, d26, b9, d9)
+        return self.macd_sums
+
+
+class IncrementalMarketConditionDetector(MarketConditionDetector):
+    """
+    증분 시장 상황 감지기
+    
+    마켓별로 이동평균·ATR·RSI·거래량 평균 등을 스트리밍 지표로 유지하고,
+    detect_market_condition()이 호출되면 새로 마감된 봉만 반영합니다.
+    - 새 봉도 없고 진행 중인 봉도 그대로면 캐시된 MarketCondition을 그대로 반환
+    - 진행 중인 봉만 바뀌었으면 O(1)로 다시 계산 (intrabar=False면 캐시 반환)
+    - 봉이 마감됐으면 그 봉만 지표에 반영
+    
+    같은 마켓에는 같은 길이의 데이터프레임(예: 최근 100개 일봉)을 넘긴다고 가정하며,
+    길이나 과거 봉이 달라지면 전체를 다시 초기화합니다.
+    결과는 MarketConditionDetector와 같습니다 (timestamp 제외).
+    """
+    
+    # 이보다 짧은 데이터는 증분 계산 없이 기본 감지기로 분석 (장기 이동평균 50일 + 1)
+    MIN_FRAME_SIZE = 51
+    
+    def __init__(self, lookback_period: int = 50, intrabar: bool = True):
+        """
+        초기화
+        
+        Args:
+            lookback_period: 분석 기간 (일)
+            intrabar: 봉 마감 전 진행 중인 봉의 변화도 반영할지 여부
+        """
+        super().__init__(lookback_period)
+        self.intrabar = intrabar
+        self.states: Dict[str, _MarketState] = {}
+        self.stats = {
+            'calls': 0,
+            'cache_hits': 0,
+            'intrabar_updates': 0,
+            'bars_added': 0,
+            'full_rebuilds': 0,
+            'fallbacks': 0
+        }
+    
+    def detect_market_condition(self, price_data: pd.DataFrame,
+                                market: str = 'default') -> MarketCondition:
+        """
+        시장 상황 분석 (증분)
+        
+        Args:
+            price_data: OHLCV 데이터 (마지막 행은 진행 중인 봉)
+                       컬럼: open, high, low, close, volume (datetime 컬럼이 있으면 봉 식별에 사용)
+            market: 상태를 구분할 마켓 코드
+        
+        Returns:
+            MarketCondition 객체
+        """
+        self.stats['calls'] += 1
+        frame_size = len(price_data)
+        if frame_size < self.MIN_FRAME_SIZE:
+            self.stats['fallbacks'] += 1
+            return super().detect_market_condition(price_data)
+        
+        keys = (price_data['datetime'] if 'datetime' in price_data.columns else price_data.index).to_numpy()
+        ohlcv = price_data[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+        
+        state = self.states.get(market)
+        new_bars = self._count_new_bars(state, keys, ohlcv)
+        
+        if new_bars is None:
+            state = self._rebuild(market, keys, ohlcv)
+        elif new_bars:
+            for row in ohlcv[-new_bars - 1:-1]:
+                state.add_closed(tuple(row.tolist()))
+            state.last_key = keys[-2]
+            self.stats['bars_added'] += new_bars
+        
+        current = tuple(ohlcv[-1].tolist())
+        if state.condition is not None and not new_bars:
+            if current == state.current or not self.intrabar:
+                self.stats['cache_hits'] += 1
+                return state.condition
+            self.stats['intrabar_updates'] += 1
+        
+        state.current = current
+        state.condition = self._evaluate(state, current)
+        return state.condition
+    
+    def reset(self, market: Optional[str] = None):
+        """마켓 상태 초기화 (None이면 전체)"""
+        if market is None:
+            self.states.clear()
+        else:
+            self.states.pop(market, None)
+    
+    def get_statistics(self) -> Dict[str, int]:
+        """호출·캐시 적중·봉 반영·재초기화 횟수"""
+        return {**self.stats, 'markets': len(self.states)}
+    
+    def _count_new_bars(self, state: Optional[_MarketState],
+                        keys: np.ndarray, ohlcv: np.ndarray) -> Optional[int]:
+        """
+        이전 호출 이후 새로 마감된 봉 수 (상태를 이어서 쓸 수 없으면 None)
+        """
+        if state is None or state.frame_size != len(keys):
+            return None
+        
+        # 마지막으로 반영한 봉이 몇 칸 앞에 있는지 (뒤에서부터 탐색)
+        for new_bars in range(len(keys) - 1):
+            position = len(keys) - 2 - new_bars
+            if keys[position] == state.last_key:
+                # 같은 봉인데 값이 다르면 과거 데이터가 바뀐 것
+                if tuple(ohlcv[position].tolist()) != state.closed[-1]:
+                    return None
+                return new_bars
+        return None
+    
+    def _rebuild(self, market: str, keys: np.ndarray, ohlcv: np.ndarray) -> _MarketState:
+        """데이터프레임의 마감된 봉으로 상태 재구성"""
+        state = _MarketState(len(keys))
+        for row in ohlcv[:-1]:
+            state.add_closed(tuple(row.tolist()))
+        state.last_key = keys[-2]
+        
+        self.states[market] = state
+        self.stats['full_rebuilds'] += 1
+        return state
+    
+    def _evaluate(self, state: _MarketState, current: Tuple[float, ...]) -> MarketCondition:
+        """마감된 봉 상태 + 진행 중인 봉으로 시장 상황 계산 (O(1))"""
+        open_, high, low, close, volume = current
+        closed = state.closed
+        prev_high, prev_low, prev_close = closed[-1][1], closed[-1][2], closed[-1][3]
+        
+        # 1. 추세
+        ma_short = state.ma_short.peek(close)
+        ma_medium = state.ma_medium.peek(close)
+        ma_long = state.ma_long.peek(close)
+        
+        ma_alignment = 0
+        if ma_short > ma_medium > ma_long:
+            ma_alignment = 1
+        elif ma_short < ma_medium < ma_long:
+            ma_alignment = -1
+        
+        base_20 = closed[-19][3]
+        price_change = (close - base_20) / base_20
+        
+        highs = (state.high_5.peek(high), state.high_5_history[-4], state.high_5_history[-9])
+        lows = (state.low_5.peek(low), state.low_5_history[-4], state.low_5_history[-9])
+        higher_highs = highs[0] > highs[1] > highs[2]
+        lower_lows = lows[0] < lows[1] < lows[2]
+        
+        trend, trend_strength = self._classify_trend(price_change, ma_alignment, higher_highs, lower_lows)
+        
+        # 2. 변동성
+        volatility_std = state.return_std.peek(close / prev_close - 1)
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        atr_percent = state.atr.peek(true_range) / close
+        volatility = self._classify_volatility((volatility_std + atr_percent) / 2)
+        
+        # 3. 모멘텀
+        delta = close - prev_close
+        gain = state.gain.peek(delta if delta > 0 else 0.0)
+        loss = state.loss.peek(-delta if delta < 0 else 0.0)
+        rsi = 100 - (100 / (1 + gain / (loss + 1e-10)))
+        rsi_normalized = (rsi - 50) / 50
+        
+        a12, d12, a26, d26, b9, d9 = state.get_macd_sums()
+        macd = (close + _MarketState.W12 * a12) / (1 + _MarketState.W12 * d12) \
+            - (close + _MarketState.W26 * a26) / (1 + _MarketState.W26 * d26)
+        signal = (macd + _MarketState.W9 * b9) / (1 + _MarketState.W9 * d9)
+        macd_normalized = math.tanh((macd - signal) / close * 100)
+        
+        base_10 = closed[-9][3]
+        roc_normalized = math.tanh((close - base_10) / base_10 * 10)
+        
+        momentum = self._combine_momentum(rsi_normalized, macd_normalized, roc_normalized)
+        
+        # 4. 거래량
+        volume_profile = self._classify_volume(
+            state.volume_short.peek(volume) / (state.volume_long.peek(volume) + 1e-10)
+        )
+        
+        # 5. 지지/저항선
+        pivot = (prev_high + prev_low + prev_close) / 3
+        support_resistance = {
+            'current_price': close,
+            'resistance_levels': [state.high_20.peek(high), 2 * pivot - prev_low],
+            'support_levels': [state.low_20.peek(low), 2 * pivot - prev_high],
+            'ma_50': ma_long,
+            'ma_200': state.ma_200.peek(close) if state.frame_size >= 200 else None,
+            'pivot': pivot
+        }
+        
+        # 6. 신뢰도
+        confidence = self._calculate_confidence(trend_strength, volatility, volume_profile)
+        
+        return MarketCondition(
+            trend=trend,
+            volatility=volatility,
+            trend_strength=trend_strength,
+            momentum=momentum,
+            volume_profile=volume_profile,
+            support_resistance=support_resistance,
+            confidence=confidence,
+            timestamp=datetime.now()
+        )
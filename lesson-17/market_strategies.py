@@ -2,16 +2,33 @@
 market_strategies.py - 시장 상황별 전략 구현
 
 상승장, 하락장, 횡보장에 따라 다른 전략을 적용합니다.
+
+각 전략은 지표를 스트리밍 지표 객체(lesson-06/streaming_indicators.py)로 유지합니다.
+- update_bar(): 마감된 봉 하나 반영 (O(1))
+- evaluate(): 진행 중인 봉(현재가)으로 신호 생성 (O(1), 지표 상태는 바꾸지 않음)
+- generate_signal(): 데이터프레임 전체로 신호 생성 (마지막 행이 진행 중인 봉)
 """
 
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Tuple
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from streaming_indicators import SMA, RSI, BollingerBands, RollingMin
+
 
 class BaseStrategy(ABC):
-    """전략 기본 클래스"""
+    """
+    전략 기본 클래스
+    
+    봉(bar)은 open/high/low/close/volume 속성을 가진 객체입니다
+    (데이터프레임 행, itertuples() 결과, 실시간 캔들 등).
+    """
     
     def __init__(self, name: str):
         """
@@ -22,15 +39,57 @@ class BaseStrategy(ABC):
         """
         self.name = name
         self.position = None
-        
-    @abstractmethod
+    
     def generate_signal(self, market_data: pd.DataFrame) -> Dict:
         """
         매매 신호 생성
         
+        마지막 행을 진행 중인 봉으로 보고, 그 이전 봉으로 지표를 다시 준비한 뒤 평가합니다.
+        실시간 루프에서는 prime()/update_bar()/evaluate()를 직접 사용하세요.
+        
         Args:
             market_data: OHLCV 데이터
         
+        Returns:
+            신호 딕셔너리 {'action': 'BUY'/'SELL'/'HOLD', 'confidence': 0.0~1.0, ...}
+        """
+        self.prime(market_data.iloc[:-1])
+        return self.evaluate(next(market_data.iloc[-1:].itertuples(index=False)))
+    
+    def prime(self, market_data: pd.DataFrame):
+        """
+        마감된 봉으로 지표 초기화
+        
+        Args:
+            market_data: OHLCV 데이터 (진행 중인 봉 제외)
+        """
+        self.reset()
+        for bar in market_data.itertuples(index=False):
+            self.update_bar(bar)
+    
+    @abstractmethod
+    def reset(self):
+        """지표 상태 초기화"""
+        pass
+    
+    @abstractmethod
+    def update_bar(self, bar: Any):
+        """
+        마감된 봉 반영
+        
+        Args:
+            bar: 마감된 봉
+        """
+        pass
+    
+    @abstractmethod
+    def evaluate(self, bar: Any) -> Dict:
+        """
+        진행 중인 봉 기준 매매 신호 생성 (지표 상태는 바꾸지 않음)
+        
+        Args:
+            bar: 진행 중인 봉 (close가 현재가)
+        
         Returns:
             신호 딕셔너리 {'action': 'BUY'/'SELL'/'HOLD', 'confidence': 0.0~1.0, ...}
         """
@@ -67,21 +126,26 @@ class TrendFollowingStrategy(BaseStrategy):
         super().__init__("추세 추종 전략")
         self.ma_short_period = 20
         self.ma_long_period = 50
+        self.reset()
     
-    def generate_signal(self, market_data: pd.DataFrame) -> Dict:
+    def reset(self):
+        self.ma_short = SMA(self.ma_short_period)
+        self.ma_long = SMA(self.ma_long_period)
+    
+    def update_bar(self, bar: Any):
+        self.ma_short.update(bar.close)
+        self.ma_long.update(bar.close)
+    
+    def evaluate(self, bar: Any) -> Dict:
         """추세 추종 신호 생성"""
-        close = market_data['close']
+        current_price = bar.close
         
-        # 이동평균선 계산
-        ma_short = close.rolling(window=self.ma_short_period).mean()
-        ma_long = close.rolling(window=self.ma_long_period).mean()
+        # 이동평균선 (현재 봉 포함 / 직전 봉까지)
+        current_ma_short = self.ma_short.peek(current_price)
+        current_ma_long = self.ma_long.peek(current_price)
         
-        current_price = close.iloc[-1]
-        current_ma_short = ma_short.iloc[-1]
-        current_ma_long = ma_long.iloc[-1]
-        
-        prev_ma_short = ma_short.iloc[-2]
-        prev_ma_long = ma_long.iloc[-2]
+        prev_ma_short = self.ma_short.value
+        prev_ma_long = self.ma_long.value
         
         # 골든 크로스 (매수)
         if prev_ma_short <= prev_ma_long and current_ma_short > current_ma_long:
@@ -145,46 +209,43 @@ class RangeTradingStrategy(BaseStrategy):
         self.rsi_overbought = 70
         self.bb_period = 20
         self.bb_std = 2
+        self.support_period = 20
+        self.reset()
     
-    def generate_signal(self, market_data: pd.DataFrame) -> Dict:
+    def reset(self):
+        self.rsi = RSI(self.rsi_period)
+        self.bb = BollingerBands(self.bb_period, self.bb_std)
+        self.support = RollingMin(self.support_period)
+    
+    def update_bar(self, bar: Any):
+        self.rsi.update(bar.close)
+        self.bb.update(bar.close)
+        self.support.update(bar.low)
+    
+    def evaluate(self, bar: Any) -> Dict:
         """레인지 트레이딩 신호 생성"""
-        close = market_data['close']
-        high = market_data['high']
-        low = market_data['low']
-        
-        # RSI 계산
-        delta = close.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        rs = gain / (loss + 1e-10)
-        rsi = 100 - (100 / (1 + rs))
-        
-        current_price = close.iloc[-1]
-        current_rsi = rsi.iloc[-1]
+        current_price = bar.close
+        current_rsi = self.rsi.peek(current_price)
         
         # 볼린저 밴드
-        bb_middle = close.rolling(window=self.bb_period).mean()
-        bb_std_dev = close.rolling(window=self.bb_period).std()
-        bb_upper = bb_middle + (bb_std_dev * self.bb_std)
-        bb_lower = bb_middle - (bb_std_dev * self.bb_std)
+        bb_middle, bb_upper, bb_lower = self.bb.peek(current_price)
         
-        # 지지선/저항선 (최근 20일)
-        support = low.iloc[-20:].min()
-        resistance = high.iloc[-20:].max()
+        # 지지선 (최근 20일 저가)
+        support = self.support.peek(bar.low)
         
         # 매수 신호: RSI 과매도 + 볼린저 하단
-        if current_rsi < self.rsi_oversold and current_price < bb_lower.iloc[-1]:
+        if current_rsi < self.rsi_oversold and current_price < bb_lower:
             return {
                 'action': 'BUY',
                 'confidence': 0.8,
                 'entry_price': current_price,
                 'stop_loss': support * 0.98,
-                'take_profit': bb_middle.iloc[-1],
+                'take_profit': bb_middle,
                 'reason': f'RSI 과매도({current_rsi:.1f}) + 볼린저 하단'
             }
         
         # 매도 신호: RSI 과매수 + 볼린저 상단
-        elif current_rsi > self.rsi_overbought and current_price > bb_upper.iloc[-1]:
+        elif current_rsi > self.rsi_overbought and current_price > bb_upper:
             return {
                 'action': 'SELL',
                 'confidence': 0.8,
@@ -221,24 +282,24 @@ class VolatilityBreakoutStrategy(BaseStrategy):
     def __init__(self, k: float = 0.5):
         super().__init__("변동성 돌파 전략")
         self.k = k  # 변동성 계수
+        self.reset()
     
-    def generate_signal(self, market_data: pd.DataFrame) -> Dict:
+    def reset(self):
+        self.prev_range: Optional[float] = None
+    
+    def update_bar(self, bar: Any):
+        self.prev_range = bar.high - bar.low
+    
+    def evaluate(self, bar: Any) -> Dict:
         """변동성 돌파 신호 생성"""
-        close = market_data['close']
-        high = market_data['high']
-        low = market_data['low']
-        open_price = market_data['open']
-        
-        # 전일 변동폭
-        prev_high = high.iloc[-2]
-        prev_low = low.iloc[-2]
-        prev_range = prev_high - prev_low
+        if self.prev_range is None:
+            return {'action': 'HOLD', 'confidence': 0.5, 'reason': '돌파 대기'}
         
         # 목표가 = 시가 + (전일 변동폭 × k)
-        today_open = open_price.iloc[-1]
-        target_price = today_open + (prev_range * self.k)
+        today_open = bar.open
+        target_price = today_open + (self.prev_range * self.k)
         
-        current_price = close.iloc[-1]
+        current_price = bar.close
         
         # 돌파 매수
         if current_price > target_price:
@@ -281,19 +342,28 @@ class DefensiveStrategy(BaseStrategy):
     def __init__(self):
         super().__init__("방어 전략")
         self.ma_period = 20
+        self.reset()
     
-    def generate_signal(self, market_data: pd.DataFrame) -> Dict:
+    def reset(self):
+        self.ma_20 = SMA(20)
+        self.ma_50 = SMA(50)
+        self.rsi = RSI(14)
+    
+    def update_bar(self, bar: Any):
+        self.ma_20.update(bar.close)
+        self.ma_50.update(bar.close)
+        self.rsi.update(bar.close)
+    
+    def evaluate(self, bar: Any) -> Dict:
         """방어적 신호 생성"""
-        close = market_data['close']
+        current_price = bar.close
         
         # 이동평균선
-        ma_20 = close.rolling(window=20).mean()
-        ma_50 = close.rolling(window=50).mean()
-        
-        current_price = close.iloc[-1]
+        ma_20 = self.ma_20.peek(current_price)
+        ma_50 = self.ma_50.peek(current_price)
         
         # 모든 포지션 청산 권장
-        if current_price < ma_20.iloc[-1] and current_price < ma_50.iloc[-1]:
+        if current_price < ma_20 and current_price < ma_50:
             return {
                 'action': 'SELL',
                 'confidence': 0.9,
@@ -301,15 +371,9 @@ class DefensiveStrategy(BaseStrategy):
             }
         
         # 단기 반등 (극히 제한적 진입)
-        elif current_price > ma_20.iloc[-1] * 1.05:
+        elif current_price > ma_20 * 1.05:
             # RSI로 재확인
-            delta = close.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / (loss + 1e-10)
-            rsi = 100 - (100 / (1 + rs))
-            
-            if rsi.iloc[-1] < 30:  # 극심한 과매도
+            if self.rsi.peek(current_price) < 30:  # 극심한 과매도
                 return {
                     'action': 'BUY',
                     'confidence': 0.5,
@@ -345,23 +409,30 @@ class MomentumScalpingStrategy(BaseStrategy):
     def __init__(self):
         super().__init__("모멘텀 스캘핑 전략")
         self.momentum_period = 10
+        self.reset()
     
-    def generate_signal(self, market_data: pd.DataFrame) -> Dict:
+    def reset(self):
+        # 현재 봉을 제외한 최근 (momentum_period - 1)개 종가
+        self.closes = deque(maxlen=self.momentum_period - 1)
+        self.avg_volume = SMA(20)
+    
+    def update_bar(self, bar: Any):
+        self.closes.append(bar.close)
+        self.avg_volume.update(bar.volume)
+    
+    def evaluate(self, bar: Any) -> Dict:
         """모멘텀 스캘핑 신호"""
-        close = market_data['close']
-        volume = market_data['volume']
+        current_price = bar.close
         
         # 단기 모멘텀 (ROC)
-        if len(close) >= self.momentum_period:
-            roc = (close.iloc[-1] - close.iloc[-self.momentum_period]) / close.iloc[-self.momentum_period]
+        if len(self.closes) == self.closes.maxlen:
+            base_price = self.closes[0]
+            roc = (current_price - base_price) / base_price
         else:
             roc = 0
         
         # 거래량 급증 확인
-        avg_volume = volume.rolling(window=20).mean()
-        volume_surge = volume.iloc[-1] > avg_volume.iloc[-1] * 1.5
-        
-        current_price = close.iloc[-1]
+        volume_surge = bar.volume > self.avg_volume.peek(bar.volume) * 1.5
         
         # 강한 모멘텀 + 거래량 급증
         if roc > 0.03 and volume_surge:  # 3% 이상 상승 + 거래량
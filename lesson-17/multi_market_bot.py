@@ -0,0 +1,600 @@
+"""
+multi_market_bot.py - 다중 마켓 적응형 자동매매 봇
+
+한 프로세스에서 여러 마켓의 AdaptiveStrategySystem을 함께 운영합니다.
+마켓마다 RealtimeAdaptiveBot 프로세스를 띄우면 REST 조회·WebSocket 연결·메모리가
+마켓 수만큼 늘어나므로, 다음을 모든 마켓이 공유합니다.
+
+- UpbitDataCollector 1개 (시작 시 일봉 조회, 요청 제한 공유)
+- TickerFeed 1개 (모든 마켓을 한 WebSocket 연결로 구독)
+- LiveCandleCache 1개 (마켓별 인메모리 일봉)
+- CapitalBudget 1개 (전체 포지션 수·투입 자금 한도)
+
+틱이 오면 해당 마켓만 asyncio 이벤트 루프에 알리고, 마켓별 작업(task)이 최신 봉으로
+전략을 평가합니다. 한 마켓의 시장 상황 재감지(봉 마감 시)는 스레드에서 실행되므로
+다른 마켓의 평가를 막지 않습니다.
+"""
+
+import asyncio
+import time
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from upbit_data_collector import UpbitDataCollector
+from adaptive_strategy_system import AdaptiveStrategySystem
+from market_condition_detector import MarketCondition
+from live_market_feed import LiveCandleCache, LiveCandle, TickerFeed
+
+# 업비트 최소 주문 금액 (원)
+MIN_ORDER_AMOUNT = 5000
+
+
+class CapitalBudget:
+    """
+    전체 포지션·자금 한도
+
+    모든 마켓이 하나의 계좌 자금을 나눠 쓰므로, 매수 전에 reserve()로 자금을 배정받고
+    청산 후 release()로 반환합니다.
+    """
+
+    def __init__(self, total_capital: float, max_positions: int = 5,
+                 max_exposure: float = 1.0, max_per_market: float = 0.2):
+        """
+        초기화
+
+        Args:
+            total_capital: 전체 자금 (원)
+            max_positions: 동시에 보유할 수 있는 최대 포지션 수
+            max_exposure: 자산 대비 최대 투입 비율 (0.0 ~ 1.0)
+            max_per_market: 자산 대비 마켓당 최대 투입 비율
+        """
+        self.initial_capital = total_capital
+        self.realized_pnl = 0.0
+        self.max_positions = max_positions
+        self.max_exposure = max_exposure
+        self.max_per_market = max_per_market
+        self.positions: Dict[str, float] = {}
+        self.stats = {'approved': 0, 'clipped': 0, 'rejected': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def equity(self) -> float:
+        """실현 손익을 반영한 자산"""
+        return self.initial_capital + self.realized_pnl
+
+    @property
+    def deployed(self) -> float:
+        """포지션에 투입된 자금"""
+        return sum(self.positions.values())
+
+    @property
+    def available(self) -> float:
+        """추가로 투입할 수 있는 자금"""
+        return max(0.0, self.equity * self.max_exposure - self.deployed)
+
+    def reserve(self, market: str, amount: float) -> float:
+        """
+        매수 자금 배정
+
+        Args:
+            market: 마켓 코드
+            amount: 요청 금액
+
+        Returns:
+            배정된 금액 (한도에 맞게 줄어들 수 있음, 배정할 수 없으면 0)
+        """
+        with self.lock:
+            if market in self.positions or len(self.positions) >= self.max_positions:
+                self.stats['rejected'] += 1
+                return 0.0
+
+            approved = min(amount, self.equity * self.max_per_market, self.available)
+            if approved < MIN_ORDER_AMOUNT:
+                self.stats['rejected'] += 1
+                return 0.0
+
+            self.positions[market] = approved
+            self.stats['approved'] += 1
+            if approved < amount:
+                self.stats['clipped'] += 1
+            return approved
+
+    def release(self, market: str, pnl: float = 0.0):
+        """
+        청산 후 자금 반환
+
+        Args:
+            market: 마켓 코드
+            pnl: 실현 손익
+        """
+        with self.lock:
+            if self.positions.pop(market, None) is not None:
+                self.realized_pnl += pnl
+
+    def get_status(self) -> Dict:
+        """한도 사용 현황"""
+        with self.lock:
+            return {
+                'equity': self.equity,
+                'realized_pnl': self.realized_pnl,
+                'deployed': self.deployed,
+                'available': self.available,
+                'open_positions': len(self.positions),
+                'max_positions': self.max_positions,
+                'positions': dict(self.positions),
+                **self.stats
+            }
+
+
+class MarketSlot:
+    """마켓 하나의 전략 시스템과 실행 상태"""
+
+    def __init__(self, market: str, system: AdaptiveStrategySystem):
+        self.market = market
+        self.system = system
+        self.market_condition: Optional[MarketCondition] = None
+        self.condition_updated_at = 0.0
+        self.pending_bars: List[LiveCandle] = []  # 아직 지표에 반영하지 않은 마감된 봉
+        self.wakeup = asyncio.Event()
+        self.ready = False
+        self.ticks = 0
+        self.evaluations = 0
+        self.last_signal: Optional[Dict] = None
+
+
+class MultiMarketAdaptiveBot:
+    """
+    다중 마켓 적응형 자동매매 봇
+
+    기능:
+    - 마켓별 AdaptiveStrategySystem (전략 선택·지표·시장 감지 상태는 마켓마다 따로)
+    - 데이터 수집기·WebSocket 피드·일봉 캐시 공유
+    - asyncio 이벤트 루프에서 마켓별 동시 평가 (틱이 온 마켓만)
+    - 전체 포지션 수·자금 한도 (CapitalBudget)
+    """
+
+    def __init__(self,
+                 markets: List[str],
+                 initial_balance: float,
+                 max_positions: int = 5,
+                 max_exposure: float = 1.0,
+                 max_per_market: float = 0.2,
+                 update_interval: int = 300,
+                 condition_refresh: int = 60,
+                 dry_run: bool = True,
+                 seed_concurrency: int = 5):
+        """
+        초기화
+
+        Args:
+            markets: 거래할 마켓 코드 목록 (예: ['KRW-BTC', 'KRW-ETH'])
+            initial_balance: 전체 초기 자금
+            max_positions: 동시에 보유할 수 있는 최대 포지션 수
+            max_exposure: 자산 대비 최대 투입 비율
+            max_per_market: 자산 대비 마켓당 최대 투입 비율
+            update_interval: 상태 출력 간격 (초)
+            condition_refresh: 봉 마감 외에 시장 상황을 다시 감지하는 간격 (초)
+            dry_run: 테스트 모드 (실제 주문 X)
+            seed_concurrency: 시작 시 동시에 일봉을 조회할 마켓 수
+
+        Raises:
+            NotImplementedError: dry_run=False (실제 주문 API 연동 전)
+        """
+        if not dry_run:
+            # 실전 모드 (TODO: 실제 주문 API 연동) - 신호를 조용히 버리며 돌지 않도록 시작을 거부
+            raise NotImplementedError("실전 모드는 아직 구현되지 않았습니다 (dry_run=True로 실행하세요)")
+
+        self.markets = list(dict.fromkeys(markets))
+        self.initial_balance = initial_balance
+        self.update_interval = update_interval
+        self.condition_refresh = condition_refresh
+        self.dry_run = dry_run
+        self.seed_concurrency = seed_concurrency
+
+        # 공유 자원
+        self.collector = UpbitDataCollector()
+        self.candles = LiveCandleCache()
+        self.budget = CapitalBudget(initial_balance, max_positions, max_exposure, max_per_market)
+        self.feed: Optional[TickerFeed] = None
+
+        # 마켓별 상태 (포지션 크기는 전체 자금 기준으로 계산하고 budget이 한도를 적용)
+        self.slots: Dict[str, MarketSlot] = {
+            market: MarketSlot(market, AdaptiveStrategySystem(account_balance=initial_balance))
+            for market in self.markets
+        }
+
+        # 실행 상태
+        self.is_running = False
+        self.stopped = False
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            'ticks': 0,
+            'evaluations': 0,
+            'bars_closed': 0,
+            'errors': 0,
+            'total_process_ms': 0.0,
+            'max_process_ms': 0.0,
+            'max_lag_ms': 0.0
+        }
+
+        # 로깅
+        self.logger = logging.getLogger(__name__)
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler('multi_market_bot.log'),
+                logging.StreamHandler()
+            ]
+        )
+
+        self.logger.info(f"봇 초기화 완료: {len(self.markets)}개 마켓")
+        self.logger.info(f"초기 자금: {initial_balance:,.0f}원")
+        self.logger.info(
+            f"한도: 최대 {max_positions}개 포지션, 투입 {max_exposure*100:.0f}%, "
+            f"마켓당 {max_per_market*100:.0f}%"
+        )
+        self.logger.info(f"모드: {'테스트(DRY RUN)' if dry_run else '실전'}")
+
+    def start(self):
+        """봇 시작 (중지될 때까지 블록)"""
+        self.logger.info("\n" + "="*80)
+        self.logger.info("🚀 다중 마켓 적응형 자동매매 봇 시작!")
+        self.logger.info("="*80 + "\n")
+
+        try:
+            asyncio.run(self.run())
+        except KeyboardInterrupt:
+            self.logger.info("\n봇 중지 (사용자 중단)")
+        except Exception as e:
+            self.logger.error(f"봇 실행 오류: {e}")
+        finally:
+            self.stop()
+
+    async def run(self):
+        """이벤트 루프 본체: 일봉 초기화 → 피드 구독 → 마켓별 평가 작업 + 상태 출력"""
+        self.is_running = True
+        self.loop = asyncio.get_running_loop()
+
+        ready = await self.seed_all()
+        if not ready:
+            self.logger.warning("초기화된 마켓이 없습니다.")
+            self.is_running = False
+            return
+
+        workers = [asyncio.create_task(self._market_worker(self.slots[market])) for market in ready]
+
+        self.feed = TickerFeed(ready, dispatch=self.on_ticks)
+        self.feed.start()
+
+        try:
+            while self.is_running:
+                await asyncio.sleep(self.update_interval)
+                if self.is_running:
+                    self._print_status()
+        finally:
+            # 루프가 닫힌 뒤 디코더 스레드가 call_soon_threadsafe를 호출하지 않도록 먼저 구독 종료
+            self.is_running = False
+            self.feed.stop()
+            self.feed = None
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def seed_all(self) -> List[str]:
+        """
+        모든 마켓의 일봉을 조회해 캐시·지표·시장 상황 초기화
+
+        Returns:
+            초기화에 성공한 마켓 목록
+        """
+        self.logger.info(f"\n1️⃣ 초기 일봉 조회 중... ({len(self.markets)}개 마켓)")
+        semaphore = asyncio.Semaphore(self.seed_concurrency)
+
+        async def seed(slot: MarketSlot):
+            async with semaphore:
+                try:
+                    slot.ready = await asyncio.to_thread(self.seed_market, slot)
+                except Exception as e:
+                    self.logger.error(f"{slot.market} 초기화 오류: {e}")
+
+        await asyncio.gather(*(seed(slot) for slot in self.slots.values()))
+
+        ready = [market for market, slot in self.slots.items() if slot.ready]
+        self.logger.info(f"초기화 완료: {len(ready)}/{len(self.markets)}개 마켓")
+        return ready
+
+    def seed_market(self, slot: MarketSlot) -> bool:
+        """
+        마켓 하나 초기화 (스레드에서 실행)
+
+        Returns:
+            성공 여부
+        """
+        historical_data = self.collector.get_candles_daily(slot.market, count=100)
+        if historical_data.empty:
+            self.logger.warning(f"{slot.market} 데이터 수집 실패")
+            return False
+
+        self.candles.seed(slot.market, historical_data)
+        slot.system.prime(historical_data.iloc[:-1])
+        self._refresh_market_condition(slot)
+        return True
+
+    def on_ticks(self, messages: List[Tuple[int, Dict]]):
+        """
+        ticker 메시지 배치 처리 (피드 디코더 스레드)
+
+        캔들만 갱신하고, 틱이 온 마켓과 마감된 봉을 이벤트 루프에 넘깁니다.
+        같은 마켓에 틱이 여러 번 와도 평가는 최신 봉으로 한 번만 합니다.
+
+        Args:
+            messages: [(수신 시각 epoch 나노초, ticker 메시지), ...]
+        """
+        touched: Dict[str, List[LiveCandle]] = {}
+        received_at = None
+
+        for received_at, data in messages:
+            market, closed_bar = self.candles.apply_ticker(data)
+            if market is None:
+                continue
+            bars = touched.setdefault(market, [])
+            if closed_bar is not None:
+                bars.append(closed_bar)
+
+        self.stats['ticks'] += len(messages)
+        if touched and self.is_running and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._wake_markets, touched, received_at)
+
+    def _wake_markets(self, touched: Dict[str, List[LiveCandle]], received_at: int):
+        """틱이 온 마켓의 평가 작업 깨우기 (이벤트 루프)"""
+        lag_ms = (time.time_ns() - received_at) / 1e6
+        self.stats['max_lag_ms'] = max(self.stats['max_lag_ms'], lag_ms)
+
+        for market, bars in touched.items():
+            slot = self.slots[market]
+            slot.ticks += 1
+            slot.pending_bars.extend(bars)
+            slot.wakeup.set()
+
+    async def _market_worker(self, slot: MarketSlot):
+        """마켓 하나의 평가 작업: 깨어날 때마다 마감된 봉 반영 후 최신 봉으로 평가"""
+        while True:
+            await slot.wakeup.wait()
+            slot.wakeup.clear()
+
+            try:
+                if slot.pending_bars:
+                    bars, slot.pending_bars = slot.pending_bars, []
+                    for bar in bars:
+                        self._on_bar_close(slot, bar)
+                    await asyncio.to_thread(self._refresh_market_condition, slot)
+                elif time.time() - slot.condition_updated_at >= self.condition_refresh:
+                    await asyncio.to_thread(self._refresh_market_condition, slot)
+
+                self._evaluate(slot)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"{slot.market} 처리 오류: {e}")
+
+    def _on_bar_close(self, slot: MarketSlot, bar: LiveCandle):
+        """일봉 마감: 지표 갱신 (시장 상황은 호출한 쪽에서 재감지)"""
+        self.stats['bars_closed'] += 1
+        self.logger.info(
+            f"📅 {slot.market} 일봉 마감: {bar.datetime:%Y-%m-%d} 종가 {bar.close:,.0f}"
+        )
+        slot.system.on_bar_close(bar)
+
+    def _refresh_market_condition(self, slot: MarketSlot):
+        """메모리 캔들로 시장 상황 감지"""
+        candles = self.candles.get_candles(slot.market, count=100)
+        slot.market_condition = slot.system.market_detector.detect_market_condition(
+            candles, market=slot.market
+        )
+        slot.condition_updated_at = time.time()
+
+    def _evaluate(self, slot: MarketSlot):
+        """현재 봉으로 전략 평가 및 신호 처리"""
+        started = time.perf_counter()
+
+        bar = self.candles.current_bar(slot.market)
+        signal = slot.system.execute_on_tick(bar, slot.market_condition)
+        slot.last_signal = signal
+        slot.evaluations += 1
+        self.stats['evaluations'] += 1
+
+        self._process_signal(slot, signal, bar.close)
+
+        process_ms = (time.perf_counter() - started) * 1000
+        self.stats['total_process_ms'] += process_ms
+        self.stats['max_process_ms'] = max(self.stats['max_process_ms'], process_ms)
+
+    def _process_signal(self, slot: MarketSlot, signal: Dict, current_price: float):
+        """
+        신호 처리 (매수는 CapitalBudget에서 자금을 배정받은 경우에만)
+
+        Args:
+            slot: 마켓 상태
+            signal: 전략 신호
+            current_price: 현재가
+        """
+        system = slot.system
+        position = system.current_position
+
+        # 포지션 없을 때 - 매수 신호 처리
+        if position is None:
+            if signal['action'] != 'BUY' or signal['confidence'] <= 0.7:
+                return
+
+            amount = self.budget.reserve(slot.market, signal['position_size'])
+            if not amount:
+                self.logger.info(f"⛔ {slot.market} 매수 신호 무시: 포지션/자금 한도 초과")
+                return
+
+            self.logger.info(f"✅ {slot.market} 매수 신호 감지! 배정 자금 {amount:,.0f}원")
+            if not system.open_position({**signal, 'position_size': amount}):
+                self.budget.release(slot.market)
+            return
+
+        # 포지션 있을 때 - 청산 조건 확인
+        stop_loss = position.get('stop_loss')
+        take_profit = position.get('take_profit')
+
+        if stop_loss and current_price <= stop_loss:
+            close_reason = "손절"
+        elif take_profit and current_price >= take_profit:
+            close_reason = "익절"
+        elif signal['action'] == 'SELL' and signal['confidence'] > 0.6:
+            close_reason = f"전략 매도 ({signal['reason']})"
+        else:
+            return
+
+        self.logger.info(f"✅ {slot.market} 포지션 청산: {close_reason}")
+        trade = system.close_position(current_price, close_reason)
+        self.budget.release(slot.market, trade['pnl'] if trade else 0.0)
+
+    def _print_status(self):
+        """주기적 상태 출력"""
+        stats = self.stats
+        budget = self.budget.get_status()
+        evaluations = stats['evaluations']
+
+        self.logger.info(f"\n{'='*80}")
+        self.logger.info(f"📊 다중 마켓 상태 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.info(f"{'='*80}")
+        self.logger.info(
+            f"틱: {stats['ticks']}건 | 평가: {evaluations}회 | 봉 마감: {stats['bars_closed']}회 | "
+            f"오류: {stats['errors']}건"
+        )
+        if evaluations:
+            self.logger.info(
+                f"처리 시간: 평균 {stats['total_process_ms'] / evaluations:.3f}ms / "
+                f"최대 {stats['max_process_ms']:.3f}ms | 최대 지연: {stats['max_lag_ms']:.1f}ms"
+            )
+
+        self.logger.info("\n💰 자금 현황:")
+        self.logger.info(f"  자산: {budget['equity']:,.0f}원 (실현 손익 {budget['realized_pnl']:+,.0f}원)")
+        self.logger.info(f"  투입: {budget['deployed']:,.0f}원 | 가용: {budget['available']:,.0f}원")
+        self.logger.info(
+            f"  포지션: {budget['open_positions']}/{budget['max_positions']}개 | "
+            f"배정 {budget['approved']}회 (축소 {budget['clipped']}회) | 거절 {budget['rejected']}회"
+        )
+
+        self.logger.info(f"\n{'마켓':<12}{'현재가':>16}{'추세':>14}{'전략':>22}{'포지션':>14}")
+        for market, slot in self.slots.items():
+            bar = self.candles.current_bar(market)
+            condition = slot.market_condition
+            position = slot.system.current_position
+            price = f"{bar.close:,.0f}" if bar else '-'
+            trend = condition.trend.value if condition else '-'
+            size = f"{position['position_size']:,.0f}" if position else '-'
+            self.logger.info(
+                f"{market:<12}{price:>16}{trend:>14}"
+                f"{(slot.system.active_strategy_name or '-'):>22}{size:>14}"
+            )
+
+    def stop(self):
+        """봇 중지"""
+        if self.stopped:
+            return
+        self.stopped = True
+        self.is_running = False
+
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed = None
+
+        self.logger.info("\n" + "="*80)
+        self.logger.info("🛑 봇 중지")
+        self.logger.info("="*80)
+
+        # 최종 리포트
+        self._print_status()
+        for market, slot in self.slots.items():
+            if slot.system.trade_history:
+                print(f"\n[{market}]")
+                slot.system.print_performance_report()
+
+        self.logger.info("\n봇이 안전하게 종료되었습니다.")
+
+    def get_status(self) -> Dict:
+        """현재 상태 조회"""
+        return {
+            'markets': self.markets,
+            'is_running': self.is_running,
+            'stats': dict(self.stats),
+            'budget': self.budget.get_status(),
+            'per_market': {
+                market: {
+                    'ready': slot.ready,
+                    'ticks': slot.ticks,
+                    'evaluations': slot.evaluations,
+                    'active_strategy': slot.system.active_strategy_name,
+                    'position': slot.system.current_position,
+                    'performance': slot.system.get_performance_report()
+                }
+                for market, slot in self.slots.items()
+            }
+        }
+
+
+def main():
+    """메인 함수"""
+
+    print("\n" + "="*80)
+    print("🤖 다중 마켓 적응형 자동매매 봇")
+    print("="*80)
+    print("\n여러 원화 마켓을 한 프로세스에서 WebSocket 하나로 구독하고,")
+    print("마켓별로 전략을 자동 전환하며 전체 자금 한도 안에서 매매합니다.")
+    print("\n⚠️  현재는 테스트 모드(DRY RUN)로 실행됩니다.")
+
+    print("\n" + "-"*80)
+    print("⚙️  설정")
+    print("-"*80)
+
+    markets_input = input("\n마켓 코드 입력 (쉼표 구분, 빈칸이면 원화 마켓 상위 N개): ").strip()
+    if markets_input:
+        markets = [m.strip().upper() for m in markets_input.split(',') if m.strip()]
+    else:
+        try:
+            count_input = input("원화 마켓 개수 (기본값: 20): ").strip()
+            count = int(count_input) if count_input else 20
+        except ValueError:
+            count = 20
+        markets = UpbitDataCollector().get_krw_markets()[:count]
+
+    try:
+        balance_input = input("\n전체 초기 자금 입력 (원, 기본값: 10000000): ").strip()
+        initial_balance = float(balance_input) if balance_input else 10_000_000
+    except ValueError:
+        initial_balance = 10_000_000
+
+    try:
+        positions_input = input("최대 동시 포지션 수 (기본값: 5): ").strip()
+        max_positions = int(positions_input) if positions_input else 5
+    except ValueError:
+        max_positions = 5
+
+    print("\n" + "-"*80)
+    print("📋 설정 완료")
+    print("-"*80)
+    print(f"  마켓: {len(markets)}개 ({', '.join(markets[:5])}{' ...' if len(markets) > 5 else ''})")
+    print(f"  초기 자금: {initial_balance:,.0f}원")
+    print(f"  최대 포지션: {max_positions}개")
+    print("  모드: 테스트 (DRY RUN)")
+
+    input("\n시작하려면 Enter를 누르세요...")
+
+    bot = MultiMarketAdaptiveBot(
+        markets=markets,
+        initial_balance=initial_balance,
+        max_positions=max_positions,
+        dry_run=True
+    )
+    bot.start()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,23 @@ realtime_adaptive_bot.py - 실시간 적응형 자동매매 봇
 
 업비트 API와 연동하여 실시간으로 시장 상황을 분석하고
 최적의 전략으로 자동 전환하며 거래를 실행합니다.
+
+실행 방식:
+- 폴링 (기본): update_interval마다 REST로 현재가·일봉 100개를 조회해 전체 분석
+- 이벤트 (event_driven=True): 시작 시 일봉을 한 번만 조회하고, WebSocket ticker가
+  올 때마다 메모리의 마지막 봉만 갱신해 바로 전략을 평가 (지표는 봉 마감 시에만 갱신)
 """
 
 import time
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
 from upbit_data_collector import UpbitDataCollector, RealtimeDataMonitor
 from adaptive_strategy_system import AdaptiveStrategySystem
 from market_condition_detector import MarketCondition
+from live_market_feed import LiveCandleCache, LiveCandle, TickerFeed
 
 
 class RealtimeAdaptiveBot:
@@ -31,20 +37,26 @@ class RealtimeAdaptiveBot:
                  market: str,
                  initial_balance: float,
                  update_interval: int = 300,  # 5분
-                 dry_run: bool = True):
+                 dry_run: bool = True,
+                 event_driven: bool = False,
+                 condition_refresh: int = 60):
         """
         초기화
         
         Args:
             market: 거래할 마켓 코드 (예: 'KRW-BTC')
             initial_balance: 초기 자금
-            update_interval: 업데이트 간격 (초)
+            update_interval: 업데이트 간격 (초, 이벤트 모드에서는 상태 출력 간격)
             dry_run: 테스트 모드 (실제 주문 X)
+            event_driven: WebSocket 틱 기반 이벤트 모드
+            condition_refresh: 이벤트 모드에서 봉 마감 외에 시장 상황을 다시 감지하는 간격 (초)
         """
         self.market = market
         self.initial_balance = initial_balance
         self.update_interval = update_interval
         self.dry_run = dry_run
+        self.event_driven = event_driven
+        self.condition_refresh = condition_refresh
         
         # 데이터 수집기
         self.collector = UpbitDataCollector()
@@ -57,6 +69,21 @@ class RealtimeAdaptiveBot:
         self.last_update_time = None
         self.update_count = 0
         
+        # 이벤트 모드 상태
+        self.candles = LiveCandleCache()
+        self.feed: Optional[TickerFeed] = None
+        self.market_condition: Optional[MarketCondition] = None
+        self.condition_updated_at = 0.0
+        self.event_stats = {
+            'ticks': 0,
+            'evaluations': 0,
+            'bars_closed': 0,
+            'errors': 0,
+            'total_process_ms': 0.0,
+            'max_process_ms': 0.0,
+            'max_lag_ms': 0.0
+        }
+        
         # 로깅
         self.logger = logging.getLogger(__name__)
         logging.basicConfig(
@@ -72,6 +99,7 @@ class RealtimeAdaptiveBot:
         self.logger.info(f"초기 자금: {initial_balance:,.0f}원")
         self.logger.info(f"업데이트 간격: {update_interval}초")
         self.logger.info(f"모드: {'테스트(DRY RUN)' if dry_run else '실전'}")
+        self.logger.info(f"실행 방식: {'이벤트(WebSocket)' if event_driven else '폴링(REST)'}")
     
     def start(self):
         """봇 시작"""
@@ -81,6 +109,10 @@ class RealtimeAdaptiveBot:
         self.logger.info("="*80 + "\n")
         
         try:
+            if self.event_driven:
+                self.run_event_loop()
+                return
+            
             while self.is_running:
                 self.run_cycle()
                 time.sleep(self.update_interval)
@@ -134,6 +166,131 @@ class RealtimeAdaptiveBot:
         except Exception as e:
             self.logger.error(f"사이클 실행 오류: {e}")
     
+    # ==================== 이벤트 모드 ====================
+    
+    def run_event_loop(self):
+        """이벤트 모드 실행 (WebSocket 틱이 전략 평가를 구동, 메인 스레드는 상태 출력만)"""
+        if not self.seed_candles():
+            self.is_running = False
+            return
+        
+        self.feed = TickerFeed([self.market], dispatch=self.on_ticks)
+        self.feed.start()
+        
+        while self.is_running:
+            time.sleep(self.update_interval)
+            if self.is_running:
+                self._print_event_status()
+    
+    def seed_candles(self) -> bool:
+        """
+        REST로 일봉을 한 번 조회해 캐시·지표·시장 상황 초기화
+        
+        Returns:
+            성공 여부
+        """
+        self.logger.info("\n1️⃣ 초기 일봉 조회 중...")
+        historical_data = self.collector.get_candles_daily(self.market, count=100)
+        
+        if historical_data.empty:
+            self.logger.warning("데이터 수집 실패")
+            return False
+        
+        self.candles.seed(self.market, historical_data)
+        self.strategy_system.prime(historical_data.iloc[:-1])
+        self._refresh_market_condition()
+        self._print_market_condition(self.market_condition)
+        return True
+    
+    def on_ticks(self, messages: List[Tuple[int, Dict]]):
+        """
+        ticker 메시지 배치 처리 (피드 디코더 스레드)
+        
+        모든 틱으로 캔들을 갱신하고, 전략 평가는 배치의 마지막 틱으로 한 번만 합니다.
+        
+        Args:
+            messages: [(수신 시각 epoch 나노초, ticker 메시지), ...]
+        """
+        started = time.perf_counter()
+        received_at = None
+        
+        try:
+            for received_at, data in messages:
+                self.event_stats['ticks'] += 1
+                market, closed_bar = self.candles.apply_ticker(data)
+                if closed_bar is not None:
+                    self._on_bar_close(closed_bar)
+            
+            if received_at is not None and self.is_running:
+                self._evaluate_tick()
+        except Exception as e:
+            self.event_stats['errors'] += 1
+            self.logger.error(f"틱 처리 오류: {e}")
+        
+        process_ms = (time.perf_counter() - started) * 1000
+        self.event_stats['total_process_ms'] += process_ms
+        self.event_stats['max_process_ms'] = max(self.event_stats['max_process_ms'], process_ms)
+        if received_at is not None:
+            lag_ms = (time.time_ns() - received_at) / 1e6
+            self.event_stats['max_lag_ms'] = max(self.event_stats['max_lag_ms'], lag_ms)
+    
+    def _on_bar_close(self, bar: LiveCandle):
+        """일봉 마감: 지표 갱신 후 시장 상황 재감지"""
+        self.event_stats['bars_closed'] += 1
+        self.logger.info(
+            f"\n📅 일봉 마감: {bar.datetime:%Y-%m-%d} "
+            f"시가 {bar.open:,.0f} 고가 {bar.high:,.0f} 저가 {bar.low:,.0f} 종가 {bar.close:,.0f}"
+        )
+        self.strategy_system.on_bar_close(bar)
+        self._refresh_market_condition()
+        self._print_market_condition(self.market_condition)
+    
+    def _refresh_market_condition(self):
+        """메모리 캔들로 시장 상황 감지"""
+        candles = self.candles.get_candles(self.market, count=100)
+        self.market_condition = self.strategy_system.market_detector.detect_market_condition(
+            candles, market=self.market
+        )
+        self.condition_updated_at = time.time()
+    
+    def _evaluate_tick(self):
+        """현재 봉으로 전략 평가 및 신호 처리"""
+        if time.time() - self.condition_updated_at >= self.condition_refresh:
+            self._refresh_market_condition()
+        
+        bar = self.candles.current_bar(self.market)
+        signal = self.strategy_system.execute_on_tick(bar, self.market_condition)
+        self.event_stats['evaluations'] += 1
+        self.update_count += 1
+        self.last_update_time = datetime.now()
+        
+        self._process_signal(signal, bar.close, verbose=False)
+    
+    def _print_event_status(self):
+        """이벤트 모드 주기적 상태 출력"""
+        bar = self.candles.current_bar(self.market)
+        stats = self.event_stats
+        evaluations = stats['evaluations']
+        
+        self.logger.info(f"\n{'='*80}")
+        self.logger.info(f"📊 이벤트 모드 상태 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.info(f"{'='*80}")
+        if bar is not None:
+            self.logger.info(f"현재가: {bar.close:,.0f}원")
+        self.logger.info(
+            f"틱: {stats['ticks']}건 | 평가: {evaluations}회 | 봉 마감: {stats['bars_closed']}회 | "
+            f"오류: {stats['errors']}건"
+        )
+        if evaluations:
+            self.logger.info(
+                f"처리 시간: 평균 {stats['total_process_ms'] / evaluations:.3f}ms / "
+                f"최대 {stats['max_process_ms']:.3f}ms | 최대 지연: {stats['max_lag_ms']:.1f}ms"
+            )
+        
+        if self.market_condition is not None:
+            self._print_market_condition(self.market_condition)
+        self._print_status()
+    
     def _print_market_condition(self, market_condition: MarketCondition):
         """시장 상황 출력"""
         self.logger.info("\n📈 시장 상황 분석:")
@@ -145,13 +302,21 @@ class RealtimeAdaptiveBot:
         self.logger.info(f"  신뢰도: {market_condition.confidence:.2f}")
         self.logger.info(f"  → 추천 전략: {market_condition.get_recommended_strategy()}")
     
-    def _process_signal(self, signal: Dict, current_price: float):
-        """신호 처리"""
-        self.logger.info(f"\n🎯 신호 분석:")
-        self.logger.info(f"  현재 전략: {signal['strategy']}")
-        self.logger.info(f"  신호: {signal['action']}")
-        self.logger.info(f"  신뢰도: {signal['confidence']:.2f}")
-        self.logger.info(f"  사유: {signal['reason']}")
+    def _process_signal(self, signal: Dict, current_price: float, verbose: bool = True):
+        """
+        신호 처리
+        
+        Args:
+            signal: 전략 신호
+            current_price: 현재가
+            verbose: 신호·포지션 상세 로그 출력 (이벤트 모드는 매 틱이라 끔)
+        """
+        if verbose:
+            self.logger.info(f"\n🎯 신호 분석:")
+            self.logger.info(f"  현재 전략: {signal['strategy']}")
+            self.logger.info(f"  신호: {signal['action']}")
+            self.logger.info(f"  신뢰도: {signal['confidence']:.2f}")
+            self.logger.info(f"  사유: {signal['reason']}")
         
         # 포지션 없을 때 - 매수 신호 처리
         if self.strategy_system.current_position is None:
@@ -175,10 +340,11 @@ class RealtimeAdaptiveBot:
             
             pnl_percent = (current_price - entry_price) / entry_price
             
-            self.logger.info(f"\n💼 현재 포지션:")
-            self.logger.info(f"  진입가: {entry_price:,.0f}원")
-            self.logger.info(f"  현재가: {current_price:,.0f}원")
-            self.logger.info(f"  손익: {pnl_percent*100:+.2f}%")
+            if verbose:
+                self.logger.info(f"\n💼 현재 포지션:")
+                self.logger.info(f"  진입가: {entry_price:,.0f}원")
+                self.logger.info(f"  현재가: {current_price:,.0f}원")
+                self.logger.info(f"  손익: {pnl_percent*100:+.2f}%")
             
             should_close = False
             close_reason = ""
@@ -230,6 +396,10 @@ class RealtimeAdaptiveBot:
         """봇 중지"""
         self.is_running = False
         
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed = None
+        
         self.logger.info("\n" + "="*80)
         self.logger.info("🛑 봇 중지")
         self.logger.info("="*80)
@@ -246,6 +416,8 @@ class RealtimeAdaptiveBot:
             'is_running': self.is_running,
             'update_count': self.update_count,
             'last_update': self.last_update_time,
+            'event_driven': self.event_driven,
+            'event_stats': dict(self.event_stats),
             'performance': self.strategy_system.get_performance_report()
         }
 
@@ -306,12 +478,19 @@ def main():
     except:
         update_interval = 300
     
+    # 실행 방식
+    print("\n실행 방식을 선택하세요:")
+    print("  1. 폴링 (업데이트 간격마다 REST 조회)")
+    print("  2. 이벤트 (WebSocket 틱마다 즉시 평가)")
+    event_driven = input("\n선택 (1-2, 기본값: 1): ").strip() == '2'
+    
     print("\n" + "-"*80)
     print("📋 설정 완료")
     print("-"*80)
     print(f"  마켓: {market}")
     print(f"  초기 자금: {initial_balance:,.0f}원")
     print(f"  업데이트 간격: {update_interval}초 ({update_interval/60:.1f}분)")
+    print(f"  실행 방식: {'이벤트 (WebSocket)' if event_driven else '폴링 (REST)'}")
     print(f"  모드: 테스트 (DRY RUN)")
     
     input("\n시작하려면 Enter를 누르세요...")
@@ -321,7 +500,8 @@ def main():
         market=market,
         initial_balance=initial_balance,
         update_interval=update_interval,
-        dry_run=True
+        dry_run=True,
+        event_driven=event_driven
     )
     
     try:
@@ -0,0 +1,119 @@
+"""
+증분 시장 상황 감지기 일치 테스트
+
+- 새 봉 마감, 진행 중인 봉 변경, 변경 없음, 과거 봉 수정 상황에서
+  IncrementalMarketConditionDetector 결과가 MarketConditionDetector와 같은지 확인
+- 캐시·재초기화·마켓별 상태가 의도대로 동작하는지 확인
+"""
+
+import pytest
+
+from benchmark_market_condition import build_frames, generate_candles
+from market_condition_detector import IncrementalMarketConditionDetector, MarketConditionDetector
+
+
+FRAME_SIZE = 100
+
+
+@pytest.fixture(scope='module')
+def candles():
+    return generate_candles(400)
+
+
+def assert_condition_equal(actual, expected):
+    """두 MarketCondition이 같은지 (timestamp 제외)"""
+    assert actual.trend == expected.trend
+    assert actual.volatility == expected.volatility
+    assert actual.volume_profile == expected.volume_profile
+    for name in ('trend_strength', 'momentum', 'confidence'):
+        assert getattr(actual, name) == pytest.approx(getattr(expected, name), rel=1e-9, abs=1e-12), name
+
+    levels, expected_levels = actual.support_resistance, expected.support_resistance
+    assert levels.keys() == expected_levels.keys()
+    for key, value in expected_levels.items():
+        assert levels[key] == pytest.approx(value, rel=1e-9, nan_ok=True), key
+
+
+@pytest.mark.parametrize('scenario', ['new_bar', 'intrabar', 'unchanged'])
+def test_incremental_matches_full_analysis(candles, scenario):
+    """상황별로 매 호출 결과가 전체 분석과 같은지 확인"""
+    frames = build_frames(candles, FRAME_SIZE, scenario)
+    original = MarketConditionDetector()
+    incremental = IncrementalMarketConditionDetector()
+
+    for frame in frames:
+        assert_condition_equal(incremental.detect_market_condition(frame),
+                               original.detect_market_condition(frame))
+
+    stats = incremental.get_statistics()
+    assert stats['full_rebuilds'] == 1
+    assert stats['fallbacks'] == 0
+    if scenario == 'new_bar':
+        assert stats['bars_added'] == len(frames) - 1
+    elif scenario == 'unchanged':
+        assert stats['cache_hits'] == len(frames) - 1
+    else:
+        assert stats['intrabar_updates'] == len(frames) - 1
+
+
+def test_several_new_bars_at_once(candles):
+    """호출 사이에 봉이 여러 개 마감돼도 결과가 같은지 확인"""
+    original = MarketConditionDetector()
+    incremental = IncrementalMarketConditionDetector()
+
+    for end in range(FRAME_SIZE, len(candles) + 1, 7):
+        frame = candles.iloc[end - FRAME_SIZE:end].reset_index(drop=True)
+        assert_condition_equal(incremental.detect_market_condition(frame),
+                               original.detect_market_condition(frame))
+
+    assert incremental.get_statistics()['full_rebuilds'] == 1
+
+
+def test_revised_history_triggers_rebuild(candles):
+    """이미 반영한 봉의 값이 바뀌면 상태를 다시 만들고 결과도 같은지 확인"""
+    original = MarketConditionDetector()
+    incremental = IncrementalMarketConditionDetector()
+    frame = candles.iloc[:FRAME_SIZE].reset_index(drop=True)
+    incremental.detect_market_condition(frame)
+
+    revised = frame.copy()
+    revised.loc[revised.index[-2], 'close'] *= 1.01
+    assert_condition_equal(incremental.detect_market_condition(revised),
+                           original.detect_market_condition(revised))
+    assert incremental.get_statistics()['full_rebuilds'] == 2
+
+
+def test_intrabar_disabled_returns_cached_condition(candles):
+    """intrabar=False면 진행 중인 봉 변경에는 캐시를 반환"""
+    frames = build_frames(candles, FRAME_SIZE, 'intrabar')
+    incremental = IncrementalMarketConditionDetector(intrabar=False)
+
+    first = incremental.detect_market_condition(frames[0])
+    assert incremental.detect_market_condition(frames[1]) is first
+
+
+def test_markets_keep_separate_state(candles):
+    """마켓별 상태가 섞이지 않는지 확인"""
+    original = MarketConditionDetector()
+    incremental = IncrementalMarketConditionDetector()
+    other = generate_candles(400, seed=7)
+
+    for end in range(FRAME_SIZE, FRAME_SIZE + 30):
+        for market, data in (('KRW-BTC', candles), ('KRW-ETH', other)):
+            frame = data.iloc[end - FRAME_SIZE:end].reset_index(drop=True)
+            assert_condition_equal(incremental.detect_market_condition(frame, market=market),
+                                   original.detect_market_condition(frame))
+
+    stats = incremental.get_statistics()
+    assert stats['markets'] == 2
+    assert stats['full_rebuilds'] == 2
+
+
+def test_short_frame_falls_back_to_full_analysis(candles):
+    """장기 이동평균을 계산할 수 없는 짧은 데이터는 기본 감지기로 분석"""
+    frame = candles.iloc[:30].reset_index(drop=True)
+    incremental = IncrementalMarketConditionDetector()
+
+    assert_condition_equal(incremental.detect_market_condition(frame),
+                           MarketConditionDetector().detect_market_condition(frame))
+    assert incremental.get_statistics()['fallbacks'] == 1
@@ -4,13 +4,48 @@ upbit_data_collector.py - 업비트 실시간 데이터 수집기
 업비트 API를 통해 실시간 가격 데이터를 수집합니다.
 """
 
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
 import requests
 import pandas as pd
 import time
+import math
+import threading
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
+from candle_store import CandleStore, kst_now, normalize_unit, unit_interval, candles_from_upbit
+
+# 캔들 조회 API 1회 최대 개수
+MAX_CANDLES_PER_REQUEST = 200
+
+
+class RateLimiter:
+    """초당 요청 수 제한 (여러 스레드에서 공유)"""
+    
+    def __init__(self, requests_per_second: int = 10):
+        self.requests_per_second = requests_per_second
+        self.request_times = []
+        self.lock = threading.Lock()
+    
+    def wait_if_needed(self):
+        """요청 제한에 걸리지 않도록 대기"""
+        with self.lock:
+            current_time = time.time()
+            self.request_times = [t for t in self.request_times if current_time - t < 1]
+            
+            if len(self.request_times) >= self.requests_per_second:
+                sleep_time = 1 - (current_time - self.request_times[0])
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+                    current_time = time.time()
+            
+            self.request_times.append(current_time)
+
 
 class UpbitDataCollector:
     """
@@ -21,11 +56,19 @@ class UpbitDataCollector:
     - 캔들 데이터 조회 (일/분/주/월)
     - 호가 정보 조회
     - 체결 내역 조회
+    - 캔들 로컬 저장소 연동 (선택)
     """
     
-    def __init__(self):
-        """초기화"""
+    def __init__(self, candle_store: Optional[CandleStore] = None):
+        """
+        초기화
+        
+        Args:
+            candle_store: 캔들 로컬 저장소 (지정 시 조회한 캔들을 저장하고 과거 데이터는 저장소에서 읽음)
+        """
         self.base_url = "https://api.upbit.com/v1"
+        self.candle_store = candle_store
+        self.rate_limiter = RateLimiter(requests_per_second=10)
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'UpbitDataCollector/1.0',
@@ -76,13 +119,15 @@ class UpbitDataCollector:
             self.logger.error(f"현재가 조회 오류: {e}")
             return {}
     
-    def get_candles_daily(self, market: str, count: int = 100) -> pd.DataFrame:
+    def get_candles_daily(self, market: str, count: int = 100,
+                          to: Optional[datetime] = None) -> pd.DataFrame:
         """
         일봉 데이터 조회
         
         Args:
             market: 마켓 코드 (예: 'KRW-BTC')
             count: 조회할 캔들 개수 (최대 200)
+            to: 이 시각(KST) 이전 캔들 조회 (None이면 최신 캔들)
         
         Returns:
             OHLCV 데이터프레임
@@ -93,6 +138,8 @@ class UpbitDataCollector:
                 'market': market,
                 'count': min(count, 200)
             }
+            if to is not None:
+                params['to'] = pd.Timestamp(to).strftime('%Y-%m-%dT%H:%M:%S') + '+09:00'
             
             response = self.session.get(url, params=params)
             response.raise_for_status()
@@ -121,6 +168,8 @@ class UpbitDataCollector:
             # datetime을 인덱스로 설정
             df['datetime'] = pd.to_datetime(df['datetime'])
             
+            self._store_candles(market, 'days', df)
+            
             return df
             
         except Exception as e:
@@ -128,7 +177,8 @@ class UpbitDataCollector:
             return pd.DataFrame()
     
     def get_candles_minutes(self, market: str, unit: int = 1, 
-                           count: int = 100) -> pd.DataFrame:
+                           count: int = 100,
+                           to: Optional[datetime] = None) -> pd.DataFrame:
         """
         분봉 데이터 조회
         
@@ -136,6 +186,7 @@ class UpbitDataCollector:
             market: 마켓 코드
             unit: 분 단위 (1, 3, 5, 10, 15, 30, 60, 240)
             count: 조회할 캔들 개수
+            to: 이 시각(KST) 이전 캔들 조회 (None이면 최신 캔들)
         
         Returns:
             OHLCV 데이터프레임
@@ -150,6 +201,8 @@ class UpbitDataCollector:
                 'market': market,
                 'count': min(count, 200)
             }
+            if to is not None:
+                params['to'] = pd.Timestamp(to).strftime('%Y-%m-%dT%H:%M:%S') + '+09:00'
             
             response = self.session.get(url, params=params)
             response.raise_for_status()
@@ -170,6 +223,8 @@ class UpbitDataCollector:
             df = df.sort_values('datetime').reset_index(drop=True)
             df['datetime'] = pd.to_datetime(df['datetime'])
             
+            self._store_candles(market, f'minutes/{unit}', df)
+            
             return df
             
         except Exception as e:
@@ -244,30 +299,172 @@ class UpbitDataCollector:
         Returns:
             OHLCV 데이터프레임
         """
-        all_data = []
-        remaining_days = days
+        df = self.backfill_candles(market, 'days', days=days)
         
-        while remaining_days > 0:
-            count = min(remaining_days, 200)
-            
-            df = self.get_candles_daily(market, count)
-            
-            if df.empty:
-                break
-            
-            all_data.append(df)
-            remaining_days -= count
-            
-            # API 호출 제한 방지 (초당 10회)
-            time.sleep(0.1)
+        if df.empty:
+            return pd.DataFrame()
         
-        if all_data:
-            result = pd.concat(all_data, ignore_index=True)
-            result = result.drop_duplicates(subset=['datetime']).sort_values('datetime')
-            result = result.reset_index(drop=True)
-            return result
+        return df[['datetime', 'open', 'high', 'low', 'close', 'volume']]
+    
+    def backfill_candles(self, market: str, unit: Union[str, int] = 'days',
+                         days: Optional[int] = None,
+                         start: Optional[datetime] = None,
+                         max_workers: int = 4,
+                         fill_gaps: bool = False) -> pd.DataFrame:
+        """
+        캔들 증분 백필 (to 파라미터로 과거 방향 페이지 조회)
+        
+        캔들 저장소가 있으면 저장된 구간은 다시 받지 않고 최신 구간(마지막 저장 캔들 이후)과
+        요청 시작 시각까지 모자란 과거 구간만 조회합니다. 페이지는 요청 제한 안에서 동시에 조회하고,
+        기존 데이터에서 바깥쪽 순서로 저장하므로 중간에 멈춰도 다음 호출에서 이어서 받습니다.
+        
+        Args:
+            market: 마켓 코드
+            unit: 캔들 단위 ('days', 'weeks', 'minutes/1' 또는 분 단위 정수)
+            days: 수집 기간 (일) - start를 지정하지 않을 때 사용
+            start: 수집 시작 시각 (KST)
+            max_workers: 동시 요청 수
+            fill_gaps: 저장소 내부 누락 구간도 다시 조회할지 여부
+                (체결이 없던 분은 캔들이 없으므로 분봉에서는 기본 비활성화)
+        
+        Returns:
+            요청 기간의 캔들 데이터프레임 (datetime, open, high, low, close, volume, value)
+        """
+        unit = normalize_unit(unit)
+        interval = unit_interval(unit)
+        if interval is None:
+            raise ValueError(f"백필을 지원하지 않는 캔들 단위: {unit}")
+        if start is None:
+            if days is None:
+                raise ValueError("days 또는 start를 지정해야 합니다.")
+            start = kst_now().normalize() - timedelta(days=days - 1)
+        start = pd.Timestamp(start)
+        now = kst_now()
+        
+        # 조회할 구간 계산 (저장된 데이터 바깥쪽부터 저장되도록 페이지 순서 결정)
+        ranges = []
+        first = last = None
+        if self.candle_store is not None:
+            first = self.candle_store.first_timestamp(market, unit)
+            last = self.candle_store.last_timestamp(market, unit)
+        
+        if last is None:
+            ranges.append((start, now, 'backward'))
+        else:
+            # 마지막 저장 캔들은 진행 중이었을 수 있으므로 다시 조회
+            ranges.append((max(last, start), now, 'forward'))
+            if start < first:
+                ranges.append((start, first - interval, 'backward'))
+            if fill_gaps:
+                for gap_start, gap_end in self.candle_store.find_gaps(market, unit, start=start):
+                    ranges.append((gap_start, gap_end, 'backward'))
+        
+        pages = []
+        for range_index, (range_start, range_end, direction) in enumerate(ranges):
+            range_pages = self._plan_candle_pages(range_start, range_end, interval)
+            if direction == 'forward':
+                range_pages = list(reversed(range_pages))
+            pages.extend((range_index, to, count) for to, count in range_pages)
+        
+        self.logger.info(f"{market} {unit} 백필: {len(pages)}개 페이지 요청")
+        
+        # 페이지 동시 조회 (결과는 계획 순서대로 저장)
+        # 한 페이지가 실패하면 같은 구간의 이후 페이지는 저장하지 않음 - 저장 구간이 실패 지점을
+        # 넘어가면 다음 호출에서 빈 구간을 다시 조회하지 않기 때문
+        fetched = []
+        failed_pages = 0
+        failed_ranges = set()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = executor.map(
+                lambda page: self._fetch_candle_page(market, unit, page[1], page[2]), pages
+            )
+            for (range_index, _, _), df in zip(pages, results):
+                if df is None or (self.candle_store is not None and range_index in failed_ranges):
+                    failed_pages += 1
+                    failed_ranges.add(range_index)
+                    continue
+                if self.candle_store is not None:
+                    self._store_candles(market, unit, df)
+                else:
+                    fetched.append(df)
+        
+        if failed_pages:
+            self.logger.warning(
+                f"{market} {unit} 백필 실패: {failed_pages}개 페이지 (실패 지점부터 다음 호출에서 다시 조회)"
+            )
         
-        return pd.DataFrame()
+        if self.candle_store is not None:
+            gaps = self.candle_store.find_gaps(market, unit, start=start)
+            if gaps:
+                self.logger.warning(f"{market} {unit} 누락 구간 {len(gaps)}개: {gaps[0][0]} ~ {gaps[-1][1]}")
+            return self.candle_store.read(market, unit, start=start)
+        
+        if not fetched:
+            return pd.DataFrame()
+        
+        df = pd.concat(fetched, ignore_index=True)
+        df = df.drop_duplicates(subset=['datetime'], keep='last').sort_values('datetime')
+        return df[df['datetime'] >= start].reset_index(drop=True)
+    
+    def _plan_candle_pages(self, range_start: pd.Timestamp, range_end: pd.Timestamp,
+                           interval: pd.Timedelta) -> List[Tuple[pd.Timestamp, int]]:
+        """
+        구간을 덮는 (to, count) 페이지 목록 (최신 페이지부터)
+        
+        각 페이지는 to 직전(미포함) count개 캔들을 조회하므로 구간 끝에서부터 200개 단위로 나눕니다.
+        """
+        n_candles = int((range_end - range_start) / interval) + 1
+        if n_candles <= 0:
+            return []
+        
+        page_span = interval * MAX_CANDLES_PER_REQUEST
+        to = range_end + timedelta(seconds=1)
+        pages = []
+        
+        for page in range(math.ceil(n_candles / MAX_CANDLES_PER_REQUEST)):
+            remaining = n_candles - page * MAX_CANDLES_PER_REQUEST
+            pages.append((to - page * page_span, min(MAX_CANDLES_PER_REQUEST, remaining)))
+        
+        return pages
+    
+    def _fetch_candle_page(self, market: str, unit: str, to: pd.Timestamp,
+                           count: int, max_retries: int = 3) -> Optional[pd.DataFrame]:
+        """to 시각(KST, 미포함) 이전 캔들 한 페이지 조회"""
+        url = f"{self.base_url}/candles/{unit}"
+        params = {
+            'market': market,
+            'count': count,
+            'to': to.strftime('%Y-%m-%dT%H:%M:%S') + '+09:00'
+        }
+        
+        for attempt in range(max_retries):
+            try:
+                self.rate_limiter.wait_if_needed()
+                response = self.session.get(url, params=params)
+                
+                # 요청 제한 초과 시 잠시 대기 후 재시도
+                if response.status_code == 429:
+                    time.sleep(0.5 * (attempt + 1))
+                    continue
+                
+                response.raise_for_status()
+                return candles_from_upbit(response.json())
+                
+            except Exception as e:
+                self.logger.error(f"캔들 페이지 조회 오류 (to={params['to']}): {e}")
+                time.sleep(0.5 * (attempt + 1))
+        
+        return None
+    
+    def _store_candles(self, market: str, unit: str, df: pd.DataFrame):
+        """조회한 캔들을 저장소에 기록"""
+        if self.candle_store is None or df.empty:
+            return
+        
+        try:
+            self.candle_store.append(market, unit, df)
+        except Exception as e:
+            self.logger.error(f"캔들 저장 오류: {e}")
 
 
 class RealtimeDataMonitor:
@@ -24,6 +24,9 @@ except ImportError:
 
 from ml_price_predictor import MLPricePredictor
 from ml_trading_system import MLTradingSystem
+from feature_store import FeatureStore
+from model_retrainer import ModelRegistry, BackgroundRetrainer, train_version
+from streaming_predictor import StreamingPredictor
 import pandas as pd
 import numpy as np
 
@@ -40,7 +43,7 @@ class AutonomousTradingBot:
     - 오류 자동 복구
     - 성과 모니터링
     - 텔레그램 알림 (선택)
-    - 자동 재학습
+    - 자동 재학습 (별도 프로세스, 검증 후 무중단 교체, 롤백)
     """
     
     def __init__(
@@ -49,7 +52,10 @@ class AutonomousTradingBot:
         initial_capital: float = 10_000_000,
         check_interval: int = 60,  # 60초마다 체크
         model_retrain_days: int = 7,  # 7일마다 재학습
-        log_file: str = './logs/autonomous_bot.log'
+        log_file: str = './logs/autonomous_bot.log',
+        feature_store_dir: str = './data/feature_store',
+        predict_on_open_bar: bool = False,
+        model_registry_dir: str = './models/versions'
     ):
         """
         초기화
@@ -60,11 +66,17 @@ class AutonomousTradingBot:
             check_interval: 체크 간격 (초)
             model_retrain_days: 모델 재학습 주기 (일)
             log_file: 로그 파일 경로
+            feature_store_dir: 특징 저장소 디렉토리
+            predict_on_open_bar: 진행 중인 봉의 특징으로 예측할지 여부
+                                 (False면 마감된 봉으로 예측하므로 새 봉이 마감될 때만 특징을 계산)
+            model_registry_dir: 버전별 모델 저장 디렉토리
         """
         self.market = market
         self.initial_capital = initial_capital
         self.check_interval = check_interval
         self.model_retrain_days = model_retrain_days
+        self.predict_on_open_bar = predict_on_open_bar
+        self.candle_interval = '60'  # 60분봉
         
         # 로깅 설정
         os.makedirs(os.path.dirname(log_file), exist_ok=True)
@@ -80,9 +92,21 @@ class AutonomousTradingBot:
         
         # 컴포넌트 초기화
         self.data_collector = UpbitDataCollector() if UpbitDataCollector else None
+        self.feature_store = FeatureStore(feature_store_dir)
         self.predictor = None
         self.trading_system = None
         
+        # 모델 버전 관리 (재학습은 별도 프로세스에서 실행)
+        self.model_registry = ModelRegistry(model_registry_dir)
+        self.retrainer = BackgroundRetrainer(self.model_registry, market=market, interval=self.candle_interval)
+        self.model_version = None
+        self.previous_predictor = None
+        self.previous_model_version = None
+        self.predictions_since_swap = 0
+        self.fast_predictor = None  # 단일 행 예측기 (예측기 교체 시 다시 생성)
+        self.closed_bars = 0        # 특징 저장소에 추가된 마감 봉 수 (누적)
+        self.fast_window_bars = 0   # 단일 행 예측기 종가 창에 반영된 마감 봉 수
+        
         # 상태 관리
         self.is_running = False
         self.last_model_training = None
@@ -115,31 +139,27 @@ class AutonomousTradingBot:
         try:
             self.logger.info("\n📊 Initializing ML Models...")
             
-            # 예측 시스템 초기화
-            self.predictor = MLPricePredictor(
-                market=self.market,
-                sequence_length=60,
-                forecast_horizon=1
-            )
-            
             # 저장된 모델 로드 시도
             if not force_retrain:
                 try:
-                    self.predictor.load_models()
-                    self.logger.info("✅ Loaded existing models")
-                    self.last_model_training = datetime.now()
+                    version = self.model_registry.get_current()
+                    if version is not None:
+                        self.predictor = self.model_registry.load_predictor(
+                            version, market=self.market, sequence_length=60
+                        )
+                        self.model_version = version
+                        self.logger.info(f"✅ Loaded model version {version}")
+                    else:
+                        self.predictor = MLPricePredictor(
+                            market=self.market,
+                            sequence_length=60,
+                            forecast_horizon=1
+                        )
+                        self.predictor.load_models()
+                        self.logger.info("✅ Loaded existing models")
                     
-                    # 거래 시스템 초기화
-                    self.trading_system = MLTradingSystem(
-                        predictor=self.predictor,
-                        initial_capital=self.initial_capital,
-                        signal_threshold=0.02,
-                        confidence_threshold=0.7,
-                        position_size=0.03,
-                        stop_loss=-0.03,
-                        take_profit=0.05,
-                        max_positions=3
-                    )
+                    self.last_model_training = datetime.now()
+                    self.trading_system = self._create_trading_system(self.predictor)
                     
                     return True
                 except:
@@ -155,51 +175,116 @@ class AutonomousTradingBot:
             self.logger.error(traceback.format_exc())
             return False
     
+    def _create_trading_system(self, predictor: MLPricePredictor) -> MLTradingSystem:
+        """거래 시스템 생성"""
+        return MLTradingSystem(
+            predictor=predictor,
+            initial_capital=self.initial_capital,
+            signal_threshold=0.02,
+            confidence_threshold=0.7,
+            position_size=0.03,
+            stop_loss=-0.03,
+            take_profit=0.05,
+            max_positions=3
+        )
+    
     def train_models(self):
-        """모델 학습"""
+        """모델 학습 (거래 시작 전 사용할 모델이 없을 때, 학습이 끝날 때까지 대기)"""
         try:
             self.logger.info("\n🎓 Training ML Models...")
             self.logger.info("This may take 10-30 minutes...")
             
-            # 데이터 준비
-            (X_train_lstm, X_train_ml, X_val_lstm, X_val_ml,
-             X_test_lstm, X_test_ml, y_train, y_val, y_test) = self.predictor.prepare_data(
-                interval='60',
-                days=180
-            )
-            
-            # 모델 학습
-            self.predictor.train_models(
-                X_train_lstm, X_train_ml,
-                X_val_lstm, X_val_ml,
-                y_train, y_val,
+            # 새 버전으로 학습 후 저장
+            version = self.model_registry.new_version()
+            train_version(
+                self.model_registry.version_dir(version),
+                market=self.market,
+                interval=self.candle_interval,
+                days=180,
+                sequence_length=60,
                 lstm_epochs=30,
                 lstm_batch_size=32
             )
             
-            # 모델 저장
-            self.predictor.save_models()
+            self.predictor = self.model_registry.load_predictor(
+                version, market=self.market, sequence_length=60
+            )
+            self.model_registry.promote(version)
+            self.model_version = version
             
             # 거래 시스템 초기화
-            self.trading_system = MLTradingSystem(
-                predictor=self.predictor,
-                initial_capital=self.initial_capital,
-                signal_threshold=0.02,
-                confidence_threshold=0.7,
-                position_size=0.03,
-                stop_loss=-0.03,
-                take_profit=0.05,
-                max_positions=3
-            )
+            self.trading_system = self._create_trading_system(self.predictor)
             
             self.last_model_training = datetime.now()
-            self.logger.info("✅ Model training completed")
+            self.logger.info(f"✅ Model training completed (version {version})")
             
         except Exception as e:
             self.logger.error(f"❌ Model training failed: {e}")
             self.logger.error(traceback.format_exc())
             raise
     
+    def request_retrain(self):
+        """백그라운드 재학습 요청 (거래 루프는 계속 실행)"""
+        if self.retrainer.start():
+            self.logger.info(f"\n🔄 Background retraining started (version {self.retrainer.pending_version})")
+    
+    def check_model_swap(self):
+        """재학습이 끝나 검증·로드된 모델이 있으면 사이클 사이에 교체"""
+        result = self.retrainer.poll()
+        if result is None:
+            return
+        
+        version, predictor, metrics = result
+        self.swap_predictor(version, predictor)
+        self.logger.info(
+            f"   MAPE: {metrics['mape']:.2f}% | "
+            f"Direction Accuracy: {metrics['direction_accuracy']:.2f}%"
+        )
+    
+    def swap_predictor(self, version: str, predictor: MLPricePredictor):
+        """
+        예측기 교체 (이전 예측기는 롤백용으로 유지)
+        
+        Args:
+            version: 새 모델 버전
+            predictor: 로드가 끝난 새 예측기
+        """
+        self.previous_predictor = self.predictor
+        self.previous_model_version = self.model_version
+        
+        self.predictor = predictor
+        self.trading_system.predictor = predictor
+        self.model_version = version
+        self.model_registry.promote(version)
+        # 현재·이전(롤백용) 버전은 남기고 오래된 버전 삭제
+        self.model_registry.prune()
+        
+        self.last_model_training = datetime.now()
+        self.predictions_since_swap = 0
+        self.logger.info(f"🔁 Model swapped: {self.previous_model_version} → {version}")
+    
+    def rollback_model(self) -> bool:
+        """
+        이전 모델로 롤백
+        
+        Returns:
+            롤백 여부
+        """
+        if self.previous_predictor is None:
+            self.logger.warning("⚠️ No previous model to roll back to")
+            return False
+        
+        failed_version = self.model_version
+        self.predictor = self.previous_predictor
+        self.trading_system.predictor = self.previous_predictor
+        self.model_version = self.previous_model_version
+        self.model_registry.rollback()
+        
+        self.previous_predictor = None
+        self.previous_model_version = None
+        self.logger.warning(f"⏪ Model rolled back: {failed_version} → {self.model_version}")
+        return True
+    
     def collect_latest_data(self) -> Optional[Dict]:
         """
         최신 데이터 수집 및 특징 생성
@@ -215,7 +300,7 @@ class AutonomousTradingBot:
             # 최근 100개 캔들 수집 (60분봉)
             df = self.data_collector.get_candles_minutes(
                 market=self.market,
-                interval=60,
+                unit=int(self.candle_interval),
                 count=100
             )
             
@@ -223,38 +308,32 @@ class AutonomousTradingBot:
                 self.logger.warning("⚠️ No data collected")
                 return None
             
-            # 특징 생성
-            df_features = self.predictor.feature_engineer.create_all_features(df)
-            df_features = df_features.dropna()
-            
-            if len(df_features) < self.predictor.sequence_length:
-                self.logger.warning("⚠️ Insufficient data for prediction")
-                return None
+            # 특징 저장소 갱신 (새로 마감된 봉과 진행 중인 봉의 특징만 계산)
+            self.closed_bars += self.feature_store.update(self.market, self.candle_interval, df, last_is_open=True)
             
-            # 시퀀스 데이터 준비
-            price_data = df_features[['close']].values
-            X_lstm, _ = self.predictor.pipeline.create_sequences(
-                price_data,
-                sequence_length=self.predictor.sequence_length,
-                forecast_horizon=1
+            # 저장된 특징에서 예측 입력 조회
+            sequence_length = self.predictor.sequence_length
+            include_open = self.predict_on_open_bar
+            closes = self.feature_store.get_column(
+                self.market, self.candle_interval, 'close', sequence_length, include_open
             )
             
-            # ML 특징 준비
-            feature_cols = [col for col in df_features.columns 
-                           if col not in ['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-            X_ml = df_features[feature_cols].values[self.predictor.sequence_length:]
+            if len(closes) < sequence_length:
+                self.logger.warning("⚠️ Insufficient data for prediction")
+                return None
             
-            # 정규화
-            X_lstm_scaled = self.predictor.price_scaler.transform(
-                X_lstm.reshape(-1, X_lstm.shape[-1])
-            ).reshape(X_lstm.shape)
-            X_ml_scaled = self.predictor.feature_scaler.transform(X_ml)
+            feature_cols = self.feature_store.feature_columns(self.market, self.candle_interval)
+            features = self.feature_store.get_feature_rows(
+                self.market, self.candle_interval, feature_cols, 1, include_open
+            )[0]
             
-            current_price = price_data[-1][0]
+            current_price = df['close'].iloc[-1]
             
+            # 정규화는 예측기(StreamingPredictor)에서 수행
             return {
-                'X_lstm': X_lstm_scaled[-1:],
-                'X_ml': X_ml_scaled[-1:],
+                'closes': closes,
+                'features': features,
+                'closed_bars': self.closed_bars,
                 'current_price': current_price,
                 'timestamp': datetime.now()
             }
@@ -274,15 +353,27 @@ class AutonomousTradingBot:
             거래 신호 딕셔너리
         """
         try:
-            # 가격 예측
-            result = self.predictor.predict(
-                data['X_lstm'],
-                data['X_ml'],
-                return_confidence=True
-            )
-            
-            predicted_price = result['predictions'][0]
-            confidence = result['confidence'][0]
+            # 가격 예측 (단일 행 예측 경로)
+            if self.fast_predictor is None or self.fast_predictor.predictor is not self.predictor:
+                if self.fast_predictor is not None:
+                    self.fast_predictor.close()
+                self.fast_predictor = StreamingPredictor(self.predictor)
+            
+            # 마감된 봉만 쓰면 새로 마감된 종가만 링 버퍼에 추가, 그 외에는 창 전체 교체
+            new_bars = data['closed_bars'] - self.fast_window_bars
+            if (not self.predict_on_open_bar and self.fast_predictor.is_ready
+                    and 0 <= new_bars < self.fast_predictor.sequence_length):
+                for price in data['closes'][len(data['closes']) - new_bars:]:
+                    self.fast_predictor.push_price(price)
+            else:
+                self.fast_predictor.set_window(data['closes'])
+            self.fast_window_bars = data['closed_bars']
+            
+            result = self.fast_predictor.predict_one(data['features'])
+            
+            predicted_price = result['prediction']
+            confidence = result['confidence']
+            self.predictions_since_swap += 1
             current_price = data['current_price']
             
             # 신호 생성
@@ -294,11 +385,16 @@ class AutonomousTradingBot:
             
             signal['current_price'] = current_price
             signal['predicted_price'] = predicted_price
+            signal['latency_ms'] = result['latency_ms']
             
             return signal
             
         except Exception as e:
             self.logger.error(f"❌ Trading decision failed: {e}")
+            
+            # 교체 직후 첫 예측부터 실패하면 이전 모델로 롤백
+            if self.previous_predictor is not None and self.predictions_since_swap == 0:
+                self.rollback_model()
             return None
     
     def execute_trade(self, signal: Dict):
@@ -417,6 +513,7 @@ class AutonomousTradingBot:
             self.logger.info(f"💰 Current Capital: {self.trading_system.current_capital:,.0f} KRW")
             self.logger.info(f"📊 Open Positions: {len(self.trading_system.positions)}")
             self.logger.info(f"📈 Total Profit: {self.trading_system.total_profit:+,.0f} KRW")
+            self.logger.info(f"⏱️ Inference: {signal['latency_ms']['total']:.2f} ms")
             
             # 오류 카운터 리셋
             self.consecutive_errors = 0
@@ -448,7 +545,7 @@ class AutonomousTradingBot:
             schedule.every().day.at("00:00").do(self.print_daily_summary)
             
             if self.model_retrain_days > 0:
-                schedule.every(self.model_retrain_days).days.do(self.train_models)
+                schedule.every(self.model_retrain_days).days.do(self.request_retrain)
             
             self.logger.info("✅ Bot started successfully")
             self.logger.info(f"⏰ Running 24/7 - Check interval: {self.check_interval}s")
@@ -459,6 +556,9 @@ class AutonomousTradingBot:
                 # 스케줄 실행
                 schedule.run_pending()
                 
+                # 재학습이 끝났으면 모델 교체
+                self.check_model_swap()
+                
                 # 거래 사이클 실행
                 self.run_cycle()
                 
@@ -488,6 +588,12 @@ class AutonomousTradingBot:
             # for position in self.trading_system.positions[:]:
             #     self.trading_system.close_position(...)
         
+        # 백그라운드 재학습 종료 (학습 프로세스가 인터프리터 종료를 막지 않도록)
+        self.retrainer.shutdown()
+        if self.fast_predictor is not None:
+            self.fast_predictor.close()
+            self.fast_predictor = None
+        
         # 최종 요약
         self.print_daily_summary()
         
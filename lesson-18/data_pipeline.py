@@ -11,13 +11,18 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-17'))
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Tuple, Optional, List
+from typing import Tuple, Optional, List, Iterator, Dict
 import logging
+import json
+import shutil
+import hashlib
+from numpy.lib.stride_tricks import sliding_window_view
 from sklearn.preprocessing import MinMaxScaler, StandardScaler
 import pickle
 
 try:
     from upbit_data_collector import UpbitDataCollector
+    from candle_store import CandleStore, kst_now
 except ImportError:
     print("경고: lesson-17/upbit_data_collector.py를 찾을 수 없습니다.")
     print("업비트 데이터 수집기를 사용할 수 없습니다.")
@@ -32,25 +37,36 @@ class DataPipeline:
     - 데이터 전처리 및 정규화
     - 학습/검증/테스트 데이터 분할
     - 시계열 시퀀스 생성
+    - 준비된 학습 데이터셋 캐시 (.npy memmap)
     """
     
-    def __init__(self, data_dir: str = './data'):
+    def __init__(self, data_dir: str = './data', use_candle_store: bool = False,
+                 candle_store_dir: Optional[str] = None):
         """
         초기화
         
         Args:
             data_dir: 데이터 저장 디렉토리
+            use_candle_store: 조회한 캔들을 로컬 캔들 저장소에 누적할지 여부 (기본값: 사용 안 함)
+            candle_store_dir: 캔들 저장소 디렉토리 (None이면 다른 차시와 공유하는 기본 위치)
         """
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
         
-        # 업비트 데이터 수집기
+        # 업비트 데이터 수집기 (저장소를 켜면 조회한 캔들을 누적하고 없는 구간만 조회)
         try:
-            self.collector = UpbitDataCollector()
+            self.candle_store = None
+            if use_candle_store:
+                self.candle_store = CandleStore(candle_store_dir) if candle_store_dir else CandleStore()
+            self.collector = UpbitDataCollector(candle_store=self.candle_store)
         except:
+            self.candle_store = None
             self.collector = None
             print("업비트 데이터 수집기 초기화 실패")
         
+        # 정규화까지 끝난 학습 데이터셋 캐시
+        self.dataset_cache = DatasetCache(os.path.join(data_dir, 'dataset_cache'))
+        
         # 스케일러
         self.price_scaler = MinMaxScaler()
         self.feature_scaler = StandardScaler()
@@ -87,45 +103,21 @@ class DataPipeline:
             return self._generate_dummy_data(days, interval)
         
         try:
-            # 업비트에서 데이터 수집
             if interval in ['1', '60', '240']:
-                # 분봉 데이터
-                df = self.collector.get_candles_minutes(
-                    market=market,
-                    interval=int(interval),
-                    count=200  # 최대 200개씩
-                )
-                
-                # 더 많은 데이터 수집 (반복)
-                all_data = []
-                required_candles = int((days * 24 * 60) / int(interval))
-                
-                for i in range(0, required_candles, 200):
-                    batch = self.collector.get_candles_minutes(
-                        market=market,
-                        interval=int(interval),
-                        count=min(200, required_candles - i)
-                    )
-                    if not batch.empty:
-                        all_data.append(batch)
-                    
-                    if len(all_data) >= required_candles // 200:
-                        break
-                
-                if all_data:
-                    df = pd.concat(all_data, ignore_index=True)
-                    df = df.drop_duplicates(subset=['timestamp'])
-                    df = df.sort_values('timestamp')
-            
+                unit = f'minutes/{interval}'
             elif interval == 'day':
-                # 일봉 데이터
-                df = self.collector.get_candles_daily(
-                    market=market,
-                    count=min(days, 200)
-                )
+                unit = 'days'
             else:
                 raise ValueError(f"지원하지 않는 간격: {interval}")
             
+            # 페이지 단위 조회 (저장소를 켜면 저장소에 없는 구간만 조회하고 결과를 기록)
+            df = self.collector.backfill_candles(market, unit, start=kst_now() - timedelta(days=days))
+            df = df.rename(columns={'datetime': 'timestamp'})
+            df = df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+            
+            if df.empty:
+                raise ValueError("저장된 캔들이 없습니다")
+            
             self.logger.info(f"데이터 수집 완료: {len(df)}개 캔들")
             return df
         
@@ -223,7 +215,8 @@ class DataPipeline:
         self,
         data: np.ndarray,
         sequence_length: int = 60,
-        forecast_horizon: int = 1
+        forecast_horizon: int = 1,
+        copy: bool = True
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         시계열 시퀀스 생성
@@ -232,20 +225,67 @@ class DataPipeline:
             data: 입력 데이터 (n_samples, n_features)
             sequence_length: 시퀀스 길이 (과거 몇 개 사용)
             forecast_horizon: 예측 시점 (미래 몇 개 후)
+            copy: False면 X를 data의 읽기 전용 뷰로 반환 (추가 메모리 없음)
         
         Returns:
             X: 입력 시퀀스 (n_samples, sequence_length, n_features)
             y: 타겟 값 (n_samples,)
         """
-        X, y = [], []
+        X, y = sliding_window_sequences(data, sequence_length, forecast_horizon)
         
-        for i in range(len(data) - sequence_length - forecast_horizon + 1):
-            # 입력: 과거 sequence_length 시점
-            X.append(data[i:(i + sequence_length)])
-            # 타겟: forecast_horizon 시점 후의 값
-            y.append(data[i + sequence_length + forecast_horizon - 1, 0])
+        if copy:
+            X_copy = np.empty(X.shape, dtype=X.dtype)
+            np.copyto(X_copy, X)
+            X = X_copy
         
-        return np.array(X), np.array(y)
+        return X, y.copy()
+    
+    def create_sequence_batches(
+        self,
+        data: np.ndarray,
+        sequence_length: int = 60,
+        forecast_horizon: int = 1,
+        batch_size: int = 32,
+        train_ratio: float = 0.7,
+        val_ratio: float = 0.15,
+        shuffle: bool = True
+    ) -> Tuple['SequenceBatchGenerator', 'SequenceBatchGenerator', 'SequenceBatchGenerator']:
+        """
+        학습/검증/테스트 배치 생성기 (split_data와 같은 순차 분할)
+        
+        3차원 시퀀스 전체를 만들지 않고 배치마다 필요한 시퀀스만 복사합니다.
+        정규화는 윈도우를 만들기 전에 2차원 data에 적용하세요 (행 단위 변환이라 결과가 같음).
+        
+        Args:
+            data: 입력 데이터 (n_samples, n_features)
+            sequence_length: 시퀀스 길이
+            forecast_horizon: 예측 시점
+            batch_size: 배치 크기
+            train_ratio: 학습 데이터 비율
+            val_ratio: 검증 데이터 비율
+            shuffle: 학습 배치 순서를 에폭마다 섞을지 여부
+        
+        Returns:
+            train_batches, val_batches, test_batches
+        """
+        n_samples = len(data) - sequence_length - forecast_horizon + 1
+        train_end = int(n_samples * train_ratio)
+        val_end = int(n_samples * (train_ratio + val_ratio))
+        
+        def make(start: int, end: int, shuffle: bool) -> SequenceBatchGenerator:
+            return SequenceBatchGenerator(
+                data, sequence_length, forecast_horizon, batch_size,
+                start=start, end=end, shuffle=shuffle
+            )
+        
+        batches = make(0, train_end, shuffle), make(train_end, val_end, False), make(val_end, n_samples, False)
+        
+        self.logger.info(f"배치 생성기 준비 완료 (배치 크기 {batch_size}):")
+        self.logger.info(f"  학습: {len(batches[0].indices)}개 시퀀스, {len(batches[0])}개 배치")
+        self.logger.info(f"  검증: {len(batches[1].indices)}개 시퀀스, {len(batches[1])}개 배치")
+        self.logger.info(f"  테스트: {len(batches[2].indices)}개 시퀀스, {len(batches[2])}개 배치")
+        
+        return batches
     
     def split_data(
         self,
@@ -351,16 +391,16 @@ class DataPipeline:
         
         return tuple(result)
     
-    def save_scaler(self, scaler, filename: str = 'scaler.pkl'):
-        """스케일러 저장"""
-        filepath = os.path.join(self.data_dir, filename)
+    def save_scaler(self, scaler, filename: str = 'scaler.pkl', directory: Optional[str] = None):
+        """스케일러 저장 (directory가 None이면 data_dir)"""
+        filepath = os.path.join(directory or self.data_dir, filename)
         with open(filepath, 'wb') as f:
             pickle.dump(scaler, f)
         self.logger.info(f"스케일러 저장: {filepath}")
     
-    def load_scaler(self, filename: str = 'scaler.pkl'):
-        """스케일러 로드"""
-        filepath = os.path.join(self.data_dir, filename)
+    def load_scaler(self, filename: str = 'scaler.pkl', directory: Optional[str] = None):
+        """스케일러 로드 (directory가 None이면 data_dir)"""
+        filepath = os.path.join(directory or self.data_dir, filename)
         with open(filepath, 'rb') as f:
             scaler = pickle.load(f)
         self.logger.info(f"스케일러 로드: {filepath}")
@@ -382,6 +422,279 @@ class DataPipeline:
         return df
 
 
+def sliding_window_sequences(
+    data: np.ndarray,
+    sequence_length: int,
+    forecast_horizon: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시퀀스 윈도우 뷰 생성 (복사 없음)
+    
+    X[i] = data[i:i+sequence_length], y[i] = data[i+sequence_length+forecast_horizon-1, 0]
+    
+    Args:
+        data: 입력 데이터 (n_samples, n_features) 또는 (n_samples,)
+        sequence_length: 시퀀스 길이
+        forecast_horizon: 예측 시점
+    
+    Returns:
+        X: 읽기 전용 뷰 (n_windows, sequence_length, n_features)
+        y: 읽기 전용 뷰 (n_windows,)
+    """
+    data = np.asarray(data)
+    if data.ndim == 1:
+        data = data[:, None]
+    
+    n_windows = max(0, len(data) - sequence_length - forecast_horizon + 1)
+    if n_windows == 0:
+        empty = np.empty((0, sequence_length, data.shape[1]), dtype=data.dtype)
+        return empty, np.empty(0, dtype=data.dtype)
+    
+    # sliding_window_view는 윈도우 축을 마지막에 붙이므로 (n, features, seq) → (n, seq, features)
+    X = sliding_window_view(data, sequence_length, axis=0)[:n_windows].transpose(0, 2, 1)
+    y = data[sequence_length + forecast_horizon - 1:, 0][:n_windows]
+    y.flags.writeable = False
+    
+    return X, y
+
+
+class DatasetCache:
+    """
+    준비된 학습 데이터셋 캐시
+    
+    정규화까지 끝난 train/val/test 배열을 .npy로 저장하고 memmap으로 엽니다.
+    키는 원본 데이터(구간·값)와 준비 설정(특징, sequence_length, 스케일러 등)의 해시이므로
+    같은 데이터·설정으로 다시 학습할 때는 특징 생성·시퀀스·분할·정규화를 건너뜁니다.
+    
+    디렉토리 구조:
+        <cache_dir>/<key>/
+            <이름>.npy        # X_train_lstm, ..., y_test
+            <스케일러>.pkl
+            meta.json         # 마지막에 기록 (있으면 완성된 캐시)
+    """
+    
+    META_FILE = 'meta.json'
+    
+    def __init__(self, cache_dir: str = './data/dataset_cache'):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 캐시 디렉토리
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def make_key(df: pd.DataFrame, **config) -> str:
+        """
+        캐시 키 생성
+        
+        Args:
+            df: 원본 OHLCV 데이터프레임
+            **config: 준비 설정 (JSON으로 직렬화 가능한 값)
+        
+        Returns:
+            16자리 해시
+        """
+        digest = hashlib.sha1()
+        
+        # 원본 데이터 구간과 값
+        if 'timestamp' in df.columns:
+            timestamps = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+            digest.update(np.ascontiguousarray(timestamps).data)
+        values = df[[c for c in ['open', 'high', 'low', 'close', 'volume'] if c in df.columns]]
+        digest.update(np.ascontiguousarray(values.to_numpy(dtype=np.float64)).data)
+        
+        # 준비 설정
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+        
+        return digest.hexdigest()[:16]
+    
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+    
+    def has(self, key: str) -> bool:
+        """완성된 캐시 존재 여부"""
+        return os.path.exists(os.path.join(self._dir(key), self.META_FILE))
+    
+    def save(self, key: str, arrays: Dict[str, np.ndarray],
+             scalers: Optional[Dict[str, object]] = None, meta: Optional[Dict] = None):
+        """
+        데이터셋 저장 (임시 디렉토리에 쓴 뒤 이름을 바꿔 원자적으로 반영)
+        
+        Args:
+            key: 캐시 키
+            arrays: {이름: 배열}
+            scalers: {이름: 스케일러}
+            meta: 추가 정보 (특징 이름 등)
+        """
+        target = self._dir(key)
+        tmp_dir = f'{target}.tmp-{os.getpid()}'
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), np.ascontiguousarray(array))
+        
+        for name, scaler in (scalers or {}).items():
+            with open(os.path.join(tmp_dir, f'{name}.pkl'), 'wb') as f:
+                pickle.dump(scaler, f)
+        
+        with open(os.path.join(tmp_dir, self.META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({
+                **(meta or {}),
+                'arrays': list(arrays),
+                'scalers': list(scalers or {}),
+                'created_at': datetime.now().isoformat()
+            }, f, indent=2, ensure_ascii=False, default=str)
+        
+        if os.path.exists(target):
+            shutil.rmtree(target)
+        try:
+            os.replace(tmp_dir, target)
+        except OSError:
+            # 다른 프로세스가 먼저 저장함
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        
+        nbytes = sum(np.asarray(array).nbytes for array in arrays.values())
+        self.logger.info(f"데이터셋 캐시 저장: {target} ({nbytes / 1024**2:.1f} MB)")
+    
+    def load(self, key: str, mmap: bool = True) -> Tuple[Dict[str, np.ndarray], Dict[str, object], Dict]:
+        """
+        데이터셋 로드
+        
+        Args:
+            key: 캐시 키
+            mmap: memmap으로 열지 여부 (False면 메모리로 읽음)
+        
+        Returns:
+            (배열, 스케일러, 메타 정보)
+        """
+        directory = self._dir(key)
+        with open(os.path.join(directory, self.META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r' if mmap else None)
+            for name in meta['arrays']
+        }
+        
+        scalers = {}
+        for name in meta['scalers']:
+            with open(os.path.join(directory, f'{name}.pkl'), 'rb') as f:
+                scalers[name] = pickle.load(f)
+        
+        self.logger.info(f"데이터셋 캐시 로드: {directory}")
+        return arrays, scalers, meta
+    
+    def clear(self, key: Optional[str] = None):
+        """캐시 삭제 (key가 None이면 전체)"""
+        if key is not None:
+            shutil.rmtree(self._dir(key), ignore_errors=True)
+            return
+        
+        for name in os.listdir(self.cache_dir):
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+
+
+class SequenceBatchGenerator:
+    """
+    시퀀스 배치 생성기
+    
+    2차원 데이터만 메모리에 두고, 배치를 요청받을 때마다 해당 시퀀스만
+    (batch_size, sequence_length, n_features) 배열로 복사합니다.
+    n개 시퀀스 전체를 만들 때보다 메모리가 약 sequence_length배 적게 듭니다.
+    
+    사용 예:
+        for X_batch, y_batch in batches: ...               # 한 에폭
+        model.fit(batches.repeat(), steps_per_epoch=len(batches))  # Keras
+    """
+    
+    def __init__(
+        self,
+        data: np.ndarray,
+        sequence_length: int = 60,
+        forecast_horizon: int = 1,
+        batch_size: int = 32,
+        start: int = 0,
+        end: Optional[int] = None,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        dtype: Optional[np.dtype] = np.float32
+    ):
+        """
+        초기화
+        
+        Args:
+            data: 입력 데이터 (n_samples, n_features), 정규화된 값
+            sequence_length: 시퀀스 길이
+            forecast_horizon: 예측 시점
+            batch_size: 배치 크기
+            start: 사용할 첫 시퀀스 번호
+            end: 사용할 마지막 시퀀스 번호 + 1 (None이면 끝까지)
+            shuffle: 에폭마다 시퀀스 순서를 섞을지 여부
+            seed: 셔플 난수 시드
+            dtype: 배치 자료형 (None이면 data와 같음)
+        """
+        self.X, self.y = sliding_window_sequences(data, sequence_length, forecast_horizon)
+        self.sequence_length = sequence_length
+        self.forecast_horizon = forecast_horizon
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.dtype = dtype
+        self.rng = np.random.default_rng(seed)
+        
+        end = len(self.X) if end is None else min(end, len(self.X))
+        self.indices = np.arange(start, max(start, end))
+    
+    def __len__(self) -> int:
+        """에폭당 배치 수"""
+        return -(-len(self.indices) // self.batch_size)
+    
+    def __getitem__(self, batch_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        배치 하나 (현재 에폭 순서 기준)
+        
+        Returns:
+            X_batch (batch, sequence_length, n_features), y_batch (batch,)
+        """
+        idx = self.indices[batch_index * self.batch_size:(batch_index + 1) * self.batch_size]
+        
+        # 연속 구간이면 슬라이스로 한 번에 복사
+        if len(idx) and idx[-1] - idx[0] == len(idx) - 1:
+            X_batch = self.X[idx[0]:idx[-1] + 1]
+            y_batch = self.y[idx[0]:idx[-1] + 1]
+        else:
+            X_batch = self.X[idx]
+            y_batch = self.y[idx]
+        
+        return np.array(X_batch, dtype=self.dtype), np.array(y_batch, dtype=self.dtype)
+    
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """한 에폭의 배치 (shuffle이면 에폭 시작 시 순서를 섞음)"""
+        if self.shuffle:
+            self.rng.shuffle(self.indices)
+        for batch_index in range(len(self)):
+            yield self[batch_index]
+    
+    def repeat(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """무한 반복 배치 (Keras fit에 steps_per_epoch=len(self)와 함께 전달)"""
+        while True:
+            yield from self
+    
+    def materialize(self) -> Tuple[np.ndarray, np.ndarray]:
+        """전체 시퀀스를 배열로 (작은 데이터 평가용)"""
+        return np.array(self.X[self.indices], dtype=self.dtype), np.array(self.y[self.indices], dtype=self.dtype)
+    
+    @property
+    def nbytes(self) -> int:
+        """전체 시퀀스를 배열로 만들었을 때 필요한 메모리 (바이트)"""
+        itemsize = np.dtype(self.dtype or self.X.dtype).itemsize
+        return len(self.indices) * self.sequence_length * self.X.shape[2] * itemsize
+
+
 if __name__ == '__main__':
     # 사용 예시
     pipeline = DataPipeline()
@@ -4,12 +4,20 @@ feature_engineering.py - 기술적 지표 기반 특징 엔지니어링
 가격 데이터에서 다양한 기술적 지표와 특징을 생성합니다.
 """
 
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+# 지표 계산식은 실시간 봇의 스트리밍 지표와 같은 구현을 사용
+from streaming_indicators import RSI, MACD, BollingerBands, ATR, Stochastic, OBV
+
 try:
     import pandas_ta as ta
 except ImportError:
@@ -207,13 +215,7 @@ class FeatureEngineer:
     
     def calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """RSI 계산"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return RSI.batch(prices, period)
     
     def calculate_macd(
         self,
@@ -223,12 +225,7 @@ class FeatureEngineer:
         signal: int = 9
     ) -> tuple:
         """MACD 계산"""
-        ema_fast = prices.ewm(span=fast).mean()
-        ema_slow = prices.ewm(span=slow).mean()
-        macd = ema_fast - ema_slow
-        macd_signal = macd.ewm(span=signal).mean()
-        macd_hist = macd - macd_signal
-        return macd, macd_signal, macd_hist
+        return MACD.batch(prices, fast, slow, signal)
     
     def calculate_bollinger_bands(
         self,
@@ -237,21 +234,11 @@ class FeatureEngineer:
         std: float = 2.0
     ) -> tuple:
         """볼린저 밴드 계산"""
-        middle = prices.rolling(window=period).mean()
-        std_dev = prices.rolling(window=period).std()
-        upper = middle + (std_dev * std)
-        lower = middle - (std_dev * std)
-        return middle, upper, lower
+        return BollingerBands.batch(prices, period, std)
     
     def calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """ATR 계산"""
-        high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
-        
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.rolling(window=period).mean()
-        return atr
+        return ATR.batch(df, period)
     
     def calculate_stochastic(
         self,
@@ -261,20 +248,19 @@ class FeatureEngineer:
         smooth_d: int = 3
     ) -> tuple:
         """Stochastic Oscillator 계산"""
-        lowest_low = df['low'].rolling(window=period).min()
-        highest_high = df['high'].rolling(window=period).max()
-        
-        stoch = 100 * (df['close'] - lowest_low) / (highest_high - lowest_low)
-        stoch_k = stoch.rolling(window=smooth_k).mean()
-        stoch_d = stoch_k.rolling(window=smooth_d).mean()
-        
-        return stoch_k, stoch_d
+        return Stochastic.batch(df, period, smooth_k, smooth_d)
     
     def calculate_cci(self, df: pd.DataFrame, period: int = 20) -> pd.Series:
         """CCI 계산"""
         tp = (df['high'] + df['low'] + df['close']) / 3
         sma = tp.rolling(window=period).mean()
-        mad = tp.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
+        
+        # 평균 절대 편차 (rolling.apply 대신 윈도우 뷰로 한 번에 계산)
+        mad = pd.Series(np.nan, index=tp.index)
+        if len(tp) >= period:
+            windows = sliding_window_view(tp.to_numpy(dtype=float), period)
+            mad.iloc[period - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+        
         cci = (tp - sma) / (0.015 * mad)
         return cci
     
@@ -292,8 +278,7 @@ class FeatureEngineer:
     
     def calculate_obv(self, df: pd.DataFrame) -> pd.Series:
         """OBV 계산"""
-        obv = (np.sign(df['close'].diff()) * df['volume']).fillna(0).cumsum()
-        return obv
+        return OBV.batch(df)
     
     def get_feature_importance_names(self) -> List[str]:
         """특징 이름 리스트 반환"""
@@ -0,0 +1,404 @@
+"""
+feature_store.py - 증분 계산 특징 저장소
+
+(마켓, 캔들 간격)별로 FeatureEngineer 특징을 디스크에 보관하고, 새 봉의 특징만 덧붙입니다.
+자동매매 봇이 매 사이클 캔들 100개 전체로 특징을 다시 계산하지 않고
+저장된 행을 바로 예측 입력(X_ml)으로 사용할 수 있습니다.
+
+저장 구조:
+    <root>/<마켓>/<간격>/timestamps.bin   # int64 (datetime64[ns] 정수값)
+    <root>/<마켓>/<간격>/features.bin     # float64 행 (meta.json의 columns 순서)
+    <root>/<마켓>/<간격>/meta.json        # 컬럼 목록
+
+계산 방식:
+- 창(window) 기반 특징(이동평균, RSI, 볼린저 밴드, CCI 등)은 저장된 최근 lookback개 봉 +
+  새 봉으로만 create_all_features를 실행해 새 봉의 행을 얻습니다.
+- 처음부터 누적되는 특징(EMA, MACD, OBV)은 스트리밍 지표 상태를 이어서 갱신합니다.
+- 마지막 봉(진행 중인 봉)은 디스크에 쓰지 않고 메모리에만 두며, 값이 바뀌었을 때만 다시 계산합니다.
+
+결과는 저장소에 쌓인 전체 봉으로 create_all_features를 실행한 값과 같습니다
+(맨 앞 워밍업 구간의 결측치 채움 제외).
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'lesson-06'))
+
+import json
+import threading
+import logging
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from feature_engineering import FeatureEngineer
+from streaming_indicators import EMA, MACD, OBV
+
+RAW_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+# obv_ma 창 크기 (FeatureEngineer.create_volume_features와 같음)
+OBV_MA_PERIOD = 20
+
+
+class _SeriesState:
+    """(마켓, 간격) 하나의 메모리 상태"""
+
+    def __init__(self, columns: List[str], lookback: int):
+        self.columns = columns
+        self.column_index = {name: i for i, name in enumerate(columns)}
+        self.timestamps = np.empty(0, dtype='<i8')
+        self.features = np.empty((0, len(columns)))
+
+        # 창 기반 특징 재계산용 최근 원본 봉
+        self.raw_tail = pd.DataFrame(columns=RAW_COLUMNS)
+        self.lookback = lookback
+
+        # 누적 특징 상태 (마감된 봉 기준)
+        self.ema_12 = EMA(span=12)
+        self.ema_26 = EMA(span=26)
+        self.macd = MACD()
+        self.obv = OBV()
+        self.obv_tail = deque(maxlen=OBV_MA_PERIOD)
+
+        # 진행 중인 봉 (디스크에 쓰지 않음)
+        self.open_raw: Optional[Tuple] = None
+        self.open_row: Optional[np.ndarray] = None
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self.timestamps[-1]) if len(self.timestamps) else None
+
+    def prime(self):
+        """저장된 전체 봉으로 누적 특징 상태와 최근 원본 봉 복원"""
+        close = self.features[:, self.column_index['close']]
+        volume = self.features[:, self.column_index['volume']]
+
+        self.ema_12.prime(close)
+        self.ema_26.prime(close)
+        self.macd.prime(close)
+        self.obv.prime(close, volume)
+        self.obv_tail = deque(
+            self.features[-OBV_MA_PERIOD:, self.column_index['obv']], maxlen=OBV_MA_PERIOD
+        )
+
+        tail = self.features[-self.lookback:]
+        self.raw_tail = pd.DataFrame(
+            {name: tail[:, self.column_index[name]] for name in RAW_COLUMNS[1:]}
+        )
+        self.raw_tail.insert(0, 'timestamp', pd.to_datetime(self.timestamps[-self.lookback:]))
+
+
+class FeatureStore:
+    """
+    증분 계산 특징 저장소
+
+    사용 예:
+        store = FeatureStore()
+        store.update('KRW-BTC', '60', candles)          # 새 봉의 특징만 계산·저장
+        X_ml = store.get_feature_rows('KRW-BTC', '60', feature_cols, count=1)
+        closes = store.get_column('KRW-BTC', '60', 'close', count=60)
+    """
+
+    def __init__(self, root_dir: str = './data/feature_store',
+                 engineer: Optional[FeatureEngineer] = None,
+                 lookback: int = 60):
+        """
+        초기화
+
+        Args:
+            root_dir: 저장 디렉토리
+            engineer: 특징 생성기 (None이면 새로 생성)
+            lookback: 창 기반 특징 재계산에 사용할 최근 봉 수 (가장 긴 창 ma_50보다 커야 함)
+        """
+        self.root_dir = root_dir
+        self.engineer = engineer or FeatureEngineer()
+        self.lookback = lookback
+        self.states: Dict[Tuple[str, str], _SeriesState] = {}
+        self.lock = threading.RLock()
+        self.stats = {
+            'updates': 0,
+            'rows_appended': 0,
+            'open_bar_recomputes': 0,
+            'cache_hits': 0,
+            'rebuilds': 0
+        }
+
+        os.makedirs(root_dir, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+    # ==================== 갱신 ====================
+
+    def update(self, market: str, interval: str, candles: pd.DataFrame,
+               last_is_open: bool = True) -> int:
+        """
+        캔들로 특징 갱신 (저장된 마지막 봉 이후의 봉만 계산)
+
+        Args:
+            market: 마켓 코드
+            interval: 캔들 간격 ('1', '60', '240', 'day' 등)
+            candles: OHLCV 데이터프레임 (timestamp 또는 datetime 컬럼, 오래된 것부터)
+            last_is_open: 마지막 행이 아직 마감되지 않은 봉인지 여부
+
+        Returns:
+            새로 저장된(마감된) 봉 수
+        """
+        raw = self._normalize(candles)
+        if raw.empty:
+            return 0
+
+        with self.lock:
+            self.stats['updates'] += 1
+            state = self._get_state(market, interval)
+
+            closed = raw.iloc[:-1] if last_is_open else raw
+            open_bar = raw.iloc[-1:] if last_is_open else raw.iloc[0:0]
+
+            # 저장된 봉과 이어지지 않으면 (처음이거나 중간이 빠짐) 받은 데이터로 다시 만듦
+            last = state.last_timestamp if state is not None else None
+            if last is None or closed.empty or closed['timestamp'].iloc[0].value > last:
+                if state is not None and last is not None:
+                    self.logger.warning(f"{market} {interval}: 저장된 특징과 이어지지 않아 다시 생성합니다.")
+                state = self._rebuild(market, interval, closed)
+                new_closed = closed.iloc[0:0]
+                appended = len(state.timestamps)
+            else:
+                new_closed = closed[closed['timestamp'].values.astype('<i8') > last]
+                appended = len(new_closed)
+
+            # 진행 중인 봉: 마감된 봉보다 새롭고, 새 봉이 마감됐거나 값이 바뀌었을 때만 다시 계산
+            last = new_closed['timestamp'].iloc[-1].value if len(new_closed) else state.last_timestamp
+            if open_bar.empty or (last is not None and open_bar['timestamp'].iloc[0].value <= last):
+                open_bar = open_bar.iloc[0:0]
+            open_raw = tuple(open_bar.iloc[0]) if len(open_bar) else None
+
+            if new_closed.empty and open_raw == state.open_raw:
+                self.stats['cache_hits'] += 1
+                return 0
+
+            rows = self._compute_rows(state, pd.concat([new_closed, open_bar], ignore_index=True), len(open_bar))
+            if len(new_closed):
+                self._append_closed(market, interval, state, new_closed, rows[:len(new_closed)])
+
+            state.open_raw = open_raw
+            state.open_row = rows[-1] if len(open_bar) else None
+            if len(open_bar):
+                self.stats['open_bar_recomputes'] += 1
+            return appended
+
+    def _append_closed(self, market: str, interval: str, state: _SeriesState,
+                       new_closed: pd.DataFrame, rows: np.ndarray):
+        """마감된 새 봉의 특징 행 저장"""
+        timestamps = new_closed['timestamp'].values.astype('<i8')
+
+        state.timestamps = np.concatenate([state.timestamps, timestamps])
+        state.features = np.vstack([state.features, rows])
+        state.raw_tail = pd.concat([state.raw_tail, new_closed], ignore_index=True).iloc[-state.lookback:]
+
+        self._write_rows(market, interval, timestamps, rows)
+        self.stats['rows_appended'] += len(rows)
+
+    def _compute_rows(self, state: _SeriesState, new_raw: pd.DataFrame, n_open: int) -> np.ndarray:
+        """
+        새 봉의 특징 행 계산
+
+        창 기반 특징은 최근 lookback개 봉 + 새 봉으로 한 번에 계산하고,
+        누적 특징(EMA, MACD, OBV)은 스트리밍 상태로 덮어씁니다.
+        마지막 n_open개(진행 중인 봉)는 상태를 바꾸지 않고 peek로 계산합니다.
+        """
+        window = pd.concat([state.raw_tail, new_raw], ignore_index=True)
+        df = self.engineer.create_all_features(window).iloc[-len(new_raw):]
+        rows = df[state.columns].to_numpy(dtype=float)
+
+        col = state.column_index
+        n_closed = len(new_raw) - n_open
+        obv_tail = state.obv_tail
+        closes = new_raw['close'].to_numpy(float)
+        volumes = new_raw['volume'].to_numpy(float)
+
+        for i, (row, close, volume) in enumerate(zip(rows, closes, volumes)):
+            if i < n_closed:
+                ema_12, ema_26 = state.ema_12.update(close), state.ema_26.update(close)
+                macd, signal, hist = state.macd.update(close)
+                obv = state.obv.update(close, volume)
+            else:
+                ema_12, ema_26 = state.ema_12.peek(close), state.ema_26.peek(close)
+                macd, signal, hist = state.macd.peek(close)
+                obv = state.obv.peek(close, volume)
+                obv_tail = deque(obv_tail, maxlen=OBV_MA_PERIOD)
+            obv_tail.append(obv)
+
+            row[col['ema_12']], row[col['ema_26']] = ema_12, ema_26
+            row[col['macd']], row[col['macd_signal']], row[col['macd_hist']] = macd, signal, hist
+            row[col['obv']] = obv
+            if len(obv_tail) == OBV_MA_PERIOD:
+                row[col['obv_ma']] = sum(obv_tail) / OBV_MA_PERIOD
+            if 'macd_rsi_interaction' in col:
+                row[col['macd_rsi_interaction']] = macd * row[col['rsi_14']]
+
+        return rows
+
+    def _rebuild(self, market: str, interval: str, closed: pd.DataFrame) -> _SeriesState:
+        """받은 마감된 봉 전체로 특징을 다시 만들고 저장"""
+        df = self.engineer.create_all_features(closed) if len(closed) else None
+        columns = self._feature_columns(df if df is not None else self.engineer.create_all_features(
+            self._warmup_frame()
+        ))
+
+        state = _SeriesState(columns, self.lookback)
+        if df is not None:
+            state.timestamps = closed['timestamp'].values.astype('<i8')
+            state.features = df[columns].to_numpy(dtype=float)
+            state.prime()
+
+        self.states[(market, str(interval))] = state
+        self._write_all(market, interval, state)
+        self.stats['rebuilds'] += 1
+        return state
+
+    # ==================== 조회 ====================
+
+    def get_feature_rows(self, market: str, interval: str, columns: List[str],
+                         count: int = 1, include_open: bool = True) -> np.ndarray:
+        """
+        최근 특징 행 (예측 입력 X_ml)
+
+        Args:
+            market: 마켓 코드
+            interval: 캔들 간격
+            columns: 특징 컬럼 목록 (학습 시 사용한 순서)
+            count: 최근 몇 개
+            include_open: 진행 중인 봉 포함 여부
+
+        Returns:
+            (count, len(columns)) 배열
+        """
+        with self.lock:
+            state = self._get_state(market, interval)
+            if state is None:
+                return np.empty((0, len(columns)))
+
+            index = [state.column_index[name] for name in columns]
+            rows = state.features
+            if include_open and state.open_row is not None:
+                closed = rows[-(count - 1):, index] if count > 1 else rows[:0, index]
+                return np.vstack([closed, state.open_row[index]])
+            return rows[-count:, index].copy()
+
+    def get_column(self, market: str, interval: str, column: str,
+                   count: int, include_open: bool = True) -> np.ndarray:
+        """최근 값 하나의 컬럼 (예: LSTM 입력용 종가)"""
+        return self.get_feature_rows(market, interval, [column], count, include_open)[:, 0]
+
+    def get_frame(self, market: str, interval: str, include_open: bool = True) -> pd.DataFrame:
+        """저장된 전체 특징 데이터프레임 (create_all_features 결과와 같은 형식)"""
+        with self.lock:
+            state = self._get_state(market, interval)
+            if state is None:
+                return pd.DataFrame()
+
+            timestamps, rows = state.timestamps, state.features
+            if include_open and state.open_row is not None:
+                timestamps = np.append(timestamps, pd.Timestamp(state.open_raw[0]).value)
+                rows = np.vstack([rows, state.open_row])
+
+            df = pd.DataFrame(rows, columns=state.columns)
+            df.insert(0, 'timestamp', pd.to_datetime(timestamps))
+            return df
+
+    def feature_columns(self, market: str, interval: str) -> List[str]:
+        """ML 특징 컬럼 (timestamp·OHLCV 제외)"""
+        state = self._get_state(market, interval)
+        if state is None:
+            return []
+        return [name for name in state.columns if name not in RAW_COLUMNS]
+
+    def get_statistics(self) -> Dict:
+        """갱신·재계산 통계"""
+        return {**self.stats, 'series': len(self.states)}
+
+    # ==================== 저장 ====================
+
+    def _series_dir(self, market: str, interval: str) -> str:
+        return os.path.join(self.root_dir, market, str(interval))
+
+    def _get_state(self, market: str, interval: str) -> Optional[_SeriesState]:
+        """메모리 상태 (없으면 디스크에서 로드)"""
+        key = (market, str(interval))
+        if key not in self.states:
+            state = self._load(market, interval)
+            if state is None:
+                return None
+            self.states[key] = state
+        return self.states[key]
+
+    def _load(self, market: str, interval: str) -> Optional[_SeriesState]:
+        """디스크에서 로드 (특징 구성이 바뀌었으면 None)"""
+        directory = self._series_dir(market, interval)
+        meta_path = os.path.join(directory, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            columns = json.load(f)['columns']
+
+        expected = self._feature_columns(self.engineer.create_all_features(self._warmup_frame()))
+        if columns != expected:
+            self.logger.warning(f"{market} {interval}: 특징 구성이 바뀌어 저장된 특징을 사용하지 않습니다.")
+            return None
+
+        timestamps = np.fromfile(os.path.join(directory, 'timestamps.bin'), dtype='<i8')
+        features = np.fromfile(os.path.join(directory, 'features.bin'), dtype='<f8')
+        n = min(len(timestamps), len(features) // len(columns))  # 쓰다가 중단된 행 제외
+
+        state = _SeriesState(columns, self.lookback)
+        state.timestamps = timestamps[:n]
+        state.features = features[:n * len(columns)].reshape(n, len(columns))
+        if n:
+            state.prime()
+        return state
+
+    def _write_all(self, market: str, interval: str, state: _SeriesState):
+        directory = self._series_dir(market, interval)
+        os.makedirs(directory, exist_ok=True)
+
+        state.timestamps.astype('<i8').tofile(os.path.join(directory, 'timestamps.bin'))
+        state.features.astype('<f8').tofile(os.path.join(directory, 'features.bin'))
+        with open(os.path.join(directory, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'columns': state.columns}, f)
+
+    def _write_rows(self, market: str, interval: str, timestamps: np.ndarray, rows: np.ndarray):
+        # 특징을 먼저 쓰고 시각을 나중에 써서, 중단되면 로드 시 짧은 쪽에 맞춰 잘림
+        directory = self._series_dir(market, interval)
+        with open(os.path.join(directory, 'features.bin'), 'ab') as f:
+            f.write(rows.astype('<f8').tobytes())
+        with open(os.path.join(directory, 'timestamps.bin'), 'ab') as f:
+            f.write(timestamps.astype('<i8').tobytes())
+
+    # ==================== 도우미 ====================
+
+    @staticmethod
+    def _normalize(candles: pd.DataFrame) -> pd.DataFrame:
+        """timestamp·OHLCV 컬럼만 남기고 시간순 정렬"""
+        if candles is None or candles.empty:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+        df = candles.rename(columns={'datetime': 'timestamp'})[RAW_COLUMNS].copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        df[RAW_COLUMNS[1:]] = df[RAW_COLUMNS[1:]].astype(float)
+        return df.drop_duplicates('timestamp', keep='last').sort_values('timestamp').reset_index(drop=True)
+
+    @staticmethod
+    def _feature_columns(df: pd.DataFrame) -> List[str]:
+        return [name for name in df.columns if name != 'timestamp']
+
+    @staticmethod
+    def _warmup_frame() -> pd.DataFrame:
+        """특징 컬럼 구성을 확인하기 위한 작은 더미 데이터"""
+        n = 60
+        close = 100 + np.arange(n, dtype=float)
+        return pd.DataFrame({
+            'timestamp': pd.date_range('2024-01-01', periods=n, freq='h'),
+            'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+            'volume': np.ones(n)
+        })
@@ -9,6 +9,9 @@ import pandas as pd
 from typing import Dict, Tuple, Optional
 import logging
 import os
+import sys
+import hashlib
+import inspect
 
 from data_pipeline import DataPipeline
 from feature_engineering import FeatureEngineer
@@ -16,6 +19,28 @@ from models.lstm_model import LSTMModel
 from models.ensemble_model import EnsembleModel
 
 
+# prepare_data가 반환하는 배열 순서 (데이터셋 캐시 이름)
+DATASET_ARRAYS = (
+    'X_train_lstm', 'X_train_ml', 'X_val_lstm', 'X_val_ml',
+    'X_test_lstm', 'X_test_ml', 'y_train', 'y_val', 'y_test'
+)
+
+# 데이터 분할 비율 (학습 끝, 검증 끝)
+DATASET_SPLIT = (0.7, 0.85)
+
+# 정규화 스케일러 종류
+SCALER_TYPES = {'price': 'minmax', 'feature': 'standard', 'target': 'minmax'}
+
+
+def _feature_code_hash() -> str:
+    """특징 생성 코드 해시 (코드가 바뀌면 데이터셋 캐시 무효화)"""
+    try:
+        source = inspect.getsource(sys.modules[FeatureEngineer.__module__])
+    except (OSError, TypeError):
+        return FeatureEngineer.__module__
+    return hashlib.sha1(source.encode()).hexdigest()[:16]
+
+
 class MLPricePredictor:
     """
     통합 ML 가격 예측 시스템
@@ -78,14 +103,20 @@ class MLPricePredictor:
     def prepare_data(
         self,
         interval: str = '60',
-        days: int = 180
+        days: int = 180,
+        df: Optional[pd.DataFrame] = None,
+        use_cache: bool = True
     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
         """
         데이터 준비
         
+        같은 데이터·설정으로 준비한 적이 있으면 데이터셋 캐시(memmap, 읽기 전용)에서 로드합니다.
+        
         Args:
             interval: 캔들 간격
             days: 수집 기간
+            df: 이미 수집한 OHLCV 데이터 (주어지면 수집을 건너뜀)
+            use_cache: 데이터셋 캐시 사용 여부
         
         Returns:
             X_train_lstm, X_train_ml, X_val_lstm, X_val_ml, X_test_lstm, X_test_ml,
@@ -96,12 +127,22 @@ class MLPricePredictor:
         self.logger.info("="*60)
         
         # 1. 데이터 수집
-        self.logger.info(f"\n1. {self.market} 데이터 수집 ({days}일)")
-        df = self.pipeline.collect_historical_data(
-            market=self.market,
-            interval=interval,
-            days=days
-        )
+        if df is None:
+            self.logger.info(f"\n1. {self.market} 데이터 수집 ({days}일)")
+            df = self.pipeline.collect_historical_data(
+                market=self.market,
+                interval=interval,
+                days=days
+            )
+        else:
+            self.logger.info(f"\n1. {self.market} 주어진 데이터 사용 ({len(df)}개 캔들)")
+        
+        # 캐시 확인
+        cache_key = None
+        if use_cache:
+            cache_key = self.pipeline.dataset_cache.make_key(df, **self._dataset_config(interval))
+            if self.pipeline.dataset_cache.has(cache_key):
+                return self._load_cached_dataset(cache_key)
         
         # 2. 특징 생성
         self.logger.info("\n2. 특징 생성")
@@ -139,8 +180,8 @@ class MLPricePredictor:
         # 6. 데이터 분할
         self.logger.info("\n5. 데이터 분할")
         n = len(X_lstm)
-        train_end = int(n * 0.7)
-        val_end = int(n * 0.85)
+        train_end = int(n * DATASET_SPLIT[0])
+        val_end = int(n * DATASET_SPLIT[1])
         
         X_train_lstm = X_lstm[:train_end]
         X_val_lstm = X_lstm[train_end:val_end]
@@ -161,28 +202,62 @@ class MLPricePredictor:
         # 7. 정규화
         self.logger.info("\n6. 데이터 정규화")
         X_train_lstm, X_val_lstm, X_test_lstm, self.price_scaler = \
-            self.pipeline.normalize_data(X_train_lstm, X_val_lstm, X_test_lstm, 'minmax')
+            self.pipeline.normalize_data(X_train_lstm, X_val_lstm, X_test_lstm, SCALER_TYPES['price'])
         
         X_train_ml, X_val_ml, X_test_ml, self.feature_scaler = \
-            self.pipeline.normalize_data(X_train_ml, X_val_ml, X_test_ml, 'standard')
+            self.pipeline.normalize_data(X_train_ml, X_val_ml, X_test_ml, SCALER_TYPES['feature'])
         
         # 타겟 정규화 (예측 시 역변환 필요)
-        y_train_2d = y_train.reshape(-1, 1)
-        y_val_2d = y_val.reshape(-1, 1)
-        y_test_2d = y_test.reshape(-1, 1)
+        y_train, y_val, y_test, self.y_scaler = self.pipeline.normalize_data(
+            y_train.reshape(-1, 1), y_val.reshape(-1, 1), y_test.reshape(-1, 1),
+            SCALER_TYPES['target']
+        )
+        y_train, y_val, y_test = y_train.flatten(), y_val.flatten(), y_test.flatten()
+        
+        result = (X_train_lstm, X_train_ml, X_val_lstm, X_val_ml,
+                  X_test_lstm, X_test_ml, y_train, y_val, y_test)
+        
+        if cache_key is not None:
+            self.pipeline.dataset_cache.save(
+                cache_key,
+                dict(zip(DATASET_ARRAYS, result)),
+                scalers={
+                    'price_scaler': self.price_scaler,
+                    'feature_scaler': self.feature_scaler,
+                    'y_scaler': self.y_scaler
+                },
+                meta={'feature_names': self.feature_names, **self._dataset_config(interval)}
+            )
         
-        from sklearn.preprocessing import MinMaxScaler
-        y_scaler = MinMaxScaler()
-        y_train = y_scaler.fit_transform(y_train_2d).flatten()
-        y_val = y_scaler.transform(y_val_2d).flatten()
-        y_test = y_scaler.transform(y_test_2d).flatten()
+        self.logger.info("데이터 준비 완료\n")
+        
+        return result
+    
+    def _dataset_config(self, interval: str) -> Dict:
+        """데이터셋 캐시 키에 들어가는 준비 설정"""
+        return {
+            'market': self.market,
+            'interval': interval,
+            'sequence_length': self.sequence_length,
+            'forecast_horizon': self.forecast_horizon,
+            'feature_code': _feature_code_hash(),
+            'scaler_types': SCALER_TYPES,
+            'split': list(DATASET_SPLIT)
+        }
+    
+    def _load_cached_dataset(self, cache_key: str) -> Tuple:
+        """데이터셋 캐시에서 배열·스케일러 로드"""
+        arrays, scalers, meta = self.pipeline.dataset_cache.load(cache_key)
         
-        self.y_scaler = y_scaler
+        self.price_scaler = scalers['price_scaler']
+        self.feature_scaler = scalers['feature_scaler']
+        self.y_scaler = scalers['y_scaler']
+        self.feature_names = meta.get('feature_names', [])
         
-        self.logger.info("데이터 준비 완료\n")
+        self.logger.info(f"캐시된 데이터셋 사용 (학습 {len(arrays['X_train_lstm'])}, "
+                         f"검증 {len(arrays['X_val_lstm'])}, 테스트 {len(arrays['X_test_lstm'])})\n")
         
-        return (X_train_lstm, X_train_ml, X_val_lstm, X_val_ml, 
-                X_test_lstm, X_test_ml, y_train, y_val, y_test)
+        return tuple(arrays[name] for name in DATASET_ARRAYS)
     
     def train_models(
         self,
@@ -265,7 +340,7 @@ class MLPricePredictor:
         
         # 각 모델 예측
         lstm_pred = self.lstm_model.predict(X_lstm)
-        rf_pred = self.ensemble_model.predict(X_ml, use_ensemble=False)  # RF만
+        rf_pred = self.ensemble_model.rf_model.predict(X_ml)  # RF만 (ensemble.predict는 XGB와 평균)
         xgb_pred = self.ensemble_model.xgb_model.predict(X_ml)  # XGB만
         
         # 가중 평균
@@ -360,8 +435,14 @@ class MLPricePredictor:
         
         return metrics
     
-    def save_models(self, model_dir: str = './models'):
-        """모델 저장"""
+    def save_models(self, model_dir: str = './models', scaler_dir: Optional[str] = None):
+        """
+        모델 저장
+        
+        Args:
+            model_dir: 모델 저장 디렉토리
+            scaler_dir: 스케일러 저장 디렉토리 (None이면 pipeline.data_dir)
+        """
         os.makedirs(model_dir, exist_ok=True)
         
         if self.lstm_model:
@@ -374,31 +455,40 @@ class MLPricePredictor:
             )
         
         # 스케일러 저장
-        self.pipeline.save_scaler(self.price_scaler, 'price_scaler.pkl')
-        self.pipeline.save_scaler(self.feature_scaler, 'feature_scaler.pkl')
-        self.pipeline.save_scaler(self.y_scaler, 'y_scaler.pkl')
+        self.pipeline.save_scaler(self.price_scaler, 'price_scaler.pkl', scaler_dir)
+        self.pipeline.save_scaler(self.feature_scaler, 'feature_scaler.pkl', scaler_dir)
+        self.pipeline.save_scaler(self.y_scaler, 'y_scaler.pkl', scaler_dir)
         
         self.logger.info("모든 모델 저장 완료")
     
-    def load_models(self, model_dir: str = './models'):
-        """모델 로드"""
-        if self.lstm_model:
-            self.lstm_model.load_model(f'{model_dir}/lstm_model.h5')
+    def load_models(self, model_dir: str = './models', scaler_dir: Optional[str] = None):
+        """
+        모델 로드
         
-        if self.ensemble_model:
-            self.ensemble_model.load_models(
-                rf_path=f'{model_dir}/rf_model.pkl',
-                xgb_path=f'{model_dir}/xgb_model.pkl'
-            )
+        Args:
+            model_dir: 모델 디렉토리
+            scaler_dir: 스케일러 디렉토리 (None이면 pipeline.data_dir)
+        """
+        # 학습하지 않은 인스턴스도 저장된 모델을 불러올 수 있도록 빈 모델 생성
+        if self.lstm_model is None:
+            self.lstm_model = LSTMModel(sequence_length=self.sequence_length)
+        
+        if self.ensemble_model is None:
+            self.ensemble_model = EnsembleModel(ensemble_weights=(0.5, 0.5))
+        
+        self.lstm_model.load_model(f'{model_dir}/lstm_model.h5')
+        self.ensemble_model.load_models(
+            rf_path=f'{model_dir}/rf_model.pkl',
+            xgb_path=f'{model_dir}/xgb_model.pkl'
+        )
         
         # 스케일러 로드
-        self.price_scaler = self.pipeline.load_scaler('price_scaler.pkl')
-        self.feature_scaler = self.pipeline.load_scaler('feature_scaler.pkl')
-        self.y_scaler = self.pipeline.load_scaler('y_scaler.pkl')
+        self.price_scaler = self.pipeline.load_scaler('price_scaler.pkl', scaler_dir)
+        self.feature_scaler = self.pipeline.load_scaler('feature_scaler.pkl', scaler_dir)
+        self.y_scaler = self.pipeline.load_scaler('y_scaler.pkl', scaler_dir)
         
         self.logger.info("모든 모델 로드 완료")
 
-
 if __name__ == '__main__':
     # 사용 예시
     print("통합 ML 가격 예측 시스템 테스트\n")
@@ -6,7 +6,7 @@ ML 가격 예측을 실제 거래 시스템에 통합합니다.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime
 import logging
 
@@ -218,9 +218,42 @@ class MLTradingSystem:
             timestamp: 시간
             reason: 청산 이유
         """
+        trade = self._record_close(
+            position['entry_price'],
+            position['entry_time'],
+            position['position_value'],
+            position['quantity'],
+            current_price,
+            timestamp,
+            reason
+        )
+        
+        # 포지션 제거
+        self.positions.remove(position)
+        
+        profit, profit_rate = trade['profit'], trade['profit_rate']
+        profit_emoji = "💰" if profit > 0 else "📉"
+        self.logger.info(f"{profit_emoji} 매도: {current_price:,.0f}원 "
+                        f"({profit:+,.0f}원, {profit_rate:+.2%}) - {reason}")
+    
+    def _record_close(
+        self,
+        entry_price: float,
+        entry_time: datetime,
+        entry_value: float,
+        quantity: float,
+        current_price: float,
+        timestamp: datetime,
+        reason: str
+    ) -> Dict:
+        """
+        청산 반영 (자본·통계·최대 낙폭·거래 히스토리)
+        
+        Returns:
+            거래 기록
+        """
         # 수익 계산
-        entry_value = position['position_value']
-        exit_value = position['quantity'] * current_price
+        exit_value = quantity * current_price
         profit = exit_value - entry_value
         profit_rate = profit / entry_value
         
@@ -245,8 +278,8 @@ class MLTradingSystem:
         
         # 거래 히스토리 저장
         trade = {
-            'entry_price': position['entry_price'],
-            'entry_time': position['entry_time'],
+            'entry_price': entry_price,
+            'entry_time': entry_time,
             'exit_price': current_price,
             'exit_time': timestamp,
             'profit': profit,
@@ -255,12 +288,7 @@ class MLTradingSystem:
         }
         self.trade_history.append(trade)
         
-        # 포지션 제거
-        self.positions.remove(position)
-        
-        profit_emoji = "💰" if profit > 0 else "📉"
-        self.logger.info(f"{profit_emoji} 매도: {current_price:,.0f}원 "
-                        f"({profit:+,.0f}원, {profit_rate:+.2%}) - {reason}")
+        return trade
     
     def check_risk_management(
         self,
@@ -294,7 +322,8 @@ class MLTradingSystem:
         X_test_lstm: np.ndarray,
         X_test_ml: np.ndarray,
         prices: np.ndarray,
-        timestamps: List[datetime]
+        timestamps: List[datetime],
+        vectorized: bool = False
     ) -> Dict:
         """
         백테스팅
@@ -304,6 +333,7 @@ class MLTradingSystem:
             X_test_ml: ML 테스트 데이터
             prices: 실제 가격 데이터
             timestamps: 시간 데이터
+            vectorized: 배열 기반 시뮬레이션 사용 여부 (결과 동일, 거래별 로그 없음)
         
         Returns:
             백테스팅 결과
@@ -312,21 +342,20 @@ class MLTradingSystem:
         self.logger.info("백테스팅 시작")
         self.logger.info("="*60)
         
-        # 초기화
-        self.current_capital = self.initial_capital
-        self.positions = []
-        self.trade_history = []
-        self.total_trades = 0
-        self.winning_trades = 0
-        self.losing_trades = 0
-        self.total_profit = 0
-        self.max_drawdown = 0
-        self.peak_capital = self.initial_capital
-        
         # 가격 예측
         self.logger.info("가격 예측 중...")
         predictions = self.predictor.predict(X_test_lstm, X_test_ml)
         
+        if vectorized:
+            return self.backtest_predictions(
+                predictions['predictions'],
+                predictions['confidence'],
+                prices,
+                timestamps
+            )
+        
+        self._reset_backtest_state()
+        
         # 매매 시뮬레이션
         self.logger.info("매매 시뮬레이션 시작...\n")
         
@@ -381,6 +410,209 @@ class MLTradingSystem:
         
         return results
     
+    def _reset_backtest_state(self):
+        """백테스팅 상태 초기화"""
+        self.current_capital = self.initial_capital
+        self.positions = []
+        self.trade_history = []
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.losing_trades = 0
+        self.total_profit = 0
+        self.max_drawdown = 0
+        self.peak_capital = self.initial_capital
+    
+    def precompute_signals(
+        self,
+        predicted_prices: np.ndarray,
+        confidence: np.ndarray,
+        prices: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        전체 구간의 매수/매도 신호를 한 번에 계산 (generate_signal과 같은 규칙)
+        
+        Args:
+            predicted_prices: 예측 가격
+            confidence: 신뢰도
+            prices: 실제 가격
+        
+        Returns:
+            (매수 마스크, 매도 마스크)
+        """
+        n = len(prices)
+        prices = np.asarray(prices, dtype=np.float64)
+        expected_change = (np.asarray(predicted_prices[:n], dtype=np.float64) - prices) / prices
+        
+        # 신뢰도가 임계값 미만이면 HOLD (NaN은 generate_signal처럼 통과)
+        confident = ~(np.asarray(confidence[:n]) < self.confidence_threshold)
+        buy = confident & (expected_change > self.signal_threshold)
+        sell = confident & ~buy & (expected_change < -self.signal_threshold)
+        
+        return buy, sell
+    
+    def backtest_predictions(
+        self,
+        predicted_prices: np.ndarray,
+        confidence: np.ndarray,
+        prices: np.ndarray,
+        timestamps: Optional[List[datetime]] = None,
+        verbose: bool = True
+    ) -> Dict:
+        """
+        예측 배열로 백테스팅 (배열 기반 시뮬레이션)
+        
+        backtest()의 봉 단위 루프와 같은 trade_history와 결과를 만듭니다.
+        신호는 precompute_signals로 한 번에 계산하고, 포지션은 max_positions개 슬롯 배열로
+        관리합니다. 봉마다 신호 딕셔너리를 만들지 않고, 매수·매도·손절·익절이
+        일어나지 않는 봉은 비교 몇 번으로 건너뜁니다.
+        
+        Args:
+            predicted_prices: 예측 가격
+            confidence: 신뢰도
+            prices: 실제 가격
+            timestamps: 시간 데이터
+            verbose: 결과 출력 여부
+        
+        Returns:
+            백테스팅 결과
+        """
+        self._reset_backtest_state()
+        
+        buy, sell = self.precompute_signals(predicted_prices, confidence, prices)
+        
+        # 스칼라 접근이 빠른 리스트로 변환
+        price_list = np.asarray(prices, dtype=np.float64).tolist()
+        buy_list = buy.tolist()
+        sell_list = sell.tolist()
+        confidence_list = np.asarray(confidence, dtype=np.float64).tolist()
+        n_timestamps = len(timestamps) if timestamps is not None else 0
+        
+        def timestamp_at(i):
+            return timestamps[i] if i < n_timestamps else datetime.now()
+        
+        # 포지션 슬롯 (열린 순서는 order에 유지)
+        slots = max(self.max_positions, 0)
+        entry_price = [0.0] * slots
+        entry_index = [0] * slots
+        entry_value = [0.0] * slots
+        quantity = [0.0] * slots
+        stop_price = [0.0] * slots
+        target_price = [0.0] * slots
+        order: List[int] = []
+        
+        # 보유 포지션 중 가장 높은 손절가 / 가장 낮은 익절가
+        low, high = -np.inf, np.inf
+        
+        def close_slot(slot, price, timestamp, reason):
+            self._record_close(
+                entry_price[slot],
+                timestamp_at(entry_index[slot]),
+                entry_value[slot],
+                quantity[slot],
+                price,
+                timestamp,
+                reason
+            )
+            order.remove(slot)
+        
+        for i in range(len(price_list) - 1):
+            current_price = price_list[i]
+            can_buy = buy_list[i] and len(order) < slots
+            
+            # 아무 일도 일어나지 않는 봉
+            if not can_buy and not (order and (sell_list[i] or current_price <= low or current_price >= high)):
+                continue
+            
+            timestamp = timestamp_at(i)
+            
+            # 매수 신호
+            if can_buy:
+                slot = next(k for k in range(slots) if k not in order)
+                position_value = self.calculate_position_size(confidence_list[i])
+                entry_price[slot] = current_price
+                entry_index[slot] = i
+                entry_value[slot] = position_value
+                quantity[slot] = position_value / current_price
+                stop_price[slot] = current_price * (1 + self.stop_loss)
+                target_price[slot] = current_price * (1 + self.take_profit)
+                order.append(slot)
+                self.current_capital -= position_value
+            
+            # 리스크 관리 (손절/익절)
+            for slot in order[:]:
+                if current_price <= stop_price[slot]:
+                    close_slot(slot, current_price, timestamp, '손절')
+                elif current_price >= target_price[slot]:
+                    close_slot(slot, current_price, timestamp, '익절')
+            
+            # 매도 신호 시 모든 포지션 청산
+            if sell_list[i]:
+                for slot in order[:]:
+                    close_slot(slot, current_price, timestamp, '매도 신호')
+            
+            if order:
+                low = max(stop_price[slot] for slot in order)
+                high = min(target_price[slot] for slot in order)
+        
+        # 남은 포지션 청산
+        final_price = price_list[-1]
+        final_timestamp = timestamps[-1] if n_timestamps else datetime.now()
+        for slot in order[:]:
+            close_slot(slot, final_price, final_timestamp, '백테스트 종료')
+        
+        results = self._calculate_results()
+        
+        if verbose:
+            self._print_results(results)
+        
+        return results
+    
+    def grid_search(
+        self,
+        predicted_prices: np.ndarray,
+        confidence: np.ndarray,
+        prices: np.ndarray,
+        signal_thresholds: List[float],
+        confidence_thresholds: List[float],
+        timestamps: Optional[List[datetime]] = None
+    ) -> pd.DataFrame:
+        """
+        신호·신뢰도 임계값 조합별 백테스팅
+        
+        Args:
+            predicted_prices: 예측 가격
+            confidence: 신뢰도
+            prices: 실제 가격
+            signal_thresholds: 신호 임계값 후보
+            confidence_thresholds: 신뢰도 임계값 후보
+            timestamps: 시간 데이터
+        
+        Returns:
+            조합별 결과 (총 수익률 내림차순)
+        """
+        original = (self.signal_threshold, self.confidence_threshold)
+        rows = []
+        
+        try:
+            for signal_threshold in signal_thresholds:
+                for confidence_threshold in confidence_thresholds:
+                    self.signal_threshold = signal_threshold
+                    self.confidence_threshold = confidence_threshold
+                    results = self.backtest_predictions(
+                        predicted_prices, confidence, prices, timestamps, verbose=False
+                    )
+                    rows.append({
+                        'signal_threshold': signal_threshold,
+                        'confidence_threshold': confidence_threshold,
+                        **results
+                    })
+        finally:
+            self.signal_threshold, self.confidence_threshold = original
+        
+        self.logger.info(f"임계값 조합 {len(rows)}개 백테스팅 완료")
+        
+        return pd.DataFrame(rows).sort_values('total_return', ascending=False).reset_index(drop=True)
+    
     def _calculate_results(self) -> Dict:
         """백테스팅 결과 계산"""
         total_return = (self.current_capital - self.initial_capital) / self.initial_capital
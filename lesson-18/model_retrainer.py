@@ -0,0 +1,505 @@
+"""
+model_retrainer.py - 백그라운드 모델 재학습 및 무중단 교체
+
+재학습은 별도 프로세스에서 데이터 스냅샷으로 실행하고 결과를 버전별 디렉토리에 저장합니다.
+검증을 통과한 버전만 실행 중인 봇의 예측기로 교체하며, 이전 버전은 롤백용으로 유지합니다.
+
+디렉토리 구조:
+    <root_dir>/
+        current.json              # {"current": 버전, "previous": 이전 버전}
+        <버전 (YYYYmmdd_HHMMSS)>/
+            lstm_model.h5, rf_model.pkl, xgb_model.pkl
+            price_scaler.pkl, feature_scaler.pkl, y_scaler.pkl
+            candles.csv           # 학습에 사용한 데이터 스냅샷
+            metrics.json          # 테스트 구간 성능
+"""
+
+import os
+import json
+import shutil
+import logging
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ml_price_predictor import MLPricePredictor
+
+
+def train_version(
+    version_dir: str,
+    market: str = 'KRW-BTC',
+    interval: str = '60',
+    days: int = 180,
+    sequence_length: int = 60,
+    lstm_epochs: int = 30,
+    lstm_batch_size: int = 32
+) -> Dict:
+    """
+    새 모델 버전 학습 (재학습 프로세스에서 실행)
+
+    Args:
+        version_dir: 버전 디렉토리
+        market: 마켓 코드
+        interval: 캔들 간격
+        days: 학습 기간 (일)
+        sequence_length: LSTM 시퀀스 길이
+        lstm_epochs: LSTM 에폭 수
+        lstm_batch_size: LSTM 배치 크기
+
+    Returns:
+        테스트 구간 성능 지표
+    """
+    os.makedirs(version_dir, exist_ok=True)
+
+    predictor = MLPricePredictor(
+        market=market,
+        sequence_length=sequence_length,
+        forecast_horizon=1
+    )
+
+    # 데이터 스냅샷 (학습 도중 들어오는 캔들과 분리)
+    df = predictor.pipeline.collect_historical_data(market=market, interval=interval, days=days)
+    df.to_csv(os.path.join(version_dir, 'candles.csv'), index=False)
+
+    (X_train_lstm, X_train_ml, X_val_lstm, X_val_ml,
+     X_test_lstm, X_test_ml, y_train, y_val, y_test) = predictor.prepare_data(
+        interval=interval,
+        days=days,
+        df=df,
+        use_cache=False  # 매번 새 캔들이라 캐시가 다시 쓰이지 않음
+    )
+
+    predictor.train_models(
+        X_train_lstm, X_train_ml,
+        X_val_lstm, X_val_ml,
+        y_train, y_val,
+        lstm_epochs=lstm_epochs,
+        lstm_batch_size=lstm_batch_size
+    )
+
+    metrics = {key: float(value) for key, value in
+               predictor.evaluate(X_test_lstm, X_test_ml, y_test).items()}
+    metrics.update({
+        'market': market,
+        'interval': interval,
+        'sequence_length': sequence_length,
+        'n_candles': len(df),
+        'data_start': str(df['timestamp'].iloc[0]),
+        'data_end': str(df['timestamp'].iloc[-1]),
+        'trained_at': datetime.now().isoformat()
+    })
+
+    predictor.save_models(version_dir, scaler_dir=version_dir)
+    with open(os.path.join(version_dir, 'metrics.json'), 'w', encoding='utf-8') as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+
+    return metrics
+
+
+def _train_worker(conn, train_function: Callable[..., Dict], version_dir: str, kwargs: Dict):
+    """재학습 프로세스 진입점 (결과를 파이프로 전달)"""
+    try:
+        conn.send(('ok', train_function(version_dir, **kwargs)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class ModelRegistry:
+    """
+    버전별 모델 저장소
+
+    current.json은 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    중간에 중단되어도 항상 온전한 버전을 가리킵니다.
+    """
+
+    POINTER_FILE = 'current.json'
+
+    def __init__(self, root_dir: str = './models/versions'):
+        """
+        초기화
+
+        Args:
+            root_dir: 버전 저장 디렉토리
+        """
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+
+    def new_version(self) -> str:
+        """새 버전 이름 (YYYYmmdd_HHMMSS, 중복 시 접미사)"""
+        base = datetime.now().strftime('%Y%m%d_%H%M%S')
+        version, suffix = base, 1
+        while os.path.exists(self.version_dir(version)):
+            version = f'{base}_{suffix}'
+            suffix += 1
+        os.makedirs(self.version_dir(version))
+        return version
+
+    def version_dir(self, version: str) -> str:
+        """버전 디렉토리 경로"""
+        return os.path.join(self.root_dir, version)
+
+    def list_versions(self) -> List[str]:
+        """학습이 끝난 버전 목록 (오래된 순)"""
+        return sorted(
+            name for name in os.listdir(self.root_dir)
+            if os.path.exists(os.path.join(self.root_dir, name, 'metrics.json'))
+        )
+
+    def load_metrics(self, version: str) -> Dict:
+        """버전의 성능 지표"""
+        with open(os.path.join(self.version_dir(version), 'metrics.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_predictor(self, version: str, market: str = 'KRW-BTC',
+                       sequence_length: int = 60) -> MLPricePredictor:
+        """버전의 모델·스케일러로 예측기 생성"""
+        version_dir = self.version_dir(version)
+        predictor = MLPricePredictor(
+            market=market,
+            sequence_length=sequence_length,
+            forecast_horizon=1
+        )
+        predictor.load_models(version_dir, scaler_dir=version_dir)
+        return predictor
+
+    # ==================== 현재 버전 ====================
+
+    def _read_pointer(self) -> Dict:
+        path = os.path.join(self.root_dir, self.POINTER_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_pointer(self, pointer: Dict):
+        path = os.path.join(self.root_dir, self.POINTER_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(pointer, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def get_current(self) -> Optional[str]:
+        """현재 사용 중인 버전"""
+        return self._read_pointer().get('current')
+
+    def get_previous(self) -> Optional[str]:
+        """롤백 대상 버전"""
+        return self._read_pointer().get('previous')
+
+    def promote(self, version: str):
+        """버전을 현재 버전으로 지정 (기존 현재 버전은 previous로)"""
+        current = self.get_current()
+        self._write_pointer({
+            'current': version,
+            'previous': current if current != version else self.get_previous(),
+            'updated_at': datetime.now().isoformat()
+        })
+        self.logger.info(f"모델 버전 교체: {current} → {version}")
+
+    def rollback(self) -> Optional[str]:
+        """이전 버전으로 되돌림 (되돌린 버전 반환)"""
+        pointer = self._read_pointer()
+        previous = pointer.get('previous')
+        if previous is None:
+            return None
+
+        self._write_pointer({
+            'current': previous,
+            'previous': pointer.get('current'),
+            'updated_at': datetime.now().isoformat()
+        })
+        self.logger.warning(f"모델 버전 롤백: {pointer.get('current')} → {previous}")
+        return previous
+
+    def prune(self, keep: int = 5):
+        """
+        오래된 버전 삭제
+
+        Args:
+            keep: 남길 최근 버전 수 (현재·이전 버전은 항상 유지)
+        """
+        pointer = self._read_pointer()
+        protected = {pointer.get('current'), pointer.get('previous')}
+        versions = self.list_versions()
+
+        for version in versions[:-keep] if keep > 0 else versions:
+            if version not in protected:
+                shutil.rmtree(self.version_dir(version), ignore_errors=True)
+                self.logger.info(f"오래된 모델 버전 삭제: {version}")
+
+
+class BackgroundRetrainer:
+    """
+    백그라운드 재학습기
+
+    start()로 재학습 프로세스를 시작하고, 봇 루프에서 매 사이클 poll()을 호출합니다.
+    학습이 끝나면 검증 후 별도 스레드에서 예측기를 로드하고,
+    로드까지 끝난 뒤에야 poll()이 (버전, 예측기, 지표)를 반환합니다.
+    실패·거부·취소된 버전의 디렉토리는 삭제합니다.
+    """
+
+    # 재학습 프로세스에서 실행할 함수 (spawn으로 전달되므로 모듈 최상위 함수여야 함)
+    train_function = staticmethod(train_version)
+    # shutdown() 시 terminate 후 프로세스 종료를 기다리는 시간 (초)
+    TERMINATE_TIMEOUT = 5.0
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        market: str = 'KRW-BTC',
+        interval: str = '60',
+        days: int = 180,
+        sequence_length: int = 60,
+        lstm_epochs: int = 30,
+        lstm_batch_size: int = 32,
+        max_mape: float = 10.0,
+        min_direction_accuracy: float = 45.0,
+        max_degradation: float = 0.2
+    ):
+        """
+        초기화
+
+        Args:
+            registry: 모델 저장소
+            market: 마켓 코드
+            interval: 캔들 간격
+            days: 학습 기간 (일)
+            sequence_length: LSTM 시퀀스 길이
+            lstm_epochs: LSTM 에폭 수
+            lstm_batch_size: LSTM 배치 크기
+            max_mape: 허용 최대 MAPE (%)
+            min_direction_accuracy: 최소 방향 정확도 (%)
+            max_degradation: 현재 버전 대비 허용 MAPE 악화 비율
+        """
+        self.registry = registry
+        self.market = market
+        self.interval = interval
+        self.days = days
+        self.sequence_length = sequence_length
+        self.lstm_epochs = lstm_epochs
+        self.lstm_batch_size = lstm_batch_size
+        self.max_mape = max_mape
+        self.min_direction_accuracy = min_direction_accuracy
+        self.max_degradation = max_degradation
+
+        # TensorFlow는 fork 이후 동작이 불안정하므로 spawn 사용
+        # (shutdown에서 학습 중인 프로세스를 종료할 수 있도록 풀 대신 Process를 직접 관리)
+        self.mp_context = multiprocessing.get_context('spawn')
+        self.load_pool = ThreadPoolExecutor(max_workers=1)
+
+        self.pending_version: Optional[str] = None
+        self.train_process: Optional[multiprocessing.Process] = None
+        self.train_conn = None
+        self.load_future: Optional[Future] = None
+        self.pending_metrics: Optional[Dict] = None
+        self.history: List[Dict] = []
+
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def is_running(self) -> bool:
+        """재학습 또는 로드 진행 중 여부"""
+        return self.pending_version is not None
+
+    def start(self) -> bool:
+        """
+        재학습 시작
+
+        Returns:
+            시작 여부 (이미 진행 중이면 False)
+        """
+        if self.is_running:
+            self.logger.info("재학습이 이미 진행 중입니다")
+            return False
+
+        version = self.registry.new_version()
+        self.pending_version = version
+
+        kwargs = {
+            'market': self.market,
+            'interval': self.interval,
+            'days': self.days,
+            'sequence_length': self.sequence_length,
+            'lstm_epochs': self.lstm_epochs,
+            'lstm_batch_size': self.lstm_batch_size
+        }
+        receiver, sender = self.mp_context.Pipe(duplex=False)
+        process = self.mp_context.Process(
+            target=_train_worker,
+            args=(sender, self.train_function, self.registry.version_dir(version), kwargs),
+            name=f'retrain-{version}',
+            daemon=True
+        )
+        try:
+            process.start()
+        except Exception as e:
+            receiver.close()
+            self._finish('failed', f"재학습 프로세스 시작 실패: {e}")
+            return False
+        finally:
+            sender.close()
+
+        self.train_process = process
+        self.train_conn = receiver
+        self.logger.info(f"백그라운드 재학습 시작: {version}")
+        return True
+
+    def _collect_training(self) -> Optional[Tuple[str, object]]:
+        """
+        끝난 재학습 프로세스의 결과 수거 (아직 실행 중이면 None)
+
+        Returns:
+            ('ok', 지표) 또는 ('error', 메시지)
+        """
+        process, conn = self.train_process, self.train_conn
+        if not conn.poll() and process.is_alive():
+            return None
+
+        # 결과를 보낸 직후 종료했을 수 있으므로 종료 확인 뒤 파이프를 다시 확인
+        result = None
+        if conn.poll():
+            try:
+                result = conn.recv()
+            except (EOFError, OSError):
+                pass
+
+        process.join()
+        conn.close()
+        self.train_process = None
+        self.train_conn = None
+
+        if result is None:
+            return 'error', f"재학습 프로세스가 결과 없이 종료됨 (exitcode {process.exitcode})"
+        return result
+
+    def poll(self) -> Optional[Tuple[str, MLPricePredictor, Dict]]:
+        """
+        재학습 상태 확인 (블로킹 없음)
+
+        Returns:
+            교체 준비가 끝난 (버전, 예측기, 지표) 또는 None
+        """
+        result = self._collect_training() if self.train_process is not None else None
+        if result is not None:
+            status, metrics = result
+            if status != 'ok':
+                self._finish('failed', f"재학습 실패: {metrics}")
+                return None
+
+            passed, reason = self.validate(metrics)
+            if not passed:
+                self._finish('rejected', f"검증 실패: {reason}", metrics)
+                return None
+
+            self.pending_metrics = metrics
+            try:
+                self.load_future = self.load_pool.submit(
+                    self.registry.load_predictor,
+                    self.pending_version,
+                    self.market,
+                    self.sequence_length
+                )
+            except Exception as e:
+                self._finish('failed', f"모델 로드 시작 실패: {e}", metrics)
+                return None
+
+        if self.load_future is not None and self.load_future.done():
+            future, self.load_future = self.load_future, None
+            version, metrics = self.pending_version, self.pending_metrics
+            try:
+                predictor = future.result()
+            except Exception as e:
+                self._finish('failed', f"모델 로드 실패: {e}", metrics)
+                return None
+
+            self._finish('ready', "교체 준비 완료", metrics)
+            return version, predictor, metrics
+
+        return None
+
+    def validate(self, metrics: Dict) -> Tuple[bool, str]:
+        """
+        새 버전 검증
+
+        Args:
+            metrics: 새 버전의 테스트 구간 지표
+
+        Returns:
+            (통과 여부, 사유)
+        """
+        mape = metrics.get('mape', np.nan)
+        direction_accuracy = metrics.get('direction_accuracy', np.nan)
+
+        if not np.isfinite(mape) or not np.isfinite(direction_accuracy):
+            return False, "지표가 유효하지 않음"
+
+        if mape > self.max_mape:
+            return False, f"MAPE {mape:.2f}% > {self.max_mape:.2f}%"
+
+        if direction_accuracy < self.min_direction_accuracy:
+            return False, (f"방향 정확도 {direction_accuracy:.2f}% < "
+                           f"{self.min_direction_accuracy:.2f}%")
+
+        current = self.registry.get_current()
+        if current is not None:
+            try:
+                current_mape = self.registry.load_metrics(current)['mape']
+            except (OSError, KeyError, ValueError):
+                current_mape = None
+
+            if current_mape is not None and mape > current_mape * (1 + self.max_degradation):
+                return False, f"MAPE {mape:.2f}%가 현재 버전 {current_mape:.2f}%보다 나쁨"
+
+        return True, "통과"
+
+    def _finish(self, status: str, message: str, metrics: Optional[Dict] = None):
+        """재학습 결과 기록 (교체 준비가 안 된 버전은 디렉토리 삭제)"""
+        version = self.pending_version
+        if status != 'ready' and version is not None:
+            shutil.rmtree(self.registry.version_dir(version), ignore_errors=True)
+
+        self.history.append({
+            'version': version,
+            'status': status,
+            'message': message,
+            'metrics': metrics,
+            'finished_at': datetime.now()
+        })
+
+        if status == 'ready':
+            self.logger.info(f"재학습 완료 ({version}): {message}")
+        else:
+            self.logger.warning(f"재학습 중단 ({version}): {message}")
+
+        self.pending_version = None
+        self.pending_metrics = None
+
+    def shutdown(self):
+        """재학습 프로세스·로드 스레드 종료 (진행 중인 학습은 프로세스를 종료해 취소)"""
+        process = self.train_process
+        if process is not None:
+            if process.is_alive():
+                process.terminate()
+                process.join(self.TERMINATE_TIMEOUT)
+            if process.is_alive():
+                self.logger.warning(f"재학습 프로세스가 종료되지 않아 강제 종료: pid {process.pid}")
+                process.kill()
+                process.join()
+            self.train_conn.close()
+            self.train_process = None
+            self.train_conn = None
+
+        # 로드 중인 예측기는 기다리지 않음 (디렉토리 삭제 전에 로드가 끝나지 않아도 무방)
+        self.load_pool.shutdown(wait=False, cancel_futures=True)
+
+        if self.is_running:
+            self.load_future = None
+            self._finish('cancelled', "종료로 재학습 취소")
@@ -4,6 +4,7 @@ models 패키지 - 머신러닝/딥러닝 모델들
 
 from .lstm_model import LSTMModel
 from .ensemble_model import EnsembleModel
+from .ensemble_sweep import EnsembleSweep, make_configs
 
-__all__ = ['LSTMModel', 'EnsembleModel']
+__all__ = ['LSTMModel', 'EnsembleModel', 'EnsembleSweep', 'make_configs']
 
@@ -36,6 +36,25 @@ class EnsembleModel:
     - 특징 중요도 분석
     """
     
+    DEFAULT_RF_PARAMS = {
+        'n_estimators': 100,
+        'max_depth': 10,
+        'min_samples_split': 5,
+        'min_samples_leaf': 2,
+        'random_state': 42,
+        'n_jobs': -1
+    }
+    
+    DEFAULT_XGB_PARAMS = {
+        'n_estimators': 100,
+        'max_depth': 6,
+        'learning_rate': 0.1,
+        'subsample': 0.8,
+        'colsample_bytree': 0.8,
+        'random_state': 42,
+        'n_jobs': -1
+    }
+    
     def __init__(
         self,
         rf_params: Optional[Dict] = None,
@@ -51,24 +70,8 @@ class EnsembleModel:
             ensemble_weights: 앙상블 가중치 (RF, XGB)
         """
         # 기본 파라미터
-        self.rf_params = rf_params or {
-            'n_estimators': 100,
-            'max_depth': 10,
-            'min_samples_split': 5,
-            'min_samples_leaf': 2,
-            'random_state': 42,
-            'n_jobs': -1
-        }
-        
-        self.xgb_params = xgb_params or {
-            'n_estimators': 100,
-            'max_depth': 6,
-            'learning_rate': 0.1,
-            'subsample': 0.8,
-            'colsample_bytree': 0.8,
-            'random_state': 42,
-            'n_jobs': -1
-        }
+        self.rf_params = rf_params or dict(self.DEFAULT_RF_PARAMS)
+        self.xgb_params = xgb_params or dict(self.DEFAULT_XGB_PARAMS)
         
         self.ensemble_weights = ensemble_weights
         
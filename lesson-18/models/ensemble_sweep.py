@@ -0,0 +1,367 @@
+"""
+ensemble_sweep.py - 앙상블 모델 하이퍼파라미터 탐색
+
+여러 Random Forest / XGBoost 설정을 시계열 교차검증(확장 윈도우)으로 병렬 평가합니다.
+
+- 데이터는 한 번만 .npy로 저장하고, 작업 프로세스는 memmap으로 열어 폴드 구간을 복사 없이 사용
+- 작업 프로세스 수 × 모델당 n_jobs가 전체 코어 수를 넘지 않도록 조정
+- 폴드마다 성능이 같은 모델의 최고 설정보다 크게 나쁜 설정은 조기 중단
+- 결과는 RMSE·MAE·학습 시간·단일 행 예측 지연시간을 담은 리더보드(CSV)로 저장
+"""
+
+import os
+import json
+import time
+import hashlib
+import itertools
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+
+from .ensemble_model import EnsembleModel, RandomForestRegressor, xgb
+
+
+def make_configs(model: str, grid: Dict[str, List]) -> List[Dict]:
+    """
+    파라미터 그리드를 설정 목록으로 펼치기
+
+    Args:
+        model: 'rf' 또는 'xgb'
+        grid: {파라미터: 후보 리스트}
+
+    Returns:
+        [{'model': model, 'params': {...}}, ...]
+    """
+    keys = list(grid)
+    return [
+        {'model': model, 'params': dict(zip(keys, values))}
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def time_series_folds(
+    n_samples: int,
+    n_splits: int = 5,
+    val_size: Optional[int] = None,
+    gap: int = 0
+) -> List[Tuple[int, int, int]]:
+    """
+    확장 윈도우 시계열 폴드
+
+    Args:
+        n_samples: 전체 샘플 수
+        n_splits: 폴드 수
+        val_size: 검증 구간 길이 (None이면 n_samples // (n_splits + 1))
+        gap: 학습 구간과 검증 구간 사이 간격
+
+    Returns:
+        [(학습 끝, 검증 시작, 검증 끝), ...] - 학습 구간은 항상 [0, 학습 끝)
+    """
+    val_size = val_size or n_samples // (n_splits + 1)
+    if val_size < 1:
+        raise ValueError(f"검증 구간이 없습니다 (n_samples={n_samples}, n_splits={n_splits})")
+    folds = []
+
+    for k in range(n_splits):
+        val_start = n_samples - (n_splits - k) * val_size
+        train_end = val_start - gap
+        if train_end <= 0:
+            raise ValueError(f"폴드 {k + 1}의 학습 구간이 없습니다 (n_samples={n_samples})")
+        folds.append((train_end, val_start, val_start + val_size))
+
+    return folds
+
+
+def build_model(config: Dict, n_jobs: int = 1):
+    """
+    설정으로 모델 생성 (EnsembleModel 기본 파라미터 위에 덮어씀)
+
+    Args:
+        config: {'model': 'rf' | 'xgb', 'params': {...}}
+        n_jobs: 모델이 사용할 코어 수
+
+    Returns:
+        학습 전 모델
+    """
+    if config['model'] == 'rf':
+        params = {**EnsembleModel.DEFAULT_RF_PARAMS, **config['params'], 'n_jobs': n_jobs}
+        return RandomForestRegressor(**params)
+
+    if config['model'] == 'xgb':
+        params = {**EnsembleModel.DEFAULT_XGB_PARAMS, **config['params'], 'n_jobs': n_jobs}
+        return xgb.XGBRegressor(**params)
+
+    raise ValueError(f"지원하지 않는 모델: {config['model']}")
+
+
+def _evaluate_fold(
+    config: Dict,
+    X_path: str,
+    y_path: str,
+    fold: Tuple[int, int, int],
+    model_n_jobs: int,
+    latency_rows: int
+) -> Dict:
+    """한 설정을 한 폴드에서 학습·평가 (작업 프로세스에서 실행)"""
+    X = np.load(X_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    train_end, val_start, val_end = fold
+
+    model = build_model(config, model_n_jobs)
+
+    start = time.perf_counter()
+    model.fit(X[:train_end], y[:train_end])
+    fit_time = time.perf_counter() - start
+
+    X_val = np.asarray(X[val_start:val_end])
+    y_val = np.asarray(y[val_start:val_end])
+    errors = model.predict(X_val) - y_val
+
+    # 단일 행 예측 지연시간 (실시간 예측과 같은 조건)
+    latencies = []
+    for row in X_val[:latency_rows]:
+        start = time.perf_counter()
+        model.predict(row.reshape(1, -1))
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        'rmse': float(np.sqrt(np.mean(errors ** 2))),
+        'mae': float(np.mean(np.abs(errors))),
+        'fit_time': fit_time,
+        'latency_ms': float(np.median(latencies)) * 1000 if latencies else np.nan
+    }
+
+
+class EnsembleSweep:
+    """
+    앙상블 모델 하이퍼파라미터 탐색기
+
+    사용 예:
+        configs = (make_configs('rf', {'n_estimators': [100, 300], 'max_depth': [6, 10]}) +
+                   make_configs('xgb', {'learning_rate': [0.05, 0.1], 'max_depth': [4, 6]}))
+
+        sweep = EnsembleSweep(n_splits=5, n_jobs=-1)
+        leaderboard = sweep.run(X_train_ml, y_train, configs)
+
+        model = EnsembleModel(rf_params=sweep.best_params(leaderboard, 'rf'),
+                              xgb_params=sweep.best_params(leaderboard, 'xgb'))
+    """
+
+    def __init__(
+        self,
+        n_splits: int = 5,
+        n_jobs: int = -1,
+        model_n_jobs: int = 1,
+        cache_dir: str = './data/sweep_cache',
+        abandon_ratio: float = 1.5,
+        min_folds: int = 1,
+        latency_rows: int = 20,
+        gap: int = 0
+    ):
+        """
+        초기화
+
+        Args:
+            n_splits: 교차검증 폴드 수
+            n_jobs: 전체 사용 코어 수 (joblib 규칙: -1이면 모든 코어, -2면 하나를 남김)
+            model_n_jobs: 모델 하나가 사용할 코어 수
+            cache_dir: 폴드 데이터 캐시 디렉토리
+            abandon_ratio: 평균 RMSE가 같은 모델 최고 설정의 몇 배를 넘으면 중단할지
+            min_folds: 조기 중단 판단 전 최소 폴드 수
+            latency_rows: 지연시간 측정에 사용할 검증 행 수
+            gap: 학습 구간과 검증 구간 사이 간격
+        """
+        if n_jobs == 0:
+            raise ValueError("n_jobs == 0은 의미가 없습니다 (joblib과 같이 양수 또는 음수를 지정하세요)")
+
+        self.n_splits = n_splits
+        self.n_jobs = n_jobs
+        self.model_n_jobs = max(1, model_n_jobs)
+        self.cache_dir = cache_dir
+        self.abandon_ratio = abandon_ratio
+        self.min_folds = min_folds
+        self.latency_rows = latency_rows
+        self.gap = gap
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def n_workers(self) -> int:
+        """
+        동시에 학습할 설정 수 (n_workers × model_n_jobs ≤ 전체 코어)
+
+        n_jobs는 joblib 규칙을 따릅니다: None은 1, 음수 n은 cpu_count + 1 + n
+        (-1이면 모든 코어, -2면 하나를 남김)
+        """
+        if self.n_jobs is None:
+            total = 1
+        elif self.n_jobs < 0:
+            total = (os.cpu_count() or 1) + 1 + self.n_jobs
+        else:
+            total = self.n_jobs
+        return max(1, total // self.model_n_jobs)
+
+    def cache_dataset(self, X: np.ndarray, y: np.ndarray) -> Tuple[str, str]:
+        """
+        학습 데이터를 .npy로 저장 (같은 데이터면 재사용)
+
+        Args:
+            X: 특징 (samples, features)
+            y: 타겟 (samples,)
+
+        Returns:
+            (X 경로, y 경로)
+        """
+        X = np.ascontiguousarray(X)
+        y = np.ascontiguousarray(y)
+
+        digest = hashlib.sha1()
+        for array in (X, y):
+            digest.update(f'{array.dtype}{array.shape}'.encode())
+            digest.update(array.data)
+        dataset_dir = os.path.join(self.cache_dir, digest.hexdigest()[:16])
+
+        X_path = os.path.join(dataset_dir, 'X.npy')
+        y_path = os.path.join(dataset_dir, 'y.npy')
+
+        if not (os.path.exists(X_path) and os.path.exists(y_path)):
+            os.makedirs(dataset_dir, exist_ok=True)
+            for path, array in ((X_path, X), (y_path, y)):
+                tmp_path = path + '.tmp.npy'
+                np.save(tmp_path, array)
+                os.replace(tmp_path, path)
+            self.logger.info(f"폴드 데이터 캐시 저장: {dataset_dir}")
+
+        return X_path, y_path
+
+    def run(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        configs: List[Dict],
+        output_path: Optional[str] = './results/ensemble_sweep.csv'
+    ) -> pd.DataFrame:
+        """
+        탐색 실행
+
+        Args:
+            X: 특징 (시간 순서)
+            y: 타겟
+            configs: 설정 목록 (make_configs 참고)
+            output_path: 리더보드 CSV 경로 (None이면 저장하지 않음)
+
+        Returns:
+            리더보드 데이터프레임 (RMSE 오름차순)
+        """
+        available = {'rf': RandomForestRegressor is not None, 'xgb': xgb is not None}
+        skipped = [c for c in configs if not available.get(c['model'], False)]
+        if skipped:
+            self.logger.warning(f"라이브러리가 없어 {len(skipped)}개 설정을 건너뜁니다")
+        configs = [c for c in configs if available.get(c['model'], False)]
+
+        X_path, y_path = self.cache_dataset(X, y)
+        folds = time_series_folds(len(y), self.n_splits, gap=self.gap)
+
+        self.logger.info(
+            f"하이퍼파라미터 탐색: 설정 {len(configs)}개 × 폴드 {len(folds)}개 "
+            f"(작업자 {self.n_workers}개 × 모델당 {self.model_n_jobs}코어)"
+        )
+
+        records: List[List[Dict]] = [[] for _ in configs]
+        abandoned_at: Dict[int, int] = {}
+        alive = list(range(len(configs)))
+
+        with Parallel(n_jobs=self.n_workers) as parallel:
+            for k, fold in enumerate(folds):
+                results = parallel(
+                    delayed(_evaluate_fold)(
+                        configs[i], X_path, y_path, fold, self.model_n_jobs, self.latency_rows
+                    )
+                    for i in alive
+                )
+                for i, result in zip(alive, results):
+                    records[i].append(result)
+
+                # 조기 중단 (남은 설정은 모두 같은 폴드까지 평가됨, 모델 종류별로 비교)
+                if k + 1 >= self.min_folds and k + 1 < len(folds):
+                    mean_rmse = {i: np.mean([r['rmse'] for r in records[i]]) for i in alive}
+                    best = {}
+                    for i in alive:
+                        model = configs[i]['model']
+                        best[model] = min(best.get(model, np.inf), mean_rmse[i])
+                    for i in alive:
+                        if mean_rmse[i] > best[configs[i]['model']] * self.abandon_ratio:
+                            abandoned_at[i] = k + 1
+                    alive = [i for i in alive if i not in abandoned_at]
+
+                self.logger.info(f"  폴드 {k + 1}/{len(folds)} 완료 - 남은 설정 {len(alive)}개")
+
+        leaderboard = self._build_leaderboard(configs, records, abandoned_at)
+
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            leaderboard.to_csv(output_path, index=False)
+            self.logger.info(f"리더보드 저장: {output_path}")
+
+        return leaderboard
+
+    def _build_leaderboard(
+        self,
+        configs: List[Dict],
+        records: List[List[Dict]],
+        abandoned_at: Dict[int, int]
+    ) -> pd.DataFrame:
+        """설정별 폴드 결과 집계"""
+        rows = []
+        for i, (config, folds) in enumerate(zip(configs, records)):
+            rmse = [r['rmse'] for r in folds]
+            rows.append({
+                'model': config['model'],
+                'params': json.dumps(config['params'], sort_keys=True),
+                'status': 'abandoned' if i in abandoned_at else 'completed',
+                'folds': len(folds),
+                'rmse': np.mean(rmse),
+                'rmse_std': np.std(rmse),
+                'mae': np.mean([r['mae'] for r in folds]),
+                'fit_time_s': np.mean([r['fit_time'] for r in folds]),
+                'latency_ms': np.median([r['latency_ms'] for r in folds])
+            })
+
+        if not rows:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(rows)
+        df['_abandoned'] = df['status'] == 'abandoned'
+        df = df.sort_values(['_abandoned', 'rmse']).drop(columns='_abandoned').reset_index(drop=True)
+        df.insert(0, 'rank', np.arange(1, len(df) + 1))
+        return df
+
+    @staticmethod
+    def best_params(leaderboard: pd.DataFrame, model: str) -> Optional[Dict]:
+        """
+        모델별 최고 설정 (EnsembleModel 생성자에 바로 넘길 수 있는 전체 파라미터)
+
+        Args:
+            leaderboard: run() 결과
+            model: 'rf' 또는 'xgb'
+
+        Returns:
+            파라미터 딕셔너리 또는 None
+        """
+        candidates = leaderboard[(leaderboard['model'] == model) &
+                                 (leaderboard['status'] == 'completed')]
+        if candidates.empty:
+            return None
+
+        params = json.loads(candidates.iloc[0]['params'])
+        defaults = EnsembleModel.DEFAULT_RF_PARAMS if model == 'rf' else EnsembleModel.DEFAULT_XGB_PARAMS
+        return {**defaults, **params}
@@ -199,7 +199,60 @@ class LSTMModel:
             self.logger.info(f"최종 검증 MAE: {final_val_mae:.6f}")
         
         return self.history
-    
+
+    def train_on_batches(
+        self,
+        train_batches,
+        val_batches=None,
+        epochs: int = 100,
+        verbose: int = 1
+    ) -> dict:
+        """
+        배치 생성기로 모델 학습 (3차원 시퀀스 전체를 메모리에 올리지 않음)
+
+        Args:
+            train_batches: 학습 배치 생성기 (DataPipeline.create_sequence_batches)
+            val_batches: 검증 배치 생성기
+            epochs: 에폭 수
+            verbose: 출력 레벨
+
+        Returns:
+            학습 히스토리
+        """
+        if self.model is None:
+            self.build_model()
+
+        self.logger.info("모델 학습 시작 (배치 생성기)...")
+        self.logger.info(
+            f"학습 배치: {len(train_batches)}개 "
+            f"(전체 시퀀스 배열 대비 {train_batches.nbytes / 1024**2:,.1f}MB 절약)"
+        )
+
+        validation_kwargs = {}
+        if val_batches is not None and len(val_batches):
+            validation_kwargs = {
+                'validation_data': val_batches.repeat(),
+                'validation_steps': len(val_batches)
+            }
+
+        history = self.model.fit(
+            train_batches.repeat(),
+            steps_per_epoch=len(train_batches),
+            epochs=epochs,
+            callbacks=self._get_callbacks(),
+            verbose=verbose,
+            **validation_kwargs
+        )
+
+        self.history = history.history
+
+        self.logger.info("학습 완료")
+        if validation_kwargs:
+            self.logger.info(f"최종 검증 손실: {history.history['val_loss'][-1]:.6f}")
+            self.logger.info(f"최종 검증 MAE: {history.history['val_mae'][-1]:.6f}")
+
+        return self.history
+
     def _get_callbacks(self) -> list:
         """학습 콜백 설정"""
         callback_list = []
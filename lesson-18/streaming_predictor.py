@@ -0,0 +1,295 @@
+"""
+streaming_predictor.py - 단일 행 저지연 예측
+
+MLPricePredictor.predict는 배치 입력용이라 한 건을 예측할 때도
+Keras predict 루프, sklearn 입력 검증, 스케일러 변환을 모두 거칩니다.
+StreamingPredictor는 같은 모델로 한 건씩 예측하는 경로를 제공합니다.
+
+- 정규화된 종가 창을 미리 할당한 링 버퍼에 유지 (새 종가는 O(1) 추가)
+- 스케일러는 affine 계수(x * a + b)로 바꿔 배열 연산만 수행
+- Random Forest는 전체 트리를 평탄한 배열로 컴파일해 모든 트리를 동시에 탐색
+- XGBoost는 booster.inplace_predict로 입력 변환 없이 예측
+- LSTM은 predict() 대신 모델을 직접 호출하고, 트리 모델과 동시에 실행
+- 단계별 지연시간 기록
+"""
+
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ml_price_predictor import MLPricePredictor
+
+
+LATENCY_STAGES = ['scale', 'lstm', 'rf', 'xgb', 'combine', 'total']
+
+
+def scaler_affine(scaler) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    스케일러를 transform(x) = x * a + b 형태의 계수로 변환
+
+    Args:
+        scaler: 학습된 MinMaxScaler 또는 StandardScaler
+
+    Returns:
+        (a, b) 또는 지원하지 않는 스케일러면 None
+    """
+    if hasattr(scaler, 'min_') and hasattr(scaler, 'scale_'):  # MinMaxScaler
+        return np.asarray(scaler.scale_, dtype=np.float64), np.asarray(scaler.min_, dtype=np.float64)
+
+    if hasattr(scaler, 'mean_') and hasattr(scaler, 'scale_'):  # StandardScaler
+        scale = np.asarray(scaler.scale_ if scaler.scale_ is not None else 1.0, dtype=np.float64)
+        mean = np.asarray(scaler.mean_ if scaler.mean_ is not None else 0.0, dtype=np.float64)
+        return 1.0 / scale, -mean / scale
+
+    return None
+
+
+class CompiledForest:
+    """
+    Random Forest 회귀 모델을 평탄한 배열로 컴파일한 형태
+
+    모든 트리의 노드를 하나의 배열에 이어 붙이고, 리프 노드는 자기 자신을 가리키게 해
+    max_depth번의 배열 연산으로 전체 트리를 동시에 탐색합니다.
+    sklearn과 같이 입력을 float32로 변환해 비교하므로 예측값이 같습니다.
+    """
+
+    def __init__(self, forest):
+        """
+        초기화
+
+        Args:
+            forest: 학습된 RandomForestRegressor
+        """
+        lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            node_ids = np.arange(n_nodes)
+            is_leaf = tree.children_left == -1
+
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value.reshape(n_nodes, -1)[:, 0])
+            roots.append(offset)
+
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.value = np.concatenate(values)
+        self.roots = np.array(roots, dtype=np.intp)
+        self.max_depth = max_depth
+
+    def predict_one(self, row: np.ndarray) -> float:
+        """
+        한 행 예측
+
+        Args:
+            row: 특징 벡터 (n_features,)
+
+        Returns:
+            트리 평균 예측값
+        """
+        x = row.astype(np.float32)
+        nodes = self.roots.copy()
+        for _ in range(self.max_depth):
+            go_left = x[self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return float(self.value[nodes].mean())
+
+
+class StreamingPredictor:
+    """
+    MLPricePredictor 단일 행 예측기
+
+    사용 예:
+        fast = StreamingPredictor(predictor)
+        fast.set_window(closes)          # 최근 sequence_length개 종가
+        result = fast.predict_one(features)
+
+        fast.push_price(new_close)       # 새 봉 마감 시 O(1) 갱신
+    """
+
+    def __init__(self, predictor: MLPricePredictor, parallel: bool = True,
+                 latency_window: int = 1000):
+        """
+        초기화
+
+        Args:
+            predictor: 학습 또는 로드가 끝난 예측기
+            parallel: LSTM을 트리 모델과 동시에 실행할지 여부
+            latency_window: 지연시간 통계에 사용할 최근 예측 수
+        """
+        if predictor.lstm_model is None or predictor.ensemble_model is None:
+            raise ValueError("모델이 학습되지 않았습니다.")
+
+        self.predictor = predictor
+        self.sequence_length = predictor.sequence_length
+        self.weights = predictor.model_weights
+
+        # 모델
+        self.keras_model = predictor.lstm_model.model
+        self.rf = CompiledForest(predictor.ensemble_model.rf_model)
+        xgb_model = predictor.ensemble_model.xgb_model
+        self.xgb_booster = xgb_model.get_booster() if hasattr(xgb_model, 'get_booster') else None
+        self.xgb_model = xgb_model
+
+        # 스케일러 계수
+        self.price_affine = scaler_affine(predictor.price_scaler)
+        self.feature_affine = scaler_affine(predictor.feature_scaler)
+        y_affine = scaler_affine(predictor.y_scaler)
+        if self.price_affine is None or self.feature_affine is None or y_affine is None:
+            raise ValueError("지원하지 않는 스케일러입니다 (MinMaxScaler/StandardScaler만 지원).")
+        self.price_a, self.price_b = float(self.price_affine[0][0]), float(self.price_affine[1][0])
+        self.y_a, self.y_b = float(y_affine[0][0]), float(y_affine[1][0])
+
+        # 링 버퍼: 같은 값을 두 번 기록해 [pos, pos + sequence_length)가 항상 연속 구간
+        self.buffer = np.zeros(2 * self.sequence_length, dtype=np.float32)
+        self.pos = 0
+        self.count = 0
+        self.row = np.empty(len(self.feature_affine[0]), dtype=np.float64)
+
+        self.executor = ThreadPoolExecutor(max_workers=1) if parallel else None
+        self.latency = {stage: deque(maxlen=latency_window) for stage in LATENCY_STAGES}
+
+    # ==================== 입력 창 ====================
+
+    def push_price(self, price: float):
+        """새 종가 추가 (가장 오래된 값 제거)"""
+        scaled = price * self.price_a + self.price_b
+        self.buffer[self.pos] = scaled
+        self.buffer[self.pos + self.sequence_length] = scaled
+        self.pos = (self.pos + 1) % self.sequence_length
+        self.count = min(self.count + 1, self.sequence_length)
+
+    def set_window(self, prices: np.ndarray):
+        """종가 창 전체 교체 (최근 sequence_length개 사용)"""
+        prices = np.asarray(prices, dtype=np.float64)[-self.sequence_length:]
+        n = len(prices)
+        scaled = prices * self.price_a + self.price_b
+
+        self.buffer[:self.sequence_length] = 0.0
+        self.buffer[self.sequence_length - n:self.sequence_length] = scaled
+        self.buffer[self.sequence_length:] = self.buffer[:self.sequence_length]
+        self.pos = 0
+        self.count = n
+
+    @property
+    def is_ready(self) -> bool:
+        """창이 가득 찼는지 여부"""
+        return self.count >= self.sequence_length
+
+    def window(self) -> np.ndarray:
+        """LSTM 입력 (1, sequence_length, 1) - 복사 없는 뷰"""
+        return self.buffer[self.pos:self.pos + self.sequence_length].reshape(1, self.sequence_length, 1)
+
+    # ==================== 예측 ====================
+
+    def _predict_lstm(self) -> Tuple[float, float]:
+        start = time.perf_counter()
+        output = self.keras_model(self.window(), training=False)
+        return float(np.asarray(output).reshape(-1)[0]), time.perf_counter() - start
+
+    def _predict_xgb(self, row: np.ndarray) -> float:
+        if self.xgb_booster is not None:
+            return float(self.xgb_booster.inplace_predict(row.reshape(1, -1))[0])
+        return float(self.xgb_model.predict(row.reshape(1, -1))[0])
+
+    def predict_one(self, features: np.ndarray) -> Dict:
+        """
+        한 건 예측 (MLPricePredictor.predict와 같은 값)
+
+        Args:
+            features: 정규화 전 특징 벡터 (n_features,) 또는 (1, n_features)
+
+        Returns:
+            예측 결과 딕셔너리 (단계별 지연시간 포함)
+        """
+        if not self.is_ready:
+            raise ValueError(f"종가 창이 부족합니다 ({self.count}/{self.sequence_length})")
+
+        timings = {}
+        start = time.perf_counter()
+
+        # 1. 정규화
+        np.multiply(np.asarray(features, dtype=np.float64).reshape(-1), self.feature_affine[0], out=self.row)
+        self.row += self.feature_affine[1]
+        timings['scale'] = time.perf_counter() - start
+
+        # 2. 모델 예측 (LSTM은 별도 스레드, 트리 모델은 현재 스레드)
+        lstm_future = self.executor.submit(self._predict_lstm) if self.executor else None
+
+        t = time.perf_counter()
+        rf_pred = self.rf.predict_one(self.row)
+        timings['rf'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        xgb_pred = self._predict_xgb(self.row)
+        timings['xgb'] = time.perf_counter() - t
+
+        lstm_pred, timings['lstm'] = lstm_future.result() if lstm_future else self._predict_lstm()
+
+        # 3. 가중 평균 + 역정규화 + 신뢰도
+        t = time.perf_counter()
+        final_pred = (
+            lstm_pred * self.weights['lstm'] +
+            rf_pred * self.weights['rf'] +
+            xgb_pred * self.weights['xgb']
+        )
+        preds = np.array([lstm_pred, rf_pred, xgb_pred])
+        preds = (preds - self.y_b) / self.y_a
+
+        std = preds.std()
+        mean_pred = preds.mean()
+        cv = std / (abs(mean_pred) + 1e-10)
+        confidence = 1.0 / (1.0 + cv)
+        timings['combine'] = time.perf_counter() - t
+        timings['total'] = time.perf_counter() - start
+
+        for stage, seconds in timings.items():
+            self.latency[stage].append(seconds)
+
+        return {
+            'prediction': (final_pred - self.y_b) / self.y_a,
+            'lstm_pred': preds[0],
+            'rf_pred': preds[1],
+            'xgb_pred': preds[2],
+            'confidence': confidence,
+            'latency_ms': {stage: seconds * 1000 for stage, seconds in timings.items()}
+        }
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        단계별 지연시간 통계 (ms)
+
+        Returns:
+            {단계: {'mean', 'p50', 'p99', 'max'}}
+        """
+        stats = {}
+        for stage, samples in self.latency.items():
+            if not samples:
+                continue
+            ms = np.array(samples) * 1000
+            stats[stage] = {
+                'mean': float(ms.mean()),
+                'p50': float(np.percentile(ms, 50)),
+                'p99': float(np.percentile(ms, 99)),
+                'max': float(ms.max())
+            }
+        return stats
+
+    def close(self):
+        """LSTM 실행 스레드 종료"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
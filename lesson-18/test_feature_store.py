@@ -0,0 +1,117 @@
+"""
+특징 저장소 일치 테스트
+
+- 봉이 하나씩 또는 여러 개씩 마감될 때 FeatureStore에 쌓인 특징이
+  전체 봉으로 create_all_features를 실행한 결과와 같은지 확인
+- 진행 중인 봉의 값만 바뀌는 경우와 디스크에서 다시 불러온 경우도 확인
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering import FeatureEngineer
+from feature_store import FeatureStore
+
+
+logging.disable(logging.INFO)
+
+MARKET, INTERVAL = 'KRW-BTC', '60'
+FRAME_SIZE = 100
+# 맨 앞 구간은 결측치 채움(bfill)이 달라 비교에서 제외 (가장 긴 창 ma_50)
+WARMUP = 60
+
+
+@pytest.fixture(scope='module')
+def candles():
+    rng = np.random.default_rng(0)
+    n = 320
+    close = 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.005, n)))
+    open_ = close * np.exp(rng.normal(0, 0.002, n))
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=n, freq='h'),
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + rng.random(n) * 0.003),
+        'low': np.minimum(open_, close) * (1 - rng.random(n) * 0.003),
+        'close': close,
+        'volume': rng.uniform(1, 100, n)
+    })
+
+
+@pytest.fixture
+def engineer():
+    return FeatureEngineer()
+
+
+def assert_matches_full_recompute(store, engineer, history):
+    """저장소 특징(진행 중인 봉 포함)이 history 전체로 계산한 특징과 같은지 확인"""
+    expected = engineer.create_all_features(history).reset_index(drop=True)
+    frame = store.get_frame(MARKET, INTERVAL)
+
+    assert len(frame) == len(expected)
+    pd.testing.assert_series_equal(frame['timestamp'], expected['timestamp'], check_names=False)
+    columns = store.feature_columns(MARKET, INTERVAL)
+    np.testing.assert_allclose(frame[columns].to_numpy()[WARMUP:],
+                               expected[columns].to_numpy(dtype=float)[WARMUP:],
+                               rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('step', [1, 4])
+def test_incremental_update_matches_full_recompute(tmp_path, candles, engineer, step):
+    """봉이 step개씩 마감될 때마다 전체 재계산 결과와 같은지 확인"""
+    store = FeatureStore(str(tmp_path), engineer=FeatureEngineer())
+    store.update(MARKET, INTERVAL, candles.iloc[:150])
+
+    for end in range(150 + step, len(candles) + 1, step):
+        appended = store.update(MARKET, INTERVAL, candles.iloc[end - FRAME_SIZE:end])
+        assert appended == step
+        assert_matches_full_recompute(store, engineer, candles.iloc[:end])
+
+    stats = store.get_statistics()
+    assert stats['rebuilds'] == 1
+
+
+def test_open_bar_change_recomputes_only_open_row(tmp_path, candles, engineer):
+    """진행 중인 봉의 값만 바뀌면 저장된 행은 그대로 두고 마지막 행만 다시 계산"""
+    store = FeatureStore(str(tmp_path), engineer=FeatureEngineer())
+    window = candles.iloc[:200].copy()
+    store.update(MARKET, INTERVAL, window)
+
+    assert store.update(MARKET, INTERVAL, window) == 0
+    assert store.get_statistics()['cache_hits'] == 1
+
+    for factor in (1.002, 0.997):
+        window.loc[window.index[-1], ['close', 'high']] *= factor
+        assert store.update(MARKET, INTERVAL, window.iloc[-FRAME_SIZE:]) == 0
+        assert_matches_full_recompute(store, engineer, window)
+
+    assert store.get_statistics()['rows_appended'] == 0
+
+
+def test_reload_from_disk_continues_incrementally(tmp_path, candles, engineer):
+    """디스크에서 다시 불러온 저장소도 이어서 갱신하면 같은 결과"""
+    store = FeatureStore(str(tmp_path), engineer=FeatureEngineer())
+    store.update(MARKET, INTERVAL, candles.iloc[:200], last_is_open=False)
+
+    reloaded = FeatureStore(str(tmp_path), engineer=FeatureEngineer())
+    closed = store.get_frame(MARKET, INTERVAL, include_open=False)
+    pd.testing.assert_frame_equal(reloaded.get_frame(MARKET, INTERVAL, include_open=False), closed)
+
+    for end in range(201, 231):
+        reloaded.update(MARKET, INTERVAL, candles.iloc[end - FRAME_SIZE:end])
+    assert_matches_full_recompute(reloaded, engineer, candles.iloc[:230])
+    assert reloaded.get_statistics()['rebuilds'] == 0
+
+
+def test_gap_in_history_triggers_rebuild(tmp_path, candles, engineer):
+    """저장된 봉과 이어지지 않는 데이터가 오면 받은 데이터로 다시 생성"""
+    store = FeatureStore(str(tmp_path), engineer=FeatureEngineer())
+    store.update(MARKET, INTERVAL, candles.iloc[:150])
+
+    later = candles.iloc[200:300]
+    store.update(MARKET, INTERVAL, later)
+
+    assert store.get_statistics()['rebuilds'] == 2
+    assert_matches_full_recompute(store, engineer, later)
@@ -0,0 +1,96 @@
+"""
+배열 기반 백테스트 일치 테스트
+
+- backtest(vectorized=True)의 거래 내역과 결과가 봉 단위 루프(vectorized=False)와 같은지 확인
+- grid_search의 조합별 결과가 조합마다 루프로 백테스트한 결과와 같은지 확인
+
+예측기는 미리 만든 예측 가격·신뢰도를 돌려주는 대역을 사용합니다.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_trading_system import MLTradingSystem
+
+
+logging.disable(logging.INFO)
+
+
+class FixedPredictor:
+    """X_test_ml 순서대로 미리 정한 예측을 돌려주는 예측기 대역"""
+
+    def __init__(self, predictions, confidence):
+        self.predictions = np.asarray(predictions, dtype=float)
+        self.confidence = np.asarray(confidence, dtype=float)
+
+    def predict(self, X_lstm, X_ml):
+        return {'predictions': self.predictions, 'confidence': self.confidence}
+
+
+@pytest.fixture(scope='module')
+def market():
+    rng = np.random.default_rng(11)
+    n = 1500
+    prices = 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    predictions = prices * (1 + rng.normal(0, 0.03, n))
+    confidence = rng.uniform(0.5, 1.0, n)
+    confidence[rng.choice(n, 20, replace=False)] = np.nan
+    timestamps = list(pd.date_range('2024-01-01', periods=n, freq='h'))
+    return prices, predictions, confidence, timestamps
+
+
+SYSTEM_CASES = [
+    dict(),
+    dict(max_positions=1),
+    dict(max_positions=5, signal_threshold=0.01, confidence_threshold=0.6),
+    dict(stop_loss=-0.01, take_profit=0.015, signal_threshold=0.005, confidence_threshold=0.5),
+    dict(max_positions=0),
+]
+
+
+def run_backtest(market, vectorized, **params):
+    prices, predictions, confidence, timestamps = market
+    system = MLTradingSystem(FixedPredictor(predictions, confidence), **params)
+    results = system.backtest(None, None, prices, timestamps, vectorized=vectorized)
+    return system, results
+
+
+def assert_results_equal(left, right):
+    assert left.keys() == right.keys()
+    for key in left:
+        assert left[key] == pytest.approx(right[key], rel=1e-12, abs=1e-9), key
+
+
+@pytest.mark.parametrize('params', SYSTEM_CASES)
+def test_vectorized_backtest_matches_loop(market, params):
+    """배열 기반 시뮬레이션의 거래 내역·결과가 봉 단위 루프와 같은지 확인"""
+    loop_system, loop = run_backtest(market, False, **params)
+    fast_system, fast = run_backtest(market, True, **params)
+
+    if params.get('max_positions', 3) > 0:
+        assert loop['total_trades'] > 0
+    pd.testing.assert_frame_equal(fast_system.get_trade_history_df(), loop_system.get_trade_history_df())
+    assert_results_equal(fast, loop)
+    assert fast_system.positions == loop_system.positions == []
+
+
+def test_grid_search_matches_loop_backtests(market):
+    """임계값 조합별 결과가 조합마다 루프로 백테스트한 결과와 같은지 확인"""
+    prices, predictions, confidence, timestamps = market
+    system = MLTradingSystem(FixedPredictor(predictions, confidence))
+    signal_thresholds = [0.005, 0.02]
+    confidence_thresholds = [0.6, 0.8]
+
+    grid = system.grid_search(predictions, confidence, prices,
+                              signal_thresholds, confidence_thresholds, timestamps)
+
+    assert len(grid) == len(signal_thresholds) * len(confidence_thresholds)
+    assert (system.signal_threshold, system.confidence_threshold) == (0.02, 0.7)
+    for row in grid.to_dict('records'):
+        _, expected = run_backtest(market, False,
+                                   signal_threshold=row.pop('signal_threshold'),
+                                   confidence_threshold=row.pop('confidence_threshold'))
+        assert_results_equal(row, expected)
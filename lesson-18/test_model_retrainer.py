@@ -0,0 +1,126 @@
+"""
+백그라운드 재학습기 동작 테스트
+
+- shutdown()이 학습 중인 프로세스를 실제로 종료하는지
+- 실패·거부·취소된 버전 디렉토리가 삭제되는지
+- 검증을 통과한 버전은 로드 후 poll()로 반환되고 디렉토리가 남는지
+
+학습 함수는 TensorFlow 없이 동작하는 가짜 함수로 교체합니다
+(spawn 프로세스에서 불러오므로 모듈 최상위 함수로 정의).
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from model_retrainer import BackgroundRetrainer, ModelRegistry
+
+
+GOOD_METRICS = {'mape': 2.0, 'direction_accuracy': 55.0}
+
+
+def slow_train(version_dir, **kwargs):
+    with open(os.path.join(version_dir, 'started'), 'w'):
+        pass
+    time.sleep(120)
+    return GOOD_METRICS
+
+
+def failing_train(version_dir, **kwargs):
+    raise RuntimeError("데이터 수집 실패")
+
+
+def crashing_train(version_dir, **kwargs):
+    os._exit(3)
+
+
+def bad_train(version_dir, **kwargs):
+    return {'mape': 50.0, 'direction_accuracy': 30.0}
+
+
+def good_train(version_dir, **kwargs):
+    with open(os.path.join(version_dir, 'metrics.json'), 'w', encoding='utf-8') as f:
+        json.dump(GOOD_METRICS, f)
+    return GOOD_METRICS
+
+
+def make_retrainer(tmp_path, train_function):
+    registry = ModelRegistry(str(tmp_path / 'versions'))
+    retrainer_class = type('FakeRetrainer', (BackgroundRetrainer,),
+                           {'train_function': staticmethod(train_function)})
+    retrainer = retrainer_class(registry)
+    # 예측기 로드도 TensorFlow 없이 (로드 스레드에서 호출)
+    registry.load_predictor = lambda version, market, sequence_length: ('predictor', version)
+    return retrainer
+
+
+def poll_until_done(retrainer, timeout=60.0):
+    """재학습이 끝날 때까지 poll() (교체 준비가 되면 결과 반환)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = retrainer.poll()
+        if result is not None or not retrainer.is_running:
+            return result
+        time.sleep(0.05)
+    raise AssertionError("재학습이 제한 시간 안에 끝나지 않음")
+
+
+def wait_for_file(path, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        assert time.monotonic() < deadline, f"{path}가 생성되지 않음"
+        time.sleep(0.05)
+
+
+def test_shutdown_terminates_running_training(tmp_path):
+    """학습 중 shutdown()하면 프로세스를 종료하고 버전 디렉토리를 삭제"""
+    retrainer = make_retrainer(tmp_path, slow_train)
+    assert retrainer.start()
+    version = retrainer.pending_version
+    version_dir = retrainer.registry.version_dir(version)
+    process = retrainer.train_process
+    wait_for_file(os.path.join(version_dir, 'started'))
+
+    started = time.monotonic()
+    retrainer.shutdown()
+
+    assert time.monotonic() - started < retrainer.TERMINATE_TIMEOUT
+    assert not process.is_alive()
+    assert not os.path.exists(version_dir)
+    assert not retrainer.is_running
+    assert retrainer.history[-1]['version'] == version
+    assert retrainer.history[-1]['status'] == 'cancelled'
+
+
+@pytest.mark.parametrize('train_function, status', [
+    (failing_train, 'failed'),
+    (crashing_train, 'failed'),
+    (bad_train, 'rejected'),
+])
+def test_unsuccessful_version_directory_is_removed(tmp_path, train_function, status):
+    """실패·비정상 종료·검증 실패한 버전은 디렉토리를 남기지 않음"""
+    retrainer = make_retrainer(tmp_path, train_function)
+    assert retrainer.start()
+    version_dir = retrainer.registry.version_dir(retrainer.pending_version)
+
+    assert poll_until_done(retrainer) is None
+    assert retrainer.history[-1]['status'] == status
+    assert not os.path.exists(version_dir)
+    assert retrainer.train_process is None
+    retrainer.shutdown()
+
+
+def test_validated_version_is_loaded_and_kept(tmp_path):
+    """검증을 통과한 버전은 로드 후 반환되고 디렉토리가 유지됨"""
+    retrainer = make_retrainer(tmp_path, good_train)
+    assert retrainer.start()
+    version = retrainer.pending_version
+
+    result = poll_until_done(retrainer)
+
+    assert result == (version, ('predictor', version), GOOD_METRICS)
+    assert retrainer.history[-1]['status'] == 'ready'
+    assert retrainer.registry.list_versions() == [version]
+    retrainer.shutdown()
@@ -0,0 +1,173 @@
+"""
+단일 행 예측기 동작 테스트
+
+- predict_one()이 같은 입력의 MLPricePredictor.predict와 같은 값을 돌려주는지
+- push_price() 링 버퍼가 set_window()로 만든 창과 같은지
+- CompiledForest가 RandomForestRegressor.predict와 같은지
+
+TensorFlow·XGBoost 없이 돌도록 LSTM과 XGBoost는 선형 모델 대역으로 대체합니다.
+"""
+
+import logging
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+from ml_price_predictor import MLPricePredictor
+from models.ensemble_model import EnsembleModel
+from streaming_predictor import LATENCY_STAGES, CompiledForest, StreamingPredictor
+
+
+logging.disable(logging.INFO)
+
+SEQUENCE_LENGTH = 10
+N_FEATURES = 6
+
+
+class LinearKerasModel:
+    """keras.Model처럼 직접 호출하거나 predict 할 수 있는 선형 모델"""
+
+    def __init__(self, weights):
+        self.weights = np.asarray(weights, dtype=np.float32)
+
+    def __call__(self, x, training=False):
+        x = np.asarray(x, dtype=np.float32)
+        return (x.reshape(len(x), -1) @ self.weights).reshape(-1, 1)
+
+    def predict(self, x, verbose=0):
+        return self(x)
+
+
+class LinearLSTM:
+    """LSTMModel 대역 (model 속성 + predict)"""
+
+    def __init__(self, weights):
+        self.model = LinearKerasModel(weights)
+
+    def predict(self, X):
+        return self.model.predict(X, verbose=0).flatten()
+
+
+class LinearXGB:
+    """XGBRegressor 대역 (get_booster가 없어 predict 경로 사용)"""
+
+    def __init__(self, coef, intercept):
+        self.coef = np.asarray(coef)
+        self.intercept = intercept
+
+    def predict(self, X):
+        return np.asarray(X) @ self.coef + self.intercept
+
+
+@pytest.fixture(scope='module')
+def market_data():
+    rng = np.random.default_rng(3)
+    n = 200
+    prices = 50_000_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    features = rng.normal(0, 1, (n, N_FEATURES)) * [1, 10, 100, 0.1, 5, 50] + [0, 5, 1000, 0, -3, 20]
+    return prices, features
+
+
+@pytest.fixture(scope='module')
+def predictor(market_data):
+    prices, features = market_data
+    rng = np.random.default_rng(4)
+
+    predictor = MLPricePredictor(sequence_length=SEQUENCE_LENGTH)
+    predictor.price_scaler = MinMaxScaler().fit(prices.reshape(-1, 1))
+    predictor.feature_scaler = StandardScaler().fit(features)
+    predictor.y_scaler = MinMaxScaler().fit(prices.reshape(-1, 1))
+
+    X = predictor.feature_scaler.transform(features)
+    y = predictor.y_scaler.transform(prices.reshape(-1, 1)).ravel()
+
+    ensemble = EnsembleModel()
+    ensemble.rf_model = RandomForestRegressor(n_estimators=15, max_depth=6, random_state=0).fit(X, y)
+    ensemble.xgb_model = LinearXGB(rng.normal(0, 0.05, N_FEATURES), 0.5)
+    predictor.ensemble_model = ensemble
+    predictor.lstm_model = LinearLSTM(rng.dirichlet(np.ones(SEQUENCE_LENGTH)))
+    return predictor
+
+
+def batch_predict(predictor, prices, features, end):
+    """MLPricePredictor.predict 경로로 end-1번째 봉 한 건 예측"""
+    window = prices[end - SEQUENCE_LENGTH:end].reshape(-1, 1)
+    X_lstm = predictor.price_scaler.transform(window).reshape(1, SEQUENCE_LENGTH, 1)
+    X_ml = predictor.feature_scaler.transform(features[end - 1:end])
+    return predictor.predict(X_lstm, X_ml)
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_predict_one_matches_batch_predict(predictor, market_data, parallel):
+    """push_price로 창을 밀면서 매 봉 predict_one()이 predict()와 같은지 확인"""
+    prices, features = market_data
+    fast = StreamingPredictor(predictor, parallel=parallel)
+    fast.set_window(prices[:SEQUENCE_LENGTH])
+
+    try:
+        for end in range(SEQUENCE_LENGTH, len(prices) + 1):
+            if end > SEQUENCE_LENGTH:
+                fast.push_price(prices[end - 1])
+            result = fast.predict_one(features[end - 1])
+            expected = batch_predict(predictor, prices, features, end)
+
+            # LSTM 입력은 float32라 정규화 순서에 따른 반올림 차이만 허용
+            assert result['prediction'] == pytest.approx(expected['predictions'][0], rel=1e-6)
+            assert result['lstm_pred'] == pytest.approx(expected['lstm_pred'][0], rel=1e-6)
+            assert result['rf_pred'] == pytest.approx(expected['rf_pred'][0], rel=1e-12)
+            assert result['xgb_pred'] == pytest.approx(expected['xgb_pred'][0], rel=1e-9)
+            assert result['confidence'] == pytest.approx(expected['confidence'][0], rel=1e-6)
+    finally:
+        fast.close()
+
+    assert set(result['latency_ms']) == set(LATENCY_STAGES)
+    assert set(fast.get_latency_stats()) == set(LATENCY_STAGES)
+
+
+def test_push_price_matches_set_window(predictor, market_data):
+    """링 버퍼를 여러 바퀴 돌려도 창이 최근 종가 순서 그대로인지 확인"""
+    prices, _ = market_data
+    pushed = StreamingPredictor(predictor, parallel=False)
+    reference = StreamingPredictor(predictor, parallel=False)
+
+    for i, price in enumerate(prices[:3 * SEQUENCE_LENGTH + 3], start=1):
+        pushed.push_price(price)
+        assert pushed.is_ready == (i >= SEQUENCE_LENGTH)
+        if pushed.is_ready:
+            reference.set_window(prices[:i])
+            np.testing.assert_array_equal(pushed.window(), reference.window())
+
+
+def test_predict_one_requires_full_window(predictor, market_data):
+    """종가 창이 다 차지 않으면 예측하지 않음"""
+    prices, features = market_data
+    fast = StreamingPredictor(predictor, parallel=False)
+    fast.set_window(prices[:SEQUENCE_LENGTH - 1])
+
+    assert not fast.is_ready
+    with pytest.raises(ValueError):
+        fast.predict_one(features[0])
+
+
+def test_compiled_forest_matches_sklearn(predictor, market_data):
+    """평탄화한 트리 탐색이 RandomForestRegressor.predict와 같은지 확인"""
+    _, features = market_data
+    rf = predictor.ensemble_model.rf_model
+    forest = CompiledForest(rf)
+    X = predictor.feature_scaler.transform(features)
+
+    compiled = np.array([forest.predict_one(row) for row in X])
+    np.testing.assert_allclose(compiled, rf.predict(X), rtol=1e-12)
+
+
+def test_unsupported_scaler_is_rejected(predictor):
+    """affine 계수로 바꿀 수 없는 스케일러는 거부"""
+    original = predictor.y_scaler
+    predictor.y_scaler = object()
+    try:
+        with pytest.raises(ValueError):
+            StreamingPredictor(predictor)
+    finally:
+        predictor.y_scaler = original